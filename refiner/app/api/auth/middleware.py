@@ -12,7 +12,12 @@ from app.db.pool import AsyncDatabaseConnection, get_db
 from ...core.exceptions import DatabaseConnectionError, DatabaseQueryError
 from ...db.users.model import DbUser
 from ...services.logger import get_logger
-from .session import SESSION_TTL, get_hashed_token, set_session_cookie
+from .session import (
+    SESSION_TTL,
+    get_hashed_token,
+    session_cache,
+    set_session_cookie,
+)
 
 RENEW_THRESHOLD = timedelta(minutes=15)
 
@@ -72,9 +77,16 @@ async def get_logged_in_user(
         )
 
     token_hash = get_hashed_token(session_token)
+
+    # * a recent lookup of this session is reused rather than repeated, as
+    # long as it isn't yet due for renewal; renewal always goes to the db
+    cached = session_cache.get(token_hash)
+    if cached is not None and cached.expires_at - dt.now(UTC) >= RENEW_THRESHOLD:
+        return cached.user
+
     db_user = None
     try:
-        db_user = await _fetch_session_user(token_hash=token_hash, db=db)
+        db_user = await _fetch_and_renew_session_user(token_hash=token_hash, db=db)
     except (DatabaseConnectionError, DatabaseQueryError) as db_err:
         logger.error(
             "Database error occurred while getting user information",
@@ -86,89 +98,98 @@ async def get_logged_in_user(
         )
 
     if not db_user:
+        session_cache.invalidate(token_hash)
         logger.info("User session could not be found in the database.")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=session_expiry_msg,
         )
 
+    # Refresh the cookie if the session was renewed
+    if db_user.pop("renewed"):
+        set_session_cookie(
+            response=response,
+            app_config=get_app_config(),
+            session_token=session_token,
+        )
+
     user = DbUserWithSessionExpiryTime(**db_user)
 
-    # Renew session if it's close to expiring
-    await _update_session_expiry_time(
-        expires_at=user.expires_at,
-        token_hash=token_hash,
-        logger=logger,
-        response=response,
-        session_token=session_token,
-        db=db,
+    # Create a DbUser from the DbUserWithSessionExpiryTime to return
+    result = user.to_db_user()
+    session_cache.set(token_hash=token_hash, user=result, expires_at=user.expires_at)
+    return result
+
+
+_FETCH_AND_RENEW_SESSION_QUERY = """
+    WITH session AS (
+        SELECT user_id, expires_at
+        FROM sessions
+        WHERE token_hash = %(token_hash)s AND expires_at > %(now)s
+    ),
+    renewed AS (
+        UPDATE sessions
+        SET expires_at = %(new_expires_at)s
+        WHERE token_hash = %(token_hash)s
+          AND expires_at > %(now)s
+          AND expires_at < %(renew_before)s
+        RETURNING expires_at
     )
+    SELECT
+        users.*,
+        COALESCE(renewed.expires_at, session.expires_at) AS expires_at,
+        renewed.expires_at IS NOT NULL AS renewed
+    FROM session
+    JOIN users ON session.user_id = users.id
+    LEFT JOIN renewed ON TRUE
+"""
 
-    # Create a DbUser from the DbUserWithSessionExpiryTime to return
-    return user.to_db_user()
 
+def _fetch_and_renew_session_params(token_hash: str) -> dict[str, str | datetime]:
+    now = dt.now(UTC)
+    return {
+        "token_hash": token_hash,
+        "now": now,
+        "new_expires_at": now + SESSION_TTL,
+        "renew_before": now + RENEW_THRESHOLD,
+    }
 
-async def _fetch_session_user(
-    token_hash: str, db: AsyncDatabaseConnection
-) -> dict | None:
-    async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT users.*, sessions.expires_at
-                FROM sessions
-                JOIN users ON sessions.user_id = users.id
-                WHERE sessions.token_hash = %s AND sessions.expires_at > %s
-                """,
-                (token_hash, dt.now(UTC)),
-            )
-            return await cur.fetchone()
 
+def get_session_warm_up_statement() -> tuple[str, dict[str, str | datetime]]:
+    """
+    The session lookup run by every authenticated request, for pool warm-up.
 
-async def _update_session_expiry_time(
-    response: Response,
-    session_token: str,
-    expires_at: datetime,
-    token_hash: str,
-    logger: Logger,
-    db: AsyncDatabaseConnection,
-) -> None:
+    Its token hash matches no session, so running it reads and renews nothing.
     """
-    Updates a user's session expiration if it is set to expire soon.
+
+    return _FETCH_AND_RENEW_SESSION_QUERY, _fetch_and_renew_session_params(
+        token_hash=""
+    )
+
+
+async def _fetch_and_renew_session_user(
+    token_hash: str, db: AsyncDatabaseConnection
+) -> dict | None:
+    """
+    Looks up a session's user and renews the session if it's close to expiring.
+
+    Both happen in one round-trip. The UPDATE only matches a session within
+    RENEW_THRESHOLD of expiring, so most requests don't write at all, and of
+    several concurrent requests due for renewal only the first one writes:
+    the rest re-check the updated row and no longer match.
 
     Args:
-        response (Response): The response object
-        session_token (str): The user's session token
-        expires_at (datetime): Current expiration time
         token_hash (str): Hashed session token
-        logger (Logger): Standard logger
         db (AsyncDatabaseConnection): The database connection
 
-    Raises:
-        HTTPException: 500 if there is an error while updating the session
+    Returns:
+        dict | None: The user's columns plus `expires_at` and `renewed`, or
+        None if the session doesn't exist or has expired
     """
-    now = dt.now(UTC)
-    if expires_at - now < RENEW_THRESHOLD:
-        new_expiration = now + SESSION_TTL
-        try:
-            async with db.get_connection() as conn:
-                async with conn.cursor(row_factory=dict_row) as cur:
-                    await cur.execute(
-                        "UPDATE sessions SET expires_at = %s WHERE token_hash = %s",
-                        (new_expiration, token_hash),
-                    )
-            set_session_cookie(
-                response=response,
-                app_config=get_app_config(),
-                session_token=session_token,
-            )
-
-        except (DatabaseConnectionError, DatabaseQueryError) as db_err:
-            logger.error(
-                "Database error occurred while getting user information",
-                extra={"error": str(db_err), "error_details": db_err.details},
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal database error.",
+    async with db.get_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                _FETCH_AND_RENEW_SESSION_QUERY,
+                _fetch_and_renew_session_params(token_hash=token_hash),
             )
+            return await cur.fetchone()
@@ -2,9 +2,11 @@ import asyncio
 import hashlib
 import hmac
 import secrets
-from datetime import UTC, timedelta
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from datetime import datetime as dt
 from logging import Logger
+from time import monotonic
 
 from fastapi import Response
 from psycopg.rows import dict_row
@@ -17,6 +19,112 @@ from ...db.users.model import DbUser
 SESSION_EXPIRY_SECONDS = 3600  # one hour
 SESSION_TTL = timedelta(seconds=SESSION_EXPIRY_SECONDS)
 
+# past this many entries, stale ones are swept before another is added
+SESSION_CACHE_MAX_ENTRIES = 10_000
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """
+    A session lookup held by the SessionCache.
+    """
+
+    user: DbUser
+    expires_at: datetime
+    cached_at: float
+
+
+class SessionCache:
+    """
+    A short-lived, per-process cache of session lookups keyed by token hash.
+
+    The UI fires many API calls in parallel per page, and each one would
+    otherwise look its session up in the database. Entries live for
+    `ttl_seconds`; logging out drops the entry in this process, and the
+    short TTL bounds how long another worker can keep serving it.
+    Disabled (a TTL of 0) until the webapp lifespan enables it.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self.ttl_seconds = 0.0
+        self._entries: dict[str, CachedSession] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether lookups are being cached.
+        """
+
+        return self.ttl_seconds > 0
+
+    def get(self, token_hash: str) -> CachedSession | None:
+        """
+        Return the cached lookup for `token_hash` if it's fresh and unexpired.
+        """
+
+        entry = self._entries.get(token_hash)
+        if entry is None:
+            return None
+
+        if (
+            monotonic() - entry.cached_at >= self.ttl_seconds
+            or entry.expires_at <= dt.now(UTC)
+        ):
+            self._entries.pop(token_hash, None)
+            return None
+
+        return entry
+
+    def set(self, token_hash: str, user: DbUser, expires_at: datetime) -> None:
+        """
+        Cache a successful session lookup.
+        """
+
+        if not self.enabled:
+            return
+
+        if len(self._entries) >= SESSION_CACHE_MAX_ENTRIES:
+            self._sweep()
+
+        self._entries[token_hash] = CachedSession(
+            user=user, expires_at=expires_at, cached_at=monotonic()
+        )
+
+    def invalidate(self, token_hash: str) -> None:
+        """
+        Drop the cached lookup for one session.
+        """
+
+        self._entries.pop(token_hash, None)
+
+    def enable(self, ttl_seconds: float) -> None:
+        """
+        Start caching session lookups for `ttl_seconds` each.
+        """
+
+        self.ttl_seconds = ttl_seconds
+
+    def disable(self) -> None:
+        """
+        Stop caching session lookups and drop anything cached.
+        """
+
+        self.ttl_seconds = 0.0
+        self._entries.clear()
+
+    def _sweep(self) -> None:
+        cutoff = monotonic() - self.ttl_seconds
+        self._entries = {
+            token_hash: entry
+            for token_hash, entry in self._entries.items()
+            if entry.cached_at > cutoff
+        }
+        if len(self._entries) >= SESSION_CACHE_MAX_ENTRIES:
+            self._entries.clear()
+
+
+session_cache = SessionCache()
+
 
 def get_hashed_token(token: str, secret_key: str | None = None) -> str:
     """
@@ -158,6 +266,7 @@ async def delete_session(token: str, db: AsyncDatabaseConnection) -> None:
         db (AsyncDatabaseConnection): The database connection
     """
     token_hash = get_hashed_token(token)
+    session_cache.invalidate(token_hash)
     query = "DELETE FROM sessions WHERE token_hash = %s"
     params = (token_hash,)
     async with db.get_connection() as conn:
@@ -1,8 +1,8 @@
+import asyncio
 from logging import Logger
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.concurrency import run_in_threadpool
 
 from app.api.auth.middleware import get_logged_in_user
 from app.db.conditions.db import get_conditions_by_ids, get_primary_condition_db
@@ -141,8 +141,8 @@ async def activate_configuration(
         )
 
     # Write the config data to S3 and get the URL back
-    s3_url = await run_in_threadpool(
-        upload_configuration_payload, config_payload, config_metadata, logger
+    s3_url = await upload_configuration_payload(
+        payload=config_payload, metadata=config_metadata, logger=logger
     )
 
     # Activate config in the database
@@ -169,15 +169,20 @@ async def activate_configuration(
         conditions=active_conditions
     )
 
-    # Write the mapping file to the jurisdiction's directory
-    await run_in_threadpool(
-        upload_condition_mapping_payload, condition_mapping_payload, jd, logger
-    )
-
     # Activation file has been written to S3 and the database record has been updated.
-    # We can now make a new current.json file for the newly activated version.
-    await run_in_threadpool(
-        upload_current_version_file, s3_url, active_config.version, logger
+    # We can now write the jurisdiction's mapping file and a new current.json file
+    # for the newly activated version; neither depends on the other.
+    await asyncio.gather(
+        upload_condition_mapping_payload(
+            mapping_payload=condition_mapping_payload,
+            jurisdiction_id=jd,
+            logger=logger,
+        ),
+        upload_current_version_file(
+            directory_key=s3_url,
+            active_version=active_config.version,
+            logger=logger,
+        ),
     )
 
     return ConfigurationStatusUpdateResponse(
@@ -243,7 +248,9 @@ async def deactivate_configuration(
 
     # Try updating `current.json` first
     s3_url = config_to_deactivate.s3_url
-    await run_in_threadpool(upload_current_version_file, s3_url, None, logger)
+    await upload_current_version_file(
+        directory_key=s3_url, active_version=None, logger=logger
+    )
 
     deactivated_config = await deactivate_configuration_db(
         configuration_id=config_to_deactivate.id,
@@ -267,8 +274,8 @@ async def deactivate_configuration(
     )
 
     # Write the mapping file to the jurisdiction's directory
-    await run_in_threadpool(
-        upload_condition_mapping_payload, condition_mapping_payload, jd, logger
+    await upload_condition_mapping_payload(
+        mapping_payload=condition_mapping_payload, jurisdiction_id=jd, logger=logger
     )
 
     return ConfigurationStatusUpdateResponse(
@@ -3,7 +3,6 @@ from logging import Logger
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.concurrency import run_in_threadpool
 
 from app.api.auth.middleware import get_logged_in_user
 from app.core.config import AppConfig, get_app_config
@@ -227,12 +226,11 @@ async def get_serialized_configuration(
         )
 
     try:
-        return await run_in_threadpool(
-            get_serialized_files,
-            user.jurisdiction_id,
-            primary_condition.canonical_url,
-            config.version,
-            logger,
+        return await get_serialized_files(
+            jurisdiction_id=user.jurisdiction_id,
+            canonical_url=primary_condition.canonical_url,
+            version=config.version,
+            logger=logger,
         )
     except Exception:
         raise HTTPException(
@@ -2,7 +2,7 @@ import csv
 import io
 from dataclasses import dataclass
 from logging import Logger
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
@@ -25,11 +25,9 @@ from app.db.configurations.custom_codes.db import (
     delete_custom_code_db,
     edit_custom_code_db,
     get_custom_code_by_id_db,
-    get_custom_codes_by_configuration_id_db,
     insert_custom_code_db,
     insert_custom_codes_db,
 )
-from app.db.configurations.custom_codes.model import DbCustomCode
 from app.db.configurations.db import (
     get_configuration_by_id_db,
 )
@@ -37,13 +35,12 @@ from app.db.configurations.model import DbTotalConditionCodeCount
 from app.db.pool import AsyncDatabaseConnection, get_db
 from app.db.users.model import DbUser
 from app.services.code_systems import (
-    find_code_system_by_display_name,
     find_code_system_by_id_or_raise,
     get_allowed_code_system_keys,
 )
 from app.services.configuration_locks import ConfigurationLock
+from app.services.custom_codes import validate_custom_codes_csv
 from app.services.logger import get_logger
-from app.services.terminology import CodeSystemKey
 
 router = APIRouter(prefix="/{configuration_id}/custom-codes")
 
@@ -259,61 +256,6 @@ async def _get_requested_config_or_raise(
     return config
 
 
-def _validate_csv_upload_row(
-    row: dict, supported_systems: list[DbCodeSystem]
-) -> tuple[str, DbCodeSystem, str] | list[str]:
-    code = (row.get("code") or "").strip()
-    code_system_raw = (row.get("code_system") or "").strip()
-    name = (row.get("display_name") or "").strip()
-
-    system_names = [s.display_name for s in supported_systems]
-
-    # get the DbCodeSystem that matches CSV system
-    matching_system = find_code_system_by_display_name(
-        systems=supported_systems, display_name=code_system_raw
-    )
-
-    row_errors: list[str] = []
-
-    if not code:
-        row_errors.append("Missing code")
-    if not name:
-        row_errors.append("Missing display_name")
-    if not code_system_raw:
-        row_errors.append("Missing code_system")
-    elif not matching_system:
-        allowed_systems_str = ", ".join(system_names)
-        row_errors.append(
-            f"Invalid system: {code_system_raw}. "
-            f"[code_system] must be one of [{allowed_systems_str}]"
-        )
-
-    if row_errors or not matching_system:
-        return row_errors
-
-    return (code, matching_system, name)
-
-
-def _check_row_response_for_duplicates(
-    code: str,
-    system: DbCodeSystem,
-    custom_codes: list[DbCustomCode],
-    codes_seen_so_far: set,
-) -> tuple[str, CodeSystemKey] | list[str]:
-    row_errors = []
-    custom_code_keys = [(cc.code, str(cc.system_id)) for cc in custom_codes]
-    code_key = (code, str(system.id))
-
-    if code_key in custom_code_keys:
-        row_errors.append("Duplicate: matches existing custom code")
-    if code_key in codes_seen_so_far:
-        row_errors.append("Duplicate: matches uploaded batch code")
-    if row_errors:
-        return row_errors
-
-    return code_key
-
-
 @router.post(
     "/upload",
     tags=["configurations"],
@@ -350,52 +292,16 @@ async def upload_custom_codes_csv(
         configuration_id=configuration_id, db=db, user=user
     )
 
-    supported_systems = await get_code_systems_db(db=db)
-
-    preview_items: list[UploadCustomCodesPreviewItem] = []
-    errors: list[dict] = []
+    code_systems = await get_code_systems_db(db=db)
 
-    custom_codes = await get_custom_codes_by_configuration_id_db(
-        configuration_id=config.id, db=db
+    validation = await validate_custom_codes_csv(
+        csv_reader,
+        supported_systems=code_systems,
+        existing_codes=config.custom_codes,
     )
-    codes_seen_so_far: set[tuple[str, CodeSystemKey]] = set()
+    preview_items = validation.preview_items
+    errors = validation.errors
 
-    for row_number, row in enumerate(csv_reader, start=2):
-        row_errors = []
-        row_response = _validate_csv_upload_row(
-            row, supported_systems=supported_systems
-        )
-        if isinstance(row_response, list):
-            row_errors.extend(row_response)
-            errors.append({"row": row_number, "error": ", ".join(row_errors)})
-            continue
-
-        (code, row_system, name) = row_response
-
-        duplicate_check_response = _check_row_response_for_duplicates(
-            code=code,
-            system=row_system,
-            custom_codes=custom_codes,
-            codes_seen_so_far=codes_seen_so_far,
-        )
-        if isinstance(duplicate_check_response, list):
-            row_errors.extend(duplicate_check_response)
-            errors.append({"row": row_number, "error": ", ".join(row_errors)})
-            continue
-
-        codes_seen_so_far.add(duplicate_check_response)
-        preview_items.append(
-            UploadCustomCodesPreviewItem(
-                id=uuid4(),
-                code=code,
-                system_id=row_system.id,
-                system_name=row_system.display_name,
-                display=name,
-                row=row_number,
-            )
-        )
-
-    code_systems = await get_code_systems_db(db=db)
     if errors:
         logger.error("CSV upload errors", extra={"errors": errors})
         raise HTTPException(
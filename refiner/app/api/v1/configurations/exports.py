@@ -1,23 +1,19 @@
 import csv
+from collections.abc import AsyncIterator
 from io import StringIO
-from logging import Logger
-from typing import Literal
+from typing import Final, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
 
 from app.api.auth.middleware import get_logged_in_user
-from app.db.code_systems.db import get_id_to_code_system_dict_db
-from app.db.conditions.db import (
-    get_condition_codes_by_condition_id_db,
-    get_included_conditions_db,
+from app.db.configurations.db import (
+    get_configuration_by_id_db,
+    stream_configuration_export_codes_db,
 )
-from app.db.conditions.model import DbCondition
-from app.db.configurations.db import get_configuration_by_id_db
 from app.db.configurations.labels import CODED_DATA_LABELS, NARRATIVE_DATA_LABELS
 from app.db.configurations.model import (
-    DbConfiguration,
     DbConfigurationSectionProcessing,
     DbNarrativeAction,
     DbSectionAction,
@@ -25,12 +21,19 @@ from app.db.configurations.model import (
 from app.db.pool import AsyncDatabaseConnection, get_db
 from app.db.users.model import DbUser
 from app.services.ecr.policy import NARRATIVE_ONLY_SECTIONS
-from app.services.file_exports import get_export_timestamp
-from app.services.file_io import ZipFileItem, ZipFilePackage
-from app.services.logger import get_logger
+from app.services.file_exports import get_export_timestamp, spool_csv_chunks
+from app.services.file_io import stream_zip
 
 router = APIRouter(prefix="/{configuration_id}/export")
 
+CODES_CSV_HEADER: Final = [
+    "Code Type",
+    "Condition",
+    "Code System",
+    "Code",
+    "Display Name",
+]
+
 
 @router.get(
     "",
@@ -41,11 +44,17 @@ router = APIRouter(prefix="/{configuration_id}/export")
 async def get_configuration_export(
     configuration_id: UUID,
     user: DbUser = Depends(get_logged_in_user),
-    logger: Logger = Depends(get_logger),
     db: AsyncDatabaseConnection = Depends(get_db),
 ) -> Response:
     """
     Create a CSV export of a configuration and all associated codes.
+
+    Every code is first read from the database and written as CSV to a
+    SpooledTemporaryFile (see `spool_csv_chunks`), which moves to disk once
+    it's large, so the database connection is released before the download
+    starts. The zip is then compressed and streamed from that spool as the
+    client downloads it, so memory stays flat however many codes the
+    configuration has.
     """
 
     config = await get_configuration_by_id_db(
@@ -58,58 +67,37 @@ async def get_configuration_export(
             detail="Configuration not found.",
         )
 
-    included_conditions = await get_included_conditions_db(
-        included_conditions=config.included_conditions, db=db
-    )
-
-    codes_csv_content = await _build_config_csv(
-        config=config, conditions=included_conditions, logger=logger, db=db
-    )
-    sections_csv_content = _build_sections_csv(sections=config.section_processing)
-
     timestamp = get_export_timestamp()
 
-    zip_package = ZipFilePackage(
-        name=_build_export_filename(
-            filename="Configuration_Export",
-            extension="zip",
+    def build_filename(filename: str, extension: Literal["csv", "zip"]) -> str:
+        return _build_export_filename(
+            filename=filename,
+            extension=extension,
             config_name=config.name,
             config_version=config.version,
             timestamp=timestamp,
         )
-    )
-
-    zip_package.add(
-        ZipFileItem(
-            file_name=_build_export_filename(
-                filename="Code_Export",
-                extension="csv",
-                config_name=config.name,
-                config_version=config.version,
-                timestamp=timestamp,
-            ),
-            file_content=codes_csv_content,
-        )
-    )
 
-    zip_package.add(
-        ZipFileItem(
-            file_name=_build_export_filename(
-                filename="Section_Export",
-                extension="csv",
-                config_name=config.name,
-                config_version=config.version,
-                timestamp=timestamp,
-            ),
-            file_content=sections_csv_content,
-        )
+    # spooled, so the codes cursor's connection goes back to the pool before
+    # the client has downloaded the zip
+    codes_csv = spool_csv_chunks(
+        header=CODES_CSV_HEADER,
+        rows=_iter_config_code_rows(configuration_id=config.id, db=db),
     )
+    sections_csv = _iter_text(_build_sections_csv(sections=config.section_processing))
 
     return StreamingResponse(
-        content=zip_package.iter_chunks(),
+        content=stream_zip(
+            [
+                (build_filename("Code_Export", "csv"), codes_csv),
+                (build_filename("Section_Export", "csv"), sections_csv),
+            ]
+        ),
         media_type="application/zip",
         headers={
-            "Content-Disposition": f'attachment; filename="{zip_package.get_name()}"'
+            "Content-Disposition": (
+                f'attachment; filename="{build_filename("Configuration_Export", "zip")}"'
+            )
         },
     )
 
@@ -160,57 +148,25 @@ def _get_narrative_data_value(narrative: DbNarrativeAction, included: bool) -> s
     return NARRATIVE_DATA_LABELS.get(narrative, "N/A")
 
 
-async def _build_config_csv(
-    config: DbConfiguration,
-    conditions: list[DbCondition],
-    logger: Logger,
-    db: AsyncDatabaseConnection,
-) -> str:
-    """Build the CSV export content for a configuration."""
-
-    code_systems = await get_id_to_code_system_dict_db(db=db)
-
-    with StringIO() as csv_text:
-        writer = csv.writer(csv_text)
-        writer.writerow(
-            ["Code Type", "Condition", "Code System", "Code", "Display Name"]
-        )
-
-        for cond in conditions:
-            codes = await get_condition_codes_by_condition_id_db(
-                condition_id=cond.id, db=db
-            )
-            for code in codes:
-                writer.writerow(
-                    [
-                        "TES condition grouper code",
-                        cond.display_name,
-                        code.system,
-                        code.code,
-                        code.description,
-                    ]
-                )
-
-        for cc in config.custom_codes or []:
-            code_system = code_systems.get(cc.system_id)
-            if code_system is None:
-                logger.warning(
-                    "Could not find code system for custom code, skipping",
-                    extra={"id": cc.id, "system_id": cc.system_id, "code": cc.code},
-                )
-                continue
-
-            writer.writerow(
-                [
-                    "Custom code",
-                    "",
-                    code_system.display_name,
-                    cc.code,
-                    cc.display,
-                ]
-            )
-
-        return csv_text.getvalue()
+async def _iter_config_code_rows(
+    configuration_id: UUID, db: AsyncDatabaseConnection
+) -> AsyncIterator[list[str]]:
+    """Yield the codes CSV rows for a configuration as they're read."""
+    async for code in stream_configuration_export_codes_db(
+        configuration_id=configuration_id, db=db
+    ):
+        yield [
+            code.code_type,
+            code.condition_name,
+            code.code_system,
+            code.code,
+            code.display_name,
+        ]
+
+
+async def _iter_text(text: str) -> AsyncIterator[str]:
+    """Yield already-built text as a single chunk."""
+    yield text
 
 
 def _build_export_filename(
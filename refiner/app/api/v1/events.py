@@ -1,5 +1,8 @@
 import asyncio
+import binascii
 import csv
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from io import StringIO
@@ -8,12 +11,14 @@ from uuid import UUID
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.api.auth.middleware import get_logged_in_user
 from app.core.exceptions import DatabaseConnectionError, DatabaseQueryError
 from app.db.conditions.db import get_condition_codes_by_condition_id_db
 from app.db.events.db import (
     AuditEvent,
+    EventPageKey,
     get_all_events_by_jd_db,
     get_code_set_event_by_id_db,
     get_custom_code_upload_events_by_event_id,
@@ -25,7 +30,7 @@ from app.db.events.db import (
 from app.db.events.model import CodeSetEvent
 from app.db.pool import AsyncDatabaseConnection, get_db
 from app.db.users.model import DbUser
-from app.services.file_exports import get_export_timestamp
+from app.services.file_exports import get_export_timestamp, spool_csv_chunks
 from app.services.logger import get_logger
 
 router = APIRouter(prefix="/events")
@@ -51,6 +56,32 @@ class EventsResponse:
     audit_events: list[AuditEvent]
     configuration_options: list[EventFilterOption]
     total_pages: int
+    next_cursor: str | None = None
+
+
+def _encode_event_cursor(event: AuditEvent) -> str:
+    """
+    Encodes an event's position in the log as an opaque page cursor.
+    """
+    key = f"{event.created_at.isoformat()}|{event.id}"
+    return urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def _decode_event_cursor(cursor: str) -> EventPageKey:
+    """
+    Decodes a page cursor made by `_encode_event_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        created_at, id = urlsafe_b64decode(cursor).decode("utf-8").split("|")
+        return EventPageKey(created_at=datetime.fromisoformat(created_at), id=UUID(id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' is not a valid events cursor.",
+        )
 
 
 @router.get(
@@ -64,16 +95,23 @@ async def get_events(
     db: AsyncDatabaseConnection = Depends(get_db),
     logger: Logger = Depends(get_logger),
     page: int = 1,
+    cursor: str | None = None,
     canonical_url: str | None = None,
 ) -> EventsResponse:
     """
     Returns a list of all events for a jurisdiction, ordered from newest to oldest.
 
+    Pages can be requested by number or, to step through the log, with the
+    `next_cursor` of the previous page; a cursor is read straight from the
+    index however far back it is, while a page number costs more the
+    deeper it goes.
+
     Args:
         user (DbUser): The user making the request.
         db (AsyncDatabaseConnection): Database connection.
         logger (Logger): Standard logger.
-        page (int): page of events to return to the client.
+        page (int): page of events to return to the client; ignored with `cursor`.
+        cursor (str | None): The `next_cursor` of the previous page.
         canonical_url (str | None): An optional filter on the condition.
 
     Returns:
@@ -81,10 +119,12 @@ async def get_events(
             - Total page count
             - The list of AuditEvents relevant for the (optional) filter
             - The list of condition information with potentially filter-able data
+            - A cursor for the next page, if there is one
     """
 
     PAGE_SIZE = 10
     jd = user.jurisdiction_id
+    after = _decode_event_cursor(cursor) if cursor else None
 
     if page < 1:
         raise HTTPException(
@@ -97,10 +137,12 @@ async def get_events(
             get_event_count_by_condition_db(
                 jurisdiction_id=jd, canonical_url=canonical_url, db=db
             ),
+            # one extra row tells us whether there's a next page
             get_events_by_jd_db(
                 jurisdiction_id=jd,
                 page=page,
-                page_size=PAGE_SIZE,
+                after=after,
+                page_size=PAGE_SIZE + 1,
                 canonical_url=canonical_url,
                 db=db,
             ),
@@ -124,15 +166,19 @@ async def get_events(
 
     total_pages = max((total_event_count + PAGE_SIZE - 1) // PAGE_SIZE, 1)
 
-    if page > total_pages:
+    if after is None and page > total_pages:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"'page' must be a number less than or equal to {total_pages}.",
         )
 
+    has_next_page = len(audit_events) > PAGE_SIZE
+    audit_events = audit_events[:PAGE_SIZE]
+
     return EventsResponse(
         total_pages=total_pages,
         audit_events=audit_events,
+        next_cursor=_encode_event_cursor(audit_events[-1]) if has_next_page else None,
         configuration_options=[
             EventFilterOption(id=co.id, name=co.name, canonical_url=co.canonical_url)
             for co in configuration_options
@@ -288,18 +334,14 @@ async def get_events_export(
         canonical_url (str | None): An optional canonical URL to filter the export by condition
 
     Returns:
-        Response: The generated CSV file
+        Response: The CSV file, streamed once every event has been read
     """
-    output = StringIO()
-    writer = csv.writer(output)
-    # CSV file headers
-    writer.writerow(["Name", "Condition", "Action", "Date"])  # CSV file headers
 
-    async for event in get_all_events_by_jd_db(
-        jurisdiction_id=user.jurisdiction_id, canonical_url=canonical_url, db=db
-    ):
-        writer.writerow(
-            [
+    async def rows() -> AsyncIterator[list[str]]:
+        async for event in get_all_events_by_jd_db(
+            jurisdiction_id=user.jurisdiction_id, canonical_url=canonical_url, db=db
+        ):
+            yield [
                 event.username,
                 f"{event.configuration_name} (Version {event.configuration_version})",
                 _format_action_text(
@@ -308,10 +350,13 @@ async def get_events_export(
                 ),
                 _format_timestamp(dt=event.created_at, timezone=timezone),
             ]
-        )
 
-    return Response(
-        content=output.getvalue(),
+    # spooled, so the events cursor's connection goes back to the pool before
+    # the client has downloaded the file
+    return StreamingResponse(
+        content=spool_csv_chunks(
+            header=["Name", "Condition", "Action", "Date"], rows=rows()
+        ),
         media_type="text/csv",
         headers={
             "Content-Disposition": f'attachment; filename="{_get_exported_file_name()}"'
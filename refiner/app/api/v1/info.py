@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 
@@ -6,6 +8,7 @@ from app.core.config import AppConfig, get_app_config
 from app.db.conditions.db import get_condition_by_id_db
 from app.db.configurations.db import get_configurations_db
 from app.db.pool import AsyncDatabaseConnection, get_db
+from app.db.reference_data import reference_data_cache
 from app.db.schema_migrations.db import get_latest_migration_db
 from app.db.tes.db import get_loaded_tes_versions_db
 from app.db.users.model import DbUser
@@ -65,6 +68,7 @@ async def get_info(
                 "revision": await get_latest_migration_db(db=db),
                 "tes_versions": [tes.version for tes in tes_versions],
                 "latest_tes_version": latest_tes_version.version,
+                "reference_data_cache": asdict(reference_data_cache.get_stats()),
             },
             "session": {
                 "username": user.username,
@@ -1,12 +1,11 @@
 import io
 import re
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from logging import Logger
 from pathlib import Path
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
@@ -25,8 +24,8 @@ from app.db.pool import AsyncDatabaseConnection, get_db
 from app.db.simulator.model import Condition, FileInfoResponse, SimulatorUploadResponse
 from app.db.users.model import DbUser
 from app.services.aws.s3 import (
-    fetch_zip_from_s3,
     get_refined_user_zip_key,
+    stream_zip_from_s3,
     upload_refined_file_package,
 )
 from app.services.conditions.refinement import filter_refined_files_by_diff_rendering
@@ -368,7 +367,9 @@ async def simulator_upload(
 async def download_refined_ecr(
     filename: str,
     user: DbUser = Depends(get_logged_in_user),
-    s3_download: Callable[[str], dict] = Depends(lambda: fetch_zip_from_s3),
+    s3_download: Callable[[str], Awaitable[AsyncIterator[bytes]]] = Depends(
+        lambda: stream_zip_from_s3
+    ),
     logger: Logger = Depends(get_logger),
 ) -> StreamingResponse:
     """Stream refined eCR zip from S3 by filename.
@@ -389,7 +390,7 @@ async def download_refined_ecr(
     )
 
     try:
-        resp = await run_in_threadpool(s3_download, key)
+        chunks = await s3_download(key)
     except Exception as e:
         logger.error(
             "Failed to fetch refined zip from S3",
@@ -400,16 +401,9 @@ async def download_refined_ecr(
             detail="File not found.",
         )
 
-    body = resp.get("Body")
-    if body is None or not hasattr(body, "iter_chunks"):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="File not found.",
-        )
-
     download_name = filename
     return StreamingResponse(
-        content=body.iter_chunks(),
+        content=chunks,
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{download_name}"'},
     )
@@ -15,8 +15,15 @@ def start_app() -> FastAPI:
     Returns:
         FastAPI: the app
     """
+    db_config = get_db_config()
     db = create_db(
-        db_url=get_db_config().DB_URL, db_password=get_db_config().DB_PASSWORD
+        db_url=db_config.DB_URL,
+        db_password=db_config.DB_PASSWORD,
+        min_size=db_config.DB_POOL_MIN_SIZE,
+        max_size=db_config.DB_POOL_MAX_SIZE,
+        timeout=db_config.DB_POOL_TIMEOUT_SECONDS,
+        max_idle=db_config.DB_POOL_MAX_IDLE_SECONDS,
+        max_lifetime=db_config.DB_POOL_MAX_LIFETIME_SECONDS,
     )
     logger = setup_logger(app_config=get_app_config())
     return create_fastapi_app(lifespan=create_lifespan(db=db, logger=logger))
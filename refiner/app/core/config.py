@@ -43,6 +43,15 @@ class AppConfig:
     def __init__(self) -> None:  # noqa: D107
         self.ENV: str = get_env_variable("ENV")
         self.VERSION: str = get_env_variable("VERSION")
+        self.METRICS_ENABLED: bool = (
+            os.getenv("METRICS_ENABLED", "false").lower() == "true"
+        )
+        self.EVENT_LOOP_LAG_THRESHOLD_MS: float = float(
+            os.getenv("EVENT_LOOP_LAG_THRESHOLD_MS", "500")
+        )
+        self.SLOW_REQUEST_THRESHOLD_MS: float = float(
+            os.getenv("SLOW_REQUEST_THRESHOLD_MS", "5000")
+        )
 
 
 class DbConfig:
@@ -51,6 +60,28 @@ class DbConfig:
     def __init__(self) -> None:  # noqa: D107
         self.DB_URL: str = get_env_variable("DB_URL")
         self.DB_PASSWORD: str = get_env_variable("DB_PASSWORD")
+        self.REFERENCE_DATA_CACHE: bool = (
+            os.getenv("REFERENCE_DATA_CACHE", "true").lower() == "true"
+        )
+        # on with the cache by default, so a seed or migration reaches
+        # running workers instead of leaving them stale until restart
+        self.REFERENCE_DATA_CACHE_LISTEN: bool = (
+            os.getenv(
+                "REFERENCE_DATA_CACHE_LISTEN", str(self.REFERENCE_DATA_CACHE)
+            ).lower()
+            == "true"
+        )
+        self.DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+        self.DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+        self.DB_POOL_TIMEOUT_SECONDS: float = float(
+            os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")
+        )
+        self.DB_POOL_MAX_IDLE_SECONDS: float = float(
+            os.getenv("DB_POOL_MAX_IDLE_SECONDS", "600")
+        )
+        self.DB_POOL_MAX_LIFETIME_SECONDS: float = float(
+            os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "3600")
+        )
 
 
 class AuthConfig:
@@ -62,6 +93,9 @@ class AuthConfig:
         self.AUTH_CLIENT_ID: str = get_env_variable("AUTH_CLIENT_ID")
         self.AUTH_CLIENT_SECRET: str = get_env_variable("AUTH_CLIENT_SECRET")
         self.AUTH_ISSUER: str = get_env_variable("AUTH_ISSUER")
+        self.SESSION_CACHE_TTL_SECONDS: float = float(
+            os.getenv("SESSION_CACHE_TTL_SECONDS", "5")
+        )
 
 
 class AwsConfig:
@@ -70,6 +104,9 @@ class AwsConfig:
     def __init__(self) -> None:  # noqa: D107
         self.S3_BUCKET_CONFIG: str = get_env_variable("S3_BUCKET_CONFIG")
         self.AWS_REGION: str = get_env_variable("AWS_REGION")
+        self.S3_MAX_POOL_CONNECTIONS: int = int(
+            os.getenv("S3_MAX_POOL_CONNECTIONS", "10")
+        )
 
 
 @lru_cache
@@ -0,0 +1,239 @@
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Final, Protocol
+
+# NOTE:
+# This module provides in-process metrics in the Prometheus text format.
+# * metrics are created on the process-wide `registry` and rendered by the
+#   webapp's metrics endpoint; nothing is pushed anywhere, so there is no
+#   external service to run and the output can be scraped or read locally
+# * histograms use fixed buckets and are safe to observe from threads
+# * callback gauges read their values at render time (pool stats, ...)
+# =============================================================================
+
+# seconds; spans sub-millisecond queries through multi-second refinements
+DEFAULT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+type LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+class Metric(Protocol):
+    """
+    Anything the registry can render.
+    """
+
+    name: str
+
+    def render(self) -> Iterator[str]:
+        """
+        Yield the metric's lines in the Prometheus text format.
+        """
+        ...
+
+
+class Histogram:
+    """
+    A Prometheus histogram with a fixed set of buckets per label set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Create an empty histogram.
+
+        Args:
+            name: The metric name, e.g. "refiner_db_query_duration_seconds".
+            documentation: The HELP text.
+            label_names: The labels every observation must supply.
+            buckets: Upper bounds of the buckets, in increasing order; a
+                +Inf bucket is always added.
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = (*sorted(buckets), float("inf"))
+        self._series: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation, e.g. a duration in seconds.
+        """
+
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            counts = self._series.get(key)
+            if counts is None:
+                counts = self._series[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observe the wall time of a block, in seconds, whether or not it raises.
+        """
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def render(self) -> Iterator[str]:
+        """
+        Yield cumulative bucket counts, sum and count per label set.
+        """
+
+        with self._lock:
+            series = {key: list(counts) for key, counts in self._series.items()}
+            sums = dict(self._sums)
+
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for key in sorted(series):
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets, series[key], strict=True):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.label_names, "le"), (*key, _format_value(upper_bound))
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackGauge:
+    """
+    A gauge whose values are read from a callback when metrics are rendered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Mapping[LabelValues, float]],
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """
+        Create a gauge backed by `callback`.
+
+        Args:
+            name: The metric name.
+            documentation: The HELP text.
+            callback: Returns the current value for each label set; keys are
+                tuples of label values in `label_names` order.
+            label_names: The gauge's label names.
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.callback = callback
+
+    def render(self) -> Iterator[str]:
+        """
+        Yield the gauge's current values.
+        """
+
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        for key, value in sorted(self.callback().items()):
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """
+    The set of metrics rendered by the metrics endpoint.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self._metrics: dict[str, Metric] = {}
+        self._lock = Lock()
+
+    def register[M: Metric](self, metric: M) -> M:
+        """
+        Add a metric, replacing any earlier metric with the same name.
+        """
+
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        Create and register a histogram.
+        """
+
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """
+        Render every registered metric in the Prometheus text format.
+        """
+
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
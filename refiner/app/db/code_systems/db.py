@@ -4,6 +4,7 @@ from uuid import UUID
 from psycopg.rows import class_row
 
 from app.db.pool import AsyncDatabaseConnection
+from app.db.reference_data import reference_data_cache
 
 
 @dataclass
@@ -18,10 +19,7 @@ class DbCodeSystem:
     oid: str
 
 
-async def get_code_systems_db(db: AsyncDatabaseConnection) -> list[DbCodeSystem]:
-    """
-    Fetches all available code systems.
-    """
+async def _fetch_code_systems_db(db: AsyncDatabaseConnection) -> list[DbCodeSystem]:
     query = """
     SELECT id, display_name, oid, key FROM systems;
     """
@@ -33,6 +31,20 @@ async def get_code_systems_db(db: AsyncDatabaseConnection) -> list[DbCodeSystem]
             return rows
 
 
+async def get_code_systems_db(db: AsyncDatabaseConnection) -> list[DbCodeSystem]:
+    """
+    Fetches all available code systems.
+
+    Served from the reference data cache when it is enabled.
+    """
+
+    return list(
+        await reference_data_cache.get_or_load(
+            "code_systems", lambda: _fetch_code_systems_db(db=db)
+        )
+    )
+
+
 async def get_id_to_code_system_dict_db(
     db: AsyncDatabaseConnection,
 ) -> dict[UUID, DbCodeSystem]:
@@ -48,15 +60,7 @@ async def get_id_to_code_system_dict_db(
         dict[UUID, DbCodeSystem]: Dictionary of found code systems, indexed by ID.
     """
 
-    query = """
-    SELECT id, display_name, oid, key FROM systems;
-    """
-
-    async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=class_row(DbCodeSystem)) as cur:
-            await cur.execute(query)
-            rows = await cur.fetchall()
-            return {system.id: system for system in rows}
+    return {system.id: system for system in await get_code_systems_db(db=db)}
 
 
 async def get_code_system_by_key_db(
@@ -74,20 +78,10 @@ async def get_code_system_by_key_db(
         DbCodeSystem | None: Matched code system if found, none otherwise.
     """
 
-    query = """
-    SELECT id, display_name, oid, key FROM systems WHERE key = %s;
-    """
-    params = (key,)
-
-    async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=class_row(DbCodeSystem)) as cur:
-            await cur.execute(query=query, params=params)
-            row = await cur.fetchone()
-
-            if not row:
-                return None
-
-            return row
+    return next(
+        (system for system in await get_code_systems_db(db=db) if system.key == key),
+        None,
+    )
 
 
 async def get_code_system_by_id_db(
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from psycopg.rows import class_row, dict_row
 
+from app.db.reference_data import reference_data_cache
 from app.db.tes.db import get_loaded_tes_versions_db
 from app.services.tes import get_latest_tes_version
 
@@ -550,8 +551,20 @@ async def get_conditions_with_rsg_codes_db(
     """
     Function to fetch all conditions with joins into codes to grab the associated condition RSGs.
 
-    Only grabs the conditions corresponding to the latest TES version.
+    Only grabs the conditions corresponding to the latest TES version. Served
+    from the reference data cache when it is enabled.
     """
+    return list(
+        await reference_data_cache.get_or_load(
+            "conditions_with_rsg_codes",
+            lambda: _fetch_conditions_with_rsg_codes_db(db=db),
+        )
+    )
+
+
+async def _fetch_conditions_with_rsg_codes_db(
+    db: AsyncDatabaseConnection,
+) -> list[ConditionSummary]:
     query = """
         SELECT
             c.id,
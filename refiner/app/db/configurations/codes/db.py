@@ -147,7 +147,8 @@ async def get_codes_db(
 
                 rows = custom_rows
 
-    # Handle condition-linked codes
+    # Handle condition-linked codes, read from the `configurations_codes`
+    # projection (kept up to date by triggers, see its migration)
     remaining = limit - len(rows) + 1  # +1 to detect next page
     cond_params: dict = {
         "configuration_id": configuration_id,
@@ -157,12 +158,14 @@ async def get_codes_db(
     cursor_clause = ""
 
     if not in_custom and decoded:
-        cursor_clause = " AND (cfgc.condition_id, c.code) > (%(cursor_condition_id)s, %(cursor_code)s)"
+        cursor_clause = (
+            " AND (m.condition_id, m.code) > (%(cursor_condition_id)s, %(cursor_code)s)"
+        )
         cond_params["cursor_condition_id"] = decoded.condition_id
         cond_params["cursor_code"] = decoded.code
 
     if code_systems:
-        cond_clauses.append(" AND s.id = ANY(%(code_systems)s::uuid[])")
+        cond_clauses.append(" AND m.system_id = ANY(%(code_systems)s::uuid[])")
         cond_params["code_systems"] = code_systems
 
     # Since "Custom Code" is not a valid UUID we need to strip it before filtering condition grouper codes on their UUID
@@ -173,56 +176,43 @@ async def get_codes_db(
         return rows, next_cursor
 
     if condition_sources:
-        cond_clauses.append(" AND v.id = ANY(%(sources)s::uuid[])")
+        cond_clauses.append(" AND m.source_ids && %(sources)s::uuid[]")
         cond_params["sources"] = condition_sources
 
     if statuses:
         # Map client values to DB values
         db_statuses = [s.lower() for s in statuses]
         if "included" in db_statuses and "excluded" not in db_statuses:
-            cond_clauses.append(" AND e.code_id IS NULL")
+            cond_clauses.append(" AND NOT m.is_excluded")
         elif "excluded" in db_statuses and "included" not in db_statuses:
-            cond_clauses.append(" AND e.code_id IS NOT NULL")
+            cond_clauses.append(" AND m.is_excluded")
         # No clause is needed if both are present
 
     if search:
+        # The projection carries code and display, so the search is a plain
+        # filter on it; its trigram indexes on code and display serve the
+        # substring matches for configurations with many codes.
         cond_clauses.append(
-            " AND (c.code ILIKE %(search)s OR c.display ILIKE %(search)s)"
+            " AND (m.code ILIKE %(search)s OR m.display ILIKE %(search)s)"
         )
         cond_params["search"] = f"%{search}%"
 
     cond_query = f"""
         SELECT
-            c.id,
-            cfgc.condition_id,
-            COALESCE(ARRAY_AGG(DISTINCT v.display_name)) AS source,
-            c.code,
-            c.display AS description,
-            c.system_id,
+            m.code_id AS id,
+            m.condition_id,
+            m.sources AS source,
+            m.code,
+            m.display AS description,
+            m.system_id,
             s.display_name AS system_name,
-            CASE WHEN e.code_id IS NULL THEN 'included' ELSE 'excluded' END AS status
-        FROM configurations_conditions cfgc
-        JOIN conditions con ON con.id = cfgc.condition_id
-        JOIN conditions_codes_temp cc ON cc.condition_id = con.id
-        JOIN codes c ON c.id = cc.code_id
-        INNER JOIN valuesets v ON v.id = cc.valueset_id AND v.condition_id = con.id
-        JOIN systems s ON s.id = c.system_id
-        LEFT JOIN configurations_conditions_code_exclusions e
-            ON e.configuration_id = cfgc.configuration_id
-            AND e.code_id = cc.code_id
-        WHERE cfgc.configuration_id = %(configuration_id)s
+            CASE WHEN m.is_excluded THEN 'excluded' ELSE 'included' END AS status
+        FROM configurations_codes m
+        JOIN systems s ON s.id = m.system_id
+        WHERE m.configuration_id = %(configuration_id)s
         {cursor_clause}
         {"".join(cond_clauses)}
-        GROUP BY
-            c.id,
-            cfgc.condition_id,
-            con.display_name,
-            c.code,
-            c.display,
-            c.system_id,
-            s.display_name,
-            e.code_id
-        ORDER BY cfgc.condition_id, c.code
+        ORDER BY m.condition_id, m.code
         LIMIT %(limit)s;
     """
 
@@ -353,21 +343,15 @@ async def get_all_filter_options_db(
     WITH base_codes AS (
         -- Standard codes linked through conditions
         SELECT
-            c.id AS code_id,
-            s.id AS system_id,
+            m.code_id,
+            m.system_id,
             v.id AS source_id,
             v.display_name AS source_name,
-            CASE WHEN e.code_id IS NOT NULL THEN 'excluded' ELSE 'included' END AS status
-        FROM configurations_conditions cfgc
-        JOIN conditions con ON con.id = cfgc.condition_id
-        JOIN conditions_codes_temp cc ON cc.condition_id = con.id
-        INNER JOIN valuesets v ON v.id = cc.valueset_id AND v.condition_id = con.id
-        JOIN codes c ON c.id = cc.code_id
-        JOIN systems s ON s.id = c.system_id
-        LEFT JOIN configurations_conditions_code_exclusions e
-            ON e.configuration_id = cfgc.configuration_id
-            AND e.code_id = cc.code_id
-        WHERE cfgc.configuration_id = %(configuration_id)s
+            CASE WHEN m.is_excluded THEN 'excluded' ELSE 'included' END AS status
+        FROM configurations_codes m
+        CROSS JOIN LATERAL unnest(m.source_ids) AS source(id)
+        JOIN valuesets v ON v.id = source.id
+        WHERE m.configuration_id = %(configuration_id)s
 
         UNION ALL
 
@@ -474,21 +458,16 @@ async def get_code_count_metadata_db(
 
     query = """
     SELECT
-        COUNT(DISTINCT c.id) AS total_code_count,
-        COUNT(DISTINCT e.code_id) AS excluded_code_count,
-        COUNT(DISTINCT cfgc.condition_id) AS code_set_count,
+        COUNT(DISTINCT m.code_id) AS total_code_count,
+        COUNT(DISTINCT m.code_id) FILTER (WHERE m.is_excluded) AS excluded_code_count,
+        COUNT(DISTINCT m.condition_id) AS code_set_count,
         (
             SELECT COUNT(*)
             FROM custom_codes cc2
             WHERE cc2.configuration_id = %(configuration_id)s
         ) AS custom_code_count
-    FROM configurations_conditions cfgc
-    JOIN conditions_codes_temp cc ON cc.condition_id = cfgc.condition_id
-    JOIN codes c ON c.id = cc.code_id
-    LEFT JOIN configurations_conditions_code_exclusions e
-        ON e.configuration_id = cfgc.configuration_id
-        AND e.code_id = cc.code_id
-    WHERE cfgc.configuration_id = %(configuration_id)s;
+    FROM configurations_codes m
+    WHERE m.configuration_id = %(configuration_id)s;
     """
 
     params = {"configuration_id": configuration_id}
@@ -130,22 +130,48 @@ async def insert_custom_codes_db(
     Adds multiple custom codes to a configuration in a single update.
     """
 
-    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(custom_codes))
-    query = f"""
-        INSERT INTO custom_codes (configuration_id, display, code, system_id)
-        VALUES {placeholders}
-        ON CONFLICT DO NOTHING
-        RETURNING *;
-    """
-
-    params = [
-        val for c in custom_codes for val in (config.id, c.display, c.code, c.system_id)
-    ]
+    if not custom_codes:
+        return []
 
     async with db.get_connection() as conn:
         async with conn.transaction():
+            # stage the upload with COPY rather than one VALUES tuple per code;
+            # a 50k row upload would be 200k bind parameters, past the
+            # protocol's limit of 65535
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    CREATE TEMP TABLE custom_codes_upload (
+                        ord INTEGER NOT NULL,
+                        display TEXT NOT NULL,
+                        code TEXT NOT NULL,
+                        system_id UUID NOT NULL
+                    ) ON COMMIT DROP;
+                    """
+                )
+                async with cur.copy(
+                    """
+                    COPY custom_codes_upload (ord, display, code, system_id)
+                    FROM STDIN
+                    """
+                ) as copy:
+                    for ord, c in enumerate(custom_codes):
+                        await copy.write_row((ord, c.display, c.code, c.system_id))
+
+            # one set-based insert; the unique constraint drops codes the
+            # configuration already has, and upload order is kept
             async with conn.cursor(row_factory=class_row(DbCustomCode)) as cur:
-                await cur.execute(query, params)
+                await cur.execute(
+                    """
+                    INSERT INTO custom_codes (configuration_id, display, code, system_id)
+                    SELECT %(configuration_id)s, display, code, system_id
+                    FROM custom_codes_upload
+                    ORDER BY ord
+                    ON CONFLICT DO NOTHING
+                    RETURNING *;
+                    """,
+                    {"configuration_id": config.id},
+                )
                 rows = await cur.fetchall()
 
             async with conn.cursor(row_factory=dict_row) as event_cur:
@@ -1,4 +1,5 @@
-from typing import Any, Literal
+from collections.abc import AsyncIterator
+from typing import Any, Final, Literal
 from uuid import UUID
 
 from psycopg import AsyncCursor
@@ -26,6 +27,7 @@ from ..conditions.model import DbCondition
 from ..pool import AsyncDatabaseConnection
 from .model import (
     DbConfiguration,
+    DbConfigurationExportCode,
     DbConfigurationSection,
     DbConfigurationSectionProcessing,
     DbConfigurationSummary,
@@ -36,6 +38,9 @@ from .model import (
 
 EMPTY_JSONB = Jsonb([])
 
+# rows fetched per round trip while streaming a configuration's codes
+EXPORT_CODES_FETCH_SIZE: Final[int] = 1000
+
 type CursorType = dict[str, Any]
 
 
@@ -439,6 +444,27 @@ async def get_configurations_db(
     return [DbConfiguration.from_db_row(row) for row in config_rows]
 
 
+async def get_all_active_configurations_db(
+    db: AsyncDatabaseConnection,
+) -> list[DbConfiguration]:
+    """
+    Fetch every active configuration across all jurisdictions in one query.
+    """
+
+    query = (
+        _get_configurations_core_query()
+        + " WHERE c.status = 'active'"
+        + " ORDER BY c.jurisdiction_id ASC, c.name ASC;"
+    )
+
+    async with db.get_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query)
+            rows = await cur.fetchall()
+
+    return [DbConfiguration.from_db_row(row) for row in rows]
+
+
 async def get_configurations_by_ids_db(
     ids: list[UUID], jurisdiction_id: str, db: AsyncDatabaseConnection
 ) -> list[DbConfiguration]:
@@ -691,6 +717,139 @@ async def get_total_condition_code_counts_by_configuration_db(
     return row
 
 
+async def stream_configuration_export_codes_db(
+    configuration_id: UUID, db: AsyncDatabaseConnection
+) -> AsyncIterator[DbConfigurationExportCode]:
+    """
+    Stream every code in a configuration's export, one row at a time.
+
+    The codes of all included conditions and the configuration's custom
+    codes come from a single query read through a server-side cursor, so
+    only EXPORT_CODES_FETCH_SIZE rows are held in memory at once. Condition
+    codes are flattened and deduplicated per condition exactly as
+    `get_condition_codes_by_condition_id_db` does, and come first (by
+    condition ID, then system and code); custom codes follow.
+
+    The connection is held until the caller has read the last row, so read
+    the rows to the end (e.g. with `spool_csv_chunks`) rather than at the
+    pace of a client download.
+    """
+
+    query = """
+        WITH c AS (
+            SELECT
+                conditions.id,
+                conditions.display_name,
+                conditions.loinc_codes,
+                conditions.snomed_codes,
+                conditions.icd10_codes,
+                conditions.rxnorm_codes,
+                conditions.cvx_codes
+            FROM configurations_conditions cc
+            JOIN conditions ON conditions.id = cc.condition_id
+            WHERE cc.configuration_id = %(configuration_id)s
+        ),
+        condition_codes AS (
+            SELECT
+                c.id AS condition_id,
+                c.display_name,
+                t.system,
+                t.code,
+                MIN(t.description) AS description
+            FROM c
+            CROSS JOIN LATERAL (
+                SELECT
+                    code_elem->>'code' AS code,
+                    'LOINC' AS system,
+                    code_elem->>'display' AS description
+                FROM jsonb_array_elements(
+                    COALESCE(c.loinc_codes, '[]'::jsonb)
+                ) AS code_elem
+
+                UNION ALL
+
+                SELECT
+                    code_elem->>'code' AS code,
+                    'SNOMED' AS system,
+                    code_elem->>'display' AS description
+                FROM jsonb_array_elements(
+                    COALESCE(c.snomed_codes, '[]'::jsonb)
+                ) AS code_elem
+
+                UNION ALL
+
+                SELECT
+                    code_elem->>'code' AS code,
+                    'ICD-10' AS system,
+                    code_elem->>'display' AS description
+                FROM jsonb_array_elements(
+                    COALESCE(c.icd10_codes, '[]'::jsonb)
+                ) AS code_elem
+
+                UNION ALL
+
+                SELECT
+                    code_elem->>'code' AS code,
+                    'RxNorm' AS system,
+                    code_elem->>'display' AS description
+                FROM jsonb_array_elements(
+                    COALESCE(c.rxnorm_codes, '[]'::jsonb)
+                ) AS code_elem
+
+                UNION ALL
+
+                SELECT
+                    code_elem->>'code' AS code,
+                    'CVX' AS system,
+                    code_elem->>'display' AS description
+                FROM jsonb_array_elements(
+                    COALESCE(c.cvx_codes, '[]'::jsonb)
+                ) AS code_elem
+            ) t
+            WHERE t.code IS NOT NULL
+            GROUP BY c.id, c.display_name, t.system, t.code
+        )
+        SELECT code_type, condition_name, code_system, code, display_name
+        FROM (
+            SELECT
+                0 AS sort_group,
+                condition_id,
+                'TES condition grouper code' AS code_type,
+                display_name AS condition_name,
+                system AS code_system,
+                code,
+                description AS display_name
+            FROM condition_codes
+
+            UNION ALL
+
+            SELECT
+                1 AS sort_group,
+                NULL AS condition_id,
+                'Custom code' AS code_type,
+                '' AS condition_name,
+                s.display_name AS code_system,
+                custom.code,
+                custom.display AS display_name
+            FROM custom_codes custom
+            JOIN systems s ON s.id = custom.system_id
+            WHERE custom.configuration_id = %(configuration_id)s
+        ) export_rows
+        ORDER BY sort_group, condition_id, code_system, code;
+    """
+
+    params = {"configuration_id": configuration_id}
+    async with db.get_connection() as conn:
+        async with conn.cursor(
+            name="configuration_export_codes",
+            row_factory=class_row(DbConfigurationExportCode),
+        ) as cur:
+            cur.itersize = EXPORT_CODES_FETCH_SIZE
+            await cur.execute(query, params)
+            async for row in cur:
+                yield row
+
+
 async def _get_configuration_section_by_code(
     configuration_id: UUID, code: str, db: AsyncDatabaseConnection
 ) -> DbConfigurationSection | None:
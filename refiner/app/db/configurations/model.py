@@ -44,6 +44,19 @@ class DbTotalConditionCodeCount:
     total_codes: int
 
 
+@dataclass(frozen=True)
+class DbConfigurationExportCode:
+    """
+    One row of a configuration's code export.
+    """
+
+    code_type: str
+    condition_name: str
+    code_system: str
+    code: str
+    display_name: str
+
+
 @dataclass(frozen=True)
 class DbConfigurationSectionInstructions:
     """
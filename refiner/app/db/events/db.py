@@ -1,7 +1,7 @@
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Final
 from uuid import UUID
 
 from psycopg import AsyncCursor
@@ -15,6 +15,25 @@ from app.db.configurations.model import DbConfiguration
 from ..pool import AsyncDatabaseConnection
 from .model import CodeSetEvent, EventInput
 
+# rows fetched per round trip while streaming the activity log export
+EXPORT_EVENTS_FETCH_SIZE: Final[int] = 500
+
+# matches events whose configuration's primary condition has the given
+# canonical URL, or every event when no URL is given
+_CANONICAL_URL_FILTER = """
+    (
+        %(canonical_url)s::TEXT IS NULL
+        OR EXISTS (
+            SELECT 1
+            FROM configurations_conditions cc
+            JOIN conditions cond ON cond.id = cc.condition_id
+            WHERE cc.configuration_id = e.configuration_id
+            AND cc.is_primary = true
+            AND cond.canonical_url = %(canonical_url)s
+        )
+    )
+"""
+
 
 @dataclass(frozen=True)
 class CsvEvent:
@@ -47,6 +66,19 @@ class AuditEvent:
     has_custom_code_upload_events: bool
 
 
+@dataclass(frozen=True)
+class EventPageKey:
+    """
+    The position of an event in the activity log's newest-first order.
+
+    A page that starts after this key holds the events older than it;
+    `id` orders events that share a timestamp.
+    """
+
+    created_at: datetime
+    id: UUID
+
+
 @dataclass(frozen=True)
 class DbEventFilterOption:
     """
@@ -80,16 +112,13 @@ async def get_event_count_by_condition_db(
     Gets a count of all events within a jurisdiction by condition.
     """
 
-    query = """
+    query = f"""
         SELECT COUNT(*) AS total_count
         FROM events e
-        LEFT JOIN configurations c ON e.configuration_id = c.id
-        LEFT JOIN configurations_conditions cc ON cc.configuration_id = c.id AND cc.is_primary = true
-        LEFT JOIN conditions cond ON cond.id = cc.condition_id AND (%s::TEXT IS NULL OR cond.canonical_url = %s)
-        WHERE e.jurisdiction_id = %s
-        AND (%s::TEXT IS NULL OR cond.id IS NOT NULL);
+        WHERE e.jurisdiction_id = %(jurisdiction_id)s
+        AND {_CANONICAL_URL_FILTER};
     """
-    params = (canonical_url, canonical_url, jurisdiction_id, canonical_url)
+    params = {"jurisdiction_id": jurisdiction_id, "canonical_url": canonical_url}
     async with db.get_connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(query, params)
@@ -188,51 +217,60 @@ async def get_event_filter_options_db(
 
 async def get_events_by_jd_db(
     jurisdiction_id: str,
-    page: int,
     page_size: int,
     db: AsyncDatabaseConnection,
     canonical_url: str | None = None,
+    page: int = 1,
+    after: EventPageKey | None = None,
 ) -> list[AuditEvent]:
     """
-    Fetches paginated event results for a jurisdiction.
+    Fetches a page of events for a jurisdiction, newest first.
+
+    With `after`, the page is read by keyset: the events older than that
+    key, straight from the (jurisdiction_id, created_at, id) index however
+    deep into the log it is. Without it, `page` picks the page by offset,
+    which costs more the further back it is; it's kept for jumping to a
+    numbered page.
 
     Intended to be displayed in the client.
     """
-    offset = (page - 1) * page_size
 
-    query = """
+    # only added when paging by keyset, so the planner always sees the row
+    # comparison as an index range rather than an OR it can't push down
+    keyset_condition = (
+        "AND (e.created_at, e.id) < (%(after_created_at)s, %(after_id)s)"
+        if after
+        else ""
+    )
+
+    query = f"""
         SELECT
             e.id,
             u.username,
             c.name AS configuration_name,
             c.version AS configuration_version,
-            cond.id AS condition_id,
             e.condition_id,
             e.action_text,
             e.code_count,
             e.created_at,
-            EXISTS (
-                SELECT 1 FROM events_custom_code_uploads ecu WHERE ecu.event_id = e.id
-            ) AS has_custom_code_upload_events
+            e.event_type = 'bulk_add_custom_code' AS has_custom_code_upload_events
         FROM events e
         LEFT JOIN users u ON e.user_id = u.id
         LEFT JOIN configurations c ON e.configuration_id = c.id
-        LEFT JOIN configurations_conditions cc ON cc.configuration_id = c.id AND cc.is_primary = true
-        LEFT JOIN conditions cond ON cond.id = cc.condition_id
-                                AND (%s::TEXT IS NULL OR cond.canonical_url = %s)
-        WHERE e.jurisdiction_id = %s
-        AND (%s::TEXT IS NULL OR cond.id IS NOT NULL)
-        ORDER BY e.created_at DESC
-        LIMIT %s OFFSET %s;
-    """
-    params = (
-        canonical_url,
-        canonical_url,
-        jurisdiction_id,
-        canonical_url,
-        page_size,
-        offset,
-    )
+        WHERE e.jurisdiction_id = %(jurisdiction_id)s
+        AND {_CANONICAL_URL_FILTER}
+        {keyset_condition}
+        ORDER BY e.created_at DESC, e.id DESC
+        LIMIT %(limit)s OFFSET %(offset)s;
+    """
+    params = {
+        "jurisdiction_id": jurisdiction_id,
+        "canonical_url": canonical_url,
+        "after_created_at": after.created_at if after else None,
+        "after_id": after.id if after else None,
+        "limit": page_size,
+        "offset": 0 if after else (page - 1) * page_size,
+    }
 
     async with db.get_connection() as conn:
         async with conn.cursor(row_factory=class_row(AuditEvent)) as cur:
@@ -247,46 +285,41 @@ async def get_all_events_by_jd_db(
     canonical_url: str | None = None,
 ) -> AsyncIterator[CsvEvent]:
     """
-    Streams all events for a jurisdiction.
+    Streams all events for a jurisdiction, newest first.
 
-    Optionally filters by canonical_url if provided.
+    Optionally filters by canonical_url if provided. Rows are read through a
+    server-side cursor, EXPORT_EVENTS_FETCH_SIZE at a time, so memory use
+    doesn't grow with the size of the log. The connection is held until the
+    last row is read, so read to the end (e.g. with `spool_csv_chunks`)
+    rather than at the pace of a client download.
 
     Intended for CSV export.
     """
-    query = """
+    query = f"""
         SELECT
             u.username,
             c.name AS configuration_name,
             c.version AS configuration_version,
             e.action_text,
             e.created_at,
-            COALESCE(
-                STRING_AGG(
-                    ecu.system || ' | ' || ecu.code || ' | ' || ecu.name,
-                    '; '
-                ),
-                ''
-            ) AS custom_code_uploads
+            COALESCE(e.custom_code_uploads, '') AS custom_code_uploads
         FROM events e
         LEFT JOIN users u ON e.user_id = u.id
         LEFT JOIN configurations c ON e.configuration_id = c.id
-        LEFT JOIN configurations_conditions cc ON cc.configuration_id = c.id AND cc.is_primary = true
-        LEFT JOIN conditions cond ON cond.id = cc.condition_id
-                                AND (%s::TEXT IS NULL OR cond.canonical_url = %s)
-        LEFT JOIN events_custom_code_uploads ecu ON ecu.event_id = e.id
-        WHERE e.jurisdiction_id = %s
-        AND (%s::TEXT IS NULL OR cond.id IS NOT NULL)
-        GROUP BY e.id, u.username, c.name, c.version, cond.id, e.action_text, e.created_at
-        ORDER BY e.created_at DESC;
+        WHERE e.jurisdiction_id = %(jurisdiction_id)s
+        AND {_CANONICAL_URL_FILTER}
+        ORDER BY e.created_at DESC, e.id DESC;
     """
-    params = (canonical_url, canonical_url, jurisdiction_id, canonical_url)
+    params = {"jurisdiction_id": jurisdiction_id, "canonical_url": canonical_url}
 
     async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=class_row(CsvEvent)) as cur:
+        async with conn.cursor(
+            name="activity_log_export", row_factory=class_row(CsvEvent)
+        ) as cur:
+            cur.itersize = EXPORT_EVENTS_FETCH_SIZE
             await cur.execute(query, params)
-            while chunk := await cur.fetchmany(500):
-                for row in chunk:
-                    yield row
+            async for row in cur:
+                yield row
 
 
 async def get_custom_code_upload_events_by_event_id(
@@ -325,37 +358,45 @@ async def insert_custom_code_upload_events_db(
     Helper function to insert a bulk custom code upload event and its subevents.
     """
 
+    system_names = {s.id: s.display_name for s in code_systems}
+
     def _get_system_name(id: UUID) -> str:
-        system = next((s for s in code_systems if s.id == id), None)
-        if system is None:
+        name = system_names.get(id)
+        if name is None:
             raise ValueError(f"Unable to determine code system by ID: {id}")
-        return system.display_name
+        return name
 
     # No events to insert
     if len(custom_codes) < 1:
         return
 
-    # Bulk upload event info
+    uploads = [
+        (_get_system_name(cc.system_id), cc.code, cc.display) for cc in custom_codes
+    ]
+
+    # Bulk upload event info; the uploads are also stored on the event as the
+    # text the activity log export shows, so reads never re-aggregate them
     event = EventInput(
         jurisdiction_id=configuration.jurisdiction_id,
         user_id=user_id,
         configuration_id=configuration.id,
         event_type="bulk_add_custom_code",
         action_text=f"Added {len(custom_codes)} custom codes from CSV",
+        custom_code_uploads="; ".join(
+            f"{system} | {code} | {name}" for system, code, name in uploads
+        ),
     )
 
     event_id = await insert_event_db(event=event, cursor=cursor)
 
-    await cursor.executemany(
+    async with cursor.copy(
         """
-        INSERT INTO events_custom_code_uploads (event_id, system, code, name)
-        VALUES (%s, %s, %s, %s)
-        """,
-        [
-            (event_id, _get_system_name(cc.system_id), cc.code, cc.display)
-            for cc in custom_codes
-        ],
-    )
+        COPY events_custom_code_uploads (event_id, system, code, name)
+        FROM STDIN
+        """
+    ) as copy:
+        for system, code, name in uploads:
+            await copy.write_row((event_id, system, code, name))
 
 
 async def insert_event_db(
@@ -374,6 +415,7 @@ async def insert_event_db(
             action_text,
             condition_id,
             code_count,
+            custom_code_uploads,
             created_at
         )
         VALUES (
@@ -384,6 +426,7 @@ async def insert_event_db(
             %(action_text)s,
             %(condition_id)s,
             %(code_count)s,
+            %(custom_code_uploads)s,
             statement_timestamp()
         )
         RETURNING id;
@@ -399,6 +442,7 @@ async def insert_event_db(
             "action_text": event.action_text,
             "condition_id": event.condition_id,
             "code_count": event.code_count,
+            "custom_code_uploads": event.custom_code_uploads,
         },
     )
 
@@ -28,6 +28,7 @@ class _EventBase:
     action_text: str
     condition_id: UUID | None = field(default=None, kw_only=True)
     code_count: int | None = field(default=None, kw_only=True)
+    custom_code_uploads: str | None = field(default=None, kw_only=True)
 
 
 @dataclass(frozen=True)
@@ -1,13 +1,71 @@
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import sys
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from time import perf_counter
+from typing import Any, Self
 
 import psycopg
 from fastapi import Request
-from psycopg_pool import AsyncConnectionPool
+from psycopg.abc import Params, QueryNoTemplate
+from psycopg.rows import Row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
 
 from app.core.exceptions import (
     DatabaseConnectionError,
 )
+from app.core.metrics import CallbackGauge, registry
+
+DB_QUERY_SECONDS = registry.histogram(
+    "refiner_db_query_duration_seconds",
+    "Time spent executing queries, by the function that ran them.",
+    label_names=("function",),
+)
+DB_CHECKOUT_WAIT_SECONDS = registry.histogram(
+    "refiner_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    label_names=("outcome",),
+)
+
+type WarmUpStatement = tuple[QueryNoTemplate, Params | None]
+
+
+def _calling_function() -> str:
+    """
+    Name the function that ran a query, skipping psycopg's own frames.
+    """
+
+    frame = sys._getframe(2)
+    while frame.f_back is not None and frame.f_globals.get("__name__", "").startswith(
+        "psycopg"
+    ):
+        frame = frame.f_back
+    return frame.f_code.co_name
+
+
+class TimedAsyncCursor(psycopg.AsyncCursor[Row]):
+    """
+    A cursor that records how long each query takes in DB_QUERY_SECONDS.
+    """
+
+    # the app doesn't use template strings, so only the plain overload is kept
+    async def execute(  # type: ignore[override]
+        self,
+        query: QueryNoTemplate,
+        params: Params | None = None,
+        *,
+        prepare: bool | None = None,
+        binary: bool | None = None,
+    ) -> Self:
+        """
+        Execute a query, timing it under the name of the calling function.
+        """
+
+        function = _calling_function()
+        start = perf_counter()
+        try:
+            return await super().execute(query, params, prepare=prepare, binary=binary)
+        finally:
+            DB_QUERY_SECONDS.observe(perf_counter() - start, function=function)
 
 
 class AsyncDatabaseConnection:
@@ -22,6 +80,9 @@ class AsyncDatabaseConnection:
         min_size: int = 1,
         max_size: int = 10,
         prepare_threshold: int | None = 5,
+        timeout: float = 30.0,
+        max_idle: float = 600.0,
+        max_lifetime: float = 3600.0,
     ) -> None:
         """
         Initializes the connection pool with the given database URL and size limits.
@@ -32,18 +93,27 @@ class AsyncDatabaseConnection:
             min_size (int, optional): Minimum number of connections to maintain in the pool. Defaults to 1.
             max_size (int, optional): Maximum number of connections allowed in the pool. Defaults to 10.
             prepare_threshold (int, optional): Number of times a query is executed before it is prepared. Defaults to 5.
+            timeout (float, optional): Seconds to wait for a connection before giving up. Defaults to 30.
+            max_idle (float, optional): Seconds an unused connection is kept before it's closed. Defaults to 600.
+            max_lifetime (float, optional): Seconds after which a connection is replaced. Defaults to 3600.
         """
         self.connection_url = db_url
         self.db_password = db_password
+        self.min_size = min_size
+        self.timeout = timeout
 
         self.pool = AsyncConnectionPool(
             self.connection_url,
             min_size=min_size,
             max_size=max_size,
+            timeout=timeout,
+            max_idle=max_idle,
+            max_lifetime=max_lifetime,
             open=False,
             kwargs={
                 "password": self.db_password,
                 "prepare_threshold": prepare_threshold,
+                "cursor_factory": TimedAsyncCursor,
             },
         )
 
@@ -63,13 +133,61 @@ class AsyncDatabaseConnection:
                 details={"error": str(e)},
             )
 
+        registry.register(
+            CallbackGauge(
+                "refiner_db_pool",
+                "Connection pool statistics, as reported by psycopg_pool.",
+                callback=lambda: {
+                    (stat,): value for stat, value in self.pool.get_stats().items()
+                },
+                label_names=("stat",),
+            )
+        )
+
+    async def warm_up(self, statements: Sequence[WarmUpStatement] = ()) -> None:
+        """
+        Opens `min_size` connections and prepares hot statements on each.
+
+        Meant to run once at startup, after `connect`, so the first requests
+        a worker serves don't pay for connecting or planning. Statements
+        are executed with `prepare=True`; give them parameters that match
+        nothing, since they really run.
+
+        Args:
+            statements (Sequence[WarmUpStatement]): (query, params) pairs to prepare.
+
+        Raises:
+            DatabaseConnectionError: If the connections cannot be opened in time.
+        """
+
+        try:
+            await self.pool.wait(timeout=self.timeout)
+        except PoolTimeout as e:
+            raise DatabaseConnectionError(
+                message="Timed out opening connection pool",
+                details={"error": str(e), "min_size": self.min_size},
+            )
+
+        if not statements:
+            return
+
+        # hold every connection at once so each one gets the statements
+        async with AsyncExitStack() as stack:
+            connections = [
+                await stack.enter_async_context(self.get_connection())
+                for _ in range(self.min_size)
+            ]
+            for conn in connections:
+                for query, params in statements:
+                    await conn.execute(query, params, prepare=True)
+
     async def close(self) -> None:
         """
         Closes all connections in the pool and shuts it down cleanly. Should be called once upon app shutdown.
         """
         await self.pool.close()
 
-    def get_stats(self) -> dict[str, int]:
+    def get_stats(self) -> dict[str, Any]:
         """
         Returns database pool stats (min connections, max connections, pool size, etc.).
         """
@@ -86,14 +204,33 @@ class AsyncDatabaseConnection:
         Raises:
             DatabaseConnectionError: If a connection cannot be retrieved from the pool.
         """
-        async with self.pool.connection() as conn:
-            yield conn
+        start = perf_counter()
+        acquired = False
+        try:
+            async with self.pool.connection() as conn:
+                acquired = True
+                DB_CHECKOUT_WAIT_SECONDS.observe(perf_counter() - start, outcome="ok")
+                yield conn
+        except PoolTimeout as e:
+            # a timeout from the caller's own block isn't ours to translate
+            if acquired:
+                raise
+            DB_CHECKOUT_WAIT_SECONDS.observe(perf_counter() - start, outcome="timeout")
+            raise DatabaseConnectionError(
+                message="Timed out waiting for a database connection",
+                details={"error": str(e), "pool_stats": self.get_stats()},
+            )
 
 
 def create_db(
     db_url: str,
     db_password: str,
     prepare_threshold: int | None = 5,
+    min_size: int = 1,
+    max_size: int = 10,
+    timeout: float = 30.0,
+    max_idle: float = 600.0,
+    max_lifetime: float = 3600.0,
 ) -> AsyncDatabaseConnection:
     """
     Creates a new database connection.
@@ -102,6 +239,11 @@ def create_db(
         db_url (str): The database connection URL
         db_password (str): The database password
         prepare_threshold (int | None): Number of times a query is executed before it is prepared. Defaults to 5.
+        min_size (int): Minimum number of pooled connections. Defaults to 1.
+        max_size (int): Maximum number of pooled connections. Defaults to 10.
+        timeout (float): Seconds to wait for a connection. Defaults to 30.
+        max_idle (float): Seconds an unused connection is kept. Defaults to 600.
+        max_lifetime (float): Seconds after which a connection is replaced. Defaults to 3600.
 
     Returns:
         AsyncDatabaseConnection: The database connection
@@ -110,6 +252,11 @@ def create_db(
         db_url=db_url,
         db_password=db_password,
         prepare_threshold=prepare_threshold,
+        min_size=min_size,
+        max_size=max_size,
+        timeout=timeout,
+        max_idle=max_idle,
+        max_lifetime=max_lifetime,
     )
 
 
@@ -0,0 +1,165 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, Final
+
+import psycopg
+
+# NOTE:
+# This module provides a process-wide cache for reference data: rows that
+# only change when seeding or migrations run (code systems, loaded TES
+# versions, the latest TES condition list).
+# * the cache is disabled until the webapp lifespan enables it, so scripts,
+#   the Lambda and tests always read straight from the database
+# * triggers on the reference tables send a NOTIFY on REFERENCE_DATA_CHANNEL
+#   when a change commits, whether from seeding, a migration or a manual fix;
+#   each webapp worker LISTENs on it and drops its cache when it arrives
+# * `invalidate_reference_data_cache()` drops the cache in this process
+# =============================================================================
+
+REFERENCE_DATA_CHANNEL: Final[str] = "reference_data_changed"
+
+_LISTEN_RETRY_DELAY_SECONDS: Final[float] = 5.0
+
+
+@dataclass
+class ReferenceDataCacheStats:
+    """
+    Hit and miss counters for the reference data cache.
+    """
+
+    enabled: bool
+    hits: int
+    misses: int
+    invalidations: int
+    keys: list[str]
+
+
+class ReferenceDataCache:
+    """
+    A small keyed cache for reference data loaded from the database.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self.enabled = False
+        self._entries: dict[str, Any] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    async def get_or_load[T](self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the cached value for `key`, loading it on a miss.
+
+        When the cache is disabled the loader is always called and nothing
+        is stored. A value loaded while an invalidation happened is returned
+        to the caller but not cached, since it may predate the change.
+        """
+
+        if not self.enabled:
+            return await loader()
+
+        if key in self._entries:
+            self._hits += 1
+            return self._entries[key]
+
+        self._misses += 1
+        generation = self._generation
+        value = await loader()
+        if self.enabled and generation == self._generation:
+            self._entries[key] = value
+        return value
+
+    def invalidate(self) -> None:
+        """
+        Drop every cached value.
+        """
+
+        self._entries.clear()
+        self._generation += 1
+        self._invalidations += 1
+
+    def enable(self) -> None:
+        """
+        Start caching reference data.
+        """
+
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop caching reference data and drop anything cached.
+        """
+
+        self.enabled = False
+        self.invalidate()
+
+    def get_stats(self) -> ReferenceDataCacheStats:
+        """
+        Returns the current hit/miss counters and cached keys.
+        """
+
+        return ReferenceDataCacheStats(
+            enabled=self.enabled,
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            keys=sorted(self._entries),
+        )
+
+
+reference_data_cache = ReferenceDataCache()
+
+
+def invalidate_reference_data_cache() -> None:
+    """
+    Drop all cached reference data in this process.
+    """
+
+    reference_data_cache.invalidate()
+
+
+async def listen_for_reference_data_changes(
+    db_url: str, db_password: str, logger: Logger
+) -> None:
+    """
+    Drop the reference data cache whenever seeding announces a change.
+
+    Holds a dedicated connection outside the pool, since LISTEN only
+    delivers notifications to the session that issued it. The cache is
+    also dropped after every (re)connect, because notifications sent while
+    disconnected are lost. Runs until cancelled.
+
+    Args:
+        db_url (str): The database connection URL
+        db_password (str): The database password
+        logger (Logger): The application logger
+    """
+
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                db_url, password=db_password, autocommit=True
+            ) as conn:
+                await conn.execute(f"LISTEN {REFERENCE_DATA_CHANNEL}")
+                reference_data_cache.invalidate()
+                logger.info(
+                    "Listening for reference data changes",
+                    extra={"channel": REFERENCE_DATA_CHANNEL},
+                )
+                async for _ in conn.notifies():
+                    reference_data_cache.invalidate()
+                    logger.info("Reference data changed; cache invalidated")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Reference data listener disconnected; retrying",
+                extra={
+                    "error": str(e),
+                    "retry_delay_seconds": _LISTEN_RETRY_DELAY_SECONDS,
+                },
+            )
+            await asyncio.sleep(_LISTEN_RETRY_DELAY_SECONDS)
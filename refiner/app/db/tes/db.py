@@ -1,8 +1,10 @@
 from uuid import UUID
 
+from psycopg import AsyncConnection
 from psycopg.rows import class_row
 
 from app.db.pool import AsyncDatabaseConnection
+from app.db.reference_data import reference_data_cache
 from app.db.tes.model import ConditionDiffExportData, DbTes, DbTesConditionUpdate
 
 
@@ -10,12 +12,22 @@ async def get_loaded_tes_versions_db(db: AsyncDatabaseConnection) -> list[DbTes]
     """
     Returns an array off all loaded TES version records.
 
+    Served from the reference data cache when it is enabled.
+
     Args:
         db (AsyncDatabaseConnection): The DB connection pool.
 
     Returns:
         list[DbTes]: A list of all the relevant TES details needed for the diff page
     """
+    return list(
+        await reference_data_cache.get_or_load(
+            "tes_versions", lambda: _fetch_loaded_tes_versions_db(db=db)
+        )
+    )
+
+
+async def _fetch_loaded_tes_versions_db(db: AsyncDatabaseConnection) -> list[DbTes]:
     query = """
     SELECT
         id,
@@ -68,86 +80,22 @@ async def _get_tes_by_version_number_db(
             return row
 
 
-async def _get_baseline_tes_diff_db(
-    db: AsyncDatabaseConnection, tes_id: UUID
-) -> list[DbTesConditionUpdate]:
-    """
-    Returns the TES update details for the first TES update, treating all conditions in that condition as "new.
-
-    Args:
-        db (AsyncDatabaseConnection): The DB connection pool.
-        tes_id (UUID): The TES version ID to grab data for.
-
-    Returns:
-        DbTesCondition: The condition that changed codes between versions.
-    """
-
-    query = """
-        SELECT
-            c.canonical_url,
-            c.display_name,
-            COALESCE(array_agg(cc.code_id)) as added_code_ids,
-            '{}'::text[] as removed_code_ids,
-            TRUE as is_new
-        FROM conditions_codes_temp cc
-        JOIN conditions c ON cc.condition_id = c.id
-        WHERE c.tes_id = %(tes_id)s
-        GROUP BY c.canonical_url, c.display_name
+async def _compute_tes_diff_db(
+    conn: AsyncConnection, cur_tes_id: UUID, prev_tes_id: UUID
+) -> None:
     """
+    Makes sure the diff between two TES versions has been precomputed.
 
-    async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=class_row(DbTesConditionUpdate)) as cur:
-            await cur.execute(query, {"tes_id": tes_id})
-            result = await cur.fetchall()
-            return result
-
+    The seeding script precomputes every version pair, so this is normally a
+    no-op; it only does the work for a pair that was never computed.
 
-async def _get_baseline_tes_update_condition_diff_db(
-    db: AsyncDatabaseConnection,
-    tes_record: DbTes,
-    cond_url: str,
-) -> ConditionDiffExportData:
-    query = """
-        SELECT DISTINCT
-            cond.canonical_url,
-            cond.display_name AS condition_name,
-            COALESCE(
-                jsonb_agg(
-                    jsonb_build_object(
-                        'code', c.code,
-                        'system_name', s.display_name,
-                        'display', c.display
-                    )
-                ) FILTER (WHERE c.id IS NOT NULL),
-                '[]'::jsonb
-            ) AS added_codes,
-            '{}'::text[] as removed_codes
-        FROM conditions_codes_temp cc
-        LEFT JOIN conditions cond ON cc.condition_id = cond.id
-        LEFT JOIN codes c ON cc.code_id = c.id
-        LEFT JOIN tes t ON cond.tes_id = t.id
-        LEFT JOIN systems s ON c.system_id = s.id
-        WHERE cond.tes_id = %(tes_id)s AND cond.canonical_url = %(cond_url)s
-        GROUP BY
-            cond.canonical_url,
-            cond.display_name;
+    Args:
+        conn (AsyncConnection): The connection the diff will be read on.
+        cur_tes_id (UUID): The current TES version ID.
+        prev_tes_id (UUID): The previous TES version ID.
     """
-
-    async with db.get_connection() as conn:
-        async with conn.cursor(row_factory=class_row(ConditionDiffExportData)) as cur:
-            await cur.execute(
-                query,
-                {
-                    "tes_id": tes_record.id,
-                    "cond_url": cond_url,
-                },
-            )
-            result = await cur.fetchone()
-            if not result:
-                raise ValueError(
-                    f"Condition with URL {cond_url} not found for TES versions {tes_record.version} "
-                )
-            return result
+    async with conn.cursor() as cur:
+        await cur.execute("SELECT compute_tes_diff(%s, %s);", (cur_tes_id, prev_tes_id))
 
 
 async def get_tes_update_condition_diff_db(
@@ -172,71 +120,50 @@ async def get_tes_update_condition_diff_db(
         db=db, cur_version=cur_version, prev_version=prev_version
     )
 
-    if cur_tes_record.id == prev_tes_record.id:
-        return await _get_baseline_tes_update_condition_diff_db(
-            db=db, tes_record=cur_tes_record, cond_url=cond_url
-        )
-
     query = """
-        WITH cur AS (
-            SELECT DISTINCT
-                cond.canonical_url,
-                cond.display_name as condition_name,
-                c.code,
-                s.display_name as system_name,
-                c.display as code_name,
-                c.id as code_id
-            FROM conditions_codes_temp cc
-            LEFT JOIN conditions cond ON cc.condition_id = cond.id
-            LEFT JOIN codes c ON cc.code_id = c.id
-            LEFT JOIN tes t ON cond.tes_id = t.id
-            LEFT JOIN systems s ON c.system_id = s.id
-            WHERE cond.tes_id = %(cur_tes_id)s AND cond.canonical_url = %(cond_url)s
-        ),
-        prev AS (
-            SELECT DISTINCT
-                cond.canonical_url,
-                cond.display_name as condition_name,
-                c.code,
-                s.display_name as system_name,
-                c.display as code_name,
-                c.id as code_id
-            FROM conditions_codes_temp cc
-            LEFT JOIN conditions cond ON cc.condition_id = cond.id
-            LEFT JOIN codes c ON cc.code_id = c.id
-            LEFT JOIN tes t ON cond.tes_id = t.id
-            LEFT JOIN systems s ON c.system_id = s.id
-            WHERE cond.tes_id = %(prev_tes_id)s AND cond.canonical_url = %(cond_url)s
-        )
         SELECT
-            COALESCE (prev.canonical_url, cur.canonical_url) AS canonical_url,
-            MAX(COALESCE(cur.condition_name, prev.condition_name)) AS condition_name,
-            COALESCE(jsonb_agg(
-                jsonb_build_object(
-                'code', cur.code,
-                'system_name', cur.system_name,
-                'display', cur.code_name
-                ))
-            FILTER (WHERE prev.code_id IS NULL), '[]'::jsonb) as added_codes,
-            COALESCE(jsonb_agg(
-                jsonb_build_object(
-                    'code', prev.code,
-                    'system_name', prev.system_name,
-                    'display', prev.code_name
-                ))
-            FILTER (WHERE cur.code_id IS NULL), '[]'::jsonb) as removed_codes
-        FROM cur
-        FULL OUTER JOIN prev
-            ON cur.canonical_url = prev.canonical_url
-            AND cur.code_id = prev.code_id
-        GROUP BY
-            COALESCE (prev.canonical_url, cur.canonical_url)
-        HAVING
-            COUNT(cur.code_id) FILTER (WHERE prev.code_id IS NULL) > 0
-            OR COUNT(prev.code_id) FILTER (WHERE cur.code_id IS NULL) > 0;
+            d.canonical_url,
+            d.display_name AS condition_name,
+            COALESCE(
+                (
+                    SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'code', c.code,
+                            'system_name', s.display_name,
+                            'display', c.display
+                        )
+                    )
+                    FROM unnest(d.added_code_ids) AS a(code_id)
+                    JOIN codes c ON c.id = a.code_id
+                    LEFT JOIN systems s ON c.system_id = s.id
+                ),
+                '[]'::jsonb
+            ) AS added_codes,
+            COALESCE(
+                (
+                    SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'code', c.code,
+                            'system_name', s.display_name,
+                            'display', c.display
+                        )
+                    )
+                    FROM unnest(d.removed_code_ids) AS r(code_id)
+                    JOIN codes c ON c.id = r.code_id
+                    LEFT JOIN systems s ON c.system_id = s.id
+                ),
+                '[]'::jsonb
+            ) AS removed_codes
+        FROM tes_diff_conditions d
+        WHERE d.cur_tes_id = %(cur_tes_id)s
+            AND d.prev_tes_id = %(prev_tes_id)s
+            AND d.canonical_url = %(cond_url)s;
     """
 
     async with db.get_connection() as conn:
+        await _compute_tes_diff_db(
+            conn=conn, cur_tes_id=cur_tes_record.id, prev_tes_id=prev_tes_record.id
+        )
         async with conn.cursor(row_factory=class_row(ConditionDiffExportData)) as cur:
             await cur.execute(
                 query,
@@ -260,6 +187,9 @@ async def _get_tes_update_diff_db(
     """
     Returns all TES update details between the current and previous ID.
 
+    Diffing a version with itself gives its baseline diff, where every
+    condition is new.
+
     Args:
         db (AsyncDatabaseConnection): The DB connection pool.
         cur_tes_id (UUID): The current TES version ID.
@@ -268,49 +198,22 @@ async def _get_tes_update_diff_db(
     Returns:
         list[DbTesCondition]: All conditions that have changed codes between versions.
     """
-    if cur_tes_id == prev_tes_id:
-        return await _get_baseline_tes_diff_db(db=db, tes_id=cur_tes_id)
-
     query = """
-    WITH cur AS (
-        SELECT DISTINCT
-            c.id as condition_id,
-            c.canonical_url,
-            cc.code_id,
-            c.display_name
-        FROM conditions_codes_temp cc
-        JOIN conditions c ON cc.condition_id = c.id
-        WHERE c.tes_id = %(cur_tes_id)s
-    ),
-    prev AS (
-        SELECT DISTINCT
-            c.id as condition_id,
-            c.canonical_url,
-            c.display_name,
-            cc.code_id
-        FROM conditions_codes_temp cc
-        JOIN conditions c ON cc.condition_id = c.id
-        WHERE c.tes_id = %(prev_tes_id)s
-    )
-
     SELECT
-        COALESCE(cur.canonical_url, prev.canonical_url) as canonical_url,
-        MAX(COALESCE(cur.display_name, prev.display_name)) AS display_name,
-        COALESCE(array_agg(cur.code_id) FILTER (where prev.code_id IS NULL), '{}'::uuid[]) as added_code_ids,
-        COALESCE(array_agg(prev.code_id) FILTER (where cur.code_id IS NULL), '{}'::uuid[]) as removed_code_ids,
-        (COUNT(prev.condition_id) = 0) AS is_new
-    FROM cur
-    FULL OUTER JOIN prev
-        ON cur.canonical_url = prev.canonical_url
-        AND cur.code_id = prev.code_id
-    GROUP BY
-        COALESCE(cur.canonical_url, prev.canonical_url)
-    HAVING
-        COUNT(cur.code_id) FILTER (WHERE prev.code_id IS NULL) > 0
-        OR COUNT(prev.code_id) FILTER (WHERE cur.code_id IS NULL) > 0;
+        canonical_url,
+        display_name,
+        added_code_ids,
+        removed_code_ids,
+        is_new
+    FROM tes_diff_conditions
+    WHERE cur_tes_id = %(cur_tes_id)s
+        AND prev_tes_id = %(prev_tes_id)s;
     """
 
     async with db.get_connection() as conn:
+        await _compute_tes_diff_db(
+            conn=conn, cur_tes_id=cur_tes_id, prev_tes_id=prev_tes_id
+        )
         async with conn.cursor(row_factory=class_row(DbTesConditionUpdate)) as cur:
             await cur.execute(
                 query, {"cur_tes_id": cur_tes_id, "prev_tes_id": prev_tes_id}
@@ -28,6 +28,12 @@ from app.services.aws.s3_keys import (
 )
 from app.services.ecr.model import JurisdictionReportableConditions, ReportableCondition
 from app.services.ecr.refine import get_file_size_in_mib
+from app.services.instrumentation import (
+    StageTimer,
+    create_stage_timer,
+    stage,
+    timing_session,
+)
 from app.services.pipeline import (
     AugmentationRun,
     RefinementContext,
@@ -69,6 +75,7 @@ class LogOperation:
     REMAINDER_RR_WRITTEN = "remainder_rr_written"
     REMAINDER_RR_SKIPPED = "remainder_rr_skipped"
     SKIPPED = "skipped"
+    STAGE_TIMINGS = "stage_timings"
 
 
 class RefinerCompleteSuccess(TypedDict):
@@ -212,93 +219,102 @@ def lambda_handler(event, context) -> dict:
                 batch_item_failures.append({"itemIdentifier": record_id})
                 continue
 
+            # per-record stage timer; None unless REFINER_STAGE_TIMING is set
+            timer = create_stage_timer()
+
             try:
-                maintenance_lock = read_active_configuration_maintenance_lock(
-                    s3_client=s3_client,
-                    bucket=s3_config_bucket_name,
-                )
+                with timing_session(timer):
+                    maintenance_lock = read_active_configuration_maintenance_lock(
+                        s3_client=s3_client,
+                        bucket=s3_config_bucket_name,
+                    )
 
-                if maintenance_lock is not None:
-                    logger.warning(
-                        "Active configuration maintenance is in progress.",
-                        operation="active_configuration_maintenance",
-                        lock_key=MAINTENANCE_LOCK_KEY,
-                        reactivation=maintenance_lock.get("reactivation"),
-                        started_at=maintenance_lock.get("started_at"),
-                        expires_at=maintenance_lock.get("expires_at"),
-                        persistence_id=persistence_id,
+                    if maintenance_lock is not None:
+                        logger.warning(
+                            "Active configuration maintenance is in progress.",
+                            operation="active_configuration_maintenance",
+                            lock_key=MAINTENANCE_LOCK_KEY,
+                            reactivation=maintenance_lock.get("reactivation"),
+                            started_at=maintenance_lock.get("started_at"),
+                            expires_at=maintenance_lock.get("expires_at"),
+                            persistence_id=persistence_id,
+                        )
+                        raise MaintenanceModeError(
+                            "Active configuration maintenance is in progress."
+                        )
+                    # S3 GET RR
+                    logger.info(
+                        f"Retrieving RR from s3://{s3_bucket_name}/{s3_object_key}",
+                        key=s3_object_key,
                     )
-                    raise MaintenanceModeError(
-                        "Active configuration maintenance is in progress."
+                    with stage("s3_get_rr"):
+                        rr_content = get_s3_object_content(
+                            s3_client=s3_client,
+                            bucket=s3_bucket_name,
+                            key=s3_object_key,
+                        )
+                    logger.info(
+                        "Retrieved RR from S3",
+                        key=s3_object_key,
                     )
-                # S3 GET RR
-                logger.info(
-                    f"Retrieving RR from s3://{s3_bucket_name}/{s3_object_key}",
-                    key=s3_object_key,
-                )
-                rr_content = get_s3_object_content(
-                    s3_client=s3_client, bucket=s3_bucket_name, key=s3_object_key
-                )
-                logger.info(
-                    "Retrieved RR from S3",
-                    key=s3_object_key,
-                )
-
-                # Construct eICR path: s3://<bucket>/<EICR_Input_Prefix>/<persistence_id>
-                eicr_key = f"{EICR_INPUT_PREFIX}{persistence_id}"
-                logger.info(
-                    f"Retrieving eICR from s3://{s3_bucket_name}/{eicr_key}",
-                    key=eicr_key,
-                )
-
-                # S3 GET eICR
-                eicr_content = get_s3_object_content(
-                    s3_client=s3_client, bucket=s3_bucket_name, key=eicr_key
-                )
-                logger.info("Retrieved eICR from S3", key=eicr_key)
-
-                # Create XMLFiles container
-                xml_files = XMLFiles(eicr=eicr_content, rr=rr_content)
 
-                # Process Refiner (eICR, RR) -> Refiner Output []
-                logger.info("Starting refinement process")
-                result = run_refinement(
-                    input=RefinementInput(
-                        xml_files=xml_files,
-                        s3_client=s3_client,
-                        config_bucket_name=s3_config_bucket_name,
-                        output_bucket_name=s3_bucket_name,
-                        persistence_id=persistence_id,
+                    # Construct eICR path: s3://<bucket>/<EICR_Input_Prefix>/<persistence_id>
+                    eicr_key = f"{EICR_INPUT_PREFIX}{persistence_id}"
+                    logger.info(
+                        f"Retrieving eICR from s3://{s3_bucket_name}/{eicr_key}",
+                        key=eicr_key,
                     )
-                )
 
-                # Create RefinerComplete file
-                complete_file: RefinerCompleteSuccess = {
-                    "RefinerMetadata": result.metadata,
-                    "RefinerSkip": False,
-                    "RefinerOutputFiles": result.output_file_keys,
-                }
+                    # S3 GET eICR
+                    with stage("s3_get_eicr"):
+                        eicr_content = get_s3_object_content(
+                            s3_client=s3_client, bucket=s3_bucket_name, key=eicr_key
+                        )
+                    logger.info("Retrieved eICR from S3", key=eicr_key)
+
+                    # Create XMLFiles container
+                    xml_files = XMLFiles(eicr=eicr_content, rr=rr_content)
+
+                    # Process Refiner (eICR, RR) -> Refiner Output []
+                    logger.info("Starting refinement process")
+                    result = run_refinement(
+                        input=RefinementInput(
+                            xml_files=xml_files,
+                            s3_client=s3_client,
+                            config_bucket_name=s3_config_bucket_name,
+                            output_bucket_name=s3_bucket_name,
+                            persistence_id=persistence_id,
+                        )
+                    )
 
-                # Construct RefinerComplete path: RefinerComplete/<persistence_id>
-                complete_key = f"{REFINER_COMPLETE_PREFIX}{persistence_id}"
+                    # Create RefinerComplete file
+                    complete_file: RefinerCompleteSuccess = {
+                        "RefinerMetadata": result.metadata,
+                        "RefinerSkip": False,
+                        "RefinerOutputFiles": result.output_file_keys,
+                    }
 
-                # PUT RefinerCompleteFile
-                logger.info(
-                    f"Writing completion file to s3://{s3_bucket_name}/{complete_key}",
-                    key=complete_key,
-                )
-                s3_client.put_object(
-                    Bucket=s3_bucket_name,
-                    Key=complete_key,
-                    Body=json.dumps(complete_file, indent=2),
-                    ContentType="application/json",
-                )
+                    # Construct RefinerComplete path: RefinerComplete/<persistence_id>
+                    complete_key = f"{REFINER_COMPLETE_PREFIX}{persistence_id}"
 
-                refined_output_count = len(result.output_file_keys)
-                logger.info(
-                    f"Successfully processed {refined_output_count} refined outputs",
-                    refined_output_count=refined_output_count,
-                )
+                    # PUT RefinerCompleteFile
+                    logger.info(
+                        f"Writing completion file to s3://{s3_bucket_name}/{complete_key}",
+                        key=complete_key,
+                    )
+                    with stage("s3_put_complete"):
+                        s3_client.put_object(
+                            Bucket=s3_bucket_name,
+                            Key=complete_key,
+                            Body=json.dumps(complete_file, indent=2),
+                            ContentType="application/json",
+                        )
+
+                    refined_output_count = len(result.output_file_keys)
+                    logger.info(
+                        f"Successfully processed {refined_output_count} refined outputs",
+                        refined_output_count=refined_output_count,
+                    )
 
             except MaintenanceModeError as e:
                 # Do not write RefinerComplete for maintenance mode.
@@ -338,6 +354,10 @@ def lambda_handler(event, context) -> dict:
                     )
                 batch_item_failures.append({"itemIdentifier": record_id})
 
+            finally:
+                if timer is not None:
+                    log_stage_timings(timer=timer, persistence_id=persistence_id)
+
         return {"batchItemFailures": batch_item_failures}
 
     except Exception as e:
@@ -655,7 +675,13 @@ def run_refinement(input: RefinementInput) -> RefinementOutput:
         operation=LogOperation.INPUT_ANALYSIS,
     )
 
-    reportable_groups = discover_reportable_conditions(input.xml_files)
+    # * discovery only needs the RR11 organizer, so stream it rather than
+    # building the full RR DOM up front; each refinement parses the RR in
+    # full when it needs it
+    with stage("discover_reportable_conditions"):
+        reportable_groups = discover_reportable_conditions(
+            input.xml_files, streaming=True
+        )
     logger.info(
         "Discovered reportable conditions from RR",
         reportable_group_payload=reportable_groups,
@@ -705,11 +731,12 @@ def process_jurisdiction(
     jurisdiction_code = jurisdiction_group.jurisdiction.upper()
     state.metadata.setdefault(jurisdiction_code, {})
 
-    rsg_cg_payload = load_condition_mapping_for_jurisdiction(
-        s3_client=refiner_input.s3_client,
-        config_bucket=refiner_input.config_bucket_name,
-        jurisdiction_code=jurisdiction_code,
-    )
+    with stage("load_condition_mapping", jurisdiction_code=jurisdiction_code):
+        rsg_cg_payload = load_condition_mapping_for_jurisdiction(
+            s3_client=refiner_input.s3_client,
+            config_bucket=refiner_input.config_bucket_name,
+            jurisdiction_code=jurisdiction_code,
+        )
 
     if rsg_cg_payload is None:
         skip_all_conditions_for_missing_mapping(
@@ -755,13 +782,18 @@ def process_condition(
         )
         return
 
-    active_configuration = load_active_configuration(
-        s3_client=refiner_input.s3_client,
-        config_bucket=refiner_input.config_bucket_name,
+    with stage(
+        "load_active_configuration",
         jurisdiction_code=jurisdiction_code,
-        cg_metadata=cg_metadata,
-        rsg_metadata=reportable_condition,
-    )
+        condition_code=rsg_code,
+    ):
+        active_configuration = load_active_configuration(
+            s3_client=refiner_input.s3_client,
+            config_bucket=refiner_input.config_bucket_name,
+            jurisdiction_code=jurisdiction_code,
+            cg_metadata=cg_metadata,
+            rsg_metadata=reportable_condition,
+        )
 
     if active_configuration is None:
         mark_condition_skipped(
@@ -783,14 +815,19 @@ def process_condition(
         run=run,
     )
 
-    write_refined_outputs(
-        refiner_input=refiner_input,
+    with stage(
+        "s3_put_refined_outputs",
         jurisdiction_code=jurisdiction_code,
-        condition_grouper_name=cg_metadata.name,
-        result=result,
         condition_code=rsg_code,
-        state=state,
-    )
+    ):
+        write_refined_outputs(
+            refiner_input=refiner_input,
+            jurisdiction_code=jurisdiction_code,
+            condition_grouper_name=cg_metadata.name,
+            result=result,
+            condition_code=rsg_code,
+            state=state,
+        )
 
     state.metadata[jurisdiction_code][rsg_code] = True
 
@@ -1012,13 +1049,14 @@ def write_remainder_rrs(
             if did_refine
         }
 
-        remainder = produce_remainder_rr_for_jurisdiction(
-            xml_files=refiner_input.xml_files,
-            jurisdiction_id=jurisdiction_code,
-            refined_condition_codes=refined_codes,
-            skipped_condition_codes=skipped_codes,
-            run=run,
-        )
+        with stage("produce_remainder_rr", jurisdiction_code=jurisdiction_code):
+            remainder = produce_remainder_rr_for_jurisdiction(
+                xml_files=refiner_input.xml_files,
+                jurisdiction_id=jurisdiction_code,
+                refined_condition_codes=refined_codes,
+                skipped_condition_codes=skipped_codes,
+                run=run,
+            )
 
         if remainder is None:
             # if-and-only-if rule not satisfied: either nothing was
@@ -1043,12 +1081,13 @@ def write_remainder_rrs(
         )
         rr_output_key = f"{output_key}/refined_RR.xml"
 
-        refiner_input.s3_client.put_object(
-            Bucket=refiner_input.output_bucket_name,
-            Key=rr_output_key,
-            Body=remainder.remainder_rr.encode("utf-8"),
-            ContentType="application/xml",
-        )
+        with stage("s3_put_remainder_rr", jurisdiction_code=jurisdiction_code):
+            refiner_input.s3_client.put_object(
+                Bucket=refiner_input.output_bucket_name,
+                Key=rr_output_key,
+                Body=remainder.remainder_rr.encode("utf-8"),
+                ContentType="application/xml",
+            )
         state.output_files.add(rr_output_key)
 
         logger.info(
@@ -1058,3 +1097,20 @@ def write_remainder_rrs(
             condition_codes=list(remainder.skipped_codes),
             operation=LogOperation.REMAINDER_RR_WRITTEN,
         )
+
+
+def log_stage_timings(timer: StageTimer, persistence_id: str) -> None:
+    """
+    Log the stage timings collected while processing a single record.
+
+    Only called when REFINER_STAGE_TIMING is enabled. Per-condition
+    refinement stages are reported separately on the "log_summary" line
+    via RefinementMetrics.stages.
+    """
+    logger.info(
+        "Record stage timings",
+        persistence_id=persistence_id,
+        total_ms=sum(s.duration_ms for s in timer.stages if s.depth == 0),
+        stages=[asdict(s) for s in timer.stages],
+        operation=LogOperation.STAGE_TIMINGS,
+    )
@@ -10,11 +10,12 @@ from datetime import datetime as dt
 from logging import Logger
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import APIRouter, Depends, FastAPI, Request, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from psycopg.rows import dict_row
 from starlette.middleware.sessions import SessionMiddleware
@@ -22,8 +23,8 @@ from starlette.types import Lifespan, Scope
 
 from .api.auth.config import get_session_secret_key
 from .api.auth.handlers import auth_router
-from .api.auth.middleware import get_logged_in_user
-from .api.auth.session import run_expired_session_cleanup_task
+from .api.auth.middleware import get_logged_in_user, get_session_warm_up_statement
+from .api.auth.session import run_expired_session_cleanup_task, session_cache
 from .api.v1.v1_router import router as v1_router
 from .core.app.base import BaseService
 from .core.app.openapi import create_custom_openapi
@@ -33,8 +34,45 @@ from .core.config import (
     get_aws_config,
     get_db_config,
 )
+from .core.metrics import CallbackGauge, registry
 from .db.pool import AsyncDatabaseConnection, get_db
+from .db.reference_data import (
+    listen_for_reference_data_changes,
+    reference_data_cache,
+)
+from .services.aws.s3 import s3
+from .services.instrumentation import (
+    StageTiming,
+    add_stage_observer,
+    remove_stage_observer,
+)
 from .services.logger import get_logger, set_request_id
+from .services.watchdog import loop_watchdog
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "refiner_http_request_duration_seconds",
+    "Time spent handling requests, by route template and status code.",
+    label_names=("method", "route", "status"),
+)
+REFINEMENT_STAGE_SECONDS = registry.histogram(
+    "refiner_refinement_stage_duration_seconds",
+    "Time spent in each refinement stage (parse, plan, refine, augment, ...).",
+    label_names=("stage",),
+)
+
+
+def _observe_refinement_stage(timing: StageTiming) -> None:
+    REFINEMENT_STAGE_SECONDS.observe(timing.duration_ms / 1000, stage=timing.name)
+
+
+def _get_threadpool_stats() -> dict[tuple[str, ...], float]:
+    # the limiter behind run_in_threadpool; `waiting` is the queue depth
+    stats = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        ("busy",): stats.borrowed_tokens,
+        ("capacity",): stats.total_tokens,
+        ("waiting",): stats.tasks_waiting,
+    }
 
 
 class CharsetStaticFiles(StaticFiles):
@@ -92,11 +130,70 @@ def create_lifespan(
         # Start the DB connection
         app.state.db = db
         await db.connect()
-        logger.info("Database pool opened", extra={"db_pool_stats": db.get_stats()})
+
+        # Open min_size connections and prepare the statements every
+        # authenticated request runs, so a cold worker's first requests
+        # don't wait on them
+        warm_up_start = time.perf_counter()
+        await db.warm_up(
+            statements=[get_session_warm_up_statement(), ("SELECT 1", None)]
+        )
+        logger.info(
+            "Database pool opened",
+            extra={
+                "db_pool_stats": db.get_stats(),
+                "warm_up_ms": round((time.perf_counter() - warm_up_start) * 1000, 2),
+            },
+        )
+
+        # Cache reference data (code systems, TES versions) for the life of the process
+        db_config = get_db_config()
+        reference_data_listener: asyncio.Task | None = None
+        if db_config.REFERENCE_DATA_CACHE:
+            reference_data_cache.enable()
+            if db_config.REFERENCE_DATA_CACHE_LISTEN:
+                reference_data_listener = asyncio.create_task(
+                    listen_for_reference_data_changes(
+                        db_url=db.connection_url,
+                        db_password=db.db_password,
+                        logger=logger,
+                    )
+                )
+
+        # Reuse session lookups across a page's parallel API calls
+        auth_config = get_auth_config()
+        if auth_config.SESSION_CACHE_TTL_SECONDS > 0:
+            session_cache.enable(ttl_seconds=auth_config.SESSION_CACHE_TTL_SECONDS)
+
+        # Feed refinement stage timings into the metrics endpoint
+        metrics_enabled = get_app_config().METRICS_ENABLED
+        if metrics_enabled:
+            add_stage_observer(_observe_refinement_stage)
+
+        # Log a sampled stack profile when the event loop stalls or a
+        # request runs long
+        app_config = get_app_config()
+        if (
+            app_config.EVENT_LOOP_LAG_THRESHOLD_MS
+            or app_config.SLOW_REQUEST_THRESHOLD_MS
+        ):
+            loop_watchdog.start(
+                logger,
+                lag_threshold_seconds=app_config.EVENT_LOOP_LAG_THRESHOLD_MS / 1000,
+                slow_request_seconds=app_config.SLOW_REQUEST_THRESHOLD_MS / 1000,
+            )
 
         # Start the cleanup tasks in the background
         asyncio.create_task(run_expired_session_cleanup_task(logger, db=db))
         yield
+        if reference_data_listener is not None:
+            reference_data_listener.cancel()
+        reference_data_cache.disable()
+        session_cache.disable()
+        await loop_watchdog.stop()
+        s3.shutdown()
+        if metrics_enabled:
+            remove_stage_observer(_observe_refinement_stage)
         # Release the DB connection
         await db.close()
         logger.info("Database pool closed")
@@ -153,6 +250,34 @@ def create_fastapi_app(lifespan: Lifespan[FastAPI]) -> FastAPI:
                 content=jsonable_encoder({"status": "FAIL", "db": "FAIL"}),
             )
 
+    # Prometheus text-format metrics, only when METRICS_ENABLED is set
+    metrics_enabled = get_app_config().METRICS_ENABLED
+    if metrics_enabled:
+        registry.register(
+            CallbackGauge(
+                "refiner_threadpool",
+                "Worker threads used by run_in_threadpool, and tasks queued for one.",
+                callback=_get_threadpool_stats,
+                label_names=("stat",),
+            )
+        )
+
+        @router.get("/metrics", tags=["internal"], include_in_schema=False)
+        async def metrics() -> PlainTextResponse:
+            """
+            Render the process's metrics in the Prometheus text format.
+
+            Returns:
+                PlainTextResponse: Every registered metric (request and
+                refinement stage latencies, DB pool stats, query latencies,
+                S3 and XSLT timings, threadpool queue depth, ...)
+            """
+
+            return PlainTextResponse(
+                content=registry.render(),
+                media_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+
     # Instantiate FastAPI via DIBBs' BaseService class
     app = BaseService(
         service_name="DIBBs eCR Refiner",
@@ -256,7 +381,10 @@ def create_fastapi_app(lifespan: Lifespan[FastAPI]) -> FastAPI:
             },
         )
 
-        response = await call_next(request)
+        with loop_watchdog.track_request(
+            str(request_id), request.method, request.url.path
+        ):
+            response = await call_next(request)
 
         duration_ms = (time.time() - start) * 1000
 
@@ -273,6 +401,39 @@ def create_fastapi_app(lifespan: Lifespan[FastAPI]) -> FastAPI:
         )
         return response
 
+    if metrics_enabled:
+
+        @app.middleware("http")
+        async def record_request_metrics(
+            request: Request, call_next: Callable[[Request], Awaitable[Response]]
+        ) -> Response:
+            """
+            Middleware to record each request's duration by route template.
+
+            Args:
+                request (Request): The incoming request
+                call_next (Callable[[Request], Awaitable[Response]): Continue the path of the original request
+
+            Returns:
+                Response: The response of the original request
+            """
+            start = time.perf_counter()
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            try:
+                response = await call_next(request)
+                status_code = response.status_code
+                return response
+            finally:
+                # the matched route's template, so /configurations/{id} is one
+                # series rather than one per configuration
+                route = request.scope.get("route")
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start,
+                    method=request.method,
+                    route=getattr(route, "path", "unmatched"),
+                    status=str(status_code),
+                )
+
     @app.middleware("http")
     async def add_security_response_headers(
         request: Request, call_next: Callable[[Request], Awaitable[Response]]
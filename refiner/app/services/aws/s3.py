@@ -1,18 +1,24 @@
+import asyncio
+import errno
 import json
 import os
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
+from functools import partial
 from io import BytesIO
 from logging import Logger
-from typing import Any
+from time import perf_counter
+from typing import Any, Final
 from uuid import UUID
 
 import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
-from fastapi.concurrency import run_in_threadpool
 
 from app.core.config import get_app_config, get_aws_config
+from app.core.metrics import registry
 from app.db.conditions.model import ConditionMappingPayload
 from app.db.configurations.model import (
     ConfigurationStorageMetadata,
@@ -32,7 +38,10 @@ from .s3_keys import (
 def _build_s3_client_kwargs() -> dict[str, Any]:
     kwargs: dict[str, Any] = {
         "region_name": get_aws_config().AWS_REGION,
-        "config": Config(signature_version="s3v4"),
+        "config": Config(
+            signature_version="s3v4",
+            max_pool_connections=get_aws_config().S3_MAX_POOL_CONNECTIONS,
+        ),
     }
 
     if get_app_config().ENV in {"local", "demo"}:
@@ -43,8 +52,166 @@ def _build_s3_client_kwargs() -> dict[str, Any]:
     return kwargs
 
 
+S3_REQUEST_SECONDS = registry.histogram(
+    "refiner_s3_request_duration_seconds",
+    "Time spent on S3 API calls, by operation.",
+    label_names=("operation",),
+)
+
+
+def _start_s3_request_timer(model: Any, context: dict, **kwargs: Any) -> None:
+    context["refiner_operation"] = model.name
+    context["refiner_started_at"] = perf_counter()
+
+
+def _observe_s3_request_timer(context: dict, **kwargs: Any) -> None:
+    started_at = context.get("refiner_started_at")
+    if started_at is not None:
+        S3_REQUEST_SECONDS.observe(
+            perf_counter() - started_at, operation=context["refiner_operation"]
+        )
+
+
 s3_client = boto3.client("s3", **_build_s3_client_kwargs())
 
+# * time every call the client makes, including each part of a managed
+# upload_fileobj transfer; failed calls end in after-call-error instead
+s3_client.meta.events.register("before-call.s3", _start_s3_request_timer)
+s3_client.meta.events.register("after-call.s3", _observe_s3_request_timer)
+s3_client.meta.events.register("after-call-error.s3", _observe_s3_request_timer)
+
+
+# NOTE:
+# ASYNC CLIENT
+# =============================================================================
+# * boto3 is blocking; the webapp reaches S3 through `s3`, which runs the
+#   shared client's calls on its own executor instead of Starlette's
+#   threadpool, so S3 latency never starves request handlers of threads
+# * the executor has one thread per connection in the client's pool, so
+#   concurrent calls (`get_objects`, `put_objects`) each get a connection
+#   rather than queueing inside botocore
+# * downloads are streamed a chunk at a time, each read on the executor
+
+# chunk size for streamed downloads
+S3_STREAM_CHUNK_SIZE: Final[int] = 64 * 1024
+
+
+class AsyncS3Client:
+    """
+    Async facade over a boto3 S3 client.
+
+    The executor is created on first use and shut down with `shutdown`.
+    """
+
+    def __init__(self, client: Any, max_workers: int) -> None:  # noqa: D107
+        self._client = client
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    def shutdown(self) -> None:
+        """
+        Shut down the executor; calls already running finish first.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def get_object(self, bucket: str, key: str) -> bytes:
+        """
+        Read an object.
+
+        Raises:
+            FileNotFoundError: The key does not exist
+            ClientError: Any other S3 error
+        """
+
+        try:
+            resp = await self._run(self._client.get_object, Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                raise FileNotFoundError(errno.ENOENT, "S3 file not found", key) from e
+            raise
+        body = resp["Body"]
+        try:
+            return await self._run(body.read)
+        finally:
+            body.close()
+
+    async def get_objects(self, bucket: str, keys: Sequence[str]) -> list[bytes]:
+        """
+        Read several objects at once, returned in the order of `keys`.
+        """
+
+        return list(await asyncio.gather(*(self.get_object(bucket, k) for k in keys)))
+
+    async def put_object(
+        self, bucket: str, key: str, body: bytes, content_type: str
+    ) -> None:
+        """
+        Write an object.
+        """
+
+        await self._run(
+            self._client.put_object,
+            Bucket=bucket,
+            Key=key,
+            Body=body,
+            ContentType=content_type,
+        )
+
+    async def put_objects(
+        self, bucket: str, objects: Mapping[str, bytes], content_type: str
+    ) -> None:
+        """
+        Write several objects, keyed by S3 key, at once.
+        """
+
+        await asyncio.gather(
+            *(
+                self.put_object(bucket, key, body, content_type)
+                for key, body in objects.items()
+            )
+        )
+
+    async def upload_fileobj(self, fileobj: BytesIO, bucket: str, key: str) -> None:
+        """
+        Upload a file object, using a multipart upload when it is large.
+        """
+
+        await self._run(self._client.upload_fileobj, fileobj, bucket, key)
+
+    async def open_object_stream(
+        self, bucket: str, key: str, chunk_size: int = S3_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Start reading an object and return its content as a chunk iterator.
+
+        The request is made before returning, so a missing key raises here
+        rather than once a response has started streaming.
+        """
+
+        resp = await self._run(self._client.get_object, Bucket=bucket, Key=key)
+        return self._iter_body(resp["Body"], chunk_size)
+
+    async def _iter_body(self, body: Any, chunk_size: int) -> AsyncIterator[bytes]:
+        try:
+            while chunk := await self._run(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def _run[T](self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="refiner-s3"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+
+s3 = AsyncS3Client(s3_client, max_workers=get_aws_config().S3_MAX_POOL_CONNECTIONS)
+
 
 @dataclass
 class SerializedFile:
@@ -67,7 +234,7 @@ class SerializedFiles:
     metadata: SerializedFile
 
 
-def get_serialized_files(
+async def get_serialized_files(
     jurisdiction_id: str, canonical_url: str, version: int, logger: Logger
 ) -> SerializedFiles:
     """
@@ -101,32 +268,32 @@ def get_serialized_files(
         },
     )
 
-    def fetch(key: str) -> str:
-        try:
-            resp = s3_client.get_object(
-                Bucket=get_aws_config().S3_BUCKET_CONFIG,
-                Key=key,
-            )
-            return resp["Body"].read().decode("utf-8")
-        except ClientError as e:
-            code = e.response["Error"]["Code"]
-            if code == "NoSuchKey":
-                logger.error("S3 file not found", extra={"key": key})
-                raise FileNotFoundError(f"S3 file not found: {key}") from e
-            logger.error("S3 error fetching file", extra={"key": key, "error": str(e)})
-            raise
+    # the three reads go out together
+    try:
+        active, metadata, current = await s3.get_objects(
+            get_aws_config().S3_BUCKET_CONFIG, [active_key, metadata_key, current_key]
+        )
+    except FileNotFoundError as e:
+        logger.error("S3 file not found", extra={"key": e.filename})
+        raise
+    except ClientError as e:
+        logger.error(
+            "S3 error fetching file",
+            extra={
+                "keys": [active_key, metadata_key, current_key],
+                "error": str(e),
+            },
+        )
+        raise
 
     return SerializedFiles(
-        active=SerializedFile(key=active_key, content=fetch(active_key)),
-        metadata=SerializedFile(
-            key=metadata_key,
-            content=fetch(metadata_key),
-        ),
-        current=SerializedFile(key=current_key, content=fetch(current_key)),
+        active=SerializedFile(key=active_key, content=active.decode("utf-8")),
+        metadata=SerializedFile(key=metadata_key, content=metadata.decode("utf-8")),
+        current=SerializedFile(key=current_key, content=current.decode("utf-8")),
     )
 
 
-def upload_current_version_file(
+async def upload_current_version_file(
     directory_key: str, active_version: int | None, logger: Logger
 ) -> None:
     """
@@ -143,18 +310,18 @@ def upload_current_version_file(
         else None
     }
 
-    s3_client.put_object(
-        Bucket=get_aws_config().S3_BUCKET_CONFIG,
-        Key=f"{directory_key}/current.json",
-        Body=json.dumps(data, indent=2).encode("utf-8"),
-        ContentType="application/json",
+    await s3.put_object(
+        get_aws_config().S3_BUCKET_CONFIG,
+        f"{directory_key}/current.json",
+        json.dumps(data, indent=2).encode("utf-8"),
+        content_type="application/json",
     )
     logger.info(
         f"Updating current.json to version {active_version}: {directory_key}/current.json"
     )
 
 
-def upload_configuration_payload(
+async def upload_configuration_payload(
     payload: ConfigurationStoragePayload,
     metadata: ConfigurationStorageMetadata,
     logger: Logger,
@@ -177,30 +344,25 @@ def upload_configuration_payload(
     canonical_url = metadata.canonical_url
     jurisdiction_id = metadata.jurisdiction_id
 
-    # Write active.json
     active_key = get_active_file_key(
         jurisdiction_id=jurisdiction_id,
         canonical_url=canonical_url,
         version=metadata.configuration_version,
     )
-    s3_client.put_object(
-        Bucket=get_aws_config().S3_BUCKET_CONFIG,
-        Key=active_key,
-        Body=json.dumps(payload_data, indent=2).encode("utf-8"),
-        ContentType="application/json",
-    )
-
-    # Write metadata.json
     metadata_key = get_metadata_file_key(
         jurisdiction_id=jurisdiction_id,
         canonical_url=canonical_url,
         version=metadata.configuration_version,
     )
-    s3_client.put_object(
-        Bucket=get_aws_config().S3_BUCKET_CONFIG,
-        Key=metadata_key,
-        Body=json.dumps(metadata_data, indent=2).encode("utf-8"),
-        ContentType="application/json",
+
+    # Write active.json and metadata.json together
+    await s3.put_objects(
+        get_aws_config().S3_BUCKET_CONFIG,
+        {
+            active_key: json.dumps(payload_data, indent=2).encode("utf-8"),
+            metadata_key: json.dumps(metadata_data, indent=2).encode("utf-8"),
+        },
+        content_type="application/json",
     )
 
     logger.info(f"Writing file to: {active_key}")
@@ -211,7 +373,7 @@ def upload_configuration_payload(
     )
 
 
-def upload_condition_mapping_payload(
+async def upload_condition_mapping_payload(
     mapping_payload: ConditionMappingPayload, jurisdiction_id: str, logger: Logger
 ) -> str:
     """
@@ -229,11 +391,11 @@ def upload_condition_mapping_payload(
 
     mapping_payload_dict = mapping_payload.to_dict()
 
-    s3_client.put_object(
-        Bucket=get_aws_config().S3_BUCKET_CONFIG,
-        Key=condition_mapping_key,
-        Body=json.dumps(mapping_payload_dict, indent=2).encode("utf-8"),
-        ContentType="application/json",
+    await s3.put_object(
+        get_aws_config().S3_BUCKET_CONFIG,
+        condition_mapping_key,
+        json.dumps(mapping_payload_dict, indent=2).encode("utf-8"),
+        content_type="application/json",
     )
 
     logger.info(
@@ -244,14 +406,6 @@ def upload_condition_mapping_payload(
     return condition_mapping_key
 
 
-def _upload_refined_ecr(
-    file_buffer: BytesIO,
-    s3_key: str,
-) -> str:
-    s3_client.upload_fileobj(file_buffer, get_aws_config().S3_BUCKET_CONFIG, s3_key)
-    return s3_key
-
-
 async def upload_refined_file_package(
     user: DbUser,
     buffer: BytesIO,
@@ -274,7 +428,8 @@ async def upload_refined_file_package(
         user_id=user.id, jurisdiction_id=user.jurisdiction_id, filename=filename
     )
     try:
-        return await run_in_threadpool(_upload_refined_ecr, buffer, key)
+        await s3.upload_fileobj(buffer, get_aws_config().S3_BUCKET_CONFIG, key)
+        return key
     except ClientError as e:
         logger.error(
             "Attempted refined file upload to S3 failed",
@@ -288,15 +443,11 @@ async def upload_refined_file_package(
     return ""
 
 
-def fetch_zip_from_s3(key: str) -> dict:
+async def stream_zip_from_s3(key: str) -> AsyncIterator[bytes]:
     """
-    Fetch file from s3, return botocore response dict.
+    Start downloading a file from S3 and return its content as a chunk iterator.
     """
-    resp = s3_client.get_object(
-        Bucket=get_aws_config().S3_BUCKET_CONFIG,
-        Key=key,
-    )
-    return resp
+    return await s3.open_object_stream(get_aws_config().S3_BUCKET_CONFIG, key)
 
 
 def get_refined_user_zip_key(user_id: UUID, jurisdiction_id: str, filename: str) -> str:
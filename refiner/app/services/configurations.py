@@ -1,13 +1,9 @@
 import re
-from collections import defaultdict
 from dataclasses import asdict, replace
 from logging import Logger
 from typing import Any
 
-from app.db.code_systems.db import (
-    get_code_system_by_key_db,
-    get_id_to_code_system_dict_db,
-)
+from app.db.code_systems.db import DbCodeSystem, get_code_systems_db
 from app.db.conditions.db import get_condition_by_id_db, get_included_conditions_db
 from app.db.conditions.model import DbConditionCoding
 from app.db.configurations.model import (
@@ -19,9 +15,6 @@ from app.db.configurations.model import (
     DbSectionAction,
 )
 from app.db.pool import AsyncDatabaseConnection
-from app.services.code_systems import (
-    get_allowed_code_system_keys,
-)
 from app.services.ecr.policy import (
     NARRATIVE_ONLY_SECTIONS,
     SECTION_PROCESSING_SKIP,
@@ -212,78 +205,80 @@ async def convert_config_to_storage_payload(
     Returns:
         ConfigurationStoragePayload | None: A configuration that can be written to a file system, or None if operation can't be completed.
     """
-    sections: list[dict[str, Any]] = []
-    included_condition_rsg_codes: set[str] = set()
+    # * everything the payload needs from the database comes from two
+    # set-based queries (all code systems, all included conditions),
+    # regardless of how many conditions the configuration includes
+    # * the code systems are indexed once here and every lookup below is
+    # in memory
+    code_systems = await get_code_systems_db(db=db)
+    code_systems_by_id = {system.id: system for system in code_systems}
+    code_systems_by_key = {system.key: system for system in code_systems}
+    system_keys_to_index_by = list(code_systems_by_key)
 
-    # build per-system code dicts for CodeSystemSets
-    coding_by_code_system: dict[str, list[dict]] = defaultdict(list)
-    code_systems = await get_id_to_code_system_dict_db(db=db)
+    conditions = await get_included_conditions_db(
+        included_conditions=configuration.included_conditions, db=db
+    )
+
+    # build the per-system lookup dicts that back CodeSystemSets in a single
+    # pass; later codes overwrite earlier ones with the same code, matching
+    # CodeSystemSets.from_dict
+    system_to_code_maps: dict[CodeSystemKey, dict[str, Coding]] = {
+        system_key: {} for system_key in OID_TO_SYSTEM_KEY_MAP.values()
+    }
+
+    def _add_codings(system: DbCodeSystem, codings: list[DbConditionCoding]) -> None:
+        code_map = system_to_code_maps.get(system.key)
+        if code_map is None:
+            return
+        for coding in codings:
+            code_map[coding.code] = Coding(
+                code=coding.code,
+                display=coding.display,
+                system_oid=system.oid,
+            )
 
     # custom codes
     for cc in configuration.custom_codes:
-        cur_code_system = code_systems[cc.system_id]
+        cur_code_system = code_systems_by_id.get(cc.system_id)
 
         if cur_code_system is None:
             raise ValueError(
                 f"System with ID {cc.system_id} doesn't match supported systems"
             )
 
-        system_to_extend = cur_code_system.key
-
         # route custom codes to the correct system dict
-        coding_by_code_system[system_to_extend].append(
-            asdict(
-                Coding(
-                    code=cc.code,
-                    display=cc.display,
-                    system_oid=cur_code_system.oid,
-                )
-            )
+        _add_codings(
+            cur_code_system,
+            [DbConditionCoding(code=cc.code, display=cc.display)],
         )
 
-    conditions = await get_included_conditions_db(
-        included_conditions=configuration.included_conditions, db=db
-    )
-    systems_keys_to_index_by = await get_allowed_code_system_keys(db=db)
-    # condition codes -> build both the flat set and per-system dicts
+    # condition codes
+    included_condition_rsg_codes: set[str] = set()
     for condition in conditions:
-        # map each db code list to its target dict + OID
+        included_condition_rsg_codes.update(condition.child_rsg_snomed_codes)
+
+        # map each db code list to its target system
         code_system_map: dict[CodeSystemKey, list[DbConditionCoding]] = (
             index_condition_code_list_by_system(
-                condition=condition, system_keys_to_index_by=systems_keys_to_index_by
+                condition=condition, system_keys_to_index_by=system_keys_to_index_by
             )
         )
 
         for key, code_list in code_system_map.items():
-            system_metadata = await get_code_system_by_key_db(key=key, db=db)
+            system_metadata = code_systems_by_key.get(key)
             if system_metadata is None:
                 raise ValueError(
                     f"System of name {key} doesn't match supported systems"
                 )
-            coding_by_code_system[system_metadata.key].extend(
-                [
-                    asdict(
-                        Coding(
-                            code=c.code,
-                            display=c.display,
-                            system_oid=system_metadata.oid,
-                        )
-                    )
-                    for c in code_list
-                ]
-            )
+            _add_codings(system_metadata, code_list)
 
-    sections = [
+    sections: list[dict[str, Any]] = [
         asdict(section_process) for section_process in configuration.section_processing
     ]
 
-    for c in conditions:
-        included_condition_rsg_codes.update(c.child_rsg_snomed_codes)
-
-    # STEP 3: build the CodeSystemSets
-    code_system_sets = CodeSystemSets.from_dict(
-        coding_by_code_system=coding_by_code_system,
+    code_system_sets = CodeSystemSets(
         oid_to_system_map=OID_TO_SYSTEM_KEY_MAP,
+        system_to_code_maps=system_to_code_maps,
     )
 
     return ConfigurationStoragePayload(
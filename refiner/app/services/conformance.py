@@ -0,0 +1,186 @@
+import os
+import random
+from dataclasses import dataclass, field
+from functools import cache
+from threading import Lock
+from time import perf_counter
+from typing import Final
+
+from lxml import etree
+from lxml.etree import _Element
+
+from .assets import get_asset_path
+from .logger import get_logger
+
+# NOTE:
+# This module provides an optional conformance check of refined output
+# against the CDA R2 XSD (with the SDTC extensions).
+# * the check is sampled: REFINER_CONFORMANCE_SAMPLE_RATE is the fraction
+#   of refinements (0.0 to 1.0) whose output is validated, so the CPU cost
+#   stays bounded no matter how much traffic the refiner sees
+# * it validates the trees the pipeline already holds; nothing is
+#   serialized or re-parsed for it
+# * the compiled schema is cached for the life of the process, since
+#   compiling it costs far more than validating a document against it
+# * an invalid document is reported, never raised; the check exists to
+#   catch engine changes that produce invalid output, not to block delivery.
+#   the same goes for the check itself failing (e.g. the schema not
+#   compiling): sample_conformance logs it and reports it as an error
+# =============================================================================
+
+CONFORMANCE_SAMPLE_RATE_ENV_VAR: Final[str] = "REFINER_CONFORMANCE_SAMPLE_RATE"
+
+CDA_SCHEMA_PATH: Final = get_asset_path(
+    "cda-r2-schema", "infrastructure", "cda", "CDA_SDTC.xsd"
+)
+
+# enough to diagnose a failure from the logs without flooding them
+MAX_REPORTED_ERRORS: Final[int] = 10
+
+# an XMLSchema keeps its error log on the instance, so concurrent
+# validations (the webapp refines in a thread pool) must take turns
+_schema_lock = Lock()
+
+
+# NOTE:
+# RESULTS
+# =============================================================================
+
+
+@dataclass
+class ConformanceCheck:
+    """
+    The result of validating one refined document against the CDA XSD.
+
+    Attributes:
+        valid: Whether the document validated.
+        duration_ms: Wall time spent validating, excluding schema
+            compilation.
+        error_count: The total number of schema violations.
+        errors: The first MAX_REPORTED_ERRORS violations, as
+            "line N: message".
+        check_error: Why the check itself failed, if it did; the document
+            is then reported as not valid, with no violations.
+    """
+
+    valid: bool
+    duration_ms: float
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+    check_error: str | None = None
+
+
+# NOTE:
+# SAMPLING
+# =============================================================================
+
+
+def get_conformance_sample_rate() -> float:
+    """
+    Read the conformance sample rate from the environment.
+
+    REFINER_CONFORMANCE_SAMPLE_RATE accepts a number between 0 and 1;
+    values outside that range are clamped. Unset or unparseable values
+    turn the check off.
+
+    Returns:
+        float: The fraction of refinements to validate.
+    """
+
+    value = os.getenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, "0").strip()
+    try:
+        rate = float(value)
+    except ValueError:
+        return 0.0
+    return min(max(rate, 0.0), 1.0)
+
+
+def should_check_conformance() -> bool:
+    """
+    Decide whether this refinement's output is validated.
+    """
+
+    rate = get_conformance_sample_rate()
+    if rate <= 0.0:
+        return False
+    return rate >= 1.0 or random.random() < rate
+
+
+# NOTE:
+# VALIDATION
+# =============================================================================
+
+
+@cache
+def get_cda_schema() -> etree.XMLSchema:
+    """
+    Compile the CDA R2 schema once per process.
+
+    lxml resolves the schema's xs:include/xs:import paths relative to the
+    root schema file, so the directory tree under assets/cda-r2-schema/
+    is all it needs.
+
+    Raises:
+        etree.XMLSchemaParseError: If the schema cannot be compiled.
+    """
+
+    return etree.XMLSchema(etree.parse(str(CDA_SCHEMA_PATH)))
+
+
+def check_conformance(root: _Element) -> ConformanceCheck:
+    """
+    Validate a parsed CDA document against the CDA R2 XSD.
+
+    Args:
+        root: The ClinicalDocument element of the refined document.
+
+    Returns:
+        ConformanceCheck: Whether it validated, how long it took, and the
+            first few violations if it didn't.
+    """
+
+    schema = get_cda_schema()
+
+    with _schema_lock:
+        start = perf_counter()
+        valid = schema.validate(root)
+        duration_ms = (perf_counter() - start) * 1000
+        # lxml-stubs declare _ErrorLog without its iteration protocol
+        error_log = list(schema.error_log)  # type: ignore[call-overload]
+
+    return ConformanceCheck(
+        valid=valid,
+        duration_ms=duration_ms,
+        error_count=len(error_log),
+        errors=[
+            f"line {error.line}: {error.message}"
+            for error in error_log[:MAX_REPORTED_ERRORS]
+        ],
+    )
+
+
+def sample_conformance(root: _Element) -> ConformanceCheck:
+    """
+    Run `check_conformance` for a sampled refinement without ever raising.
+
+    If the check itself fails, the failure is logged and returned as a
+    ConformanceCheck with `check_error` set, so a broken schema or an
+    unexpected validator error can't fail the refinement it samples.
+
+    Args:
+        root: The ClinicalDocument element of the refined document.
+
+    Returns:
+        ConformanceCheck: The check's result, or the reason it failed.
+    """
+
+    start = perf_counter()
+    try:
+        return check_conformance(root)
+    except Exception as e:
+        get_logger().exception("Conformance check failed", extra={"error": str(e)})
+        return ConformanceCheck(
+            valid=False,
+            duration_ms=(perf_counter() - start) * 1000,
+            check_error=str(e) or type(e).__name__,
+        )
@@ -0,0 +1,135 @@
+import asyncio
+import csv
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Any, Final
+from uuid import UUID, uuid4
+
+from app.api.v1.configurations.custom_codes.model import UploadCustomCodesPreviewItem
+from app.db.code_systems.db import DbCodeSystem
+from app.db.configurations.custom_codes.model import DbCustomCode
+
+# NOTE:
+# This module validates bulk custom code CSV uploads.
+# * code systems are indexed by display name and existing codes by
+#   (code, system ID) once per upload, so each row is checked in O(1)
+# * rows are read lazily from the CSV reader and processed in chunks; the
+#   event loop gets control back between chunks, so a 50k row upload does
+#   not hold up every other request while it is validated
+# =============================================================================
+
+# rows validated between yields to the event loop
+CSV_UPLOAD_CHUNK_ROWS: Final[int] = 5000
+
+# the header row is row 1, so the first code is on row 2
+_FIRST_CSV_DATA_ROW: Final[int] = 2
+
+type CustomCodeKey = tuple[str, UUID]
+
+
+@dataclass
+class CustomCodeCsvValidation:
+    """
+    The outcome of validating a custom code CSV upload.
+    """
+
+    preview_items: list[UploadCustomCodesPreviewItem] = field(default_factory=list)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+class _CsvRowValidator:
+    def __init__(  # noqa: D107
+        self,
+        supported_systems: list[DbCodeSystem],
+        existing_codes: Iterable[DbCustomCode],
+    ) -> None:
+        self.systems_by_name = {s.display_name: s for s in supported_systems}
+        self.allowed_systems = ", ".join(s.display_name for s in supported_systems)
+        self.existing_keys: set[CustomCodeKey] = {
+            (cc.code, cc.system_id) for cc in existing_codes
+        }
+        self.seen_keys: set[CustomCodeKey] = set()
+
+    def validate(
+        self, row_number: int, row: dict[str, Any]
+    ) -> UploadCustomCodesPreviewItem | list[str]:
+        code = (row.get("code") or "").strip()
+        code_system_raw = (row.get("code_system") or "").strip()
+        name = (row.get("display_name") or "").strip()
+
+        system = self.systems_by_name.get(code_system_raw)
+
+        row_errors: list[str] = []
+
+        if not code:
+            row_errors.append("Missing code")
+        if not name:
+            row_errors.append("Missing display_name")
+        if not code_system_raw:
+            row_errors.append("Missing code_system")
+        elif not system:
+            row_errors.append(
+                f"Invalid system: {code_system_raw}. "
+                f"[code_system] must be one of [{self.allowed_systems}]"
+            )
+
+        if row_errors or not system:
+            return row_errors
+
+        key = (code, system.id)
+        if key in self.existing_keys:
+            row_errors.append("Duplicate: matches existing custom code")
+        if key in self.seen_keys:
+            row_errors.append("Duplicate: matches uploaded batch code")
+        if row_errors:
+            return row_errors
+
+        self.seen_keys.add(key)
+        return UploadCustomCodesPreviewItem(
+            id=uuid4(),
+            code=code,
+            system_id=system.id,
+            system_name=system.display_name,
+            display=name,
+            row=row_number,
+        )
+
+
+async def validate_custom_codes_csv(
+    csv_reader: csv.DictReader[str],
+    supported_systems: list[DbCodeSystem],
+    existing_codes: Iterable[DbCustomCode],
+) -> CustomCodeCsvValidation:
+    """
+    Validate every row of a custom code CSV upload.
+
+    Each row must have a code, a display name and a supported code system,
+    and must not repeat an existing custom code or an earlier row.
+
+    Args:
+        csv_reader (csv.DictReader[str]): Reader over the uploaded CSV
+        supported_systems (list[DbCodeSystem]): The code systems codes may use
+        existing_codes (Iterable[DbCustomCode]): The configuration's custom codes
+
+    Returns:
+        CustomCodeCsvValidation: The valid rows as preview items and the errors
+        of the invalid ones, both in CSV order
+    """
+
+    validator = _CsvRowValidator(
+        supported_systems=supported_systems, existing_codes=existing_codes
+    )
+    result = CustomCodeCsvValidation()
+
+    rows = enumerate(csv_reader, start=_FIRST_CSV_DATA_ROW)
+    for chunk in batched(rows, CSV_UPLOAD_CHUNK_ROWS):
+        for row_number, row in chunk:
+            outcome = validator.validate(row_number, row)
+            if isinstance(outcome, list):
+                result.errors.append({"row": row_number, "error": ", ".join(outcome)})
+            else:
+                result.preview_items.append(outcome)
+        await asyncio.sleep(0)
+
+    return result
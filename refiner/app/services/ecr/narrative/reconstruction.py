@@ -7,6 +7,7 @@ from lxml.etree import _Element
 
 from app.services.ecr.policy import ReconstructableSection
 from app.services.format import remove_element
+from app.services.instrumentation import timed_stage
 
 from ..model import HL7_NS, HL7_XSI_NS
 from ..specification.constants import (
@@ -1351,6 +1352,7 @@ type NarrativeReconstructionFallback = Literal[
 ]
 
 
+@timed_stage("reconstruct_narrative")
 def reconstruct_narrative(
     section: _Element,
     *,
@@ -1,5 +1,4 @@
 import dataclasses
-from typing import cast
 
 from lxml import etree
 from lxml.etree import _Element
@@ -19,6 +18,7 @@ from app.services.ecr.model import (
 )
 from app.services.ecr.narrative import replace_narrative_with_removal_notice
 from app.services.ecr.policy import NARRATIVE_ONLY_SECTIONS, SECTION_PROCESSING_SKIP
+from app.services.ecr.reportability import RRIndex, build_rr_index
 from app.services.ecr.section import (
     append_section_provenance_footnote,
     create_minimal_section,
@@ -28,6 +28,7 @@ from app.services.ecr.section import (
 )
 from app.services.ecr.specification import detect_eicr_version, load_spec
 from app.services.format import remove_element
+from app.services.instrumentation import stage
 from app.services.terminology import ProcessedConfiguration
 
 # NOTE:
@@ -481,80 +482,85 @@ def refine_eicr(
         if section is None:
             continue
 
-        provenance = plan.section_provenance.get(section_code)
-        outcome: SectionOutcome
-
-        if not section_rules.include:
-            # BRANCH 1: wholesale removal
-            create_minimal_section(section=section, removal_reason="configured")
-            outcome = SectionOutcome.REMOVED_BY_CONFIG
-
-        elif section_code in NARRATIVE_ONLY_SECTIONS:
-            # BRANCH 2a: narrative-only section. the eICR spec defines
-            # no entry match rules for this section, so there is no
-            # coded data to refine — the section is conveyed entirely
-            # through its <text> element. the only decision is what to
-            # do with the narrative.
-            #
-            # these outcomes are distinct from RETAINED /
-            # RETAINED_NARRATIVE_REMOVED below because this branch
-            # reflects the spec's structural reality, not a
-            # configuration choice the jurisdiction made.
-            if section_rules.narrative == "remove":
-                replace_narrative_with_removal_notice(
-                    section=section, namespaces=HL7_NS
-                )
-                outcome = SectionOutcome.NARRATIVE_ONLY_REMOVED
+        # * each section is its own stage, labelled with the runtime
+        # outcome, so timing can be broken down by section and branch
+        with stage("refine_eicr.section", section_code=section_code) as span:
+            provenance = plan.section_provenance.get(section_code)
+            outcome: SectionOutcome
+
+            if not section_rules.include:
+                # BRANCH 1: wholesale removal
+                create_minimal_section(section=section, removal_reason="configured")
+                outcome = SectionOutcome.REMOVED_BY_CONFIG
+
+            elif section_code in NARRATIVE_ONLY_SECTIONS:
+                # BRANCH 2a: narrative-only section. the eICR spec defines
+                # no entry match rules for this section, so there is no
+                # coded data to refine — the section is conveyed entirely
+                # through its <text> element. the only decision is what to
+                # do with the narrative.
+                #
+                # these outcomes are distinct from RETAINED /
+                # RETAINED_NARRATIVE_REMOVED below because this branch
+                # reflects the spec's structural reality, not a
+                # configuration choice the jurisdiction made.
+                if section_rules.narrative == "remove":
+                    replace_narrative_with_removal_notice(
+                        section=section, namespaces=HL7_NS
+                    )
+                    outcome = SectionOutcome.NARRATIVE_ONLY_REMOVED
+                else:
+                    outcome = SectionOutcome.NARRATIVE_ONLY_RETAINED
+
+            elif section_rules.action == "retain":
+                # BRANCH 2b: refinable section, jurisdiction chose to retain
+                # it. honor the narrative setting.
+                #
+                # the narrative="remove" case used to be a silent no-op (the
+                # old `retain` branch was a literal `pass`); it now
+                # correctly replaces the narrative with the removal notice
+                # while leaving the entries untouched.
+                if section_rules.narrative == "remove":
+                    replace_narrative_with_removal_notice(
+                        section=section, namespaces=HL7_NS
+                    )
+                    outcome = SectionOutcome.RETAINED_NARRATIVE_REMOVED
+                else:
+                    outcome = SectionOutcome.RETAINED
+
             else:
-                outcome = SectionOutcome.NARRATIVE_ONLY_RETAINED
-
-        elif section_rules.action == "retain":
-            # BRANCH 2b: refinable section, jurisdiction chose to retain
-            # it. honor the narrative setting.
-            #
-            # the narrative="remove" case used to be a silent no-op (the
-            # old `retain` branch was a literal `pass`); it now
-            # correctly replaces the narrative with the removal notice
-            # while leaving the entries untouched.
-            if section_rules.narrative == "remove":
-                replace_narrative_with_removal_notice(
-                    section=section, namespaces=HL7_NS
+                # BRANCH 3: refine entries via the matching engines:
+                # * process_section returns a SectionRunResult describing what
+                # actually happened, which _interpret_run_result maps to a
+                # user-facing outcome
+                # * the configured narrative action ("retain"/"remove"/
+                # "reconstruct"/"keep_on_match") is threaded straight through
+                # to the engine, which owns the decision after pruning +
+                # enrichment
+                run_result = process_section(
+                    section=section,
+                    codes_to_match=plan.codes_to_check,
+                    namespaces=HL7_NS,
+                    section_specification=section_specification,
+                    code_system_sets=plan.code_system_sets,
+                    augmentation_timestamp=plan.augmentation_timestamp,
+                    narrative=section_rules.narrative,
+                )
+                outcome = _interpret_run_result(run_result=run_result)
+
+            span.set(outcome=outcome)
+
+            if provenance is not None:
+                # finalize the provenance record with the runtime outcome
+                # before rendering the footnote. SectionProvenanceRecord is
+                # frozen, so dataclasses.replace produces a new instance
+                # rather than mutating in place
+                finalized = dataclasses.replace(provenance, outcome=outcome)
+                append_section_provenance_footnote(
+                    section=section,
+                    provenance=finalized,
+                    augmentation_timestamp=plan.augmentation_timestamp,
                 )
-                outcome = SectionOutcome.RETAINED_NARRATIVE_REMOVED
-            else:
-                outcome = SectionOutcome.RETAINED
-
-        else:
-            # BRANCH 3: refine entries via the matching engines:
-            # * process_section returns a SectionRunResult describing what
-            # actually happened, which _interpret_run_result maps to a
-            # user-facing outcome
-            # * the configured narrative action ("retain"/"remove"/
-            # "reconstruct"/"keep_on_match") is threaded straight through
-            # to the engine, which owns the decision after pruning +
-            # enrichment
-            run_result = process_section(
-                section=section,
-                codes_to_match=plan.codes_to_check,
-                namespaces=HL7_NS,
-                section_specification=section_specification,
-                code_system_sets=plan.code_system_sets,
-                augmentation_timestamp=plan.augmentation_timestamp,
-                narrative=section_rules.narrative,
-            )
-            outcome = _interpret_run_result(run_result=run_result)
-
-        if provenance is not None:
-            # finalize the provenance record with the runtime outcome
-            # before rendering the footnote. SectionProvenanceRecord is
-            # frozen, so dataclasses.replace produces a new instance
-            # rather than mutating in place
-            finalized = dataclasses.replace(provenance, outcome=outcome)
-            append_section_provenance_footnote(
-                section=section,
-                provenance=finalized,
-                augmentation_timestamp=plan.augmentation_timestamp,
-            )
 
 
 # NOTE:
@@ -583,6 +589,7 @@ def create_rr_refinement_plan(
 def refine_rr(
     rr_root: _Element,
     plan: RRRefinementPlan,
+    index: RRIndex | None = None,
 ) -> None:
     """
     Refine an RR by filtering out conditions not reportable to the jurisdiction.
@@ -591,48 +598,35 @@ def refine_rr(
     beforehand and serializing afterward.
 
     Processing behavior:
-        - It iterates through the RR and removes information common to all RR's.
         - It loops through all the condition observations in the reportability RC
-            - Anything that isn't RRSVS1 reportable is filtered out
-            - Of the remaining reportable observations, anything that isn't specified
-              in the refinement configurations are filtered out
-            - For anything remaining, any codes that aren't specified within the
-              in the configuration RSG or custom codes are filtered out.
+            - Anything that isn't specified in the refinement configuration is
+              filtered out
+            - Of the remaining observations, anything whose routing entity
+              context lacks an RRVS1 reportable determination is filtered out
+
+    The condition observations are read from an `RRIndex`, so the work
+    here is a dictionary lookup per distinct condition code plus the
+    targeted removal of the affected components. The index is consumed:
+    once this function has removed components, it no longer reflects
+    the tree.
 
     Args:
         rr_root: The parsed RR root element.
         plan: The RRRefinementPlan for the corresponding eICR.
+        index: An RRIndex previously built over `rr_root`. When omitted,
+            one is built here.
 
     Raises:
         StructureValidationError: If the document structure is invalid.
     """
 
-    # now, move on to processing the actual RR body
-    structured_body = rr_root.find(".//hl7:structuredBody", HL7_NS)
-
-    if structured_body is None:
-        raise StructureValidationError(
-            message="No structured body found in RR",
-            details={"document_type": "RR"},
-        )
-    rr11_organizers = cast(
-        list[_Element],
-        structured_body.xpath(
-            ".//hl7:section[hl7:code/@code='55112-7']//hl7:entry/hl7:organizer[hl7:code/@code='RR11']",
-            namespaces=HL7_NS,
-        ),
-    )
-
-    if not rr11_organizers and not rr11_organizers[0]:
-        raise StructureValidationError(
-            message="Missing required RR11 Coded Information Organizer",
-            details={
-                "document_type": "RR",
-                "error": "RR11 organizer not found in Summary Section",
-            },
-        )
-
-    rr_organizer = rr11_organizers[0]
+    if index is None:
+        if rr_root.find(".//hl7:structuredBody", HL7_NS) is None:
+            raise StructureValidationError(
+                message="No structured body found in RR",
+                details={"document_type": "RR"},
+            )
+        index = build_rr_index(rr_root)
 
     # Compile the set of conditions the jurisdiction has a configuration
     # for as represented by the child_rsg_snomed codes that exist in the payload
@@ -640,73 +634,23 @@ def refine_rr(
         plan.included_condition_child_rsg_snomed_codes_to_retain
     )
 
-    components_to_check = cast(
-        list[_Element],
-        rr_organizer.xpath(
-            ".//hl7:component[hl7:observation[hl7:templateId/@root='2.16.840.1.113883.10.20.15.2.3.12']]",
-            namespaces=HL7_NS,
-        ),
-    )
-
-    for component in components_to_check:
-        observation = component.find("hl7:observation", HL7_NS)
-        if observation is None:
-            continue
-
-        value = observation.find("hl7:value", HL7_NS)
-        if value is None:
-            continue
-
-        value_to_check = value.get("code")
-        if value_to_check not in codes_to_keep:
+    for code, entries in index.by_code.items():
+        for entry in entries:
             # if the payload in question doesn't have that condition in the config,
             # remove that observation
-            remove_element(component)
-            continue
-
-        organizers = cast(
-            list[_Element],
-            observation.xpath(
-                ".//hl7:entryRelationship/hl7:organizer",
-                namespaces=HL7_NS,
-            ),
-        )
-
-        if not organizers:
-            continue
-
-        organizer = organizers[0]
-
-        rr7_roles = cast(
-            list[_Element],
-            organizer.xpath(
-                ".//hl7:participant/hl7:participantRole[hl7:code/@code='RR7']",
-                namespaces=HL7_NS,
-            ),
-        )
-
-        if not rr7_roles:
-            continue
-
-        for rr7_role in rr7_roles:
-            id_element = rr7_role.find("hl7:id", HL7_NS)
-
-            if id_element is None:
+            if code not in codes_to_keep:
+                remove_element(entry.component)
                 continue
 
-        # Similarly, if component / observation doesn't have a tagged RRVS1 entry,
-        # it's not reportable, so throw out the whole thing
-        reportable_observation_tags = cast(
-            list[_Element],
-            organizer.xpath(
-                ".//hl7:component/hl7:observation[hl7:value/@code='RRVS1']",
-                namespaces=HL7_NS,
-            ),
-        )
+            # only the first routing organizer is considered; with no routing
+            # entity there is nothing to judge reportability against
+            if not entry.routings or not entry.routings[0].has_routing_entity:
+                continue
 
-        if len(reportable_observation_tags) == 0:
-            remove_element(component)
-            continue
+            # if the routing context doesn't have a tagged RRVS1 determination,
+            # it's not reportable, so throw out the whole thing
+            if not entry.routings[0].is_reportable:
+                remove_element(entry.component)
 
 
 def refine_rr_for_unconfigured_conditions(
@@ -1,5 +1,8 @@
+from dataclasses import dataclass, field
+from io import BytesIO
 from typing import cast
 
+from lxml import etree
 from lxml.etree import _Element
 
 from ...core.exceptions import StructureValidationError
@@ -19,139 +22,246 @@ from .model import HL7_NS, JurisdictionReportableConditions, ReportableCondition
 
 
 # NOTE:
-# INTERNAL HELPERS
+# CONSTANTS
 # =============================================================================
 
+_RR11_ORGANIZER_XPATH = ".//hl7:section[hl7:code/@code='55112-7']//hl7:entry/hl7:organizer[hl7:code/@code='RR11']"
 
-def get_reportable_conditions_by_jurisdiction(
-    root: _Element,
-) -> list[JurisdictionReportableConditions]:
+_RELEVANT_REPORTABLE_CONDITION_OBSERVATION_OID = "2.16.840.1.113883.10.20.15.2.3.12"
+
+_CONDITION_COMPONENT_XPATH = f".//hl7:component[hl7:observation[hl7:templateId/@root='{_RELEVANT_REPORTABLE_CONDITION_OBSERVATION_OID}']]"
+
+_SUMMARY_SECTION_LOINC = "55112-7"
+
+# clark-notation tags for iterparse, which matches on tag names rather than
+# namespace prefixes
+_HL7_ORGANIZER_TAG = f"{{{HL7_NS['hl7']}}}organizer"
+_HL7_SECTION_TAG = f"{{{HL7_NS['hl7']}}}section"
+_HL7_ENTRY_TAG = f"{{{HL7_NS['hl7']}}}entry"
+_HL7_TEXT_TAG = f"{{{HL7_NS['hl7']}}}text"
+
+
+# NOTE:
+# RR INDEX MODELS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class RRConditionRouting:
     """
-    Traverse the RR11 Coded Information Organizer in a Reportability Response (RR) CDA document to extract all SNOMED-coded reportable conditions, grouped by jurisdiction/routing agency.
+    One entryRelationship/organizer beneath an RR condition observation.
 
-    Steps performed:
-        1. Locate the single RR11 Coded Information Organizer within the Summary Section
-           (LOINC code 55112-7). This organizer contains the context for routing and conditions.
-        2. Prepare a mapping from jurisdiction code (RR7 Routing Entity extension) to a dictionary
-           of unique SNOMED-coded reportable conditions.
-        3. For each SNOMED-coded condition observation (templateId 2.16.840.1.113883.10.20.15.2.3.12):
-            A. Extract the SNOMED code and display name from its <value> element.
-            B. For each entryRelationship/component/organizer beneath the condition:
-                i. Identify RR7 Routing Entity participantRole and extract its jurisdiction code (extension attribute).
-                ii. Confirm this context contains a reportability determination (RR1 observation with value RRVS1).
-                iii. If reportable, associate the SNOMED code with the jurisdiction in the mapping, deduplicating by code.
-        4. Build and return a list of JurisdictionReportableConditions instances, each containing the jurisdiction code and its unique list of reportable conditions.
+    Each organizer carries the routing entity (RR7) a condition is
+    reported to and the reportability determination (RR1) for that
+    routing entity.
 
-    Args:
-        root (_Element): Parsed lxml root of the RR CDA document.
+    Attributes:
+        jurisdiction: The upper-cased extension of the first RR7 routing
+            entity's <id>. None when the organizer has no RR7 role or the
+            role has no usable id.
+        has_routing_entity: True if the organizer contains any RR7
+            participantRole, even one without an id.
+        is_reportable: True if the organizer contains an RR1
+            determination observation whose value is RRVS1.
+    """
 
-    Returns:
-        list[JurisdictionReportableConditions]: List of jurisdiction → reportable condition groupings.
+    jurisdiction: str | None
+    has_routing_entity: bool
+    is_reportable: bool
+
+
+@dataclass(frozen=True)
+class RRConditionEntry:
     """
+    A single relevant reportable condition observation in the RR11 organizer.
 
-    # STEP 1:
-    # locate RR11 organizer (should be only one per RR document)
-    rr11_organizers = cast(
+    Attributes:
+        component: The <component> wrapping the condition observation;
+            this is the element removed when RR refinement drops the
+            condition.
+        code: The SNOMED code from the observation's <value>. None when
+            the value carries no code.
+        display_name: The display name from the observation's <value>.
+        routings: One entry per entryRelationship/organizer, in document
+            order.
+    """
+
+    component: _Element
+    code: str | None
+    display_name: str
+    routings: tuple[RRConditionRouting, ...]
+
+
+@dataclass
+class RRIndex:
+    """
+    One-pass index over the RR11 Coded Information Organizer of a parsed RR.
+
+    Built once per parsed RR tree by `build_rr_index`. Reportability
+    discovery and RR refinement both read from the index instead of
+    re-running descendant XPaths for every condition and jurisdiction.
+
+    The index holds references into the tree it was built from. Once
+    `refine_rr` has removed components from that tree, the index is
+    stale and must not be reused.
+
+    Attributes:
+        organizer: The RR11 Coded Information Organizer.
+        conditions: Indexed condition observations, in document order.
+        by_code: Indexed condition observations keyed by SNOMED code.
+    """
+
+    organizer: _Element
+    conditions: list[RRConditionEntry] = field(default_factory=list)
+    by_code: dict[str | None, list[RRConditionEntry]] = field(default_factory=dict)
+
+
+# NOTE:
+# INTERNAL HELPERS
+# =============================================================================
+
+
+def _build_condition_routing(organizer: _Element) -> RRConditionRouting:
+    """
+    Read the RR7 routing entity and RR1 determination from one organizer.
+    """
+
+    rr7_roles = cast(
         list[_Element],
-        root.xpath(
-            ".//hl7:section[hl7:code/@code='55112-7']//hl7:entry/hl7:organizer[hl7:code/@code='RR11']",
+        organizer.xpath(
+            ".//hl7:participantRole[hl7:code/@code='RR7']",
             namespaces=HL7_NS,
         ),
     )
-    if not rr11_organizers:
-        raise StructureValidationError(
-            message="Missing required RR11 Coded Information Organizer",
-            details={
-                "document_type": "RR",
-                "error": "RR11 organizer not found in Summary Section",
-            },
-        )
-    rr11_organizer = rr11_organizers[0]
 
-    # STEP 2:
-    # prepare jurisdiction → condition mapping
-    jurisdiction_to_conditions: dict[str, dict[str, ReportableCondition]] = {}
+    jurisdiction: str | None = None
+    if rr7_roles:
+        id_element = rr7_roles[0].find("hl7:id", HL7_NS)
+        if id_element is not None:
+            extension = id_element.get("extension")
+            if extension:
+                jurisdiction = extension.upper()
 
-    # STEP 3:
-    # traverse condition observations in RR11
-    condition_observations = cast(
+    rr1_reportable = cast(
         list[_Element],
-        rr11_organizer.xpath(
-            ".//hl7:observation[hl7:templateId[@root='2.16.840.1.113883.10.20.15.2.3.12']]",
+        organizer.xpath(
+            ".//hl7:observation[hl7:code/@code='RR1']/hl7:value[@code='RRVS1']",
             namespaces=HL7_NS,
         ),
     )
-    for condition_observation in condition_observations:
-        # A:
-        # get SNOMED code + display name
-        value_element = condition_observation.find("hl7:value", HL7_NS)
-        if value_element is None:
+
+    return RRConditionRouting(
+        jurisdiction=jurisdiction,
+        has_routing_entity=bool(rr7_roles),
+        is_reportable=bool(rr1_reportable),
+    )
+
+
+def _missing_rr11_organizer_error() -> StructureValidationError:
+    """
+    The error raised when an RR has no RR11 organizer in its Summary Section.
+    """
+
+    return StructureValidationError(
+        message="Missing required RR11 Coded Information Organizer",
+        details={
+            "document_type": "RR",
+            "error": "RR11 organizer not found in Summary Section",
+        },
+    )
+
+
+def _is_summary_rr11_organizer(organizer: _Element) -> bool:
+    """
+    Check whether a completed <organizer> is the Summary Section's RR11 organizer.
+
+    Mirrors _RR11_ORGANIZER_XPATH for a single element: the organizer is
+    coded RR11, sits directly in an <entry>, and has a Summary Section
+    (LOINC 55112-7) ancestor. The section's <code> precedes its entries,
+    so it has already been parsed by the time the organizer is complete.
+    """
+
+    code = organizer.find("hl7:code", HL7_NS)
+    if code is None or code.get("code") != "RR11":
+        return False
+
+    parent = organizer.getparent()
+    if parent is None or parent.tag != _HL7_ENTRY_TAG:
+        return False
+
+    return any(
+        section.find(f"hl7:code[@code='{_SUMMARY_SECTION_LOINC}']", HL7_NS) is not None
+        for section in organizer.iterancestors(_HL7_SECTION_TAG)
+    )
+
+
+def _index_rr11_organizer(organizer: _Element) -> RRIndex:
+    """
+    Traverse the condition observation components of an RR11 organizer exactly once.
+
+    For each <component> wrapping a relevant reportable condition
+    observation that has a <value>, records the SNOMED code and display
+    name, and one RRConditionRouting per entryRelationship/organizer.
+    """
+
+    index = RRIndex(organizer=organizer)
+
+    components = cast(
+        list[_Element],
+        organizer.xpath(_CONDITION_COMPONENT_XPATH, namespaces=HL7_NS),
+    )
+    for component in components:
+        observation = component.find("hl7:observation", HL7_NS)
+        if observation is None:
             continue
-        snomed_code = value_element.get("code")
-        display_name = value_element.get(
-            "displayName", "Condition display name not found"
-        )
-        if not snomed_code:
+        value_element = observation.find("hl7:value", HL7_NS)
+        if value_element is None:
             continue
-        condition_object = ReportableCondition(
-            code=snomed_code, display_name=display_name
-        )
 
-        # B:
-        # for each entryRelationship/component/organizer under this observation
-        entry_relationships = condition_observation.findall(
-            "hl7:entryRelationship", HL7_NS
+        entry = RRConditionEntry(
+            component=component,
+            code=value_element.get("code") or None,
+            display_name=value_element.get(
+                "displayName", "Condition display name not found"
+            ),
+            routings=tuple(
+                _build_condition_routing(routing_organizer)
+                for routing_organizer in observation.iterfind(
+                    "hl7:entryRelationship/hl7:organizer", HL7_NS
+                )
+            ),
         )
-        for entry_relationship in entry_relationships:
-            organizer = entry_relationship.find("hl7:organizer", HL7_NS)
-            if organizer is None:
-                continue
+        index.conditions.append(entry)
+        index.by_code.setdefault(entry.code, []).append(entry)
 
-            # i:
-            # find RR7 Routing Entity participantRole
-            rr7_roles = cast(
-                list[_Element],
-                organizer.xpath(
-                    ".//hl7:participantRole[hl7:code/@code='RR7']",
-                    namespaces=HL7_NS,
-                ),
-            )
-            if not rr7_roles:
-                continue
-            rr7_role = rr7_roles[0]
+    return index
 
-            id_element = rr7_role.find("hl7:id", HL7_NS)
-            if id_element is None:
-                continue
 
-            jurisdiction_code = id_element.get("extension")
-            if not jurisdiction_code:
-                continue
-            jurisdiction_code = jurisdiction_code.upper()
-
-            # ii:
-            # confirm RR1/RRVS1 "reportable" determination exists in this organizer
-            rr1_reportable = cast(
-                list[_Element],
-                organizer.xpath(
-                    ".//hl7:observation[hl7:code/@code='RR1']/hl7:value[@code='RRVS1']",
-                    namespaces=HL7_NS,
-                ),
-            )
-            if not rr1_reportable:
+def _group_conditions_by_jurisdiction(
+    index: RRIndex,
+) -> list[JurisdictionReportableConditions]:
+    """
+    Group the indexed SNOMED-coded conditions by reporting jurisdiction.
+
+    A condition is associated with a jurisdiction for every routing
+    organizer that names the jurisdiction and carries an RR1/RRVS1
+    reportable determination. Conditions are deduplicated by code within
+    each jurisdiction.
+    """
+
+    jurisdiction_to_conditions: dict[str, dict[str, ReportableCondition]] = {}
+
+    for entry in index.conditions:
+        if entry.code is None:
+            continue
+        for routing in entry.routings:
+            if routing.jurisdiction is None or not routing.is_reportable:
                 continue
+            jurisdiction_to_conditions.setdefault(routing.jurisdiction, {})[
+                entry.code
+            ] = ReportableCondition(code=entry.code, display_name=entry.display_name)
 
-            # iii:
-            # add to jurisdiction mapping, deduping SNOMED code
-            if jurisdiction_code not in jurisdiction_to_conditions:
-                jurisdiction_to_conditions[jurisdiction_code] = {}
-            jurisdiction_to_conditions[jurisdiction_code][snomed_code] = (
-                condition_object
-            )
-
-    # STEP 4:
-    # build output: List of JurisdictionReportableConditions
-    jurisdiction_groups = [
+    return [
         JurisdictionReportableConditions(
             jurisdiction=jurisdiction,
             conditions=list(cond_map.values()),
@@ -159,4 +269,131 @@ def get_reportable_conditions_by_jurisdiction(
         for jurisdiction, cond_map in jurisdiction_to_conditions.items()
     ]
 
-    return jurisdiction_groups
+
+# NOTE:
+# PUBLIC API FUNCTIONS
+# =============================================================================
+
+
+def build_rr_index(root: _Element) -> RRIndex:
+    """
+    Build an RRIndex over the RR11 Coded Information Organizer of a parsed RR.
+
+    Steps performed:
+        1. Locate the single RR11 Coded Information Organizer within the Summary Section
+           (LOINC code 55112-7).
+        2. For each <component> wrapping a relevant reportable condition observation
+           (templateId 2.16.840.1.113883.10.20.15.2.3.12) that has a <value>:
+            A. Record the SNOMED code and display name from the <value>.
+            B. For each entryRelationship/organizer beneath the observation, record the
+               RR7 routing entity jurisdiction and whether an RR1/RRVS1 "reportable"
+               determination is present.
+
+    Args:
+        root (_Element): Parsed lxml root of the RR CDA document.
+
+    Returns:
+        RRIndex: The index over the RR11 organizer.
+
+    Raises:
+        StructureValidationError: If the RR11 organizer is missing.
+    """
+
+    # STEP 1:
+    # locate RR11 organizer (should be only one per RR document)
+    rr11_organizers = cast(
+        list[_Element],
+        root.xpath(_RR11_ORGANIZER_XPATH, namespaces=HL7_NS),
+    )
+    if not rr11_organizers:
+        raise _missing_rr11_organizer_error()
+
+    # STEP 2:
+    # traverse condition observation components in RR11 exactly once
+    return _index_rr11_organizer(rr11_organizers[0])
+
+
+def get_reportable_conditions_by_jurisdiction(
+    root: _Element,
+    index: RRIndex | None = None,
+) -> list[JurisdictionReportableConditions]:
+    """
+    Traverse the RR11 Coded Information Organizer in a Reportability Response (RR) CDA document to extract all SNOMED-coded reportable conditions, grouped by jurisdiction/routing agency.
+
+    Steps performed:
+        1. Build (or reuse) the RRIndex over the RR11 Coded Information Organizer.
+        2. Prepare a mapping from jurisdiction code (RR7 Routing Entity extension) to a dictionary
+           of unique SNOMED-coded reportable conditions.
+        3. For each indexed condition observation with a SNOMED code, and for each of its
+           routing organizers that names a jurisdiction and carries an RR1/RRVS1 reportable
+           determination, associate the condition with the jurisdiction, deduplicating by code.
+        4. Build and return a list of JurisdictionReportableConditions instances, each containing the jurisdiction code and its unique list of reportable conditions.
+
+    Args:
+        root (_Element): Parsed lxml root of the RR CDA document.
+        index (RRIndex | None): A previously built index over `root`. When
+            omitted, one is built here.
+
+    Returns:
+        list[JurisdictionReportableConditions]: List of jurisdiction → reportable condition groupings.
+
+    Raises:
+        StructureValidationError: If the RR11 organizer is missing.
+    """
+
+    # STEP 1:
+    # one pass over the RR11 organizer
+    if index is None:
+        index = build_rr_index(root)
+
+    # STEPS 2-4:
+    # associate reportable conditions with their jurisdictions
+    return _group_conditions_by_jurisdiction(index)
+
+
+def stream_reportable_conditions_by_jurisdiction(
+    rr_content: str | bytes,
+) -> list[JurisdictionReportableConditions]:
+    """
+    Extract reportable conditions grouped by jurisdiction without parsing the whole RR.
+
+    Produces the same result as `get_reportable_conditions_by_jurisdiction`,
+    but reads the RR incrementally with `iterparse` and stops as soon as the
+    Summary Section's RR11 organizer is complete. Anything after it, such as
+    large embedded narratives in later sections, is never read. Section
+    narratives (<text>) seen before the organizer are cleared as soon as
+    they are complete, since discovery never reads them.
+
+    The partial tree built along the way is discarded; callers that go on
+    to refine the RR must still parse it in full.
+
+    Args:
+        rr_content: The RR CDA document as a string or bytes.
+
+    Returns:
+        list[JurisdictionReportableConditions]: List of jurisdiction → reportable condition groupings.
+
+    Raises:
+        etree.XMLSyntaxError: If the RR is malformed before the RR11
+            organizer is complete.
+        StructureValidationError: If the document has no RR11 organizer
+            in its Summary Section.
+    """
+
+    if isinstance(rr_content, str):
+        rr_content = rr_content.encode("utf-8")
+
+    for _, element in etree.iterparse(
+        BytesIO(rr_content),
+        events=("end",),
+        tag=(_HL7_ORGANIZER_TAG, _HL7_TEXT_TAG),
+    ):
+        if element.tag == _HL7_TEXT_TAG:
+            if cast(_Element, element.getparent()).tag == _HL7_SECTION_TAG:
+                element.clear(keep_tail=True)
+            continue
+
+        if _is_summary_rr11_organizer(element):
+            return _group_conditions_by_jurisdiction(_index_rr11_organizer(element))
+
+    raise _missing_rr11_organizer_error()
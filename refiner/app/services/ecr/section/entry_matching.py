@@ -6,6 +6,7 @@ from lxml.etree import _Element
 
 from app.core.exceptions import XMLParsingError
 from app.services.format import remove_element
+from app.services.instrumentation import timed_stage
 from app.services.terminology import CodeSystemSets, Coding
 
 from ..model import (
@@ -68,6 +69,7 @@ class EntryMatch:
 # =============================================================================
 
 
+@timed_stage("entry_matching.process")
 def process(
     section: _Element,
     code_system_sets: CodeSystemSets,
@@ -6,6 +6,7 @@ from lxml.etree import _Element
 
 from app.core.exceptions import StructureValidationError, XMLParsingError
 from app.services.format import remove_element
+from app.services.instrumentation import timed_stage
 from app.services.terminology import CodeSystemSets
 
 from ..model import (
@@ -34,6 +35,7 @@ from .utils import (
 # =============================================================================
 
 
+@timed_stage("generic_matching.process")
 def process(
     section: _Element,
     codes_to_match: set[str],
@@ -1,4 +1,15 @@
+import csv
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from datetime import UTC, datetime
+from io import StringIO
+from tempfile import SpooledTemporaryFile
+from typing import Any, Final
+
+# CSV text is handed out in pieces of about this many characters
+CSV_CHUNK_SIZE: Final[int] = 64 * 1024
+
+# characters of a spooled CSV export kept in memory before it moves to disk
+CSV_SPOOL_MAX_MEMORY: Final[int] = 8 * 1024 * 1024
 
 
 def get_export_timestamp() -> str:
@@ -11,3 +22,64 @@ def get_export_timestamp() -> str:
     now = datetime.now(UTC)
     timestamp = now.strftime("%m%d%y_%H_%M_%S")
     return timestamp
+
+
+async def iter_csv_chunks(
+    header: Sequence[str], rows: AsyncIterable[Sequence[Any]]
+) -> AsyncIterator[str]:
+    """
+    Write rows as CSV as they arrive, yielding the text in pieces.
+
+    Rows are buffered until about CSV_CHUNK_SIZE characters have been
+    written, so a streamed export neither holds the whole file in memory
+    nor sends one tiny chunk per row.
+
+    Args:
+        header (Sequence[str]): The header row
+        rows (AsyncIterable[Sequence[Any]]): The data rows
+
+    Yields:
+        str: The next piece of CSV text
+    """
+    with StringIO() as csv_text:
+        writer = csv.writer(csv_text)
+        writer.writerow(header)
+
+        async for row in rows:
+            writer.writerow(row)
+            if csv_text.tell() >= CSV_CHUNK_SIZE:
+                yield csv_text.getvalue()
+                csv_text.seek(0)
+                csv_text.truncate()
+
+        yield csv_text.getvalue()
+
+
+async def spool_csv_chunks(
+    header: Sequence[str], rows: AsyncIterable[Sequence[Any]]
+) -> AsyncIterator[str]:
+    """
+    Write every row as CSV to a temporary file, then yield the text in pieces.
+
+    Unlike `iter_csv_chunks`, rows are read to the end before the first piece
+    is yielded. When rows come from a server-side cursor, its pooled
+    connection is released as fast as the database can send them, instead of
+    being held for the client's whole download. Up to CSV_SPOOL_MAX_MEMORY
+    characters are kept in memory; larger exports spill to disk.
+
+    Args:
+        header (Sequence[str]): The header row
+        rows (AsyncIterable[Sequence[Any]]): The data rows
+
+    Yields:
+        str: The next piece of CSV text
+    """
+    with SpooledTemporaryFile(
+        max_size=CSV_SPOOL_MAX_MEMORY, mode="w+", encoding="utf-8", newline=""
+    ) as spool:
+        async for chunk in iter_csv_chunks(header=header, rows=rows):
+            spool.write(chunk)
+
+        spool.seek(0)
+        while chunk := spool.read(CSV_CHUNK_SIZE):
+            yield chunk
@@ -1,6 +1,6 @@
 import io
 import time
-from collections.abc import Iterator
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
 from dataclasses import dataclass
 from io import BytesIO
 from zipfile import ZIP_DEFLATED, BadZipFile, ZipFile, ZipInfo
@@ -158,6 +158,27 @@ def create_refined_file_names(
     )
 
 
+def _get_zip_entry_date_time() -> tuple[int, int, int, int, int, int]:
+    # Compute entry mtimes ourselves from current UTC time. We deliberately
+    # bypass CPython's default ZipInfo construction path
+    # (ZipInfo._for_archive), because it honors `SOURCE_DATE_EPOCH` via
+    # time.localtime() – which produces invalid pre-1980 DOS dates in any
+    # timezone west of UTC. That path crashes with: `struct.error: 'H' format
+    # requires 0 <= number <= 65535`.
+    #
+    # Using gmtime() makes the timestamp timezone-agnostic and ensures DOS-date
+    # math (year - 1980) is always non-negative for any sane "now".
+    now_utc = time.gmtime()
+    return (
+        now_utc.tm_year,
+        now_utc.tm_mon,
+        now_utc.tm_mday,
+        now_utc.tm_hour,
+        now_utc.tm_min,
+        now_utc.tm_sec,
+    )
+
+
 def create_refined_ecr_zip_in_memory(
     *,
     zip_package: ZipFilePackage,
@@ -176,24 +197,7 @@ def create_refined_ecr_zip_in_memory(
         - If content is str, it is encoded as UTF-8 before writing.
         - Skips any empty files; robust against partial failures (e.g., missing HTML).
     """
-    # Compute entry mtimes ourselves from current UTC time. We deliberately
-    # bypass CPython's default ZipInfo construction path
-    # (ZipInfo._for_archive), because it honors `SOURCE_DATE_EPOCH` via
-    # time.localtime() – which produces invalid pre-1980 DOS dates in any
-    # timezone west of UTC. That path crashes with: `struct.error: 'H' format
-    # requires 0 <= number <= 65535`.
-    #
-    # Using gmtime() makes the timestamp timezone-agnostic and ensures DOS-date
-    # math (year - 1980) is always non-negative for any sane "now".
-    now_utc = time.gmtime()
-    entry_date_time = (
-        now_utc.tm_year,
-        now_utc.tm_mon,
-        now_utc.tm_mday,
-        now_utc.tm_hour,
-        now_utc.tm_min,
-        now_utc.tm_sec,
-    )
+    entry_date_time = _get_zip_entry_date_time()
 
     zip_buffer = io.BytesIO()
 
@@ -327,3 +331,75 @@ async def read_xml_zip(file: FileUpload) -> XMLFiles:
         raise FileProcessingError(
             message="Failed to process ZIP file", details={"error": str(e)}
         )
+
+
+class _ZipChunkSink:
+    """
+    A write-only sink that hands back whatever ZipFile has written to it.
+
+    It can't seek or tell, so ZipFile writes each entry's sizes in a data
+    descriptor after its data, and entries can be streamed without knowing
+    their size up front.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes, /) -> int:
+        """
+        Buffer data written by ZipFile.
+        """
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """
+        Nothing to flush; data is handed out by `drain`.
+        """
+
+    def close(self) -> None:
+        """
+        Nothing to close; called by ZipFile when the archive is finished.
+        """
+
+    def drain(self) -> bytes:
+        """
+        Return and forget everything written since the last drain.
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    files: Iterable[tuple[str, AsyncIterable[str]]],
+) -> AsyncIterator[bytes]:
+    """
+    Stream a zip archive while its entries are still being produced.
+
+    Each entry's text is compressed and yielded as it arrives, so the first
+    bytes reach the client before the last rows are read and memory use
+    doesn't grow with the size of the archive. Useful for usage with a
+    StreamingResponse.
+
+    Args:
+        files: (file name, text chunks) pairs, written in order as UTF-8.
+
+    Yields:
+        bytes: The next piece of the archive.
+    """
+    sink = _ZipChunkSink()
+    entry_date_time = _get_zip_entry_date_time()
+
+    with ZipFile(sink, "w", ZIP_DEFLATED) as zf:
+        for file_name, chunks in files:
+            zinfo = ZipInfo(filename=file_name, date_time=entry_date_time)
+            zinfo.compress_type = zf.compression
+            with zf.open(zinfo, "w") as entry:
+                async for chunk in chunks:
+                    entry.write(chunk.encode("utf-8"))
+                    if data := sink.drain():
+                        yield data
+
+    # the last entry's descriptor and the central directory
+    yield sink.drain()
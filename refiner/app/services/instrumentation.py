@@ -0,0 +1,386 @@
+import os
+import threading
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from types import TracebackType
+from typing import Final, Literal
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# NOTE:
+# This module provides a lightweight stage timer for the refinement pipeline.
+# * a StageTimer is made active for a block of work with `timing_session`;
+#   the active timer lives in a ContextVar (the same approach logger.py uses
+#   for the request ID) so deep code can open a stage without the timer
+#   being threaded through every signature
+# * `stage(...)` and `@timed_stage(...)` are no-ops when no timer is active:
+#   one ContextVar lookup and a shared null span, nothing else
+# * timing is opted into with the REFINER_STAGE_TIMING environment variable,
+#   or by registering a stage observer (the webapp's metrics do this), which
+#   is handed every stage as it completes
+# * "memory" mode is meant for the Lambda and the profiling CLI, which run
+#   one refinement at a time. tracemalloc is process-wide, so only one
+#   memory session may be open at once; a session that starts while another
+#   one is tracing (concurrent webapp requests) records wall time only
+# =============================================================================
+
+STAGE_TIMING_ENV_VAR: Final[str] = "REFINER_STAGE_TIMING"
+
+type StageTimingMode = Literal["off", "on", "memory"]
+
+_KIB: Final[int] = 1024
+
+
+# NOTE:
+# RESULTS
+# =============================================================================
+
+
+@dataclass
+class StageTiming:
+    """
+    The measurements for one completed stage.
+
+    Attributes:
+        name: The stage name, e.g. "parse_eicr" or "refine_eicr.section".
+        depth: How many stages enclosed this one when it ran; 0 for
+            top-level stages. Stages are listed in the order they
+            started, so depth is enough to read the list as a tree.
+        duration_ms: Wall time spent in the stage.
+        attributes: Extra labels attached to the stage (section code,
+            outcome, ...).
+        memory_allocated_kib: Net traced allocation still held when the
+            stage ended. Only set in "memory" mode.
+        memory_peak_kib: Highest traced allocation reached during the
+            stage, relative to where the stage started. Only set in
+            "memory" mode.
+        max_rss_kib: The process's peak resident set size when the stage
+            ended. Only set in "memory" mode on platforms that report it.
+    """
+
+    name: str
+    depth: int
+    duration_ms: float = 0.0
+    attributes: dict[str, str] = field(default_factory=dict)
+    memory_allocated_kib: float | None = None
+    memory_peak_kib: float | None = None
+    max_rss_kib: int | None = None
+
+
+# NOTE:
+# SPANS
+# =============================================================================
+
+
+class _NullSpan:
+    """
+    The span handed out when no timer is active. Every method is a no-op.
+    """
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    def set(self, **attributes: object) -> None:
+        """
+        Ignore attributes; there is nothing to record them on.
+        """
+
+        return None
+
+
+_NULL_SPAN: Final[_NullSpan] = _NullSpan()
+
+
+@dataclass
+class _MemoryFrame:
+    """
+    tracemalloc bookkeeping for one open span.
+
+    tracemalloc has a single, process-wide peak counter. Each span resets
+    it on entry, so on exit the enclosing span must be told about the
+    peak its child observed, or that peak would be lost to it.
+    """
+
+    start_bytes: int
+    observed_peak_bytes: int
+
+
+# process-wide, like the tracemalloc peak counter it compensates for
+_memory_frames: list[_MemoryFrame] = []
+
+# the one memory session allowed to trace; sessions nested inside it (same
+# context) share it, any other session is refused memory tracking
+_memory_session_lock = threading.Lock()
+_memory_session_open = False
+_in_memory_session: ContextVar[bool] = ContextVar("in_memory_session", default=False)
+
+type StageObserver = Callable[[StageTiming], None]
+
+_stage_observers: list[StageObserver] = []
+
+
+def add_stage_observer(observer: StageObserver) -> None:
+    """
+    Call `observer` with every stage as it completes, in every session.
+
+    Registering an observer turns stage timing on even when
+    REFINER_STAGE_TIMING is off, since there would otherwise be no stages
+    to observe.
+    """
+
+    if observer not in _stage_observers:
+        _stage_observers.append(observer)
+
+
+def remove_stage_observer(observer: StageObserver) -> None:
+    """
+    Stop calling a stage observer added with `add_stage_observer`.
+    """
+
+    if observer in _stage_observers:
+        _stage_observers.remove(observer)
+
+
+class _Span:
+    """
+    A single timed stage on an active StageTimer.
+    """
+
+    __slots__ = ("_timer", "_timing", "_start")
+
+    def __init__(self, timer: "StageTimer", name: str, attributes: dict) -> None:
+        self._timer = timer
+        self._timing = StageTiming(
+            name=name,
+            depth=0,
+            attributes={key: str(value) for key, value in attributes.items()},
+        )
+        self._start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._timing.depth = self._timer._depth
+        self._timer.stages.append(self._timing)
+        self._timer._depth += 1
+        if self._timer.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _memory_frames:
+                parent = _memory_frames[-1]
+                parent.observed_peak_bytes = max(parent.observed_peak_bytes, peak)
+            tracemalloc.reset_peak()
+            _memory_frames.append(
+                _MemoryFrame(start_bytes=current, observed_peak_bytes=current)
+            )
+        self._start = perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._timing.duration_ms = (perf_counter() - self._start) * 1000
+        self._timer._depth -= 1
+        if exc_type is not None:
+            self._timing.attributes["error"] = exc_type.__name__
+        if self._timer.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            frame = _memory_frames.pop()
+            span_peak = max(frame.observed_peak_bytes, peak)
+            if _memory_frames:
+                parent = _memory_frames[-1]
+                parent.observed_peak_bytes = max(parent.observed_peak_bytes, span_peak)
+            self._timing.memory_allocated_kib = (current - frame.start_bytes) / _KIB
+            self._timing.memory_peak_kib = (span_peak - frame.start_bytes) / _KIB
+            if resource is not None:
+                self._timing.max_rss_kib = resource.getrusage(
+                    resource.RUSAGE_SELF
+                ).ru_maxrss
+        for observer in _stage_observers:
+            observer(self._timing)
+        return None
+
+    def set(self, **attributes: object) -> None:
+        """
+        Attach labels to the stage, e.g. the outcome once it is known.
+        """
+
+        for key, value in attributes.items():
+            self._timing.attributes[key] = str(value)
+
+
+# NOTE:
+# TIMER
+# =============================================================================
+
+
+class StageTimer:
+    """
+    Collects StageTiming records for one unit of work.
+
+    Create one per unit of work (a refinement, a Lambda record) and make
+    it active with `timing_session`. Stages opened with `stage` while it
+    is active are recorded on it.
+    """
+
+    def __init__(self, track_memory: bool = False) -> None:  # noqa: D107
+        self.track_memory = track_memory
+        self.stages: list[StageTiming] = []
+        self._depth = 0
+
+    def span(self, name: str, **attributes: object) -> _Span:
+        """
+        Open a stage on this timer directly, whether or not it is active.
+        """
+
+        return _Span(self, name, attributes)
+
+
+_active_timer: ContextVar[StageTimer | None] = ContextVar(
+    "active_stage_timer", default=None
+)
+
+
+def get_stage_timing_mode() -> StageTimingMode:
+    """
+    Read the stage timing mode from the environment.
+
+    REFINER_STAGE_TIMING accepts "on" (wall time per stage) or "memory"
+    (wall time plus tracemalloc and peak RSS per stage). Anything else,
+    including unset, turns timing off.
+
+    Returns:
+        StageTimingMode: "off", "on" or "memory".
+    """
+
+    value = os.getenv(STAGE_TIMING_ENV_VAR, "off").strip().lower()
+    if value in ("on", "memory"):
+        return value  # type: ignore[return-value]
+    return "off"
+
+
+def create_stage_timer() -> StageTimer | None:
+    """
+    Create a StageTimer according to REFINER_STAGE_TIMING.
+
+    A stage observer (see `add_stage_observer`) needs stages to observe,
+    so one is created in "on" mode while any observer is registered.
+
+    Returns:
+        StageTimer | None: A timer, or None when timing is off.
+    """
+
+    mode = get_stage_timing_mode()
+    if mode == "off":
+        return StageTimer() if _stage_observers else None
+    return StageTimer(track_memory=mode == "memory")
+
+
+def _claim_memory_session() -> bool:
+    global _memory_session_open
+    with _memory_session_lock:
+        if _memory_session_open:
+            return False
+        _memory_session_open = True
+        return True
+
+
+def _release_memory_session() -> None:
+    global _memory_session_open
+    with _memory_session_lock:
+        _memory_session_open = False
+
+
+@contextmanager
+def timing_session(timer: StageTimer | None) -> Iterator[StageTimer | None]:
+    """
+    Make `timer` the active timer for the duration of the block.
+
+    Passing None makes every stage inside the block a no-op, including
+    stages that would otherwise land on an enclosing session's timer.
+
+    In "memory" mode, tracemalloc is started for the block if it was not
+    already tracing, and stopped again afterwards. Only one memory session
+    can be open in the process; if another one (not an enclosing one) is
+    already open, `timer.track_memory` is turned off and the block records
+    wall time only.
+    """
+
+    claimed = False
+    if timer is not None and timer.track_memory and not _in_memory_session.get():
+        claimed = _claim_memory_session()
+        if not claimed:
+            timer.track_memory = False
+
+    started_tracing = False
+    memory_token = None
+    if claimed:
+        memory_token = _in_memory_session.set(True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+    token = _active_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _active_timer.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+        if memory_token is not None:
+            _in_memory_session.reset(memory_token)
+            _memory_frames.clear()
+            _release_memory_session()
+
+
+def stage(name: str, **attributes: object) -> _Span | _NullSpan:
+    """
+    Time a block of work on the active timer.
+
+    Usage:
+        with stage("refine_eicr.section", section_code=code) as span:
+            ...
+            span.set(outcome=outcome)
+
+    Returns a shared no-op span when no timer is active.
+    """
+
+    timer = _active_timer.get()
+    if timer is None:
+        return _NULL_SPAN
+    return _Span(timer, name, attributes)
+
+
+def timed_stage[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorate a function so every call is recorded as a stage.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            timer = _active_timer.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            with _Span(timer, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -6,6 +6,11 @@ from app.services.conditions.parsing import extract_uuid_from_canonical_url
 
 from ..core.exceptions import RefinementException, XMLValidationError
 from ..core.models.types import XMLFiles
+from .conformance import (
+    ConformanceCheck,
+    sample_conformance,
+    should_check_conformance,
+)
 from .ecr.augment import (
     REMAINDER_SCOPE,
     AugmentationRun,
@@ -24,8 +29,18 @@ from .ecr.refine import (
     refine_eicr,
     refine_rr,
 )
-from .ecr.reportability import get_reportable_conditions_by_jurisdiction
+from .ecr.reportability import (
+    build_rr_index,
+    get_reportable_conditions_by_jurisdiction,
+    stream_reportable_conditions_by_jurisdiction,
+)
 from .format import format_xml_document_for_display
+from .instrumentation import (
+    StageTiming,
+    create_stage_timer,
+    stage,
+    timing_session,
+)
 from .terminology import ProcessedConfiguration
 
 # TODO:
@@ -137,21 +152,32 @@ class RefinementMetricsEicr:
 class RefinementMetrics:
     """
     The metrics calculated during the refinement process.
+
+    `stages` holds the per-stage timings (parse, plan, per-section
+    refinement, augmentation, serialization, ...) when stage timing is
+    enabled with REFINER_STAGE_TIMING; otherwise it is None.
     """
 
     eicr: RefinementMetricsEicr
+    stages: list[StageTiming] | None = None
 
 
 @dataclass
 class RefinementReport:
     """
     Data collected during refinement for reporting and logging purposes.
+
+    `eicr_conformance` and `rr_conformance` hold the CDA XSD check of the
+    refined documents when this refinement was sampled for it with
+    REFINER_CONFORMANCE_SAMPLE_RATE; otherwise they are None.
     """
 
     augmented_eicr_result: AugmentedResult
     augmented_rr_result: AugmentedResult
     canonical_url: str
     configuration_version: int
+    eicr_conformance: ConformanceCheck | None = None
+    rr_conformance: ConformanceCheck | None = None
 
 
 @dataclass
@@ -175,6 +201,7 @@ class RefinementResult:
 
 def discover_reportable_conditions(
     xml_files: XMLFiles,
+    streaming: bool = False,
 ) -> list[JurisdictionReportableConditions]:
     """
     Parse the RR and return all reportable conditions grouped by jurisdiction.
@@ -185,14 +212,24 @@ def discover_reportable_conditions(
     - testing.py filters to the logged-in user's jurisdiction
     - lambda processes all jurisdictions that have reportable conditions
 
+    With `streaming=True` the RR is read incrementally and reading stops
+    once the Summary Section's RR11 organizer is complete, so discovery
+    (and whatever the caller starts from its result) does not wait on a
+    full parse of a large RR. The trade-off is that malformed XML after
+    the organizer is not detected here; it surfaces when the RR is parsed
+    in full for refinement.
+
     Args:
         xml_files: The eICR/RR pair.
+        streaming: Read only as much of the RR as discovery needs.
 
     Returns:
         All reportable condition groups extracted from the RR.
     """
 
     try:
+        if streaming:
+            return stream_reportable_conditions_by_jurisdiction(xml_files.rr)
         rr_root = xml_files.parse_rr()
         return get_reportable_conditions_by_jurisdiction(rr_root)
     except etree.XMLSyntaxError as e:
@@ -236,6 +273,7 @@ def refine_for_condition(
         3. Refine (mutate trees in place)
         4. Augment (mutate same trees in place)
         5. Serialize, format, and measure once at the end
+        6. Optionally (sampled) check both trees against the CDA XSD
 
     The AugmentationRun is supplied by the caller and shared across
     every refine_for_condition and produce_remainder_rr_for_jurisdiction
@@ -277,59 +315,92 @@ def refine_for_condition(
             a valid UUID.
     """
 
-    try:
-        # * parse both documents up front so refinement and augmentation
-        # can mutate the same trees
-        # * parse failures surface here rather than after wasted work
-        # on the eICR side.
-        eicr_root = xml_files.parse_eicr()
-        rr_root = xml_files.parse_rr()
+    # * the per-condition timer is separate from any enclosing session's
+    # timer (e.g. a Lambda record) so its stages can travel on the result;
+    # the enclosing session sees this whole call as one stage
+    timer = create_stage_timer()
 
-        # the AugmentationRun was built by the caller and is shared
-        # across the session — see create_augmentation_run_from_xml_files
-        #
-        # _extract_uuid_from_canonical_url returns a validated UUID
-        # (raises if the trailing segment isn't UUID-shaped), which is
-        # exactly the type augment_eicr/augment_rr now require — the
-        # type is the validator, no separate shape check needed
-        condition_grouper_uuid = extract_uuid_from_canonical_url(context.canonical_url)
-
-        # plan -> refine -> augment -> output (eICR)
-        eicr_plan = create_eicr_refinement_plan(
-            processed_configuration=processed_configuration,
-            eicr_root=eicr_root,
-            augmentation_timestamp=run.augmentation_time,
-            config_version=context.configuration_version,
-        )
-        refine_eicr(eicr_root=eicr_root, plan=eicr_plan)
-        augmented_eicr_result = augment_eicr(
-            eicr_root,
-            run,
-            jurisdiction_id=context.jurisdiction_id,
-            condition_grouper_uuid=condition_grouper_uuid,
-        )
-        refined_eicr = etree.tostring(eicr_root, encoding="unicode")
-
-        # plan -> refine -> augment -> output (RR)
-        rr_plan = create_rr_refinement_plan(
-            processed_configuration=processed_configuration,
-        )
-        refine_rr(rr_root=rr_root, plan=rr_plan)
-        augmented_rr_result = augment_rr(
-            rr_root,
-            run,
-            jurisdiction_id=context.jurisdiction_id,
-            scope=condition_grouper_uuid,
-        )
-
-        # cross-link the pair: the refined RR's eICR external socument
-        # reference must identify the refined eICR it accompanies (read
-        # off eicr_root, which augment_eicr has already stamped), not
-        # the original eICR it inherited. per-condition pair only; the
-        # remainder RR has no paired refined eICR
-        update_rr_eicr_external_document_reference(rr_root, eicr_root)
+    try:
+        with stage("refine_for_condition"), timing_session(timer):
+            # * parse both documents up front so refinement and augmentation
+            # can mutate the same trees
+            # * parse failures surface here rather than after wasted work
+            # on the eICR side.
+            with stage("parse_eicr"):
+                eicr_root = xml_files.parse_eicr()
+            with stage("parse_rr"):
+                rr_root = xml_files.parse_rr()
+
+            # * index the RR11 organizer once, right after parsing, so RR
+            # refinement below is lookups plus targeted removals
+            # * a missing RR11 organizer also surfaces here, before any
+            # eICR work is done
+            with stage("index_rr"):
+                rr_index = build_rr_index(rr_root)
+
+            # the AugmentationRun was built by the caller and is shared
+            # across the session — see create_augmentation_run_from_xml_files
+            #
+            # _extract_uuid_from_canonical_url returns a validated UUID
+            # (raises if the trailing segment isn't UUID-shaped), which is
+            # exactly the type augment_eicr/augment_rr now require — the
+            # type is the validator, no separate shape check needed
+            condition_grouper_uuid = extract_uuid_from_canonical_url(
+                context.canonical_url
+            )
+
+            # plan -> refine -> augment -> output (eICR)
+            with stage("plan_eicr"):
+                eicr_plan = create_eicr_refinement_plan(
+                    processed_configuration=processed_configuration,
+                    eicr_root=eicr_root,
+                    augmentation_timestamp=run.augmentation_time,
+                    config_version=context.configuration_version,
+                )
+            with stage("refine_eicr"):
+                refine_eicr(eicr_root=eicr_root, plan=eicr_plan)
+            with stage("augment_eicr"):
+                augmented_eicr_result = augment_eicr(
+                    eicr_root,
+                    run,
+                    jurisdiction_id=context.jurisdiction_id,
+                    condition_grouper_uuid=condition_grouper_uuid,
+                )
+            with stage("serialize_eicr"):
+                refined_eicr = etree.tostring(eicr_root, encoding="unicode")
+
+            # plan -> refine -> augment -> output (RR)
+            rr_plan = create_rr_refinement_plan(
+                processed_configuration=processed_configuration,
+            )
+            with stage("refine_rr"):
+                refine_rr(rr_root=rr_root, plan=rr_plan, index=rr_index)
+            with stage("augment_rr"):
+                augmented_rr_result = augment_rr(
+                    rr_root,
+                    run,
+                    jurisdiction_id=context.jurisdiction_id,
+                    scope=condition_grouper_uuid,
+                )
 
-        refined_rr = etree.tostring(rr_root, encoding="unicode")
+                # cross-link the pair: the refined RR's eICR external socument
+                # reference must identify the refined eICR it accompanies (read
+                # off eicr_root, which augment_eicr has already stamped), not
+                # the original eICR it inherited. per-condition pair only; the
+                # remainder RR has no paired refined eICR
+                update_rr_eicr_external_document_reference(rr_root, eicr_root)
+
+            with stage("serialize_rr"):
+                refined_rr = etree.tostring(rr_root, encoding="unicode")
+
+            # * a sampled fraction of refinements check the trees they just
+            # serialized against the CDA XSD, so an engine change that emits
+            # invalid output shows up in the report; see conformance.py
+            eicr_conformance = rr_conformance = None
+            if should_check_conformance():
+                with stage("check_conformance"):
+                    eicr_conformance = sample_conformance(eicr_root)
+                    rr_conformance = sample_conformance(rr_root)
 
         # * one calculation, computed here, propagated through the
         # result so testing.py and lambda_function.py do not maintain
@@ -343,13 +414,16 @@ def refine_for_condition(
                         unrefined=xml_files.eicr, refined=refined_eicr
                     ),
                     size_mib=get_file_size_in_mib(file_content=refined_eicr),
-                )
+                ),
+                stages=timer.stages if timer is not None else None,
             ),
             report=RefinementReport(
                 augmented_eicr_result=augmented_eicr_result,
                 augmented_rr_result=augmented_rr_result,
                 canonical_url=context.canonical_url,
                 configuration_version=context.configuration_version,
+                eicr_conformance=eicr_conformance,
+                rr_conformance=rr_conformance,
             ),
         )
 
@@ -456,13 +530,17 @@ def produce_remainder_rr_for_jurisdiction(
     if not refined_condition_codes or not skipped_condition_codes:
         return None
 
-    rr_root = xml_files.parse_rr()
+    with stage("parse_rr"):
+        rr_root = xml_files.parse_rr()
+    with stage("index_rr"):
+        rr_index = build_rr_index(rr_root)
 
     # filter the RR down to the skipped conditions only
     plan = RRRefinementPlan(
         included_condition_child_rsg_snomed_codes_to_retain=skipped_condition_codes
     )
-    refine_rr(rr_root=rr_root, plan=plan)
+    with stage("refine_rr"):
+        refine_rr(rr_root=rr_root, plan=plan, index=rr_index)
 
     # augment with REMAINDER_SCOPE in place of a condition grouper UUID
     augmented_result = augment_rr(
@@ -474,8 +552,10 @@ def produce_remainder_rr_for_jurisdiction(
 
     # serialize and pretty-print at the pipeline boundary, same as
     # the per-condition outputs from refine_for_condition
-    remainder_rr = etree.tostring(rr_root, encoding="unicode")
-    remainder_rr = format_xml_document_for_display(remainder_rr)
+    with stage("serialize_rr"):
+        remainder_rr = etree.tostring(rr_root, encoding="unicode")
+    with stage("format_rr"):
+        remainder_rr = format_xml_document_for_display(remainder_rr)
 
     return RemainderRRResult(
         remainder_rr=remainder_rr,
@@ -0,0 +1,325 @@
+import asyncio
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import Context
+from dataclasses import dataclass, field
+from logging import Logger
+from time import perf_counter
+from types import FrameType
+from typing import Final
+from uuid import UUID
+
+from app.core.metrics import registry
+
+from .logger import request_id_ctx_var, set_request_id
+
+# NOTE:
+# This module watches the webapp's event loop for stalls and slow requests.
+# * a heartbeat task wakes every `interval_seconds`; how late it wakes is
+#   the event-loop lag, exported as a histogram
+# * a watchdog thread notices when the heartbeat stops beating. While the
+#   loop is stalled it samples the loop thread's stack every few
+#   milliseconds, so the profile shows the synchronous code (parsing,
+#   refinement, XSLT, ...) that is holding the loop. The stall is logged
+#   with the request ID of the task that was running
+# * requests that run longer than `slow_request_seconds` have the await
+#   stacks of their tasks sampled on each heartbeat; when the request ends
+#   its profile (including any stall it caused) is logged
+# * stacks are "folded" (root first, `;`-separated), the input format of
+#   flamegraph.pl, speedscope and similar tools
+# * nothing is sampled until a threshold is crossed; in the steady state
+#   the cost is one heartbeat per interval
+# =============================================================================
+
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "refiner_event_loop_lag_seconds",
+    "How late the event loop's heartbeat woke up; high values mean blocking code.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# keep a stuck loop from sampling forever; the stall is still logged
+MAX_STALL_PROFILE_SECONDS: Final[float] = 30.0
+
+# the most common stacks are what matter; the rest only bloat the log line
+MAX_LOGGED_STACKS: Final[int] = 20
+
+# deep recursion (lxml tree walks) adds nothing past this many frames
+MAX_STACK_DEPTH: Final[int] = 64
+
+
+# NOTE:
+# STACKS
+# =============================================================================
+
+
+def fold_stack(frames: Iterable[FrameType]) -> str:
+    """
+    Fold frames, outermost first, into a `file:function:line;...` string.
+    """
+
+    return ";".join(
+        f"{frame.f_code.co_filename.rsplit('/', 1)[-1]}:"
+        f"{frame.f_code.co_qualname}:{frame.f_lineno}"
+        for frame in frames
+    )
+
+
+def _walk_frames(frame: FrameType | None) -> list[FrameType]:
+    frames: list[FrameType] = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _top_stacks(stacks: Counter[str]) -> list[dict[str, str | int]]:
+    return [
+        {"stack": stack, "samples": samples}
+        for stack, samples in stacks.most_common(MAX_LOGGED_STACKS)
+    ]
+
+
+# NOTE:
+# WATCHDOG
+# =============================================================================
+
+
+@dataclass
+class TrackedRequest:
+    """
+    A request in flight, and the stacks sampled while it was slow.
+    """
+
+    method: str
+    path: str
+    started_at: float
+    stacks: Counter[str] = field(default_factory=Counter)
+    blocked_ms: float = 0.0
+
+
+class LoopWatchdog:
+    """
+    Detects event-loop stalls and slow requests and logs a sampled profile.
+
+    Not running until the webapp lifespan starts it; until then
+    `track_request` is a no-op.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self.lag_threshold_seconds = 0.0
+        self.slow_request_seconds = 0.0
+        self.interval_seconds = 0.1
+        self.sample_interval_seconds = 0.005
+        self._logger: Logger | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._last_beat = 0.0
+        self._heartbeat: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._requests: dict[str, TrackedRequest] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the heartbeat is running.
+        """
+
+        return self._heartbeat is not None
+
+    def start(
+        self,
+        logger: Logger,
+        lag_threshold_seconds: float,
+        slow_request_seconds: float,
+        interval_seconds: float = 0.1,
+        sample_interval_seconds: float = 0.005,
+    ) -> None:
+        """
+        Start the heartbeat and the watchdog thread on the running loop.
+
+        Args:
+            logger: Where stalls and slow requests are logged.
+            lag_threshold_seconds: Profile the loop once it has been blocked
+                this long; 0 turns stall profiling off.
+            slow_request_seconds: Profile requests running longer than this;
+                0 turns slow-request profiling off.
+            interval_seconds: How often the heartbeat wakes.
+            sample_interval_seconds: How often a stalled loop is sampled.
+        """
+
+        if self.running:
+            return
+
+        self._logger = logger
+        self.lag_threshold_seconds = lag_threshold_seconds
+        self.slow_request_seconds = slow_request_seconds
+        self.interval_seconds = interval_seconds
+        self.sample_interval_seconds = sample_interval_seconds
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = perf_counter()
+        self._stopping.clear()
+
+        self._heartbeat = asyncio.create_task(self._beat())
+        if lag_threshold_seconds > 0:
+            self._thread = threading.Thread(
+                target=self._watch, name="refiner-loop-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    async def stop(self) -> None:
+        """
+        Stop the heartbeat and the watchdog thread.
+        """
+
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._stopping.set()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+        self._requests.clear()
+
+    @contextmanager
+    def track_request(self, request_id: str, method: str, path: str) -> Iterator[None]:
+        """
+        Track a request for the duration of the block.
+
+        Must be entered on the event loop, in the request's context. If the
+        request turns out to be slow, its profile is logged on exit.
+        """
+
+        if not self.running:
+            yield
+            return
+
+        record = TrackedRequest(method=method, path=path, started_at=perf_counter())
+        self._requests[request_id] = record
+        try:
+            yield
+        finally:
+            self._requests.pop(request_id, None)
+            duration = perf_counter() - record.started_at
+            if 0 < self.slow_request_seconds <= duration and self._logger:
+                with self._lock:
+                    samples = sum(record.stacks.values())
+                    stacks = _top_stacks(record.stacks)
+                self._logger.warning(
+                    "Slow request",
+                    extra={
+                        "request_id": request_id,
+                        "path": path,
+                        "method": method,
+                        "duration_ms": round(duration * 1000, 2),
+                        "blocked_ms": round(record.blocked_ms, 2),
+                        "samples": samples,
+                        "stacks": stacks,
+                    },
+                )
+
+    async def _beat(self) -> None:
+        while True:
+            expected = perf_counter() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            now = perf_counter()
+            EVENT_LOOP_LAG_SECONDS.observe(max(now - expected, 0.0))
+            self._last_beat = now
+            if self.slow_request_seconds > 0:
+                self._sample_slow_requests(now)
+
+    def _sample_slow_requests(self, now: float) -> None:
+        slow = {
+            request_id: record
+            for request_id, record in self._requests.items()
+            if now - record.started_at >= self.slow_request_seconds
+        }
+        if not slow:
+            return
+
+        # a request spans several tasks (middleware, endpoint, ...); each
+        # inherits the request's context, so the request ID finds them all
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is current:
+                continue
+            request_id = task.get_context().get(request_id_ctx_var)
+            record = slow.get(request_id or "")
+            if record is None:
+                continue
+            stack = fold_stack(task.get_stack(limit=MAX_STACK_DEPTH))
+            if stack:
+                with self._lock:
+                    record.stacks[stack] += 1
+
+    # NOTE:
+    # The rest runs on the watchdog thread.
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval_seconds):
+            beat = self._last_beat
+            if (
+                perf_counter() - beat - self.interval_seconds
+                >= self.lag_threshold_seconds
+            ):
+                self._profile_stall(beat)
+
+    def _profile_stall(self, beat: float) -> None:
+        assert self._loop is not None
+
+        # the task holding the loop; its context carries the request ID
+        task = asyncio.current_task(self._loop)
+        request_id = task.get_context().get(request_id_ctx_var) if task else None
+        stalled_at = beat + self.interval_seconds
+
+        stacks: Counter[str] = Counter()
+        while (
+            self._last_beat == beat
+            and not self._stopping.is_set()
+            and perf_counter() - stalled_at < MAX_STALL_PROFILE_SECONDS
+        ):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stacks[fold_stack(_walk_frames(frame))] += 1
+            self._stopping.wait(self.sample_interval_seconds)
+
+        stall_ms = (perf_counter() - stalled_at) * 1000
+        record = self._requests.get(request_id or "")
+        if record is not None:
+            with self._lock:
+                record.stacks.update(stacks)
+                record.blocked_ms += stall_ms
+
+        # log from a fresh context so the request ID filter tags the line
+        # with the stalled request rather than this thread's (absent) one
+        Context().run(self._log_stall, request_id, stall_ms, stacks)
+
+    def _log_stall(
+        self, request_id: str | None, stall_ms: float, stacks: Counter[str]
+    ) -> None:
+        if request_id is not None:
+            set_request_id(UUID(request_id))
+        if self._logger is None:
+            return
+
+        record = self._requests.get(request_id or "")
+        self._logger.warning(
+            "Event loop stalled",
+            extra={
+                "request_id": request_id,
+                "path": record.path if record else None,
+                "method": record.method if record else None,
+                "stall_ms": round(stall_ms, 2),
+                "samples": sum(stacks.values()),
+                "sample_interval_ms": self.sample_interval_seconds * 1000,
+                "stacks": _top_stacks(stacks),
+            },
+        )
+
+
+loop_watchdog = LoopWatchdog()
@@ -10,6 +10,7 @@ from pathlib import Path
 
 from lxml import etree
 
+from app.core.metrics import registry
 from app.services.assets import get_asset_path
 from app.services.ecr.model import ReportableCondition
 from app.services.file_io import ZipFileItem
@@ -21,6 +22,12 @@ def _get_path_to_xslt_stylesheet() -> Path:
     return get_asset_path("xslt", "CDA-phcaserpt-1.1.1-CDAR2_eCR_eICR.xsl")
 
 
+XSLT_RENDER_SECONDS = registry.histogram(
+    "refiner_xslt_render_duration_seconds",
+    "Time spent rendering a refined eICR to HTML.",
+)
+
+
 class XSLTTransformationError(Exception):
     """Custom exception for XSLT transformation errors."""
 
@@ -90,9 +97,10 @@ def create_refined_eicr_html_file(
     """
     try:
         xslt_stylesheet_path = _get_path_to_xslt_stylesheet()
-        html_bytes = _transform_xml_to_html(
-            refined_eicr.encode("utf-8"), xslt_stylesheet_path, logger
-        )
+        with XSLT_RENDER_SECONDS.time():
+            html_bytes = _transform_xml_to_html(
+                refined_eicr.encode("utf-8"), xslt_stylesheet_path, logger
+            )
 
         logger.info(
             f"Successfully transformed XML to HTML for condition: {condition.display_name}",
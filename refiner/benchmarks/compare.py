@@ -0,0 +1,126 @@
+"""
+Compare two pytest-benchmark JSON reports and flag regressions.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 10] [--stat median]
+
+Benchmarks are matched on their full name (test + corpus id). A benchmark
+regresses when the chosen statistic in CURRENT is more than `threshold`
+percent slower than in BASELINE. The exit code is 1 when any benchmark
+regressed, so the command can gate a release or a CI job.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+STATS = ("min", "median", "mean")
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    One benchmark's baseline vs current timing.
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change_percentage(self) -> float:
+        """
+        Percent change from baseline; positive means slower.
+        """
+
+        if self.baseline == 0:
+            return 0.0
+        return (self.current - self.baseline) / self.baseline * 100
+
+
+def load_report(path: Path, stat: str) -> dict[str, float]:
+    """
+    Read a pytest-benchmark JSON report into {benchmark name: seconds}.
+    """
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {bench["name"]: bench["stats"][stat] for bench in data["benchmarks"]}
+
+
+def compare_reports(
+    baseline: dict[str, float], current: dict[str, float]
+) -> tuple[list[Comparison], list[str], list[str]]:
+    """
+    Pair up benchmarks present in both reports.
+
+    Returns the comparisons plus the names only found in the baseline
+    (removed) and only found in the current report (added).
+    """
+
+    comparisons = [
+        Comparison(name=name, baseline=baseline[name], current=current[name])
+        for name in sorted(baseline.keys() & current.keys())
+    ]
+    removed = sorted(baseline.keys() - current.keys())
+    added = sorted(current.keys() - baseline.keys())
+    return comparisons, removed, added
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Print the comparison table and return the process exit code.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Allowed slowdown in percent before a benchmark counts as a regression.",
+    )
+    parser.add_argument("--stat", choices=STATS, default="median")
+    args = parser.parse_args(argv)
+
+    comparisons, removed, added = compare_reports(
+        load_report(args.baseline, args.stat), load_report(args.current, args.stat)
+    )
+
+    name_width = max((len(c.name) for c in comparisons), default=10)
+    print(
+        f"{'benchmark':<{name_width}}  {'baseline ms':>12}  {'current ms':>12}  {'change':>8}"
+    )
+    regressions = []
+    for comparison in comparisons:
+        regressed = comparison.change_percentage > args.threshold
+        if regressed:
+            regressions.append(comparison)
+        print(
+            f"{comparison.name:<{name_width}}  "
+            f"{comparison.baseline * 1000:>12.3f}  "
+            f"{comparison.current * 1000:>12.3f}  "
+            f"{comparison.change_percentage:>+7.1f}%"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    for name in removed:
+        print(f"missing from current report: {name}")
+    for name in added:
+        print(f"new benchmark (no baseline): {name}")
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmark(s) regressed more than "
+            f"{args.threshold:g}% on {args.stat}"
+        )
+        return 1
+
+    print(f"\nno regressions beyond {args.threshold:g}% on {args.stat}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
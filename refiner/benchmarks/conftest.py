@@ -0,0 +1,88 @@
+import pytest
+
+from app.services.terminology import ProcessedConfiguration
+from benchmarks.corpus import (
+    FIXTURE_PAIRS,
+    CorpusDocument,
+    build_configuration,
+    generate_scaled_document,
+    load_fixture_pair,
+)
+
+_GENERATED_PREFIX = "generated_"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("refiner benchmarks")
+    group.addoption(
+        "--corpus-sizes",
+        default="1",
+        help=(
+            "Comma-separated eICR sizes in MiB for the generated corpus "
+            "documents, e.g. '1,10,50'. Pass an empty string to run only "
+            "the committed fixtures."
+        ),
+    )
+    group.addoption(
+        "--bench-rounds",
+        type=int,
+        default=5,
+        help="Rounds per benchmark. Each round gets a freshly parsed tree.",
+    )
+    group.addoption(
+        "--bench-db-url",
+        default=None,
+        help=(
+            "Connection string of a fully seeded database (SEED_ALL_TES_DATA=true) "
+            "for the code search and custom code insert benchmarks. The "
+            "password is read from DB_PASSWORD. Those benchmarks are skipped "
+            "without it."
+        ),
+    )
+
+
+def _generated_sizes(config: pytest.Config) -> list[int]:
+    raw = config.getoption("--corpus-sizes")
+    return [int(size) for size in raw.split(",") if size.strip()]
+
+
+def pytest_generate_tests(metafunc):
+    if "corpus_id" not in metafunc.fixturenames:
+        return
+
+    corpus_ids = [corpus_id for corpus_id, _, _ in FIXTURE_PAIRS] + [
+        f"{_GENERATED_PREFIX}{size}mb" for size in _generated_sizes(metafunc.config)
+    ]
+    metafunc.parametrize("corpus_id", corpus_ids, scope="session")
+
+
+@pytest.fixture(scope="session")
+def corpus_entry(corpus_id: str) -> tuple[CorpusDocument, ProcessedConfiguration]:
+    # session scoped and parametrized on corpus_id, so pytest groups the
+    # benchmarks by corpus document and each generated document is built
+    # once and released before the next one is generated
+    if corpus_id.startswith(_GENERATED_PREFIX):
+        size = int(corpus_id.removeprefix(_GENERATED_PREFIX).removesuffix("mb"))
+        document = generate_scaled_document(size)
+    else:
+        document = load_fixture_pair(corpus_id)
+    return document, build_configuration(document.xml_files)
+
+
+@pytest.fixture
+def corpus_document(
+    corpus_entry: tuple[CorpusDocument, ProcessedConfiguration],
+) -> CorpusDocument:
+    return corpus_entry[0]
+
+
+@pytest.fixture
+def processed_configuration(
+    corpus_entry: tuple[CorpusDocument, ProcessedConfiguration],
+) -> ProcessedConfiguration:
+    return corpus_entry[1]
+
+
+@pytest.fixture
+def bench_rounds(request: pytest.FixtureRequest) -> int:
+    return request.config.getoption("--bench-rounds")
@@ -0,0 +1,182 @@
+"""
+Benchmark corpus: committed eICR/RR fixture pairs plus synthetic large documents.
+
+The synthetic documents are grown from the all-sections fixture pair by
+repeating every section's <entry> elements until the serialized eICR
+reaches the requested size. The RR is left untouched; RR size does not
+scale with eICR size in real feeds.
+"""
+
+import math
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+
+from lxml import etree
+
+from app.core.models.types import XMLFiles
+from app.services.ecr.model import HL7_NS
+from app.services.ecr.reportability import get_reportable_conditions_by_jurisdiction
+from app.services.ecr.specification.constants import OID_TO_SYSTEM_KEY_MAP
+from app.services.terminology import ProcessedConfiguration
+
+FIXTURE_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+# (corpus id, eICR path, RR path) relative to tests/fixtures
+FIXTURE_PAIRS: list[tuple[str, str, str]] = [
+    (
+        "eicr_v1_1",
+        "eicr_v1_1/mon_mothma_covid_influenza_eICR.xml",
+        "eicr_v1_1/mon_mothma_covid_influenza_RR.xml",
+    ),
+    (
+        "eicr_v3_1_1",
+        "eicr_v3_1_1/mon_mothma_zika_eICR.xml",
+        "eicr_v3_1_1/mon_mothma_zika_RR.xml",
+    ),
+    (
+        "ecr_pairs",
+        "ecr_pairs/all_sections_covid_influenza/eICR.xml",
+        "ecr_pairs/all_sections_covid_influenza/RR.xml",
+    ),
+]
+
+# the pair synthetic documents are grown from
+SCALING_SOURCE = "ecr_pairs"
+
+# keep one in every N coded elements in the generated configuration so a
+# benchmark run exercises both the keep and the prune branches
+_CONFIGURATION_SAMPLE_RATE = 4
+
+MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CorpusDocument:
+    """
+    One eICR/RR pair in the benchmark corpus.
+    """
+
+    corpus_id: str
+    xml_files: XMLFiles
+
+    @property
+    def eicr_size_mib(self) -> float:
+        """
+        Size of the eICR in MiB.
+        """
+
+        return len(self.xml_files.eicr.encode("utf-8")) / MIB
+
+
+def load_fixture_pair(corpus_id: str) -> CorpusDocument:
+    """
+    Load one of the committed fixture pairs by corpus id.
+    """
+
+    _, eicr_path, rr_path = next(p for p in FIXTURE_PAIRS if p[0] == corpus_id)
+    return CorpusDocument(
+        corpus_id=corpus_id,
+        xml_files=XMLFiles(
+            eicr=(FIXTURE_DIR / eicr_path).read_text(encoding="utf-8"),
+            rr=(FIXTURE_DIR / rr_path).read_text(encoding="utf-8"),
+        ),
+    )
+
+
+def scale_eicr(eicr: str, target_mib: float) -> str:
+    """
+    Grow an eICR to roughly `target_mib` by repeating each section's entries.
+
+    Every section with entries gets the same repetition factor, so the
+    relative weight of each section in the source document is preserved.
+    The result is never smaller than the source.
+    """
+
+    root = etree.fromstring(eicr.encode("utf-8"))
+    sections_with_entries = [
+        (section, section.findall("hl7:entry", HL7_NS))
+        for section in root.iterfind(".//hl7:section", HL7_NS)
+    ]
+    sections_with_entries = [(s, e) for s, e in sections_with_entries if e]
+
+    base_bytes = len(eicr.encode("utf-8"))
+    entry_bytes = sum(
+        len(etree.tostring(entry))
+        for _, entries in sections_with_entries
+        for entry in entries
+    )
+    target_bytes = int(target_mib * MIB)
+    if entry_bytes == 0 or target_bytes <= base_bytes:
+        return eicr
+
+    copies = math.ceil((target_bytes - base_bytes) / entry_bytes)
+    for section, entries in sections_with_entries:
+        # new entries go directly after the last existing entry so
+        # anything trailing the entries (e.g. a footnote) stays put
+        anchor = entries[-1]
+        for _ in range(copies):
+            for entry in entries:
+                clone = deepcopy(entry)
+                anchor.addnext(clone)
+                anchor = clone
+
+    return etree.tostring(root, encoding="unicode")
+
+
+def generate_scaled_document(target_mib: int) -> CorpusDocument:
+    """
+    Build a synthetic pair whose eICR is roughly `target_mib` MiB.
+    """
+
+    source = load_fixture_pair(SCALING_SOURCE)
+    return CorpusDocument(
+        corpus_id=f"generated_{target_mib}mb",
+        xml_files=XMLFiles(
+            eicr=scale_eicr(source.xml_files.eicr, target_mib),
+            rr=source.xml_files.rr,
+        ),
+    )
+
+
+def build_configuration(xml_files: XMLFiles) -> ProcessedConfiguration:
+    """
+    Build a deterministic ProcessedConfiguration for a corpus document.
+
+    Includes every reportable condition code in the RR and a fixed sample
+    of the coded elements found in the eICR, grouped by code system, so
+    refinement keeps some entries and prunes the rest.
+    """
+
+    rr_root = xml_files.parse_rr()
+    rsg_codes = {
+        condition.code
+        for group in get_reportable_conditions_by_jurisdiction(rr_root)
+        for condition in group.conditions
+    }
+
+    eicr_root = xml_files.parse_eicr()
+    code_system_sets: dict[str, dict[str, dict[str, str]]] = {}
+    coded = [
+        element
+        for element in eicr_root.iterfind(".//hl7:entry//*[@code][@codeSystem]", HL7_NS)
+        if element.get("codeSystem") in OID_TO_SYSTEM_KEY_MAP
+    ]
+    for element in coded[::_CONFIGURATION_SAMPLE_RATE]:
+        oid = element.get("codeSystem", "")
+        code = element.get("code", "")
+        code_system_sets.setdefault(OID_TO_SYSTEM_KEY_MAP[oid], {})[code] = {
+            "code": code,
+            "display": element.get("displayName", ""),
+            "system": oid,
+        }
+
+    return ProcessedConfiguration.from_dict(
+        {
+            "sections": [],
+            "included_condition_rsg_codes": sorted(rsg_codes),
+            "code_system_sets": {
+                key: list(codings.values()) for key, codings in code_system_sets.items()
+            },
+        }
+    )
@@ -0,0 +1,102 @@
+"""
+Code search benchmarks against a fully seeded database.
+
+These time `get_codes_db` with a search term, the query behind every
+keystroke in the configuration codes browser. They need a database seeded
+with every TES version (`SEED_ALL_TES_DATA=true`) and at least one
+configuration, passed with `--bench-db-url`; without it they are skipped.
+
+Condition codes are searched in the `configurations_codes` projection and
+custom codes in `custom_codes`; both have pg_trgm indexes on code and
+display. The terms range from one character to one that matches nothing.
+"""
+
+import asyncio
+import os
+from collections.abc import Iterator
+from uuid import UUID
+
+import pytest
+
+from app.api.v1.configurations.codes.model import FilterInput
+from app.db.configurations.codes.db import get_codes_db
+from app.db.pool import AsyncDatabaseConnection, create_db
+
+# the page size the codes endpoint uses
+CODES_LIMIT = 100
+
+SEARCH_TERMS = ["a", "vi", "virus", "influenza", "8480", "no-such-code-anywhere"]
+
+
+@pytest.fixture(scope="module")
+def runner() -> Iterator[asyncio.Runner]:
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="module")
+def db(
+    request: pytest.FixtureRequest, runner: asyncio.Runner
+) -> Iterator[AsyncDatabaseConnection]:
+    db_url = request.config.getoption("--bench-db-url")
+    if not db_url:
+        pytest.skip("code search benchmarks need --bench-db-url")
+
+    db = create_db(db_url=db_url, db_password=os.getenv("DB_PASSWORD", ""))
+    runner.run(db.connect())
+    yield db
+    runner.run(db.close())
+
+
+@pytest.fixture(scope="module")
+def largest_configuration_id(
+    db: AsyncDatabaseConnection, runner: asyncio.Runner
+) -> UUID:
+    """
+    The configuration with the most condition codes, i.e. the slowest to search.
+    """
+
+    async def _get() -> UUID | None:
+        async with db.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT cfgc.configuration_id
+                    FROM configurations_conditions cfgc
+                    JOIN conditions_codes_temp cc ON cc.condition_id = cfgc.condition_id
+                    GROUP BY cfgc.configuration_id
+                    ORDER BY COUNT(*) DESC
+                    LIMIT 1;
+                    """
+                )
+                row = await cur.fetchone()
+        return row[0] if row else None
+
+    configuration_id = runner.run(_get())
+    if configuration_id is None:
+        pytest.skip("the benchmark database has no configurations")
+    return configuration_id
+
+
+@pytest.mark.parametrize("search", SEARCH_TERMS)
+def test_get_codes_db_search(
+    benchmark,
+    bench_rounds: int,
+    runner: asyncio.Runner,
+    db: AsyncDatabaseConnection,
+    largest_configuration_id: UUID,
+    search: str,
+):
+    benchmark.extra_info["search"] = search
+
+    def search_codes():
+        return runner.run(
+            get_codes_db(
+                configuration_id=largest_configuration_id,
+                db=db,
+                limit=CODES_LIMIT,
+                filters=FilterInput(search=search),
+            )
+        )
+
+    benchmark.pedantic(search_codes, rounds=bench_rounds, warmup_rounds=1)
@@ -0,0 +1,229 @@
+"""
+Bulk custom code upload benchmarks at 50k rows.
+
+`test_validate_custom_codes_csv` times the preview step of a CSV upload,
+`validate_custom_codes_csv`, against a configuration that already has
+UPLOAD_ROWS custom codes. It needs no database.
+
+`test_insert_custom_codes_db` times the confirm step, `insert_custom_codes_db`,
+against a real database passed with `--bench-db-url`; without it it is
+skipped. It adds UPLOAD_ROWS codes to the draft configuration with the
+fewest custom codes and deletes them, and their upload event, after every
+round.
+"""
+
+import asyncio
+import csv
+import io
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.api.v1.configurations.custom_codes.model import AddCustomCodeInput
+from app.db.code_systems.db import DbCodeSystem, get_code_systems_db
+from app.db.configurations.custom_codes.db import insert_custom_codes_db
+from app.db.configurations.custom_codes.model import DbCustomCode
+from app.db.configurations.db import get_configuration_by_id_db
+from app.db.configurations.model import DbConfiguration
+from app.db.pool import AsyncDatabaseConnection, create_db
+from app.services.custom_codes import validate_custom_codes_csv
+
+UPLOAD_ROWS = 50_000
+
+# prefix of every code the benchmarks create, so cleanup cannot touch real ones
+CODE_PREFIX = "bench-upload-"
+
+SYSTEMS = [
+    DbCodeSystem(id=uuid4(), key=key, display_name=name, oid=oid)
+    for key, name, oid in [
+        ("loinc", "LOINC", "2.16.840.1.113883.6.1"),
+        ("snomed", "SNOMED", "2.16.840.1.113883.6.96"),
+        ("icd10", "ICD-10", "2.16.840.1.113883.6.90"),
+        ("rxnorm", "RxNorm", "2.16.840.1.113883.6.88"),
+    ]
+]
+
+
+def _build_csv(rows: int) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["code", "code_system", "display_name"])
+    for n in range(rows):
+        system = SYSTEMS[n % len(SYSTEMS)]
+        writer.writerow([f"{CODE_PREFIX}{n}", system.display_name, f"Code {n}"])
+    return out.getvalue()
+
+
+def _existing_codes(rows: int) -> list[DbCustomCode]:
+    now = datetime.now()
+    configuration_id = uuid4()
+    return [
+        DbCustomCode(
+            id=uuid4(),
+            display=f"Existing {n}",
+            code=f"existing-{n}",
+            system_id=SYSTEMS[n % len(SYSTEMS)].id,
+            created_at=now,
+            updated_at=now,
+            configuration_id=configuration_id,
+        )
+        for n in range(rows)
+    ]
+
+
+@pytest.fixture(scope="module")
+def runner() -> Iterator[asyncio.Runner]:
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+def test_validate_custom_codes_csv(
+    benchmark, bench_rounds: int, runner: asyncio.Runner
+):
+    csv_text = _build_csv(UPLOAD_ROWS)
+    existing_codes = _existing_codes(UPLOAD_ROWS)
+    benchmark.extra_info["rows"] = UPLOAD_ROWS
+
+    def validate():
+        result = runner.run(
+            validate_custom_codes_csv(
+                csv.DictReader(io.StringIO(csv_text)),
+                supported_systems=SYSTEMS,
+                existing_codes=existing_codes,
+            )
+        )
+        assert len(result.preview_items) == UPLOAD_ROWS
+        return result
+
+    benchmark.pedantic(validate, rounds=bench_rounds, warmup_rounds=1)
+
+
+@pytest.fixture(scope="module")
+def db(
+    request: pytest.FixtureRequest, runner: asyncio.Runner
+) -> Iterator[AsyncDatabaseConnection]:
+    db_url = request.config.getoption("--bench-db-url")
+    if not db_url:
+        pytest.skip("custom code insert benchmarks need --bench-db-url")
+
+    db = create_db(db_url=db_url, db_password=os.getenv("DB_PASSWORD", ""))
+    runner.run(db.connect())
+    yield db
+    runner.run(db.close())
+
+
+@pytest.fixture(scope="module")
+def draft_configuration(
+    db: AsyncDatabaseConnection, runner: asyncio.Runner
+) -> tuple[DbConfiguration, UUID]:
+    """
+    The draft configuration with the fewest custom codes, and a user to credit.
+    """
+
+    async def _get() -> tuple[DbConfiguration, UUID] | None:
+        async with db.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT c.id, c.jurisdiction_id, u.id
+                    FROM configurations c
+                    JOIN users u ON u.jurisdiction_id = c.jurisdiction_id
+                    WHERE c.status = 'draft'
+                    ORDER BY (
+                        SELECT COUNT(*) FROM custom_codes cc
+                        WHERE cc.configuration_id = c.id
+                    )
+                    LIMIT 1;
+                    """
+                )
+                row = await cur.fetchone()
+        if row is None:
+            return None
+        configuration_id, jurisdiction_id, user_id = row
+        config = await get_configuration_by_id_db(
+            id=configuration_id, jurisdiction_id=jurisdiction_id, db=db
+        )
+        return (config, user_id) if config else None
+
+    found = runner.run(_get())
+    if found is None:
+        pytest.skip("the benchmark database has no draft configuration with a user")
+    return found
+
+
+async def _delete_benchmark_codes(
+    configuration_id: UUID, db: AsyncDatabaseConnection
+) -> None:
+    async with db.get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                DELETE FROM custom_codes
+                WHERE configuration_id = %(configuration_id)s
+                  AND code LIKE %(prefix)s;
+                """,
+                {"configuration_id": configuration_id, "prefix": f"{CODE_PREFIX}%"},
+            )
+            await cur.execute(
+                """
+                DELETE FROM events_custom_code_uploads
+                WHERE code LIKE %(prefix)s;
+                """,
+                {"prefix": f"{CODE_PREFIX}%"},
+            )
+            await cur.execute(
+                """
+                DELETE FROM events
+                WHERE configuration_id = %(configuration_id)s
+                  AND event_type = 'bulk_add_custom_code'
+                  AND custom_code_uploads LIKE %(uploads)s;
+                """,
+                {
+                    "configuration_id": configuration_id,
+                    "uploads": f"% | {CODE_PREFIX}%",
+                },
+            )
+
+
+def test_insert_custom_codes_db(
+    benchmark,
+    bench_rounds: int,
+    runner: asyncio.Runner,
+    db: AsyncDatabaseConnection,
+    draft_configuration: tuple[DbConfiguration, UUID],
+):
+    config, user_id = draft_configuration
+    code_systems = runner.run(get_code_systems_db(db=db))
+    custom_codes = [
+        AddCustomCodeInput(
+            code=f"{CODE_PREFIX}{n}",
+            display=f"Code {n}",
+            system_id=code_systems[n % len(code_systems)].id,
+        )
+        for n in range(UPLOAD_ROWS)
+    ]
+    benchmark.extra_info["rows"] = UPLOAD_ROWS
+
+    def setup():
+        runner.run(_delete_benchmark_codes(configuration_id=config.id, db=db))
+
+    def insert():
+        rows = runner.run(
+            insert_custom_codes_db(
+                config=config,
+                custom_codes=custom_codes,
+                code_systems=code_systems,
+                user_id=user_id,
+                db=db,
+            )
+        )
+        assert len(rows) == UPLOAD_ROWS
+        return rows
+
+    try:
+        benchmark.pedantic(insert, setup=setup, rounds=bench_rounds, warmup_rounds=1)
+    finally:
+        setup()
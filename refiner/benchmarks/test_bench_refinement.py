@@ -0,0 +1,211 @@
+"""
+Refinement engine benchmarks.
+
+Every benchmark is parametrized over the corpus (committed fixture pairs
+plus generated documents, see `--corpus-sizes`). Functions that mutate
+the tree get a freshly parsed document per round through
+`benchmark.pedantic(setup=...)`, so parsing is excluded from their
+timings unless parsing is part of the function under test.
+"""
+
+import logging
+from uuid import UUID
+
+import pytest
+
+from app.services.ecr.augment import augment_eicr, create_augmentation_run
+from app.services.ecr.model import HL7_NS, ReportableCondition
+from app.services.ecr.narrative import reconstruct_narrative
+from app.services.ecr.refine import create_eicr_refinement_plan, refine_eicr
+from app.services.ecr.section import entry_matching, generic_matching
+from app.services.ecr.section.traversal import get_section_by_code
+from app.services.ecr.specification import detect_eicr_version, load_spec
+from app.services.format import format_xml_document_for_display
+from app.services.pipeline import (
+    RefinementContext,
+    create_augmentation_run_from_xml_files,
+    refine_for_condition,
+)
+from app.services.xslt import create_refined_eicr_html_file
+from benchmarks.corpus import CorpusDocument
+
+RESULTS_SECTION = "30954-2"
+SOCIAL_HISTORY_SECTION = "29762-2"
+
+_CONDITION_GROUPER_UUID = UUID("00000000-0000-4000-8000-000000000000")
+_CONTEXT = RefinementContext(
+    canonical_url=f"https://tes.tools.aimsplatform.org/api/fhir/ValueSet/{_CONDITION_GROUPER_UUID}",
+    jurisdiction_id="SDDH",
+    configuration_version=1,
+)
+_AUGMENTATION_TIMESTAMP = "20260101000000+0000"
+
+_logger = logging.getLogger("benchmarks")
+
+
+def _annotate(benchmark, document: CorpusDocument) -> None:
+    benchmark.extra_info["corpus_id"] = document.corpus_id
+    benchmark.extra_info["eicr_size_mib"] = round(document.eicr_size_mib, 3)
+
+
+def _section(document: CorpusDocument, loinc_code: str):
+    eicr_root = document.xml_files.parse_eicr()
+    structured_body = eicr_root.find(".//hl7:structuredBody", HL7_NS)
+    section = get_section_by_code(structured_body, loinc_code)
+    if section is None:
+        pytest.skip(f"{document.corpus_id} has no {loinc_code} section")
+    return eicr_root, section
+
+
+def test_refine_for_condition(
+    benchmark, corpus_document, processed_configuration, bench_rounds
+):
+    _annotate(benchmark, corpus_document)
+    run = create_augmentation_run_from_xml_files(corpus_document.xml_files)
+
+    benchmark.pedantic(
+        refine_for_condition,
+        kwargs={
+            "xml_files": corpus_document.xml_files,
+            "processed_configuration": processed_configuration,
+            "context": _CONTEXT,
+            "run": run,
+        },
+        rounds=bench_rounds,
+    )
+
+
+def test_refine_eicr(benchmark, corpus_document, processed_configuration, bench_rounds):
+    _annotate(benchmark, corpus_document)
+
+    def setup():
+        eicr_root = corpus_document.xml_files.parse_eicr()
+        plan = create_eicr_refinement_plan(
+            processed_configuration=processed_configuration,
+            eicr_root=eicr_root,
+            augmentation_timestamp=_AUGMENTATION_TIMESTAMP,
+            config_version=1,
+        )
+        return (), {"eicr_root": eicr_root, "plan": plan}
+
+    benchmark.pedantic(refine_eicr, setup=setup, rounds=bench_rounds)
+
+
+def test_entry_matching_process(
+    benchmark, corpus_document, processed_configuration, bench_rounds
+):
+    _annotate(benchmark, corpus_document)
+    eicr_root, _ = _section(corpus_document, RESULTS_SECTION)
+    specification = load_spec(detect_eicr_version(eicr_root))
+
+    def setup():
+        _, section = _section(corpus_document, RESULTS_SECTION)
+        return (), {
+            "section": section,
+            "code_system_sets": processed_configuration.code_system_sets,
+            "section_specification": specification.sections[RESULTS_SECTION],
+            "namespaces": HL7_NS,
+            "augmentation_timestamp": _AUGMENTATION_TIMESTAMP,
+            "narrative_action": "retain",
+        }
+
+    benchmark.pedantic(entry_matching.process, setup=setup, rounds=bench_rounds)
+
+
+def test_generic_matching_process(
+    benchmark, corpus_document, processed_configuration, bench_rounds
+):
+    _annotate(benchmark, corpus_document)
+    eicr_root, _ = _section(corpus_document, SOCIAL_HISTORY_SECTION)
+    specification = load_spec(detect_eicr_version(eicr_root))
+
+    def setup():
+        _, section = _section(corpus_document, SOCIAL_HISTORY_SECTION)
+        return (), {
+            "section": section,
+            "codes_to_match": processed_configuration.codes,
+            "namespaces": HL7_NS,
+            "section_specification": specification.sections.get(SOCIAL_HISTORY_SECTION),
+            "augmentation_timestamp": _AUGMENTATION_TIMESTAMP,
+            "code_system_sets": processed_configuration.code_system_sets,
+            "narrative_action": "retain",
+        }
+
+    benchmark.pedantic(generic_matching.process, setup=setup, rounds=bench_rounds)
+
+
+def test_reconstruct_narrative(
+    benchmark, corpus_document, processed_configuration, bench_rounds
+):
+    _annotate(benchmark, corpus_document)
+    eicr_root, _ = _section(corpus_document, RESULTS_SECTION)
+    specification = load_spec(detect_eicr_version(eicr_root))
+
+    def setup():
+        # reconstruction runs on the post-prune section, so prune first
+        _, section = _section(corpus_document, RESULTS_SECTION)
+        entry_matching.process(
+            section=section,
+            code_system_sets=processed_configuration.code_system_sets,
+            section_specification=specification.sections[RESULTS_SECTION],
+            namespaces=HL7_NS,
+            augmentation_timestamp=_AUGMENTATION_TIMESTAMP,
+            narrative_action="retain",
+        )
+        return (section,), {"augmentation_timestamp": _AUGMENTATION_TIMESTAMP}
+
+    benchmark.pedantic(reconstruct_narrative, setup=setup, rounds=bench_rounds)
+
+
+def test_augment_eicr(benchmark, corpus_document, bench_rounds):
+    _annotate(benchmark, corpus_document)
+
+    def setup():
+        eicr_root = corpus_document.xml_files.parse_eicr()
+        return (), {
+            "eicr_root": eicr_root,
+            "run": create_augmentation_run(eicr_root),
+            "jurisdiction_id": _CONTEXT.jurisdiction_id,
+            "condition_grouper_uuid": _CONDITION_GROUPER_UUID,
+        }
+
+    benchmark.pedantic(augment_eicr, setup=setup, rounds=bench_rounds)
+
+
+@pytest.fixture
+def refined_eicr(corpus_document, processed_configuration) -> str:
+    result = refine_for_condition(
+        xml_files=corpus_document.xml_files,
+        processed_configuration=processed_configuration,
+        context=_CONTEXT,
+        run=create_augmentation_run_from_xml_files(corpus_document.xml_files),
+    )
+    return result.documents.eicr
+
+
+def test_format_xml_document_for_display(
+    benchmark, corpus_document, refined_eicr, bench_rounds
+):
+    _annotate(benchmark, corpus_document)
+
+    benchmark.pedantic(
+        format_xml_document_for_display, args=(refined_eicr,), rounds=bench_rounds
+    )
+
+
+def test_xslt_render(benchmark, corpus_document, refined_eicr, bench_rounds):
+    _annotate(benchmark, corpus_document)
+    condition = ReportableCondition(code="840539006", display_name="Benchmark")
+
+    result = benchmark.pedantic(
+        create_refined_eicr_html_file,
+        kwargs={
+            "condition": condition,
+            "refined_eicr": refined_eicr,
+            "file_name": "refined_eICR.html",
+            "logger": _logger,
+        },
+        rounds=bench_rounds,
+    )
+
+    assert "<html" in result.file_content.lower()
@@ -0,0 +1,12 @@
+-- migrate:up
+CREATE TABLE active_payload_schema_reactivation_progress (
+    target_schema_version INTEGER NOT NULL,
+    configuration_id UUID NOT NULL REFERENCES configurations(id) ON DELETE CASCADE,
+    configuration_version INTEGER NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (target_schema_version, configuration_id, configuration_version)
+);
+
+-- migrate:down
+DROP TABLE active_payload_schema_reactivation_progress;
@@ -0,0 +1,38 @@
+-- migrate:up
+
+-- The webapp caches code systems, loaded TES versions and the latest TES
+-- condition list (app/db/reference_data.py) and drops the cache when it
+-- hears reference_data_changed. Sending the notification from triggers
+-- covers seeding, migrations and manual fixes alike. NOTIFY is delivered on
+-- commit and repeats within a transaction are folded into one, so a seed
+-- run sends a single notification however many statements it issues.
+CREATE FUNCTION notify_reference_data_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('reference_data_changed', '');
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER systems_notify_reference_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON systems
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_data_changed();
+
+CREATE TRIGGER tes_notify_reference_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tes
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_data_changed();
+
+CREATE TRIGGER conditions_notify_reference_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON conditions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_data_changed();
+
+CREATE TRIGGER conditions_codes_temp_notify_reference_data_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON conditions_codes_temp
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_data_changed();
+
+-- migrate:down
+DROP TRIGGER conditions_codes_temp_notify_reference_data_changed ON conditions_codes_temp;
+DROP TRIGGER conditions_notify_reference_data_changed ON conditions;
+DROP TRIGGER tes_notify_reference_data_changed ON tes;
+DROP TRIGGER systems_notify_reference_data_changed ON systems;
+DROP FUNCTION notify_reference_data_changed();
@@ -0,0 +1,15 @@
+-- migrate:up
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+-- Custom codes are indexed here. Condition codes are searched in the
+-- configurations_codes projection; its trigram indexes are created once that
+-- table exists, in 20261019112500_add_configurations_codes_trigram_indexes.
+CREATE INDEX idx_custom_codes_code_trgm
+    ON custom_codes USING gin (code gin_trgm_ops);
+
+CREATE INDEX idx_custom_codes_display_trgm
+    ON custom_codes USING gin (display gin_trgm_ops);
+
+-- migrate:down
+DROP INDEX IF EXISTS idx_custom_codes_display_trgm;
+DROP INDEX IF EXISTS idx_custom_codes_code_trgm;
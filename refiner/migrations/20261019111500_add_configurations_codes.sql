@@ -0,0 +1,258 @@
+-- migrate:up
+
+-- One row per code a configuration picks up through its associated conditions,
+-- kept in step with the tables it's derived from by the triggers below. This
+-- lets the codes browser page, count and facet a configuration's codes with an
+-- index range scan instead of re-joining conditions, codes, valuesets and
+-- exclusions on every request. Custom codes are not projected; they already
+-- live in a single table keyed by configuration.
+CREATE TABLE configurations_codes (
+    configuration_id UUID NOT NULL REFERENCES configurations(id) ON DELETE CASCADE,
+    condition_id UUID NOT NULL,
+    code_id UUID NOT NULL,
+    code TEXT NOT NULL,
+    display TEXT NOT NULL,
+    system_id UUID NOT NULL,
+    source_ids UUID[] NOT NULL,
+    sources TEXT[] NOT NULL,
+    is_excluded BOOLEAN NOT NULL DEFAULT FALSE,
+
+    PRIMARY KEY (configuration_id, condition_id, code_id)
+);
+
+-- paging order of the codes browser
+CREATE INDEX configurations_codes_configuration_id_condition_id_code_idx
+    ON configurations_codes (configuration_id, condition_id, code);
+
+-- exclusion and code updates
+CREATE INDEX configurations_codes_code_id_configuration_id_idx
+    ON configurations_codes (code_id, configuration_id);
+
+-- Rebuilds the projected rows for the given (configuration, condition) pairs
+-- from the source tables. Pairs no longer in configurations_conditions are
+-- simply removed.
+CREATE FUNCTION refresh_configurations_codes(
+    p_configuration_ids UUID[],
+    p_condition_ids UUID[]
+) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  DELETE FROM configurations_codes m
+  USING unnest(p_configuration_ids, p_condition_ids) AS p(configuration_id, condition_id)
+  WHERE m.configuration_id = p.configuration_id
+    AND m.condition_id = p.condition_id;
+
+  INSERT INTO configurations_codes (
+    configuration_id,
+    condition_id,
+    code_id,
+    code,
+    display,
+    system_id,
+    source_ids,
+    sources,
+    is_excluded
+  )
+  SELECT
+    cfgc.configuration_id,
+    cfgc.condition_id,
+    c.id,
+    c.code,
+    c.display,
+    c.system_id,
+    ARRAY_AGG(DISTINCT v.id),
+    ARRAY_AGG(DISTINCT v.display_name),
+    EXISTS (
+      SELECT 1
+      FROM configurations_conditions_code_exclusions e
+      WHERE e.configuration_id = cfgc.configuration_id
+        AND e.code_id = c.id
+    )
+  FROM (
+    SELECT DISTINCT configuration_id, condition_id
+    FROM unnest(p_configuration_ids, p_condition_ids) AS p(configuration_id, condition_id)
+  ) p
+  JOIN configurations_conditions cfgc
+    ON cfgc.configuration_id = p.configuration_id
+    AND cfgc.condition_id = p.condition_id
+  JOIN conditions_codes_temp cc ON cc.condition_id = cfgc.condition_id
+  JOIN valuesets v ON v.id = cc.valueset_id AND v.condition_id = cfgc.condition_id
+  JOIN codes c ON c.id = cc.code_id
+  GROUP BY cfgc.configuration_id, cfgc.condition_id, c.id;
+END;
+$$;
+
+-- A condition was associated with or removed from a configuration.
+CREATE FUNCTION configurations_codes_sync_configuration_condition() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM refresh_configurations_codes(
+      ARRAY[OLD.configuration_id], ARRAY[OLD.condition_id]
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM refresh_configurations_codes(
+      ARRAY[NEW.configuration_id], ARRAY[NEW.condition_id]
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER configurations_conditions_sync_configurations_codes
+    AFTER INSERT OR UPDATE OR DELETE ON configurations_conditions
+    FOR EACH ROW EXECUTE FUNCTION configurations_codes_sync_configuration_condition();
+
+-- A code was excluded from or re-included in a configuration.
+CREATE FUNCTION configurations_codes_sync_exclusion() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE configurations_codes
+    SET is_excluded = FALSE
+    WHERE code_id = OLD.code_id
+      AND configuration_id = OLD.configuration_id;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE configurations_codes
+    SET is_excluded = TRUE
+    WHERE code_id = NEW.code_id
+      AND configuration_id = NEW.configuration_id;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER configurations_conditions_code_exclusions_sync_configurations_codes
+    AFTER INSERT OR UPDATE OR DELETE ON configurations_conditions_code_exclusions
+    FOR EACH ROW EXECUTE FUNCTION configurations_codes_sync_exclusion();
+
+-- A code's value, display or system changed.
+CREATE FUNCTION configurations_codes_sync_codes() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  UPDATE configurations_codes m
+  SET
+    code = n.code,
+    display = n.display,
+    system_id = n.system_id
+  FROM new_rows n
+  WHERE m.code_id = n.id
+    AND (m.code, m.display, m.system_id) IS DISTINCT FROM (n.code, n.display, n.system_id);
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER codes_sync_configurations_codes
+    AFTER UPDATE ON codes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_codes();
+
+-- A condition's code set or valuesets changed (TES seeding). Statement level,
+-- since seeding writes these tables in bulk. Both tables have a condition_id
+-- column, so one function serves both.
+CREATE FUNCTION configurations_codes_sync_conditions() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+  configuration_ids UUID[];
+  condition_ids UUID[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (SELECT condition_id FROM new_rows);
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (SELECT condition_id FROM old_rows);
+  ELSE
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (
+      SELECT condition_id FROM new_rows
+      UNION
+      SELECT condition_id FROM old_rows
+    );
+  END IF;
+
+  IF configuration_ids IS NOT NULL THEN
+    PERFORM refresh_configurations_codes(configuration_ids, condition_ids);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER conditions_codes_temp_insert_sync_configurations_codes
+    AFTER INSERT ON conditions_codes_temp
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_conditions();
+
+CREATE TRIGGER conditions_codes_temp_update_sync_configurations_codes
+    AFTER UPDATE ON conditions_codes_temp
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_conditions();
+
+CREATE TRIGGER conditions_codes_temp_delete_sync_configurations_codes
+    AFTER DELETE ON conditions_codes_temp
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_conditions();
+
+-- Seeding truncates conditions_codes_temp before reloading it. TRUNCATE fires
+-- no row or transition-table triggers, and afterwards no condition has any
+-- codes, so every projected row is stale.
+CREATE FUNCTION configurations_codes_sync_truncate() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  TRUNCATE configurations_codes;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER conditions_codes_temp_truncate_sync_configurations_codes
+    AFTER TRUNCATE ON conditions_codes_temp
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_truncate();
+
+CREATE TRIGGER valuesets_update_sync_configurations_codes
+    AFTER UPDATE ON valuesets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION configurations_codes_sync_conditions();
+
+-- backfill every existing configuration
+SELECT refresh_configurations_codes(
+    ARRAY(SELECT configuration_id FROM configurations_conditions ORDER BY configuration_id, condition_id),
+    ARRAY(SELECT condition_id FROM configurations_conditions ORDER BY configuration_id, condition_id)
+);
+
+-- migrate:down
+DROP TRIGGER valuesets_update_sync_configurations_codes ON valuesets;
+DROP TRIGGER conditions_codes_temp_truncate_sync_configurations_codes ON conditions_codes_temp;
+DROP TRIGGER conditions_codes_temp_delete_sync_configurations_codes ON conditions_codes_temp;
+DROP TRIGGER conditions_codes_temp_update_sync_configurations_codes ON conditions_codes_temp;
+DROP TRIGGER conditions_codes_temp_insert_sync_configurations_codes ON conditions_codes_temp;
+DROP TRIGGER codes_sync_configurations_codes ON codes;
+DROP TRIGGER configurations_conditions_code_exclusions_sync_configurations_codes ON configurations_conditions_code_exclusions;
+DROP TRIGGER configurations_conditions_sync_configurations_codes ON configurations_conditions;
+DROP FUNCTION configurations_codes_sync_truncate();
+DROP FUNCTION configurations_codes_sync_conditions();
+DROP FUNCTION configurations_codes_sync_codes();
+DROP FUNCTION configurations_codes_sync_exclusion();
+DROP FUNCTION configurations_codes_sync_configuration_condition();
+DROP FUNCTION refresh_configurations_codes(UUID[], UUID[]);
+DROP TABLE configurations_codes;
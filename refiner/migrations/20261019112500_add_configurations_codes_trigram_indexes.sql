@@ -0,0 +1,15 @@
+-- migrate:up
+
+-- Condition code search filters a configuration's configurations_codes rows
+-- with code/display ILIKE '%term%'; trigram indexes serve those substring
+-- matches instead of filtering every row. pg_trgm is created by
+-- 20261019101500_add_code_search_trigram_indexes.
+CREATE INDEX idx_configurations_codes_code_trgm
+    ON configurations_codes USING gin (code gin_trgm_ops);
+
+CREATE INDEX idx_configurations_codes_display_trgm
+    ON configurations_codes USING gin (display gin_trgm_ops);
+
+-- migrate:down
+DROP INDEX IF EXISTS idx_configurations_codes_display_trgm;
+DROP INDEX IF EXISTS idx_configurations_codes_code_trgm;
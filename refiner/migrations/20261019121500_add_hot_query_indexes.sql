@@ -0,0 +1,38 @@
+-- migrate:up
+
+-- configurations list: get_configurations_db filters by jurisdiction and sorts by name
+CREATE INDEX configurations_jurisdiction_id_name_idx
+    ON configurations (jurisdiction_id, name);
+
+-- finding the configurations a condition belongs to (configurations_codes
+-- refreshes, condition-scoped configuration lookups); the primary key only
+-- serves lookups by configuration
+CREATE INDEX configurations_conditions_condition_id_idx
+    ON configurations_conditions (condition_id);
+
+-- TES diffs scope every CTE to one TES version; the
+-- (canonical_url, tes_id) unique key can't serve a tes_id-only filter
+CREATE INDEX conditions_tes_id_idx
+    ON conditions (tes_id);
+
+-- code updates and the codes browser reach a code's conditions by code_id; the
+-- primary key leads with condition_id
+CREATE INDEX conditions_codes_temp_code_id_idx
+    ON conditions_codes_temp (code_id);
+
+-- activity log: get_events_by_jd_db/get_all_events_by_jd_db filter by
+-- jurisdiction and page newest first
+CREATE INDEX events_jurisdiction_id_created_at_idx
+    ON events (jurisdiction_id, created_at DESC);
+
+-- custom code uploads are fetched and checked for existence per event
+CREATE INDEX events_custom_code_uploads_event_id_idx
+    ON events_custom_code_uploads (event_id);
+
+-- migrate:down
+DROP INDEX events_custom_code_uploads_event_id_idx;
+DROP INDEX events_jurisdiction_id_created_at_idx;
+DROP INDEX conditions_codes_temp_code_id_idx;
+DROP INDEX conditions_tes_id_idx;
+DROP INDEX configurations_conditions_condition_id_idx;
+DROP INDEX configurations_jurisdiction_id_name_idx;
@@ -0,0 +1,155 @@
+-- migrate:up
+
+-- TES versions don't change once loaded, so the diff between two of them is
+-- computed once (by the seeding script, or on first request) and read back
+-- from here. A row in tes_diffs marks a version pair as computed; its changed
+-- conditions are in tes_diff_conditions. Diffing a version with itself gives
+-- the baseline diff, where every condition is new.
+CREATE TABLE tes_diffs (
+    cur_tes_id UUID NOT NULL REFERENCES tes(id) ON DELETE CASCADE,
+    prev_tes_id UUID NOT NULL REFERENCES tes(id) ON DELETE CASCADE,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (cur_tes_id, prev_tes_id)
+);
+
+CREATE TABLE tes_diff_conditions (
+    cur_tes_id UUID NOT NULL,
+    prev_tes_id UUID NOT NULL,
+    canonical_url TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    added_code_ids UUID[] NOT NULL,
+    removed_code_ids UUID[] NOT NULL,
+    is_new BOOLEAN NOT NULL,
+
+    PRIMARY KEY (cur_tes_id, prev_tes_id, canonical_url),
+    FOREIGN KEY (cur_tes_id, prev_tes_id)
+        REFERENCES tes_diffs (cur_tes_id, prev_tes_id) ON DELETE CASCADE
+);
+
+-- Computes the diff for a version pair unless it has been computed already.
+-- Concurrent callers wait on the first one's tes_diffs row and then find it.
+CREATE FUNCTION compute_tes_diff(p_cur_tes_id UUID, p_prev_tes_id UUID) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  INSERT INTO tes_diffs (cur_tes_id, prev_tes_id)
+  VALUES (p_cur_tes_id, p_prev_tes_id)
+  ON CONFLICT DO NOTHING;
+
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
+  IF p_cur_tes_id = p_prev_tes_id THEN
+    INSERT INTO tes_diff_conditions (
+      cur_tes_id,
+      prev_tes_id,
+      canonical_url,
+      display_name,
+      added_code_ids,
+      removed_code_ids,
+      is_new
+    )
+    SELECT
+      p_cur_tes_id,
+      p_prev_tes_id,
+      c.canonical_url,
+      c.display_name,
+      array_agg(cc.code_id),
+      '{}'::uuid[],
+      TRUE
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_cur_tes_id
+    GROUP BY c.canonical_url, c.display_name;
+
+    RETURN;
+  END IF;
+
+  INSERT INTO tes_diff_conditions (
+    cur_tes_id,
+    prev_tes_id,
+    canonical_url,
+    display_name,
+    added_code_ids,
+    removed_code_ids,
+    is_new
+  )
+  WITH cur AS (
+    SELECT DISTINCT
+      c.id as condition_id,
+      c.canonical_url,
+      cc.code_id,
+      c.display_name
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_cur_tes_id
+  ),
+  prev AS (
+    SELECT DISTINCT
+      c.id as condition_id,
+      c.canonical_url,
+      c.display_name,
+      cc.code_id
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_prev_tes_id
+  )
+  SELECT
+    p_cur_tes_id,
+    p_prev_tes_id,
+    COALESCE(cur.canonical_url, prev.canonical_url),
+    MAX(COALESCE(cur.display_name, prev.display_name)),
+    COALESCE(array_agg(cur.code_id) FILTER (where prev.code_id IS NULL), '{}'::uuid[]),
+    COALESCE(array_agg(prev.code_id) FILTER (where cur.code_id IS NULL), '{}'::uuid[]),
+    (COUNT(prev.condition_id) = 0)
+  FROM cur
+  FULL OUTER JOIN prev
+    ON cur.canonical_url = prev.canonical_url
+    AND cur.code_id = prev.code_id
+  GROUP BY
+    COALESCE(cur.canonical_url, prev.canonical_url)
+  HAVING
+    COUNT(cur.code_id) FILTER (WHERE prev.code_id IS NULL) > 0
+    OR COUNT(prev.code_id) FILTER (WHERE cur.code_id IS NULL) > 0;
+END;
+$$;
+
+-- Computes the diff for every ordered pair of loaded versions that involves a
+-- newly loaded one, including its baseline. Pairs of versions that were
+-- already loaded keep their diffs. Run after seeding TES data.
+CREATE FUNCTION refresh_tes_diffs() RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+  new_tes_ids UUID[];
+BEGIN
+  -- a version without its baseline diff hasn't been diffed against anything
+  SELECT ARRAY_AGG(t.id)
+  INTO new_tes_ids
+  FROM tes t
+  WHERE NOT EXISTS (
+    SELECT 1
+    FROM tes_diffs d
+    WHERE d.cur_tes_id = t.id AND d.prev_tes_id = t.id
+  );
+
+  IF new_tes_ids IS NULL THEN
+    RETURN;
+  END IF;
+
+  PERFORM compute_tes_diff(cur.id, prev.id)
+  FROM tes cur
+  CROSS JOIN tes prev
+  WHERE cur.id = ANY(new_tes_ids) OR prev.id = ANY(new_tes_ids);
+END;
+$$;
+
+SELECT refresh_tes_diffs();
+
+-- migrate:down
+DROP FUNCTION refresh_tes_diffs();
+DROP FUNCTION compute_tes_diff(UUID, UUID);
+DROP TABLE tes_diff_conditions;
+DROP TABLE tes_diffs;
@@ -0,0 +1,38 @@
+-- migrate:up
+
+-- Custom code uploads are written once with their event and only ever read as
+-- one line of text per event (activity log export), so the text is stored on
+-- the event instead of being re-aggregated from events_custom_code_uploads on
+-- every read. The per-code rows stay for the upload details view.
+ALTER TABLE events ADD COLUMN custom_code_uploads TEXT;
+
+UPDATE events e
+SET custom_code_uploads = uploads.custom_code_uploads
+FROM (
+    SELECT
+        event_id,
+        STRING_AGG(system || ' | ' || code || ' | ' || name, '; ') AS custom_code_uploads
+    FROM events_custom_code_uploads
+    GROUP BY event_id
+) uploads
+WHERE uploads.event_id = e.id;
+
+-- activity log: pages are read newest first by (created_at, id) keyset
+-- within a jurisdiction. id breaks ties between events written in the same
+-- statement, and the included columns are every events column a page reads,
+-- so a page is read from the index alone. custom_code_uploads is left out:
+-- it is unbounded and only the export, which reads every row anyway, needs
+-- it. This replaces the (jurisdiction_id, created_at) index, which it covers.
+CREATE INDEX events_jurisdiction_id_created_at_id_idx
+    ON events (jurisdiction_id, created_at DESC, id DESC)
+    INCLUDE (user_id, configuration_id, event_type, action_text, code_count, condition_id);
+
+DROP INDEX events_jurisdiction_id_created_at_idx;
+
+-- migrate:down
+CREATE INDEX events_jurisdiction_id_created_at_idx
+    ON events (jurisdiction_id, created_at DESC);
+
+DROP INDEX events_jurisdiction_id_created_at_id_idx;
+
+ALTER TABLE events DROP COLUMN custom_code_uploads;
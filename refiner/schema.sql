@@ -29,6 +29,20 @@ SET row_security = off;
 COMMENT ON SCHEMA public IS '';
 
 
+--
+-- Name: pg_trgm; Type: EXTENSION; Schema: -; Owner: -
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+
+--
+-- Name: EXTENSION pg_trgm; Type: COMMENT; Schema: -; Owner: -
+--
+
+COMMENT ON EXTENSION pg_trgm IS 'text similarity measurement and index searching based on trigrams';
+
+
 --
 -- Name: configuration_status; Type: TYPE; Schema: public; Owner: -
 --
@@ -94,6 +108,228 @@ CREATE TYPE public.section_narrative AS ENUM (
 );
 
 
+--
+-- Name: compute_tes_diff(p_cur_tes_id uuid, p_prev_tes_id uuid); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.compute_tes_diff(p_cur_tes_id uuid, p_prev_tes_id uuid) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  INSERT INTO tes_diffs (cur_tes_id, prev_tes_id)
+  VALUES (p_cur_tes_id, p_prev_tes_id)
+  ON CONFLICT DO NOTHING;
+
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
+  IF p_cur_tes_id = p_prev_tes_id THEN
+    INSERT INTO tes_diff_conditions (
+      cur_tes_id,
+      prev_tes_id,
+      canonical_url,
+      display_name,
+      added_code_ids,
+      removed_code_ids,
+      is_new
+    )
+    SELECT
+      p_cur_tes_id,
+      p_prev_tes_id,
+      c.canonical_url,
+      c.display_name,
+      array_agg(cc.code_id),
+      '{}'::uuid[],
+      TRUE
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_cur_tes_id
+    GROUP BY c.canonical_url, c.display_name;
+
+    RETURN;
+  END IF;
+
+  INSERT INTO tes_diff_conditions (
+    cur_tes_id,
+    prev_tes_id,
+    canonical_url,
+    display_name,
+    added_code_ids,
+    removed_code_ids,
+    is_new
+  )
+  WITH cur AS (
+    SELECT DISTINCT
+      c.id as condition_id,
+      c.canonical_url,
+      cc.code_id,
+      c.display_name
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_cur_tes_id
+  ),
+  prev AS (
+    SELECT DISTINCT
+      c.id as condition_id,
+      c.canonical_url,
+      c.display_name,
+      cc.code_id
+    FROM conditions_codes_temp cc
+    JOIN conditions c ON cc.condition_id = c.id
+    WHERE c.tes_id = p_prev_tes_id
+  )
+  SELECT
+    p_cur_tes_id,
+    p_prev_tes_id,
+    COALESCE(cur.canonical_url, prev.canonical_url),
+    MAX(COALESCE(cur.display_name, prev.display_name)),
+    COALESCE(array_agg(cur.code_id) FILTER (where prev.code_id IS NULL), '{}'::uuid[]),
+    COALESCE(array_agg(prev.code_id) FILTER (where cur.code_id IS NULL), '{}'::uuid[]),
+    (COUNT(prev.condition_id) = 0)
+  FROM cur
+  FULL OUTER JOIN prev
+    ON cur.canonical_url = prev.canonical_url
+    AND cur.code_id = prev.code_id
+  GROUP BY
+    COALESCE(cur.canonical_url, prev.canonical_url)
+  HAVING
+    COUNT(cur.code_id) FILTER (WHERE prev.code_id IS NULL) > 0
+    OR COUNT(prev.code_id) FILTER (WHERE cur.code_id IS NULL) > 0;
+END;
+$$;
+
+
+--
+-- Name: configurations_codes_sync_codes(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.configurations_codes_sync_codes() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  UPDATE configurations_codes m
+  SET
+    code = n.code,
+    display = n.display,
+    system_id = n.system_id
+  FROM new_rows n
+  WHERE m.code_id = n.id
+    AND (m.code, m.display, m.system_id) IS DISTINCT FROM (n.code, n.display, n.system_id);
+
+  RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: configurations_codes_sync_conditions(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.configurations_codes_sync_conditions() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+  configuration_ids UUID[];
+  condition_ids UUID[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (SELECT condition_id FROM new_rows);
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (SELECT condition_id FROM old_rows);
+  ELSE
+    SELECT ARRAY_AGG(cfgc.configuration_id), ARRAY_AGG(cfgc.condition_id)
+    INTO configuration_ids, condition_ids
+    FROM configurations_conditions cfgc
+    WHERE cfgc.condition_id IN (
+      SELECT condition_id FROM new_rows
+      UNION
+      SELECT condition_id FROM old_rows
+    );
+  END IF;
+
+  IF configuration_ids IS NOT NULL THEN
+    PERFORM refresh_configurations_codes(configuration_ids, condition_ids);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: configurations_codes_sync_configuration_condition(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.configurations_codes_sync_configuration_condition() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM refresh_configurations_codes(
+      ARRAY[OLD.configuration_id], ARRAY[OLD.condition_id]
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM refresh_configurations_codes(
+      ARRAY[NEW.configuration_id], ARRAY[NEW.condition_id]
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: configurations_codes_sync_exclusion(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.configurations_codes_sync_exclusion() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE configurations_codes
+    SET is_excluded = FALSE
+    WHERE code_id = OLD.code_id
+      AND configuration_id = OLD.configuration_id;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE configurations_codes
+    SET is_excluded = TRUE
+    WHERE code_id = NEW.code_id
+      AND configuration_id = NEW.configuration_id;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: configurations_codes_sync_truncate(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.configurations_codes_sync_truncate() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  TRUNCATE configurations_codes;
+
+  RETURN NULL;
+END;
+$$;
+
+
 --
 -- Name: configurations_set_last_activated_at_on_status_change(); Type: FUNCTION; Schema: public; Owner: -
 --
@@ -112,6 +348,106 @@ END;
 $$;
 
 
+--
+-- Name: notify_reference_data_changed(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.notify_reference_data_changed() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  PERFORM pg_notify('reference_data_changed', '');
+  RETURN NULL;
+END;
+$$;
+
+
+--
+-- Name: refresh_configurations_codes(p_configuration_ids uuid[], p_condition_ids uuid[]); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.refresh_configurations_codes(p_configuration_ids uuid[], p_condition_ids uuid[]) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  DELETE FROM configurations_codes m
+  USING unnest(p_configuration_ids, p_condition_ids) AS p(configuration_id, condition_id)
+  WHERE m.configuration_id = p.configuration_id
+    AND m.condition_id = p.condition_id;
+
+  INSERT INTO configurations_codes (
+    configuration_id,
+    condition_id,
+    code_id,
+    code,
+    display,
+    system_id,
+    source_ids,
+    sources,
+    is_excluded
+  )
+  SELECT
+    cfgc.configuration_id,
+    cfgc.condition_id,
+    c.id,
+    c.code,
+    c.display,
+    c.system_id,
+    ARRAY_AGG(DISTINCT v.id),
+    ARRAY_AGG(DISTINCT v.display_name),
+    EXISTS (
+      SELECT 1
+      FROM configurations_conditions_code_exclusions e
+      WHERE e.configuration_id = cfgc.configuration_id
+        AND e.code_id = c.id
+    )
+  FROM (
+    SELECT DISTINCT configuration_id, condition_id
+    FROM unnest(p_configuration_ids, p_condition_ids) AS p(configuration_id, condition_id)
+  ) p
+  JOIN configurations_conditions cfgc
+    ON cfgc.configuration_id = p.configuration_id
+    AND cfgc.condition_id = p.condition_id
+  JOIN conditions_codes_temp cc ON cc.condition_id = cfgc.condition_id
+  JOIN valuesets v ON v.id = cc.valueset_id AND v.condition_id = cfgc.condition_id
+  JOIN codes c ON c.id = cc.code_id
+  GROUP BY cfgc.configuration_id, cfgc.condition_id, c.id;
+END;
+$$;
+
+
+--
+-- Name: refresh_tes_diffs(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.refresh_tes_diffs() RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+  new_tes_ids UUID[];
+BEGIN
+  -- a version without its baseline diff hasn't been diffed against anything
+  SELECT ARRAY_AGG(t.id)
+  INTO new_tes_ids
+  FROM tes t
+  WHERE NOT EXISTS (
+    SELECT 1
+    FROM tes_diffs d
+    WHERE d.cur_tes_id = t.id AND d.prev_tes_id = t.id
+  );
+
+  IF new_tes_ids IS NULL THEN
+    RETURN;
+  END IF;
+
+  PERFORM compute_tes_diff(cur.id, prev.id)
+  FROM tes cur
+  CROSS JOIN tes prev
+  WHERE cur.id = ANY(new_tes_ids) OR prev.id = ANY(new_tes_ids);
+END;
+$$;
+
+
 --
 -- Name: set_updated_at(); Type: FUNCTION; Schema: public; Owner: -
 --
@@ -130,6 +466,18 @@ SET default_tablespace = '';
 
 SET default_table_access_method = heap;
 
+--
+-- Name: active_payload_schema_reactivation_progress; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.active_payload_schema_reactivation_progress (
+    target_schema_version integer NOT NULL,
+    configuration_id uuid NOT NULL,
+    configuration_version integer NOT NULL,
+    completed_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
 --
 -- Name: active_payload_schema_reactivations; Type: TABLE; Schema: public; Owner: -
 --
@@ -228,6 +576,23 @@ CREATE TABLE public.configurations (
 );
 
 
+--
+-- Name: configurations_codes; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.configurations_codes (
+    configuration_id uuid NOT NULL,
+    condition_id uuid NOT NULL,
+    code_id uuid NOT NULL,
+    code text NOT NULL,
+    display text NOT NULL,
+    system_id uuid NOT NULL,
+    source_ids uuid[] NOT NULL,
+    sources text[] NOT NULL,
+    is_excluded boolean DEFAULT false NOT NULL
+);
+
+
 --
 -- Name: configurations_conditions; Type: TABLE; Schema: public; Owner: -
 --
@@ -309,7 +674,8 @@ CREATE TABLE public.events (
     action_text text NOT NULL,
     created_at timestamp with time zone DEFAULT now() NOT NULL,
     condition_id uuid,
-    code_count integer
+    code_count integer,
+    custom_code_uploads text
 );
 
 
@@ -384,6 +750,32 @@ CREATE TABLE public.tes (
 );
 
 
+--
+-- Name: tes_diff_conditions; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.tes_diff_conditions (
+    cur_tes_id uuid NOT NULL,
+    prev_tes_id uuid NOT NULL,
+    canonical_url text NOT NULL,
+    display_name text NOT NULL,
+    added_code_ids uuid[] NOT NULL,
+    removed_code_ids uuid[] NOT NULL,
+    is_new boolean NOT NULL
+);
+
+
+--
+-- Name: tes_diffs; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.tes_diffs (
+    cur_tes_id uuid NOT NULL,
+    prev_tes_id uuid NOT NULL,
+    computed_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
 --
 -- Name: users; Type: TABLE; Schema: public; Owner: -
 --
@@ -417,6 +809,14 @@ CREATE TABLE public.valuesets (
 );
 
 
+--
+-- Name: active_payload_schema_reactivation_progress active_payload_schema_reactivation_progress_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.active_payload_schema_reactivation_progress
+    ADD CONSTRAINT active_payload_schema_reactivation_progress_pkey PRIMARY KEY (target_schema_version, configuration_id, configuration_version);
+
+
 --
 -- Name: active_payload_schema_reactivations active_payload_schema_reactivations_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -481,6 +881,14 @@ ALTER TABLE ONLY public.conditions
     ADD CONSTRAINT conditions_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: configurations_codes configurations_codes_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.configurations_codes
+    ADD CONSTRAINT configurations_codes_pkey PRIMARY KEY (configuration_id, condition_id, code_id);
+
+
 --
 -- Name: configurations_conditions_code_exclusions configurations_conditions_code_exc_configuration_id_code_id_key; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -633,6 +1041,22 @@ ALTER TABLE ONLY public.systems
     ADD CONSTRAINT systems_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: tes_diff_conditions tes_diff_conditions_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.tes_diff_conditions
+    ADD CONSTRAINT tes_diff_conditions_pkey PRIMARY KEY (cur_tes_id, prev_tes_id, canonical_url);
+
+
+--
+-- Name: tes_diffs tes_diffs_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.tes_diffs
+    ADD CONSTRAINT tes_diffs_pkey PRIMARY KEY (cur_tes_id, prev_tes_id);
+
+
 --
 -- Name: tes tes_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -694,6 +1118,13 @@ CREATE INDEX active_payload_schema_reactivations_status_idx ON public.active_pay
 CREATE INDEX active_payload_schema_reactivations_target_schema_version_idx ON public.active_payload_schema_reactivations USING btree (target_schema_version);
 
 
+--
+-- Name: conditions_codes_temp_code_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX conditions_codes_temp_code_id_idx ON public.conditions_codes_temp USING btree (code_id);
+
+
 --
 -- Name: conditions_context_groupers_category_idx; Type: INDEX; Schema: public; Owner: -
 --
@@ -708,6 +1139,41 @@ CREATE INDEX conditions_context_groupers_category_idx ON public.valuesets USING
 CREATE INDEX conditions_context_groupers_condition_id_idx ON public.valuesets USING btree (condition_id);
 
 
+--
+-- Name: conditions_tes_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX conditions_tes_id_idx ON public.conditions USING btree (tes_id);
+
+
+--
+-- Name: configurations_codes_code_id_configuration_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX configurations_codes_code_id_configuration_id_idx ON public.configurations_codes USING btree (code_id, configuration_id);
+
+
+--
+-- Name: configurations_codes_configuration_id_condition_id_code_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX configurations_codes_configuration_id_condition_id_code_idx ON public.configurations_codes USING btree (configuration_id, condition_id, code);
+
+
+--
+-- Name: configurations_conditions_condition_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX configurations_conditions_condition_id_idx ON public.configurations_conditions USING btree (condition_id);
+
+
+--
+-- Name: configurations_jurisdiction_id_name_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX configurations_jurisdiction_id_name_idx ON public.configurations USING btree (jurisdiction_id, name);
+
+
 --
 -- Name: configurations_sections_code_idx; Type: INDEX; Schema: public; Owner: -
 --
@@ -722,6 +1188,20 @@ CREATE INDEX configurations_sections_code_idx ON public.configurations_sections
 CREATE INDEX configurations_sections_configuration_id_idx ON public.configurations_sections USING btree (configuration_id);
 
 
+--
+-- Name: events_custom_code_uploads_event_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX events_custom_code_uploads_event_id_idx ON public.events_custom_code_uploads USING btree (event_id);
+
+
+--
+-- Name: events_jurisdiction_id_created_at_id_idx; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX events_jurisdiction_id_created_at_id_idx ON public.events USING btree (jurisdiction_id, created_at DESC, id DESC) INCLUDE (user_id, configuration_id, event_type, action_text, code_count, condition_id);
+
+
 --
 -- Name: idx_conditions_codes_code_id; Type: INDEX; Schema: public; Owner: -
 --
@@ -736,6 +1216,34 @@ CREATE INDEX idx_conditions_codes_code_id ON public.conditions_codes USING btree
 CREATE INDEX idx_conditions_codes_condition_id ON public.conditions_codes USING btree (condition_id);
 
 
+--
+-- Name: idx_configurations_codes_code_trgm; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_configurations_codes_code_trgm ON public.configurations_codes USING gin (code public.gin_trgm_ops);
+
+
+--
+-- Name: idx_configurations_codes_display_trgm; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_configurations_codes_display_trgm ON public.configurations_codes USING gin (display public.gin_trgm_ops);
+
+
+--
+-- Name: idx_custom_codes_code_trgm; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_custom_codes_code_trgm ON public.custom_codes USING gin (code public.gin_trgm_ops);
+
+
+--
+-- Name: idx_custom_codes_display_trgm; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_custom_codes_display_trgm ON public.custom_codes USING gin (display public.gin_trgm_ops);
+
+
 --
 -- Name: one_primary_per_configuration; Type: INDEX; Schema: public; Owner: -
 --
@@ -743,6 +1251,69 @@ CREATE INDEX idx_conditions_codes_condition_id ON public.conditions_codes USING
 CREATE UNIQUE INDEX one_primary_per_configuration ON public.configurations_conditions USING btree (configuration_id) WHERE (is_primary = true);
 
 
+--
+-- Name: codes codes_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER codes_sync_configurations_codes AFTER UPDATE ON public.codes REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_codes();
+
+
+--
+-- Name: conditions_codes_temp conditions_codes_temp_delete_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_codes_temp_delete_sync_configurations_codes AFTER DELETE ON public.conditions_codes_temp REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_conditions();
+
+
+--
+-- Name: conditions_codes_temp conditions_codes_temp_insert_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_codes_temp_insert_sync_configurations_codes AFTER INSERT ON public.conditions_codes_temp REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_conditions();
+
+
+--
+-- Name: conditions_codes_temp conditions_codes_temp_notify_reference_data_changed; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_codes_temp_notify_reference_data_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.conditions_codes_temp FOR EACH STATEMENT EXECUTE FUNCTION public.notify_reference_data_changed();
+
+
+--
+-- Name: conditions_codes_temp conditions_codes_temp_truncate_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_codes_temp_truncate_sync_configurations_codes AFTER TRUNCATE ON public.conditions_codes_temp FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_truncate();
+
+
+--
+-- Name: conditions_codes_temp conditions_codes_temp_update_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_codes_temp_update_sync_configurations_codes AFTER UPDATE ON public.conditions_codes_temp REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_conditions();
+
+
+--
+-- Name: conditions conditions_notify_reference_data_changed; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER conditions_notify_reference_data_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.conditions FOR EACH STATEMENT EXECUTE FUNCTION public.notify_reference_data_changed();
+
+
+--
+-- Name: configurations_conditions_code_exclusions configurations_conditions_code_exclusions_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER configurations_conditions_code_exclusions_sync_configurations_codes AFTER INSERT OR DELETE OR UPDATE ON public.configurations_conditions_code_exclusions FOR EACH ROW EXECUTE FUNCTION public.configurations_codes_sync_exclusion();
+
+
+--
+-- Name: configurations_conditions configurations_conditions_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER configurations_conditions_sync_configurations_codes AFTER INSERT OR DELETE OR UPDATE ON public.configurations_conditions FOR EACH ROW EXECUTE FUNCTION public.configurations_codes_sync_configuration_condition();
+
+
 --
 -- Name: configurations configurations_set_last_activated_at_on_status_change_trigger; Type: TRIGGER; Schema: public; Owner: -
 --
@@ -750,6 +1321,20 @@ CREATE UNIQUE INDEX one_primary_per_configuration ON public.configurations_condi
 CREATE TRIGGER configurations_set_last_activated_at_on_status_change_trigger BEFORE UPDATE OF status ON public.configurations FOR EACH ROW EXECUTE FUNCTION public.configurations_set_last_activated_at_on_status_change();
 
 
+--
+-- Name: systems systems_notify_reference_data_changed; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER systems_notify_reference_data_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.systems FOR EACH STATEMENT EXECUTE FUNCTION public.notify_reference_data_changed();
+
+
+--
+-- Name: tes tes_notify_reference_data_changed; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER tes_notify_reference_data_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.tes FOR EACH STATEMENT EXECUTE FUNCTION public.notify_reference_data_changed();
+
+
 --
 -- Name: codes update_codes_updated_at; Type: TRIGGER; Schema: public; Owner: -
 --
@@ -813,6 +1398,21 @@ CREATE TRIGGER update_tes_updated_at BEFORE UPDATE ON public.tes FOR EACH ROW EX
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON public.users FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
 
 
+--
+-- Name: valuesets valuesets_update_sync_configurations_codes; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER valuesets_update_sync_configurations_codes AFTER UPDATE ON public.valuesets REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.configurations_codes_sync_conditions();
+
+
+--
+-- Name: active_payload_schema_reactivation_progress active_payload_schema_reactivation_progress_configuration_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.active_payload_schema_reactivation_progress
+    ADD CONSTRAINT active_payload_schema_reactivation_progress_configuration_id_fkey FOREIGN KEY (configuration_id) REFERENCES public.configurations(id) ON DELETE CASCADE;
+
+
 --
 -- Name: valuesets conditions_context_groupers_condition_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
@@ -845,6 +1445,14 @@ ALTER TABLE ONLY public.conditions
     ADD CONSTRAINT conditions_tes_id_fkey FOREIGN KEY (tes_id) REFERENCES public.tes(id);
 
 
+--
+-- Name: configurations_codes configurations_codes_configuration_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.configurations_codes
+    ADD CONSTRAINT configurations_codes_configuration_id_fkey FOREIGN KEY (configuration_id) REFERENCES public.configurations(id) ON DELETE CASCADE;
+
+
 --
 -- Name: configurations_conditions_code_exclusions configurations_conditions_code_exclusions_code_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
@@ -1013,6 +1621,30 @@ ALTER TABLE ONLY public.sessions
     ADD CONSTRAINT sessions_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id);
 
 
+--
+-- Name: tes_diff_conditions tes_diff_conditions_cur_tes_id_prev_tes_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.tes_diff_conditions
+    ADD CONSTRAINT tes_diff_conditions_cur_tes_id_prev_tes_id_fkey FOREIGN KEY (cur_tes_id, prev_tes_id) REFERENCES public.tes_diffs(cur_tes_id, prev_tes_id) ON DELETE CASCADE;
+
+
+--
+-- Name: tes_diffs tes_diffs_cur_tes_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.tes_diffs
+    ADD CONSTRAINT tes_diffs_cur_tes_id_fkey FOREIGN KEY (cur_tes_id) REFERENCES public.tes(id) ON DELETE CASCADE;
+
+
+--
+-- Name: tes_diffs tes_diffs_prev_tes_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.tes_diffs
+    ADD CONSTRAINT tes_diffs_prev_tes_id_fkey FOREIGN KEY (prev_tes_id) REFERENCES public.tes(id) ON DELETE CASCADE;
+
+
 --
 -- Name: users users_jurisdiction_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
@@ -1065,4 +1697,12 @@ INSERT INTO public.schema_migrations (version) VALUES
     ('20260810165940'),
     ('20260813133341'),
     ('20260813142528'),
-    ('20260813142548');
+    ('20260813142548'),
+    ('20261019093000'),
+    ('20261019095000'),
+    ('20261019101500'),
+    ('20261019111500'),
+    ('20261019112500'),
+    ('20261019121500'),
+    ('20261019131500'),
+    ('20261019141500');
@@ -3,8 +3,11 @@ import hashlib
 import json
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from dotenv import load_dotenv
 from fetch_api_data import run_fetch_pipeline
@@ -37,15 +40,19 @@ TES_DATA_STAGING_DIR = TES_DATA_DIR / "staging"
 MANIFEST_PATH = TES_DATA_DIR / "manifest.json"
 
 API_KEY = os.getenv("TES_API_KEY")
+# seconds to wait before each round of TES_FETCH_CONCURRENCY page requests
 API_SLEEP_INTERVAL = float(os.getenv("API_SLEEP_INTERVAL", "1.0"))
 TES_VALIDATE = os.getenv("TES_VALIDATE", "true").lower() in ("1", "true", "yes")
+TES_VALIDATE_WORKERS = int(os.getenv("TES_VALIDATE_WORKERS", str(os.cpu_count() or 1)))
 
 # manifest schema constants
 # * bump MANIFEST_VERSION when the manifest schema changes in a way that
 #   older code wouldn't understand correctly
 # * v2 added: manifest_version, name, version top-level fields, and per-file
 #   shard support via .partNN.json filenames
-MANIFEST_VERSION = 2
+# * v3 added: a per-file `valuesets` map of "<url>|<version>" to the hash of
+#   the ValueSet as the API returned it
+MANIFEST_VERSION = 3
 MANIFEST_NAME = "tes-groupers"
 
 
@@ -120,6 +127,133 @@ def _validate_valuesets_file(filepath: Path) -> tuple[int, int]:
     return len(valid_vs), invalid_count
 
 
+def _valueset_key(valueset: dict[str, Any]) -> str:
+    """
+    Identifies a ValueSet across runs by its canonical url and version.
+    """
+
+    return f"{valueset.get('url', '')}|{valueset.get('version', '')}"
+
+
+def _hash_staged_valuesets(filepath: Path) -> dict[str, str]:
+    """
+    Hashes every ValueSet in a staged file, as fetched and before validation.
+
+    Keys are sorted before hashing so the result only changes when the
+    ValueSet's content does.
+    """
+
+    with open(filepath, encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    return {
+        _valueset_key(vs): hashlib.sha256(
+            json.dumps(vs, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        for vs in data.get("valuesets", []) or []
+    }
+
+
+def _is_unchanged(
+    filename: str, valueset_hashes: dict[str, str], old_files: dict[str, Any]
+) -> bool:
+    """
+    Whether a staged file holds exactly the ValueSets the last run synced.
+
+    This only compares content: the staged ValueSets must hash the same as
+    the ones recorded for the file. The synced file and its recorded hash are
+    then trusted as they are, so the file is neither validated nor rehashed.
+    A file synced without validation isn't skipped when TES_VALIDATE is on,
+    so it gets validated.
+    """
+
+    old_entry = old_files.get(filename)
+    if not old_entry or old_entry.get("valuesets") != valueset_hashes:
+        return False
+
+    if TES_VALIDATE and not old_entry.get("validation_ran"):
+        return False
+
+    return (TES_DATA_DIR / filename).exists()
+
+
+@dataclass
+class StagedFileResult:
+    """
+    The outcome of validating and hashing one staged file.
+    """
+
+    filename: str
+    hash: str
+    valid: int
+    invalid: int
+    validation_ran: bool
+
+
+def _process_staged_file(filepath: Path, validate: bool) -> StagedFileResult:
+    """
+    Validates (optionally) and hashes a staged file.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+
+    if validate:
+        valid_count, invalid_count = _validate_valuesets_file(filepath)
+    else:
+        valid_count, invalid_count = len(_hash_staged_valuesets(filepath)), 0
+
+    return StagedFileResult(
+        filename=filepath.name,
+        hash=calculate_sha256(filepath),
+        valid=valid_count,
+        invalid=invalid_count,
+        validation_ran=validate,
+    )
+
+
+def _print_valueset_diff(
+    old_files: dict[str, Any], new_files: dict[str, Any], limit: int = 20
+) -> None:
+    """
+    Prints which ValueSets were added, removed, or changed since the last run.
+    """
+
+    old_hashes = {
+        key: value
+        for entry in old_files.values()
+        for key, value in (entry.get("valuesets") or {}).items()
+    }
+    new_hashes = {
+        key: value
+        for entry in new_files.values()
+        for key, value in (entry.get("valuesets") or {}).items()
+    }
+
+    if old_files and not old_hashes:
+        print(
+            "  ⚠️  Previous manifest has no per-valueset hashes; "
+            "every ValueSet is reported as added."
+        )
+
+    added = sorted(new_hashes.keys() - old_hashes.keys())
+    removed = sorted(old_hashes.keys() - new_hashes.keys())
+    changed = sorted(
+        key
+        for key in new_hashes.keys() & old_hashes.keys()
+        if new_hashes[key] != old_hashes[key]
+    )
+
+    print(
+        f"  🧾 ValueSets: {len(added)} added, {len(changed)} changed, "
+        f"{len(removed)} removed."
+    )
+    for label, keys in (("ADDED", added), ("CHANGED", changed), ("REMOVED", removed)):
+        for key in keys[:limit]:
+            print(f"    {label}: {key}")
+        if len(keys) > limit:
+            print(f"    ... and {len(keys) - limit} more {label.lower()}")
+
+
 def main() -> None:
     """
     Orchestrates the data fetching and change detection pipeline.
@@ -166,7 +300,7 @@ def main() -> None:
 
     # 2: run the fetch pipeline
     print("🚀 Running API fetch and classification pipeline...")
-    record_counts = run_fetch_pipeline(
+    run_fetch_pipeline(
         output_dir=TES_DATA_STAGING_DIR,
         api_key=API_KEY,
         sleep_interval=API_SLEEP_INTERVAL,
@@ -187,13 +321,39 @@ def main() -> None:
 
     print("🧐 Analyzing new files and generating new manifest...")
 
-    # Validate staged files (optional toggle)
-    validated_summary: dict[str, dict] = {}
-    for json_file in list(new_files_in_staging):
-        if TES_VALIDATE:
-            print(f"🔬 Validating staged file: {json_file.name}")
+    # skip files whose ValueSets are exactly what the last run synced
+    # * comparing per-valueset hashes of the raw staged content means an
+    #   unchanged file is neither validated nor rehashed
+    old_files = old_manifest.get("files", {})
+    staged_hashes = {
+        json_file.name: _hash_staged_valuesets(json_file)
+        for json_file in new_files_in_staging
+    }
+
+    new_manifest_files: dict[str, dict[str, Any]] = {}
+    changed_in_staging = []
+    for json_file in new_files_in_staging:
+        if _is_unchanged(json_file.name, staged_hashes[json_file.name], old_files):
+            new_manifest_files[json_file.name] = dict(old_files[json_file.name])
+        else:
+            changed_in_staging.append(json_file)
+
+    print(
+        f"  ⏭️  {len(new_files_in_staging) - len(changed_in_staging)} files unchanged, "
+        f"{len(changed_in_staging)} to {'validate and ' if TES_VALIDATE else ''}hash."
+    )
+
+    # validate (optional toggle) and hash changed files in parallel
+    with ProcessPoolExecutor(max_workers=TES_VALIDATE_WORKERS) as pool:
+        futures = {
+            pool.submit(_process_staged_file, json_file, TES_VALIDATE): json_file
+            for json_file in changed_in_staging
+        }
+        for future, json_file in futures.items():
+            if TES_VALIDATE:
+                print(f"🔬 Validating staged file: {json_file.name}")
             try:
-                valid_count, invalid_count = _validate_valuesets_file(json_file)
+                result = future.result()
             except ImportError as ie:
                 print(f"❌ Validation failed (missing dependency): {ie}")
                 raise
@@ -203,7 +363,7 @@ def main() -> None:
                 )
                 raise
 
-            if valid_count == 0:
+            if result.validation_ran and result.valid == 0:
                 # nothing valid — remove staged file to avoid polluting data dir
                 json_file.unlink()
                 print(
@@ -211,37 +371,13 @@ def main() -> None:
                 )
                 continue
 
-            validated_summary[json_file.name] = {
-                "valid": valid_count,
-                "invalid": invalid_count,
-                "validation_ran": True,
+            new_manifest_files[json_file.name] = {
+                "hash": result.hash,
+                "record_count": result.valid,
+                "error_count": result.invalid,
+                "validation_ran": result.validation_ran,
+                "valuesets": staged_hashes[json_file.name],
             }
-        else:
-            # skipped validation — trust pipeline counts
-            validated_summary[json_file.name] = {
-                "valid": record_counts.get(json_file.name.replace(".json", ""), 0),
-                "invalid": 0,
-                "validation_ran": False,
-            }
-
-    # recompute list of staged files (some may have been removed)
-    new_files_in_staging = list(TES_DATA_STAGING_DIR.glob("*.json"))
-
-    new_manifest_files = {}
-    for json_file in new_files_in_staging:
-        # compute hash of the (possibly rewritten) file
-        file_hash = calculate_sha256(json_file)
-        rec_count = validated_summary.get(json_file.name, {}).get("valid", 0)
-        err_count = validated_summary.get(json_file.name, {}).get("invalid", 0)
-        validation_ran = validated_summary.get(json_file.name, {}).get(
-            "validation_ran", False
-        )
-        new_manifest_files[json_file.name] = {
-            "hash": file_hash,
-            "record_count": rec_count,
-            "error_count": err_count,
-            "validation_ran": validation_ran,
-        }
 
     # 4: compare using set operations for clarity
     old_filenames = set(old_manifest.get("files", {}).keys())
@@ -259,6 +395,8 @@ def main() -> None:
     }
 
     # 5: act on results
+    _print_valueset_diff(old_files=old_files, new_files=new_manifest_files)
+
     if not any([new_files, updated_files, deleted_files]):
         print("  🎉 No changes detected. Nothing to do.")
     else:
@@ -273,7 +411,12 @@ def main() -> None:
             (TES_DATA_DIR / filename).unlink()
             print(f"    💥 DELETED: {filename}")
 
-        # 6: write new manifest
+    # 6: write new manifest
+    # * only when a file entry changed; unchanged files keep their old entry,
+    #   so a run where nothing changed leaves the manifest alone
+    # * this includes entries that only gained fields, e.g. on the first run
+    #   after a manifest schema bump
+    if new_manifest_files != old_files:
         final_manifest = {
             "manifest_version": MANIFEST_VERSION,
             "name": MANIFEST_NAME,
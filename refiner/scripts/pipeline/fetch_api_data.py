@@ -1,12 +1,15 @@
+import asyncio
+import hashlib
 import json
 import math
 import os
-import time
-from collections import defaultdict
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
-import requests
+import httpx
 from dotenv import load_dotenv
 
 # size threshold per shard, in bytes
@@ -14,6 +17,20 @@ from dotenv import load_dotenv
 # * gives headroom for category growth between releases
 SHARD_THRESHOLD_BYTES = 30 * 1024 * 1024
 
+# ValueSets per API page
+BATCH_SIZE = 250
+
+# pages requested at once
+# * the api pages by offset and doesn't report a total, so each round asks for
+#   this many consecutive pages and stops at the first empty one
+MAX_IN_FLIGHT_PAGES = int(os.getenv("TES_FETCH_CONCURRENCY", "4"))
+
+# where fetched pages are kept between runs so they can be revalidated with
+# conditional requests instead of downloaded again
+HTTP_CACHE_DIR = Path(
+    os.getenv("TES_HTTP_CACHE_DIR", Path(__file__).parent / ".http-cache")
+)
+
 
 def dynamic_classify_valueset(valueset: dict[str, Any]) -> str | None:
     """
@@ -191,23 +208,235 @@ def _write_category_files(
     return written
 
 
+@dataclass
+class FetchStats:
+    """
+    How many API pages were downloaded versus confirmed unchanged.
+    """
+
+    downloaded: int = 0
+    not_modified: int = 0
+
+
+class ConditionalPageCache:
+    """
+    On-disk cache of API pages, keyed by URL.
+
+    A page is only cached when the API sent an ETag or Last-Modified header
+    with it. On the next run those validators go out as If-None-Match and
+    If-Modified-Since, so an unchanged page comes back as an empty 304 and is
+    read from disk.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """
+        Opens (and creates, if needed) the cache directory.
+        """
+
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def load(self, url: str) -> dict[str, Any] | None:
+        """
+        Returns the cached entry for a URL, or None if there isn't a usable one.
+        """
+
+        try:
+            with open(self._path(url), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def validators(entry: dict[str, Any] | None) -> dict[str, str]:
+        """
+        Builds the conditional request headers for a cached entry.
+        """
+
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """
+        Caches a page if the API gave us a way to revalidate it.
+        """
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        # write then rename so an interrupted run never leaves a torn entry
+        path = self._path(url)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"etag": etag, "last_modified": last_modified, "body": response.text},
+                fh,
+            )
+        tmp_path.replace(path)
+
+
+class _CategorySpool:
+    """
+    Spools each category's ValueSets to its own JSON Lines file.
+
+    Pages are classified as they arrive, so only one category is held in
+    memory at a time when the shard files are written.
+    """
+
+    def __init__(self, spool_dir: Path) -> None:
+        self.spool_dir = spool_dir
+        self._files: dict[str, TextIO] = {}
+
+    def append(self, category: str, resource: dict[str, Any]) -> bool:
+        """
+        Spools a ValueSet; returns True if it's the first in its category.
+        """
+
+        is_new = category not in self._files
+        if is_new:
+            self._files[category] = open(
+                self.spool_dir / f"{category}.jsonl", "w", encoding="utf-8"
+            )
+
+        self._files[category].write(json.dumps(resource) + "\n")
+        return is_new
+
+    def close(self) -> None:
+        for fh in self._files.values():
+            fh.close()
+
+    @property
+    def categories(self) -> list[str]:
+        return sorted(self._files)
+
+    def read(self, category: str) -> list[dict[str, Any]]:
+        with open(self.spool_dir / f"{category}.jsonl", encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh]
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    cache: ConditionalPageCache,
+    url: str,
+    stats: FetchStats,
+) -> dict[str, Any]:
+    """
+    Fetches one page of the ValueSet bundle, revalidating a cached copy if we have one.
+    """
+
+    cached = cache.load(url)
+    response = await client.get(url, headers=cache.validators(cached))
+
+    if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+        stats.not_modified += 1
+        return json.loads(cached["body"])
+
+    response.raise_for_status()
+    stats.downloaded += 1
+    cache.store(url, response)
+    return response.json()
+
+
+async def _fetch_all_pages(
+    api_url: str,
+    api_key: str,
+    sleep_interval: float,
+    cache: ConditionalPageCache,
+    max_in_flight: int,
+    on_entries: Callable[[list[dict[str, Any]]], None],
+) -> FetchStats:
+    """
+    Fetches every page of active ValueSets, max_in_flight pages at a time.
+
+    Each round of max_in_flight requests waits sleep_interval seconds before
+    it's sent, so the pause is per round rather than per request.
+
+    Pages are handed to on_entries in offset order, so the output doesn't
+    depend on which request finishes first.
+    """
+
+    stats = FetchStats()
+    limits = httpx.Limits(
+        max_connections=max_in_flight, max_keepalive_connections=max_in_flight
+    )
+
+    async with httpx.AsyncClient(
+        headers={"X-API-KEY": api_key}, limits=limits, timeout=30
+    ) as client:
+        offset = 0
+        while True:
+            offsets = [offset + i * BATCH_SIZE for i in range(max_in_flight)]
+            print(f"  📡 Fetching batches from offsets {offsets[0]}-{offsets[-1]}...")
+
+            # give the api some breathing room between rounds
+            await asyncio.sleep(sleep_interval)
+
+            bundles = await asyncio.gather(
+                *(
+                    _fetch_page(
+                        client=client,
+                        cache=cache,
+                        url=(
+                            f"{api_url}/ValueSet?status=active&_count={BATCH_SIZE}"
+                            f"&_getpagesoffset={page_offset}"
+                        ),
+                        stats=stats,
+                    )
+                    for page_offset in offsets
+                )
+            )
+
+            for bundle in bundles:
+                entries = bundle.get("entry", [])
+                if not entries:
+                    print("  ✅ No more entries found. API fetch complete.")
+                    return stats
+                on_entries(entries)
+
+            offset += max_in_flight * BATCH_SIZE
+
+
 def run_fetch_pipeline(
-    output_dir: Path, api_key: str, sleep_interval: float, log_dir_base: Path
+    output_dir: Path,
+    api_key: str,
+    sleep_interval: float,
+    log_dir_base: Path,
+    cache_dir: Path = HTTP_CACHE_DIR,
+    max_in_flight: int = MAX_IN_FLIGHT_PAGES,
 ) -> dict[str, int]:
     """
     Fetches, classifies, and saves FHIR ValueSets from the API.
 
-    This function streams all active ValueSet resources from the TES API,
-    classifies them into versioned categories, sorts each category by canonical
-    url, and writes them to one or more shard files per category. Categories
-    that fit under SHARD_THRESHOLD_BYTES are written as a single file;
-    larger categories are split into multiple `.partNN.json` files.
+    This function fetches all active ValueSet resources from the TES API,
+    several pages at a time, and classifies them into versioned categories as
+    they arrive, spooling each category to disk. Each category is then sorted
+    by canonical url and written to one or more shard files. Categories that
+    fit under SHARD_THRESHOLD_BYTES are written as a single file; larger
+    categories are split into multiple `.partNN.json` files.
+
+    Pages are cached in cache_dir and revalidated with conditional requests,
+    so a refresh only downloads the pages that changed since the last run.
 
     Args:
         output_dir: The directory where the output JSON files will be saved.
         api_key: The API key for authenticating with the TES API.
-        sleep_interval: The number of seconds to wait between API calls.
+        sleep_interval: The number of seconds each round of max_in_flight
+            requests waits before it's sent.
         log_dir_base: The project root -> scripts/ Path for cleaner cli output.
+        cache_dir: Where fetched pages are cached between runs.
+        max_in_flight: How many pages are requested at once.
 
     Returns:
         A dictionary mapping output filename stems (without .json) to the
@@ -217,67 +446,61 @@ def run_fetch_pipeline(
 
     load_dotenv()
     API_URL = os.getenv("TES_API_URL", "https://tes.tools.aimsplatform.org/api/fhir")
-    BATCH_SIZE = 250
-
-    # buffer per-category in memory so we can sort and split at the end
-    # * peak memory is bounded by the size of the full active tes dataset
-    # * the previous version of this script streamed straight to disk, which
-    #   was lighter on memory but made size-based sharding impossible without
-    #   reading files back; given the dataset size, buffering is the simpler
-    #   tradeoff
-    buffered: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+
+    cache = ConditionalPageCache(cache_dir)
     ignored_count = 0
 
-    headers = {"X-API-KEY": api_key}
-    offset = 0
-    while True:
-        print(f"  📡 Fetching batch from offset {offset}...")
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spool = _CategorySpool(Path(spool_dir))
 
-        # give the api some breathing room
-        time.sleep(sleep_interval)
+        def classify_entries(entries: list[dict[str, Any]]) -> None:
+            nonlocal ignored_count
 
-        url = (
-            f"{API_URL}/ValueSet?status=active&_count={BATCH_SIZE}"
-            f"&_getpagesoffset={offset}"
-        )
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        bundle = response.json()
-        entries = bundle.get("entry", [])
-        if not entries:
-            print("  ✅ No more entries found. API fetch complete.")
-            break
-
-        for entry in entries:
-            resource = entry.get("resource", {})
-            if resource.get("resourceType") != "ValueSet":
-                continue
-
-            category = dynamic_classify_valueset(resource)
-
-            if category is None:
-                ignored_count += 1
-                continue
-
-            if category not in buffered:
-                print(f"    ✨ Discovered new category: '{category}'")
-
-            buffered[category].append(resource)
-
-        offset += BATCH_SIZE
-
-    print("  🏁 Finalizing files...")
-    if ignored_count > 0:
-        print(f"    🙈 Ignored {ignored_count} triggering-related ValueSets.")
-
-    record_counts: dict[str, int] = {}
-    for category in sorted(buffered.keys()):
-        written = _write_category_files(
-            category=category,
-            valuesets=buffered[category],
-            output_dir=output_dir,
-            log_dir_base=log_dir_base,
+            for entry in entries:
+                resource = entry.get("resource", {})
+                if resource.get("resourceType") != "ValueSet":
+                    continue
+
+                category = dynamic_classify_valueset(resource)
+
+                if category is None:
+                    ignored_count += 1
+                    continue
+
+                if spool.append(category, resource):
+                    print(f"    ✨ Discovered new category: '{category}'")
+
+        try:
+            stats = asyncio.run(
+                _fetch_all_pages(
+                    api_url=API_URL,
+                    api_key=api_key,
+                    sleep_interval=sleep_interval,
+                    cache=cache,
+                    max_in_flight=max_in_flight,
+                    on_entries=classify_entries,
+                )
+            )
+        finally:
+            spool.close()
+
+        print(
+            f"  📦 Downloaded {stats.downloaded} pages, "
+            f"{stats.not_modified} unchanged since the last run."
         )
-        record_counts.update(written)
+
+        print("  🏁 Finalizing files...")
+        if ignored_count > 0:
+            print(f"    🙈 Ignored {ignored_count} triggering-related ValueSets.")
+
+        record_counts: dict[str, int] = {}
+        for category in spool.categories:
+            written = _write_category_files(
+                category=category,
+                valuesets=spool.read(category),
+                output_dir=output_dir,
+                log_dir_base=log_dir_base,
+            )
+            record_counts.update(written)
 
     return record_counts
@@ -0,0 +1,418 @@
+import argparse
+import json
+import math
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from zipfile import ZipFile
+
+from lxml import etree
+from lxml.etree import _Element
+from rich.console import Console
+from rich.table import Table
+
+from app.core.models.types import XMLFiles
+from app.services.ecr.augment import create_augmentation_run
+from app.services.ecr.model import HL7_NS
+from app.services.ecr.refine import create_eicr_refinement_plan, refine_eicr
+from app.services.ecr.section.traversal import get_section_by_code
+from app.services.instrumentation import StageTimer, timing_session
+from app.services.terminology import ProcessedConfiguration
+
+"""
+Profile per-section refinement cost across a corpus of eICR/RR pairs.
+
+Runs eICR plan creation and refinement for every pair in a corpus directory
+against a single active configuration, and reports for each section LOINC:
+
+- wall time (total, share of all section time, p50/p95/p99 per document)
+- mean entry count before and after refinement
+- mean serialized size before and after refinement
+- the distribution of SectionOutcome values
+
+The section timings come from the "refine_eicr.section" stages that
+refine_eicr records (see app/services/instrumentation.py), so the numbers
+are the same ones REFINER_STAGE_TIMING reports in production.
+
+A corpus is a directory containing any mix of:
+
+- zip files holding CDA_eICR.xml and CDA_RR.xml (the packaged sample layout)
+- subdirectories holding CDA_eICR.xml and CDA_RR.xml
+
+The configuration is an active.json payload as the Lambda reads it from S3.
+
+Usage (from the refiner directory):
+
+    python -m scripts.profiling.profile_sections \\
+        --corpus path/to/corpus \\
+        --configuration path/to/active.json \\
+        --rounds 5 \\
+        --json section_profile.json
+"""
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+DEFAULT_CORPUS_DIR = SCRIPTS_DIR / "data" / "source-ecr-files" / "packaged"
+
+EICR_FILENAME = "CDA_eICR.xml"
+RR_FILENAME = "CDA_RR.xml"
+
+SECTION_STAGE = "refine_eicr.section"
+
+
+# NOTE:
+# CORPUS LOADING
+# =============================================================================
+
+
+def load_corpus(corpus_dir: Path) -> dict[str, XMLFiles]:
+    """
+    Load every eICR/RR pair in a corpus directory, keyed by pair name.
+
+    Entries that are neither a zip nor a directory holding both files are
+    skipped.
+    """
+
+    pairs: dict[str, XMLFiles] = {}
+
+    for path in sorted(corpus_dir.iterdir()):
+        if path.is_file() and path.suffix == ".zip":
+            with ZipFile(path) as z:
+                names = set(z.namelist())
+                if not {EICR_FILENAME, RR_FILENAME} <= names:
+                    continue
+                pairs[path.stem] = XMLFiles(
+                    eicr=z.read(EICR_FILENAME).decode("utf-8"),
+                    rr=z.read(RR_FILENAME).decode("utf-8"),
+                )
+        elif path.is_dir():
+            eicr_path = path / EICR_FILENAME
+            rr_path = path / RR_FILENAME
+            if not (eicr_path.exists() and rr_path.exists()):
+                continue
+            pairs[path.name] = XMLFiles(
+                eicr=eicr_path.read_text(encoding="utf-8"),
+                rr=rr_path.read_text(encoding="utf-8"),
+            )
+
+    return pairs
+
+
+def load_configuration(configuration_path: Path) -> ProcessedConfiguration:
+    """
+    Load an active.json payload into a ProcessedConfiguration.
+    """
+
+    with configuration_path.open(encoding="utf-8") as f:
+        return ProcessedConfiguration.from_dict(json.load(f))
+
+
+# NOTE:
+# MEASUREMENT
+# =============================================================================
+
+
+@dataclass
+class SectionSample:
+    """
+    One section of one document, measured over one refinement.
+    """
+
+    loinc_code: str
+    display_name: str
+    duration_ms: float
+    outcome: str
+    entries_in: int
+    entries_out: int
+    bytes_in: int
+    bytes_out: int
+
+
+@dataclass
+class SectionProfile:
+    """
+    Aggregated measurements for one section LOINC across the corpus.
+    """
+
+    loinc_code: str
+    display_name: str
+    durations_ms: list[float] = field(default_factory=list)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    entries_in: int = 0
+    entries_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def samples(self) -> int:
+        """
+        Number of section refinements measured.
+        """
+
+        return len(self.durations_ms)
+
+    @property
+    def total_ms(self) -> float:
+        """
+        Total wall time spent refining this section.
+        """
+
+        return sum(self.durations_ms)
+
+    def percentile_ms(self, percentile: float) -> float:
+        """
+        Nearest-rank percentile of the per-refinement wall time.
+        """
+
+        ordered = sorted(self.durations_ms)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+def _measure_sections(
+    structured_body: _Element, section_codes: list[str]
+) -> dict[str, tuple[int, int]]:
+    """
+    Count entries and serialized bytes for each present section.
+    """
+
+    measurements: dict[str, tuple[int, int]] = {}
+    for code in section_codes:
+        section = get_section_by_code(
+            structured_body=structured_body, loinc_code=code, namespaces=HL7_NS
+        )
+        if section is None:
+            continue
+        measurements[code] = (
+            len(section.findall("hl7:entry", namespaces=HL7_NS)),
+            len(etree.tostring(section)),
+        )
+    return measurements
+
+
+def profile_document(
+    xml_files: XMLFiles, configuration: ProcessedConfiguration
+) -> list[SectionSample]:
+    """
+    Plan and refine one eICR, measuring every section it contains.
+
+    Only the eICR is refined; sections live there, and RR refinement does
+    not depend on the eICR plan.
+    """
+
+    eicr_root = xml_files.parse_eicr()
+    run = create_augmentation_run(eicr_root=eicr_root)
+    plan = create_eicr_refinement_plan(
+        processed_configuration=configuration,
+        eicr_root=eicr_root,
+        augmentation_timestamp=run.augmentation_time,
+    )
+
+    structured_body = eicr_root.find(".//hl7:structuredBody", namespaces=HL7_NS)
+    if structured_body is None:
+        return []
+
+    section_codes = list(plan.section_instructions)
+    before = _measure_sections(structured_body, section_codes)
+
+    timer = StageTimer()
+    with timing_session(timer):
+        refine_eicr(eicr_root=eicr_root, plan=plan)
+
+    after = _measure_sections(structured_body, section_codes)
+
+    samples: list[SectionSample] = []
+    for timing in timer.stages:
+        if timing.name != SECTION_STAGE:
+            continue
+        code = timing.attributes["section_code"]
+        provenance = plan.section_provenance.get(code)
+        entries_in, bytes_in = before.get(code, (0, 0))
+        entries_out, bytes_out = after.get(code, (0, 0))
+        samples.append(
+            SectionSample(
+                loinc_code=code,
+                display_name=provenance.display_name if provenance else code,
+                duration_ms=timing.duration_ms,
+                outcome=timing.attributes.get("outcome", "error"),
+                entries_in=entries_in,
+                entries_out=entries_out,
+                bytes_in=bytes_in,
+                bytes_out=bytes_out,
+            )
+        )
+
+    return samples
+
+
+def profile_corpus(
+    pairs: dict[str, XMLFiles],
+    configuration: ProcessedConfiguration,
+    rounds: int,
+    console: Console,
+) -> dict[str, SectionProfile]:
+    """
+    Profile every pair `rounds` times and aggregate by section LOINC.
+
+    Each round re-parses the eICR so every refinement starts from the
+    original document.
+    """
+
+    profiles: dict[str, SectionProfile] = {}
+
+    for name, xml_files in pairs.items():
+        console.print(f"Profiling [bold]{name}[/bold] ({rounds} rounds)")
+        for _ in range(rounds):
+            for sample in profile_document(xml_files, configuration):
+                profile = profiles.setdefault(
+                    sample.loinc_code,
+                    SectionProfile(
+                        loinc_code=sample.loinc_code,
+                        display_name=sample.display_name,
+                    ),
+                )
+                profile.durations_ms.append(sample.duration_ms)
+                profile.outcomes[sample.outcome] += 1
+                profile.entries_in += sample.entries_in
+                profile.entries_out += sample.entries_out
+                profile.bytes_in += sample.bytes_in
+                profile.bytes_out += sample.bytes_out
+
+    return profiles
+
+
+# NOTE:
+# REPORTING
+# =============================================================================
+
+
+def display_profile(profiles: dict[str, SectionProfile], console: Console) -> None:
+    """
+    Render the per-section profile, most expensive section first.
+    """
+
+    grand_total_ms = sum(p.total_ms for p in profiles.values()) or 1.0
+
+    table = Table(
+        title="Per-section refinement cost",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("LOINC", style="bold")
+    table.add_column("Section", no_wrap=False)
+    table.add_column("n", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Entries in→out", justify="right")
+    table.add_column("KiB in→out", justify="right")
+    table.add_column("Outcomes", no_wrap=False)
+
+    for profile in sorted(profiles.values(), key=lambda p: p.total_ms, reverse=True):
+        n = profile.samples
+        outcomes = ", ".join(
+            f"{outcome} ×{count}" for outcome, count in profile.outcomes.most_common()
+        )
+        table.add_row(
+            profile.loinc_code,
+            profile.display_name,
+            str(n),
+            f"{profile.total_ms:.1f}",
+            f"{profile.total_ms / grand_total_ms:.0%}",
+            f"{profile.percentile_ms(50):.2f}",
+            f"{profile.percentile_ms(95):.2f}",
+            f"{profile.percentile_ms(99):.2f}",
+            f"{profile.entries_in / n:.1f}→{profile.entries_out / n:.1f}",
+            f"{profile.bytes_in / n / 1024:.1f}→{profile.bytes_out / n / 1024:.1f}",
+            outcomes,
+        )
+
+    console.print(table)
+
+
+def write_profile_json(profiles: dict[str, SectionProfile], output_path: Path) -> None:
+    """
+    Write the aggregated profile as JSON for comparison across runs.
+
+    Entry and byte counts are totals across all samples; divide by
+    `samples` for the per-document means shown in the table.
+    """
+
+    payload = []
+    for profile in sorted(profiles.values(), key=lambda p: p.total_ms, reverse=True):
+        record = asdict(profile)
+        record.pop("durations_ms")
+        record["outcomes"] = dict(profile.outcomes)
+        record.update(
+            samples=profile.samples,
+            total_ms=profile.total_ms,
+            p50_ms=profile.percentile_ms(50),
+            p95_ms=profile.percentile_ms(95),
+            p99_ms=profile.percentile_ms(99),
+        )
+        payload.append(record)
+
+    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def main() -> None:
+    """
+    Parse arguments, profile the corpus and report.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Profile per-section refinement cost across a corpus of eICR/RR pairs."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=DEFAULT_CORPUS_DIR,
+        help="Directory of eICR/RR pairs (zips or subdirectories)",
+    )
+    parser.add_argument(
+        "--configuration",
+        type=Path,
+        required=True,
+        help="Path to an active.json configuration payload",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="How many times to refine each document",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Optional path to also write the profile as JSON",
+    )
+    args = parser.parse_args()
+
+    console = Console()
+
+    pairs = load_corpus(args.corpus)
+    if not pairs:
+        console.print(
+            f"[bold red]Error:[/bold red] No eICR/RR pairs found in '{args.corpus}'."
+        )
+        raise SystemExit(1)
+
+    configuration = load_configuration(args.configuration)
+    profiles = profile_corpus(
+        pairs=pairs,
+        configuration=configuration,
+        rounds=args.rounds,
+        console=console,
+    )
+
+    display_profile(profiles, console)
+
+    if args.json is not None:
+        write_profile_json(profiles, args.json)
+        console.print(f"Wrote profile to [bold]{args.json}[/bold]")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 from psycopg.rows import dict_row
 
 from app.core.config import get_aws_config
-from app.db.configurations.db import get_configurations_db
+from app.db.configurations.db import get_all_active_configurations_db
 from app.db.configurations.model import (
     CURRENT_ACTIVE_CONFIG_SCHEMA_VERSION,
     MAINTENANCE_LOCK_KEY,
@@ -36,11 +36,15 @@ This script:
    regenerated successfully.
 2. Creates a maintenance lock in S3 to temporarily pause Lambda processing.
 3. Records the reactivation attempt in Postgres.
-4. Queries Postgres for all currently active configurations.
-5. Rebuilds each active.json and metadata.json using current application code.
-6. Uploads the files to their existing S3 locations.
-7. Records the final reactivation status, success count, and failure count.
-8. Removes the maintenance lock after all files are regenerated successfully.
+4. Queries Postgres for all currently active configurations in one query.
+5. Skips configurations already checkpointed for the target schema version by
+   an earlier, partially failed run.
+6. Rebuilds each remaining active.json and metadata.json using current
+   application code, REACTIVATION_CONCURRENCY configurations at a time.
+7. Uploads the files to their existing S3 locations and checkpoints each
+   configuration as it completes.
+8. Records the final reactivation status, success count, and failure count.
+9. Removes the maintenance lock after all files are regenerated successfully.
 
 This script does not:
 
@@ -68,6 +72,10 @@ REACTIVATION_MAX_ATTEMPTS = 3
 REACTIVATION_RETRY_BASE_DELAY_SECONDS = 1.0
 MAX_FAILURE_IDS_IN_ERROR = 10
 
+# Number of configurations regenerated at once. Each worker holds at most one
+# pooled connection at a time, so keep this at or below the pool's max size.
+REACTIVATION_CONCURRENCY = int(os.getenv("REACTIVATION_CONCURRENCY", "8"))
+
 
 class MaintenanceLock(TypedDict):
     """Maintenance lock payload written to S3 during active config reactivation."""
@@ -295,57 +303,66 @@ def remove_maintenance_lock() -> None:
     delete_maintenance_lock()
 
 
-async def get_active_jurisdiction_ids_db(
+async def get_completed_configuration_versions_db(
     *,
     db: AsyncDatabaseConnection,
-) -> list[str]:
+    target_schema_version: int,
+) -> set[tuple[str, int]]:
     """
-    Return jurisdiction IDs that currently have active configurations.
+    Return the (configuration_id, version) pairs already regenerated for a schema version.
 
-    This allows the reactivation to reuse get_configurations_db(), which
-    expects a jurisdiction ID.
+    A rerun after a partial failure uses this checkpoint to skip configurations
+    whose artifacts were already rewritten. A configuration that has been
+    reactivated since (a new version) is not in the set and is regenerated.
     """
 
     query = """
-        SELECT DISTINCT jurisdiction_id
-        FROM configurations
-        WHERE status = 'active'
-        ORDER BY jurisdiction_id;
+        SELECT configuration_id, configuration_version
+        FROM active_payload_schema_reactivation_progress
+        WHERE target_schema_version = %s;
     """
 
     async with db.get_connection() as connection:
         async with connection.cursor(row_factory=dict_row) as cursor:
-            await cursor.execute(query)
+            await cursor.execute(query, (target_schema_version,))
             rows = await cursor.fetchall()
 
-    return [row["jurisdiction_id"] for row in rows]
+    return {
+        (str(row["configuration_id"]), row["configuration_version"]) for row in rows
+    }
 
 
-async def get_all_active_configurations_db(
+async def record_configuration_regenerated_db(
     *,
     db: AsyncDatabaseConnection,
-) -> list[DbConfiguration]:
+    target_schema_version: int,
+    configuration: DbConfiguration,
+) -> None:
     """
-    Return all active configurations across all jurisdictions.
-
-    The existing get_configurations_db() function is reused so each
-    row is converted into a complete DbConfiguration model.
+    Checkpoint one configuration as regenerated for a schema version.
     """
 
-    jurisdiction_ids = await get_active_jurisdiction_ids_db(db=db)
-
-    active_configurations: list[DbConfiguration] = []
-
-    for jurisdiction_id in jurisdiction_ids:
-        jurisdiction_configurations = await get_configurations_db(
-            jurisdiction_id=jurisdiction_id,
-            status="active",
-            db=db,
+    query = """
+        INSERT INTO active_payload_schema_reactivation_progress (
+            target_schema_version,
+            configuration_id,
+            configuration_version
         )
+        VALUES (%s, %s, %s)
+        ON CONFLICT DO NOTHING;
+    """
 
-        active_configurations.extend(jurisdiction_configurations)
-
-    return active_configurations
+    async with db.get_connection() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute(
+                query,
+                (
+                    target_schema_version,
+                    configuration.id,
+                    configuration.version,
+                ),
+            )
+            await connection.commit()
 
 
 async def get_latest_complete_reactivation_schema_version_db(
@@ -503,13 +520,10 @@ async def regenerate_active_configuration(
                     f"configuration {configuration.id}."
                 )
 
-            # upload_configuration_payload() is synchronous. The normal activation
-            # endpoint runs it in a thread pool, so asyncio.to_thread() is used here.
-            await asyncio.to_thread(
-                upload_configuration_payload,
-                config_payload,
-                config_metadata,
-                logger,
+            await upload_configuration_payload(
+                payload=config_payload,
+                metadata=config_metadata,
+                logger=logger,
             )
 
             upload_finished_at = time.perf_counter()
@@ -566,13 +580,21 @@ async def regenerate_active_configs(
     *,
     db: AsyncDatabaseConnection,
     limit: int | None = None,
+    concurrency: int = REACTIVATION_CONCURRENCY,
 ) -> RegenerationResult:
     """
     Query Postgres and regenerate all currently active configurations.
 
+    All active configurations are fetched in one query. Configurations
+    already checkpointed for the target schema version are skipped and
+    counted as successful, so a rerun only does the remaining work. The rest
+    are regenerated by up to `concurrency` workers sharing the same pool;
+    each one is checkpointed as soon as its upload succeeds.
+
     Args:
         db: Open application database pool.
         limit: Optional number of configurations to process for testing.
+        concurrency: Maximum number of configurations regenerated at once.
 
     Returns:
         RegenerationResult: Counts and failure IDs from regeneration.
@@ -583,50 +605,89 @@ async def regenerate_active_configs(
     if limit is not None:
         active_configurations = active_configurations[:limit]
 
+    completed = await get_completed_configuration_versions_db(
+        db=db,
+        target_schema_version=CURRENT_ACTIVE_CONFIG_SCHEMA_VERSION,
+    )
+
+    pending = [
+        configuration
+        for configuration in active_configurations
+        if (str(configuration.id), configuration.version) not in completed
+    ]
+
     total = len(active_configurations)
-    successful = 0
+    skipped = total - len(pending)
+    successful = skipped
     failures: list[str] = []
 
     logger.info(
         "Starting active configuration regeneration. "
-        "configuration_count=%s limit=%s target_schema_version=%s",
+        "configuration_count=%s already_completed=%s pending=%s limit=%s "
+        "concurrency=%s target_schema_version=%s",
         total,
+        skipped,
+        len(pending),
         limit,
+        concurrency,
         CURRENT_ACTIVE_CONFIG_SCHEMA_VERSION,
     )
 
-    for configuration in active_configurations:
-        try:
-            await regenerate_active_configuration(
-                configuration=configuration,
-                db=db,
-            )
-            successful += 1
-        except Exception:
-            configuration_id = str(configuration.id)
-            failures.append(configuration_id)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started_at = time.perf_counter()
 
-            logger.exception(
-                "Failed to regenerate active configuration. "
-                "configuration_id=%s configuration_version=%s jurisdiction_id=%s",
-                configuration_id,
-                configuration.version,
-                configuration.jurisdiction_id,
-            )
+    async def regenerate_with_checkpoint(configuration: DbConfiguration) -> None:
+        nonlocal successful
+
+        async with semaphore:
+            try:
+                await regenerate_active_configuration(
+                    configuration=configuration,
+                    db=db,
+                )
+                await record_configuration_regenerated_db(
+                    db=db,
+                    target_schema_version=CURRENT_ACTIVE_CONFIG_SCHEMA_VERSION,
+                    configuration=configuration,
+                )
+                successful += 1
+            except Exception:
+                configuration_id = str(configuration.id)
+                failures.append(configuration_id)
+
+                logger.exception(
+                    "Failed to regenerate active configuration. "
+                    "configuration_id=%s configuration_version=%s jurisdiction_id=%s",
+                    configuration_id,
+                    configuration.version,
+                    configuration.jurisdiction_id,
+                )
+
+    await asyncio.gather(
+        *(regenerate_with_checkpoint(configuration) for configuration in pending)
+    )
+
+    elapsed_seconds = time.perf_counter() - started_at
+    regenerated = successful - skipped
 
     logger.info(
         "Active configuration regeneration finished. "
-        "total=%s successful=%s failed=%s target_schema_version=%s",
+        "total=%s successful=%s skipped=%s failed=%s elapsed_seconds=%s "
+        "configurations_per_second=%s concurrency=%s target_schema_version=%s",
         total,
         successful,
+        skipped,
         len(failures),
+        round(elapsed_seconds, 2),
+        round(regenerated / elapsed_seconds, 2) if elapsed_seconds > 0 else None,
+        concurrency,
         CURRENT_ACTIVE_CONFIG_SCHEMA_VERSION,
     )
 
     return {
         "total": total,
         "successful": successful,
-        "failures": failures,
+        "failures": sorted(failures),
     }
 
 
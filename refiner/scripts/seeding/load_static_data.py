@@ -418,6 +418,18 @@ def _build_processed_conditions(
     return results
 
 
+def _log_load_rate(table: str, row_count: int, started_at: float) -> None:
+    """
+    Logs how many rows a bulk load wrote into a table and how fast.
+    """
+
+    elapsed = time.perf_counter() - started_at
+    rate = row_count / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        f"⚡ {table}: {row_count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+    )
+
+
 def _upsert_conditions(
     cursor: Cursor,
     processed: list[ProcessedCondition],
@@ -425,76 +437,123 @@ def _upsert_conditions(
     """
     Upserts condition rows and their associated context grouper rows.
 
-    Each condition is upserted using a CTE that returns the row's id
-    regardless of whether the row was inserted, updated, or unchanged.
+    Every condition is streamed into a staging table with COPY and merged
+    into conditions with a single INSERT ... ON CONFLICT. The IDs are then
+    read back for all staged rows, whether they were inserted, updated, or
+    unchanged.
 
-    Both upserts use IS DISTINCT FROM to avoid touching rows where
-    nothing has changed, preventing spurious updated_at timestamps.
+    The merge uses IS DISTINCT FROM to avoid touching rows where nothing has
+    changed, preventing spurious updated_at timestamps.
     """
 
     logger.info("⏳ Upserting condition records...")
+    started_at = time.perf_counter()
 
-    condition_upsert_query = """
-        WITH upsert_condition AS (
-            INSERT INTO conditions (
-                canonical_url,
-                tes_id,
-                display_name,
-                loinc_codes,
-                snomed_codes,
-                icd10_codes,
-                rxnorm_codes,
-                cvx_codes,
-                coverage_level,
-                coverage_level_reason,
-                coverage_level_date
-            )
-            VALUES (
-                %(canonical_url)s,
-                %(tes_id)s,
-                %(display_name)s,
-                %(loinc_codes)s,
-                %(snomed_codes)s,
-                %(icd10_codes)s,
-                %(rxnorm_codes)s,
-                %(cvx_codes)s,
-                %(coverage_level)s,
-                %(coverage_level_reason)s,
-                %(coverage_level_date)s
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS stage_conditions (
+            canonical_url TEXT NOT NULL,
+            version TEXT NOT NULL,
+            tes_id UUID NOT NULL,
+            display_name TEXT,
+            loinc_codes JSONB,
+            snomed_codes JSONB,
+            icd10_codes JSONB,
+            rxnorm_codes JSONB,
+            cvx_codes JSONB,
+            coverage_level TEXT,
+            coverage_level_reason TEXT,
+            coverage_level_date DATE
+        ) ON COMMIT DROP
+    """)
+    cursor.execute("TRUNCATE stage_conditions")
+
+    def condition_generator():
+        for item in processed:
+            cond = item["condition"]
+            yield (
+                cond["canonical_url"],
+                cond["version"],
+                cond["tes_id"],
+                cond["display_name"],
+                cond["loinc_codes"],
+                cond["snomed_codes"],
+                cond["icd10_codes"],
+                cond["rxnorm_codes"],
+                cond["cvx_codes"],
+                cond["coverage_level"],
+                cond["coverage_level_reason"],
+                cond["coverage_level_date"],
             )
-            ON CONFLICT (canonical_url, tes_id)
-            DO UPDATE SET
-                display_name = EXCLUDED.display_name,
-                loinc_codes = EXCLUDED.loinc_codes,
-                snomed_codes = EXCLUDED.snomed_codes,
-                icd10_codes = EXCLUDED.icd10_codes,
-                rxnorm_codes = EXCLUDED.rxnorm_codes,
-                cvx_codes = EXCLUDED.cvx_codes,
-                coverage_level = EXCLUDED.coverage_level,
-                coverage_level_reason = EXCLUDED.coverage_level_reason,
-                coverage_level_date = EXCLUDED.coverage_level_date
-            WHERE
-                conditions.display_name IS DISTINCT FROM EXCLUDED.display_name
-                OR conditions.loinc_codes IS DISTINCT FROM EXCLUDED.loinc_codes
-                OR conditions.snomed_codes IS DISTINCT FROM EXCLUDED.snomed_codes
-                OR conditions.icd10_codes IS DISTINCT FROM EXCLUDED.icd10_codes
-                OR conditions.rxnorm_codes IS DISTINCT FROM EXCLUDED.rxnorm_codes
-                OR conditions.cvx_codes IS DISTINCT FROM EXCLUDED.cvx_codes
-                OR conditions.coverage_level IS DISTINCT FROM EXCLUDED.coverage_level
-                OR conditions.coverage_level_reason IS DISTINCT FROM EXCLUDED.coverage_level_reason
-                OR conditions.coverage_level_date IS DISTINCT FROM EXCLUDED.coverage_level_date
-            RETURNING id
+
+    logger.info("🚀 Streaming conditions into stage table...")
+    with cursor.copy(
+        "COPY stage_conditions (canonical_url, version, tes_id, display_name, loinc_codes, snomed_codes, icd10_codes, rxnorm_codes, cvx_codes, coverage_level, coverage_level_reason, coverage_level_date) FROM STDIN"
+    ) as copy:
+        for record in condition_generator():
+            copy.write_row(record)
+
+    logger.info(f"📥 Staged {len(processed)} condition rows.")
+    cursor.execute("ANALYZE stage_conditions;")
+
+    cursor.execute("""
+        INSERT INTO conditions (
+            canonical_url,
+            tes_id,
+            display_name,
+            loinc_codes,
+            snomed_codes,
+            icd10_codes,
+            rxnorm_codes,
+            cvx_codes,
+            coverage_level,
+            coverage_level_reason,
+            coverage_level_date
         )
-        SELECT id FROM upsert_condition
-        UNION ALL
-        SELECT c.id
-        FROM conditions c
-        JOIN tes t ON t.id = c.tes_id
-        WHERE c.canonical_url = %(canonical_url)s
-            AND t.version = %(version)s
-            AND NOT EXISTS (SELECT 1 FROM upsert_condition)
-        LIMIT 1
-    """
+        SELECT
+            s.canonical_url,
+            s.tes_id,
+            s.display_name,
+            s.loinc_codes,
+            s.snomed_codes,
+            s.icd10_codes,
+            s.rxnorm_codes,
+            s.cvx_codes,
+            s.coverage_level,
+            s.coverage_level_reason,
+            s.coverage_level_date
+        FROM stage_conditions s
+        ON CONFLICT (canonical_url, tes_id)
+        DO UPDATE SET
+            display_name = EXCLUDED.display_name,
+            loinc_codes = EXCLUDED.loinc_codes,
+            snomed_codes = EXCLUDED.snomed_codes,
+            icd10_codes = EXCLUDED.icd10_codes,
+            rxnorm_codes = EXCLUDED.rxnorm_codes,
+            cvx_codes = EXCLUDED.cvx_codes,
+            coverage_level = EXCLUDED.coverage_level,
+            coverage_level_reason = EXCLUDED.coverage_level_reason,
+            coverage_level_date = EXCLUDED.coverage_level_date
+        WHERE
+            conditions.display_name IS DISTINCT FROM EXCLUDED.display_name
+            OR conditions.loinc_codes IS DISTINCT FROM EXCLUDED.loinc_codes
+            OR conditions.snomed_codes IS DISTINCT FROM EXCLUDED.snomed_codes
+            OR conditions.icd10_codes IS DISTINCT FROM EXCLUDED.icd10_codes
+            OR conditions.rxnorm_codes IS DISTINCT FROM EXCLUDED.rxnorm_codes
+            OR conditions.cvx_codes IS DISTINCT FROM EXCLUDED.cvx_codes
+            OR conditions.coverage_level IS DISTINCT FROM EXCLUDED.coverage_level
+            OR conditions.coverage_level_reason IS DISTINCT FROM EXCLUDED.coverage_level_reason
+            OR conditions.coverage_level_date IS DISTINCT FROM EXCLUDED.coverage_level_date;
+    """)
+    logger.info(f"✨ {cursor.rowcount:,} condition rows inserted or updated.")
+
+    cursor.execute("""
+        SELECT s.canonical_url, s.version, c.id
+        FROM stage_conditions s
+        JOIN conditions c
+            ON c.canonical_url = s.canonical_url
+            AND c.tes_id = s.tes_id
+    """)
+    condition_ids = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
 
     condition_to_code_relationships: dict[
         ConditionUniqueIndex, ConditionToCodeToValuesetTrace
@@ -502,19 +561,16 @@ def _upsert_conditions(
 
     for item in processed:
         cond = item["condition"]
-        cursor.execute(condition_upsert_query, cond)
-        condition_response = cursor.fetchone()
+        condition_canonical_url = cond.get("canonical_url")
+        condition_version = cond.get("version")
+        condition_name = cond.get("display_name")
 
-        if condition_response is None or not condition_response[0]:
+        cond_id = condition_ids.get((condition_canonical_url, condition_version))
+        if not cond_id:
             raise ValueError(
                 f"Condition upsert for condition with params {cond} did not return ID"
             )
 
-        cond_id = condition_response[0]
-        condition_canonical_url = cond.get("canonical_url")
-        condition_version = cond.get("version")
-        condition_name = cond.get("display_name")
-
         condition_payload = ConditionToCodeToValuesetTrace(
             condition_id=cond_id,
             condition_display_name=condition_name,
@@ -528,6 +584,7 @@ def _upsert_conditions(
             (condition_canonical_url, condition_version)
         ] = condition_payload
 
+    _log_load_rate("conditions", len(processed), started_at)
     return condition_to_code_relationships
 
 
@@ -542,6 +599,7 @@ def _upsert_relationships(
     code_map = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
 
     logger.info("⏳ Refreshing relationships table...")
+    started_at = time.perf_counter()
     cursor.execute("TRUNCATE conditions_codes_temp;")
 
     child_rsg_key = "child_rsg"
@@ -589,6 +647,7 @@ def _upsert_relationships(
     )
 
     cursor.execute("ANALYZE conditions_codes_temp;")
+    _log_load_rate("conditions_codes_temp", inserted_count, started_at)
     return
 
 
@@ -597,6 +656,7 @@ def _upsert_codes(
     data: list[CodeRow],
 ) -> None:
     logger.info("⏳ Starting codes upsert process...")
+    started_at = time.perf_counter()
 
     cursor.execute("""
         CREATE TEMP TABLE IF NOT EXISTS stage_codes (
@@ -639,6 +699,7 @@ def _upsert_codes(
     """)
 
     logger.info(f"✨ {cursor.rowcount:,} total new rows inserted in codes table.")
+    _log_load_rate("codes", len(data), started_at)
     return
 
 
@@ -647,6 +708,7 @@ def _upsert_valuesets(
     data: list[ValuesetRow],
 ) -> None:
     logger.info("⏳ Starting valuesets upsert process...")
+    started_at = time.perf_counter()
 
     cursor.execute("""
         CREATE TEMP TABLE IF NOT EXISTS stage_valuesets (
@@ -720,6 +782,7 @@ def _upsert_valuesets(
     """)
 
     logger.info(f"✨ {cursor.rowcount:,} total valuesets seeded.")
+    _log_load_rate("valuesets", len(data), started_at)
     return
 
 
@@ -889,6 +952,11 @@ def load_static_data(db_url: str, db_password: str, seed_all_tes_data: bool) ->
                     seed_all_tes_data=seed_all_tes_data,
                 )
 
+                # TES diffs are read back from tes_diff_conditions rather than
+                # computed per request, so diff any newly loaded versions
+                logger.info("⏳ Precomputing TES version diffs...")
+                cursor.execute("SELECT refresh_tes_diffs();")
+
                 logger.info("🏁 Done!")
 
     except Exception:
@@ -0,0 +1,341 @@
+"""
+Batch schematron and XSD validation over many documents.
+
+Validates every XML file under the given directories (or the paths piped in
+on stdin, one per line, when given `-`) across a pool of worker processes.
+Each worker compiles the CDA R2 schema once and each schematron stylesheet
+the first time it needs it, then reuses them for every document it's handed.
+
+Writes a consolidated JSON and/or JUnit XML report and exits non-zero if any
+document has errors.
+
+Usage (from refiner/):
+    python -m scripts.validation.validate_batch path/to/outputs --json report.json
+    find out/ -name '*.xml' | python -m scripts.validation.validate_batch - --junit report.xml
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing.util import Finalize
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from lxml import etree
+from rich.console import Console
+from rich.table import Table
+
+from scripts.validation.validate_document_schematron import (
+    SchematronValidator,
+    resolve_stylesheet,
+)
+from scripts.validation.validate_document_xsd import build_schema, collect_xsd_issues
+
+
+@dataclass
+class DocumentResult:
+    """
+    Validation outcome for one document.
+    """
+
+    path: str
+    document_type: str | None = None
+    xsd: list[dict[str, str]] = field(default_factory=list)
+    schematron: list[dict[str, str]] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def error_count(self) -> int:
+        """
+        XSD violations plus schematron errors.
+        """
+
+        return len(self.xsd) + sum(
+            1 for r in self.schematron if r["severity"] in ("ERROR", "FATAL")
+        )
+
+    @property
+    def warning_count(self) -> int:
+        """
+        Schematron warnings; these never fail a document.
+        """
+
+        return sum(1 for r in self.schematron if r["severity"] == "WARNING")
+
+    @property
+    def passed(self) -> bool:
+        """
+        Whether the document was validated and had no errors.
+        """
+
+        return self.error is None and self.error_count == 0
+
+
+# per-worker state, set up once by _init_worker
+_schema: etree.XMLSchema | None = None
+_schematron: SchematronValidator | None = None
+
+
+def _init_worker(run_xsd: bool, run_schematron: bool) -> None:
+    global _schema, _schematron
+
+    if run_xsd:
+        _schema = build_schema(Console(stderr=True))
+        if _schema is None:
+            raise RuntimeError("Could not compile CDA R2 schema.")
+    if run_schematron:
+        _schematron = SchematronValidator()
+        # runs as the worker process exits, when the pool shuts down
+        Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    global _schematron
+
+    if _schematron is not None:
+        _schematron.close()
+        _schematron = None
+
+
+def _validate_document(path: str) -> DocumentResult:
+    result = DocumentResult(path=path)
+
+    try:
+        doc = etree.parse(path)
+    except (OSError, etree.XMLSyntaxError) as e:
+        result.error = f"Could not parse document: {e}"
+        return result
+
+    if _schema is not None:
+        result.xsd = collect_xsd_issues(_schema, doc)
+
+    if _schematron is not None:
+        stylesheet = resolve_stylesheet(doc.getroot())
+        if stylesheet is None:
+            result.error = "Not a recognized eICR or RR document version."
+            return result
+
+        result.document_type, xslt_path = stylesheet
+        try:
+            result.schematron = _schematron.validate(Path(path), xslt_path)
+        except Exception as e:
+            result.error = f"Schematron validation failed: {e}"
+
+    return result
+
+
+def iter_documents(sources: Iterable[str]) -> Iterator[Path]:
+    """
+    Expands directories to the XML files under them; `-` reads paths from stdin.
+    """
+
+    for source in sources:
+        if source == "-":
+            yield from (Path(line.strip()) for line in sys.stdin if line.strip())
+            continue
+
+        path = Path(source)
+        if path.is_dir():
+            yield from sorted(path.rglob("*.xml"))
+        else:
+            yield path
+
+
+def validate_documents(
+    paths: Iterable[Path],
+    workers: int,
+    run_xsd: bool = True,
+    run_schematron: bool = True,
+) -> list[DocumentResult]:
+    """
+    Validates documents across a pool of workers, returning results in input order.
+    """
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(run_xsd, run_schematron),
+    ) as pool:
+        return list(pool.map(_validate_document, (str(p) for p in paths), chunksize=4))
+
+
+def build_json_report(results: list[DocumentResult], elapsed: float) -> dict:
+    """
+    A single machine-readable report for every validated document.
+    """
+
+    return {
+        "summary": {
+            "documents": len(results),
+            "passed": sum(1 for r in results if r.passed),
+            "failed": sum(1 for r in results if not r.passed),
+            "errors": sum(r.error_count for r in results),
+            "warnings": sum(r.warning_count for r in results),
+            "elapsed_seconds": round(elapsed, 3),
+        },
+        "documents": [
+            {
+                **asdict(r),
+                "passed": r.passed,
+                "error_count": r.error_count,
+                "warning_count": r.warning_count,
+            }
+            for r in results
+        ],
+    }
+
+
+def build_junit_report(results: list[DocumentResult], elapsed: float) -> str:
+    """
+    JUnit XML with one test case per document, failed on any error.
+
+    Warnings are listed in the test case's output but don't fail it.
+    """
+
+    failures = sum(1 for r in results if not r.passed)
+    testsuites = ET.Element(
+        "testsuites", tests=str(len(results)), failures=str(failures)
+    )
+    testsuite = ET.SubElement(
+        testsuites,
+        "testsuite",
+        name="cda-validation",
+        tests=str(len(results)),
+        failures=str(failures),
+        time=f"{elapsed:.3f}",
+    )
+
+    for r in results:
+        testcase = ET.SubElement(
+            testsuite,
+            "testcase",
+            classname=r.document_type or "unknown",
+            name=r.path,
+        )
+        issues = [
+            f"[XSD {i['severity']}] {i['message']} ({i['location']})" for i in r.xsd
+        ] + [
+            f"[Schematron {i['severity']}] {i['message']} ({i['location']})"
+            for i in r.schematron
+        ]
+
+        if not r.passed:
+            failure = ET.SubElement(
+                testcase,
+                "failure",
+                message=r.error or f"{r.error_count} validation errors",
+            )
+            failure.text = "\n".join(issues)
+        elif issues:
+            ET.SubElement(testcase, "system-out").text = "\n".join(issues)
+
+    ET.indent(testsuites)
+    return ET.tostring(testsuites, encoding="unicode", xml_declaration=True)
+
+
+def display_batch_summary(results: list[DocumentResult], console: Console) -> None:
+    """
+    Lists the documents that failed, then the overall counts.
+    """
+
+    failed = [r for r in results if not r.passed]
+    if failed:
+        table = Table(
+            title="Failed Documents",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Document", no_wrap=False)
+        table.add_column("Type")
+        table.add_column("XSD Errors", justify="right")
+        table.add_column("Schematron Errors", justify="right")
+        table.add_column("Problem", no_wrap=False)
+
+        for r in failed:
+            table.add_row(
+                r.path,
+                r.document_type or "-",
+                str(len(r.xsd)),
+                str(r.error_count - len(r.xsd)),
+                r.error or "",
+                style="bright_red",
+            )
+        console.print(table)
+
+    style = "bold bright_red" if failed else "bold green1"
+    console.print(
+        f"{len(results) - len(failed)}/{len(results)} documents passed "
+        f"({sum(r.warning_count for r in results)} warnings).",
+        style=style,
+    )
+
+
+def main() -> int:
+    """
+    Parses arguments, validates the documents and writes the reports.
+    """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help="XML files or directories to validate; `-` reads paths from stdin.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count).",
+    )
+    parser.add_argument("--json", type=Path, help="Write a JSON report here.")
+    parser.add_argument("--junit", type=Path, help="Write a JUnit XML report here.")
+    parser.add_argument("--no-xsd", action="store_true", help="Skip XSD validation.")
+    parser.add_argument(
+        "--no-schematron", action="store_true", help="Skip schematron validation."
+    )
+    args = parser.parse_args()
+
+    console = Console()
+    paths = list(iter_documents(args.sources))
+    if not paths:
+        console.print("No XML documents found.", style="bold yellow")
+        return 0
+
+    console.print(
+        f"Validating {len(paths)} documents with {args.workers} workers...",
+        style="bold",
+    )
+    start = time.perf_counter()
+    results = validate_documents(
+        paths,
+        workers=args.workers,
+        run_xsd=not args.no_xsd,
+        run_schematron=not args.no_schematron,
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(build_json_report(results, elapsed), fh, indent=2)
+            fh.write("\n")
+        console.print(f"JSON report written to {args.json}")
+
+    if args.junit:
+        args.junit.write_text(build_junit_report(results, elapsed), encoding="utf-8")
+        console.print(f"JUnit report written to {args.junit}")
+
+    display_batch_summary(results, console)
+    console.print(f"⏱️  Took {elapsed:.3f} seconds")
+
+    return 0 if all(r.passed for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
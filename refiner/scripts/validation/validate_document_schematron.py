@@ -1,5 +1,6 @@
 import subprocess
 from pathlib import Path
+from typing import Any
 
 from lxml import etree
 from lxml.etree import _Element
@@ -78,6 +79,29 @@ def get_document_template_info(
     return None, None
 
 
+def resolve_stylesheet(root: _Element) -> tuple[str, Path] | None:
+    """
+    Looks up the validation XSLT for a parsed document, without any output.
+
+    Returns the document's type and version (e.g. "eICR STU 3.1.1") and the
+    stylesheet path, or None if the document isn't a known eICR/RR version.
+    """
+
+    root_oid, extension = get_document_template_info(root, {"hl7": "urn:hl7-org:v3"})
+    if not root_oid:
+        return None
+
+    standard_family = STANDARDS_MAP[root_oid]
+    version_info = standard_family["versions"].get(extension)
+    if version_info is None:
+        return None
+
+    return (
+        f"{standard_family['name']} {version_info['version_name']}",
+        version_info["path"],
+    )
+
+
 def determine_validation_path(xml_path: Path) -> tuple[str, Path] | tuple[None, None]:
     """
     Determine eICR/RR version and return its file path.
@@ -90,46 +114,30 @@ def determine_validation_path(xml_path: Path) -> tuple[str, Path] | tuple[None,
     console.print(f"Analyzing file: {xml_path.name}")
 
     try:
-        tree = etree.parse(str(xml_path))
-        root = tree.getroot()
-        nsmap = {"hl7": "urn:hl7-org:v3"}
-
-        root_oid, extension = get_document_template_info(root, nsmap)
+        root = etree.parse(str(xml_path)).getroot()
+        stylesheet = resolve_stylesheet(root)
 
-        if not root_oid:
-            console.print(
-                "❌ Could not find a recognizable eICR or RR document-level templateId.",
-                style="bold bright_red",
+        if stylesheet is None:
+            # look the templateId up again only to say what was wrong with it
+            root_oid, extension = get_document_template_info(
+                root, {"hl7": "urn:hl7-org:v3"}
             )
-            return None, None
-
-        if root_oid in STANDARDS_MAP:
-            standard_family = STANDARDS_MAP[root_oid]
-
-            if extension in standard_family["versions"]:
-                version_info = standard_family["versions"][extension]
-                doc_type_name = standard_family["name"]
-                version_name = version_info["version_name"]
-                xslt_path = version_info["path"]
-
+            if not root_oid:
                 console.print(
-                    f"✅ Document: [bold]{doc_type_name} {version_name}[/bold] (root: {root_oid}, ext: {extension})",
-                    style="green1",
+                    "❌ Could not find a recognizable eICR or RR document-level templateId.",
+                    style="bold bright_red",
                 )
-                return doc_type_name, xslt_path
             else:
                 console.print(
                     f"❌ Found standard with root '{root_oid}' but its extension '{extension}' is unknown.",
                     style="bold bright_red",
                 )
-                return None, None
-        else:
-            console.print(
-                f"❌ Unknown document standard with root OID: {root_oid}",
-                style="bold bright_red",
-            )
             return None, None
 
+        doc_type, xslt_path = stylesheet
+        console.print(f"✅ Document: [bold]{doc_type}[/bold]", style="green1")
+        return doc_type, xslt_path
+
     except Exception as e:
         console.print(
             f"❌ Error determining document type: {e}", style="bold bright_red"
@@ -230,6 +238,67 @@ def display_summary(validation_results: list[dict[str, str]], console: Console)
         console.print("\nValidation Passed", style="bold green1")
 
 
+class SchematronValidator:
+    """
+    Runs schematron validation, compiling each XSLT only once.
+
+    One Saxon processor is kept for the validator's lifetime and a stylesheet
+    is compiled the first time a document needs it.
+
+    Saxon objects can't be shared across processes, so batch validation
+    creates one of these per worker. Use it as a context manager, or call
+    close(), to release the processor when done.
+    """
+
+    def __init__(self) -> None:
+        """
+        Starts the Saxon processor; stylesheets are compiled on demand.
+        """
+
+        self._processor = PySaxonProcessor(license=False)
+        self._xslt_processor = self._processor.new_xslt30_processor()
+        self._executables: dict[Path, Any] = {}
+
+    def __enter__(self) -> "SchematronValidator":
+        """
+        Returns the validator for use in a `with` block.
+        """
+
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """
+        Closes the validator when the `with` block exits.
+        """
+
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases the compiled stylesheets and the Saxon processor.
+        """
+
+        self._executables.clear()
+        self._processor.__exit__(None, None, None)
+
+    def _executable(self, xslt_path: Path) -> Any:
+        if xslt_path not in self._executables:
+            self._executables[xslt_path] = self._xslt_processor.compile_stylesheet(
+                stylesheet_file=str(xslt_path)
+            )
+        return self._executables[xslt_path]
+
+    def validate(self, xml_path: Path, xslt_path: Path) -> list[dict[str, str]]:
+        """
+        Validates a document file and returns its parsed SVRL results.
+        """
+
+        svrl_output_string = self._executable(xslt_path).transform_to_string(
+            source_file=str(xml_path)
+        )
+        return parse_svrl(svrl_output_string) if svrl_output_string else []
+
+
 def validate_xml_with_schematron(xml_path: Path) -> None:
     """
     Orchestrates the validation process for a single XML file.
@@ -243,43 +312,26 @@ def validate_xml_with_schematron(xml_path: Path) -> None:
 
     console.print(f"Using stylesheet: {xslt_path.relative_to(BASE_DIR)}")
 
-    with PySaxonProcessor(license=False) as processor:
-        try:
-            xslt_processor = processor.new_xslt30_processor()
-            executable = xslt_processor.compile_stylesheet(
-                stylesheet_file=str(xslt_path)
-            )
-            console.print("Stylesheet compiled successfully.", style="green1")
+    try:
+        with SchematronValidator() as validator:
+            validation_results = validator.validate(xml_path, xslt_path)
+    except Exception as e:
+        console.print(
+            f"An error occurred during Saxon processing: {e}",
+            style="bold bright_red",
+        )
+        return
 
-            svrl_output_string = executable.transform_to_string(
-                source_file=str(xml_path)
+    if not validation_results:
+        console.print(
+            Panel(
+                "[bold green]✅ Validation Passed: No errors or warnings found![/bold green]"
             )
+        )
+        return
 
-            if not svrl_output_string:
-                console.print(
-                    "Transformation produced no output. The file may be valid or the stylesheet may be misconfigured.",
-                    style="bold orange1",
-                )
-                return
-
-            validation_results = parse_svrl(svrl_output_string)
-
-            if not validation_results:
-                console.print(
-                    Panel(
-                        "[bold green]✅ Validation Passed: No errors or warnings found![/bold green]"
-                    )
-                )
-                return
-
-            display_svrl_results(validation_results, console)
-            display_summary(validation_results, console)
-
-        except Exception as e:
-            console.print(
-                f"An error occurred during Saxon processing: {e}",
-                style="bold bright_red",
-            )
+    display_svrl_results(validation_results, console)
+    display_summary(validation_results, console)
 
 
 def main() -> None:
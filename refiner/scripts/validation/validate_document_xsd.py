@@ -6,7 +6,9 @@ from rich.panel import Panel
 from rich.table import Table
 
 BASE_DIR = Path(__file__).parent
-SCHEMA_DIR = BASE_DIR / "cda-r2-schema"
+# the schema lives with the app's assets so the runtime conformance check
+# (app/services/conformance.py) ships with the same copy
+SCHEMA_DIR = BASE_DIR.parent.parent / "assets" / "cda-r2-schema"
 ROOT_SCHEMA = SCHEMA_DIR / "infrastructure" / "cda" / "CDA_SDTC.xsd"
 
 DATA_DIR = BASE_DIR.parent / "data" / "source-ecr-files"
@@ -34,12 +36,37 @@ def build_schema(console: Console) -> etree.XMLSchema | None:
         return None
 
 
+def collect_xsd_issues(
+    schema: etree.XMLSchema, doc: etree._ElementTree
+) -> list[dict[str, str]]:
+    """
+    Validate a parsed document against a compiled schema and return its issues.
+    """
+
+    schema.validate(doc)
+
+    return [
+        {
+            "severity": "ERROR",
+            "message": error.message,
+            "location": f"line {error.line}, col {error.column}",
+            "path": error.path or "unknown",
+        }
+        for error in schema.error_log
+    ]
+
+
 def validate_xml_with_xsd(
-    xml_path: Path, console: Console | None = None
+    xml_path: Path,
+    console: Console | None = None,
+    schema: etree.XMLSchema | None = None,
 ) -> list[dict[str, str]]:
     """
     Validate a CDA document against the CDA R2 XSD schema set.
 
+    Pass a schema from build_schema to reuse it across documents; otherwise
+    one is compiled for this call.
+
     Returns a list of validation issue dicts with keys:
         severity  - always "ERROR" for XSD violations
         message   - human-readable error description
@@ -52,7 +79,8 @@ def validate_xml_with_xsd(
     if console is None:
         console = Console()
 
-    schema = build_schema(console)
+    if schema is None:
+        schema = build_schema(console)
     if schema is None:
         raise ValueError("Could not compile CDA R2 schema.")
 
@@ -62,20 +90,7 @@ def validate_xml_with_xsd(
         console.print(f"❌ XML parse error: {e}", style="bold bright_red")
         return []
 
-    schema.validate(doc)
-
-    results = []
-    for error in schema.error_log:
-        results.append(
-            {
-                "severity": "ERROR",
-                "message": error.message,
-                "location": f"line {error.line}, col {error.column}",
-                "path": error.path or "unknown",
-            }
-        )
-
-    return results
+    return collect_xsd_issues(schema, doc)
 
 
 def display_xsd_results(
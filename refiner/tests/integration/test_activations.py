@@ -137,8 +137,8 @@ def upload_regenerated_payload_to_localstack(config_payload, config_metadata, lo
     """
     Test replacement for upload_configuration_payload().
 
-    regenerate_active_configuration() calls upload_configuration_payload() in a
-    background thread. The real function uses the app-level S3 client and bucket
+    regenerate_active_configuration() awaits upload_configuration_payload(), so
+    this is patched in with an AsyncMock. The real function uses the app-level S3 client and bucket
     env, which does not match this integration test's LocalStack HTTP setup.
     This replacement writes the same active.json and metadata.json files to the
     LocalStack object URLs the rest of these integration tests already use.
@@ -314,6 +314,7 @@ class TestActivations:
 
         with patch(
             "scripts.reactivations.regenerate_active_configs.upload_configuration_payload",
+            new_callable=AsyncMock,
             side_effect=upload_regenerated_payload_to_localstack,
         ):
             await regenerate_active_configuration(
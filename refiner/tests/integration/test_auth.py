@@ -1,6 +1,11 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
 
+from app.api.auth.session import SESSION_TTL, get_hashed_token
+from tests.integration.conftest import TEST_SECRET_KEY, TEST_USER_ID
+
 
 @pytest.mark.integration
 @pytest.mark.asyncio
@@ -17,3 +22,46 @@ class TestAuth:
         async with AsyncClient(base_url=base_url) as client:
             response = await client.post("/api/v1/simulator/upload")
             assert response.status_code == 401
+
+    async def test_session_close_to_expiry_is_renewed(self, setup, base_url, db_pool):
+        """
+        A session within the renewal threshold should be extended and its
+        cookie refreshed by the same request that authenticates it.
+        """
+        token = "renewal-test-token"
+        token_hash = get_hashed_token(token=token, secret_key=TEST_SECRET_KEY)
+
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO sessions (token_hash, user_id, expires_at)
+                    VALUES (%s, %s, NOW() + INTERVAL '5 minutes')
+                    """,
+                    (token_hash, TEST_USER_ID),
+                )
+
+        try:
+            async with AsyncClient(base_url=base_url) as client:
+                client.cookies.update({"refiner-session": token})
+                response = await client.get("/api/v1/configurations/")
+
+            assert response.status_code == 200
+            assert "refiner-session" in response.headers.get("set-cookie", "")
+
+            async with db_pool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "SELECT expires_at FROM sessions WHERE token_hash = %s",
+                        (token_hash,),
+                    )
+                    row = await cur.fetchone()
+
+            assert row is not None
+            assert row[0] > datetime.now(UTC) + SESSION_TTL - timedelta(minutes=1)
+        finally:
+            async with db_pool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "DELETE FROM sessions WHERE token_hash = %s", (token_hash,)
+                    )
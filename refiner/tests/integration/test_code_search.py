@@ -0,0 +1,77 @@
+import pytest
+
+from app.api.v1.configurations.codes.model import FilterInput
+from app.db.configurations.codes.db import get_codes_db
+
+
+def _index_names(plan: dict) -> set[str]:
+    """
+    Collect every index name used anywhere in an EXPLAIN (FORMAT JSON) plan node.
+    """
+
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def _explain_index_names(db_pool, query: str, params: dict) -> set[str]:
+    async with db_pool.get_connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor() as cur:
+                # the test database holds far fewer codes than production, so
+                # the planner would rightly prefer a sequential scan; turning
+                # it off shows whether an index *can* serve the query
+                await cur.execute("SET LOCAL enable_seqscan = off")
+                await cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+                row = await cur.fetchone()
+
+    assert row is not None
+    return _index_names(row[0][0]["Plan"])
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestCodeSearch:
+    async def test_custom_code_search_uses_trigram_indexes(self, setup, db_pool):
+        index_names = await _explain_index_names(
+            db_pool,
+            """
+            SELECT id
+            FROM custom_codes
+            WHERE code ILIKE %(search)s OR display ILIKE %(search)s
+            """,
+            {"search": "%drown%"},
+        )
+
+        assert {
+            "idx_custom_codes_code_trgm",
+            "idx_custom_codes_display_trgm",
+        } <= index_names
+
+    async def test_search_matches_code_or_description(
+        self, setup, db_pool, create_config, get_condition_id
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+
+        all_codes, _ = await get_codes_db(
+            configuration_id=config["id"],
+            db=db_pool,
+            limit=1000,
+            filters=FilterInput(),
+        )
+        target = next(c.code for c in all_codes if len(c.code) >= 5)
+
+        for search in [target, target[1:4], target[:2]]:
+            codes, _ = await get_codes_db(
+                configuration_id=config["id"],
+                db=db_pool,
+                limit=1000,
+                filters=FilterInput(search=search),
+            )
+
+            assert target in {c.code for c in codes}
+            assert all(
+                search.lower() in f"{c.code} {c.description}".lower() for c in codes
+            )
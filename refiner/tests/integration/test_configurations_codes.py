@@ -0,0 +1,209 @@
+from uuid import UUID
+
+import pytest
+from psycopg.rows import dict_row
+
+from app.db.configurations.codes.db import (
+    get_code_count_metadata_db,
+    set_codes_status_db,
+)
+
+# the join `configurations_codes` replaces, computed straight from the
+# source tables for comparison
+EXPECTED_MEMBERSHIP_QUERY = """
+    SELECT
+        cfgc.condition_id,
+        c.id AS code_id,
+        c.code,
+        c.display,
+        c.system_id,
+        ARRAY_AGG(DISTINCT v.display_name) AS sources,
+        (e.code_id IS NOT NULL) AS is_excluded
+    FROM configurations_conditions cfgc
+    JOIN conditions_codes_temp cc ON cc.condition_id = cfgc.condition_id
+    JOIN codes c ON c.id = cc.code_id
+    INNER JOIN valuesets v ON v.id = cc.valueset_id AND v.condition_id = cfgc.condition_id
+    LEFT JOIN configurations_conditions_code_exclusions e
+        ON e.configuration_id = cfgc.configuration_id
+        AND e.code_id = cc.code_id
+    WHERE cfgc.configuration_id = %(configuration_id)s
+    GROUP BY cfgc.condition_id, c.id, c.code, c.display, c.system_id, e.code_id
+"""
+
+PROJECTED_MEMBERSHIP_QUERY = """
+    SELECT condition_id, code_id, code, display, system_id, sources, is_excluded
+    FROM configurations_codes
+    WHERE configuration_id = %(configuration_id)s
+"""
+
+
+async def _rows(db_pool, query: str, configuration_id: UUID) -> set[tuple]:
+    async with db_pool.get_connection() as conn:
+        return await _rows_on(conn, query, configuration_id)
+
+
+async def _rows_on(conn, query: str, configuration_id: UUID) -> set[tuple]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(query, {"configuration_id": configuration_id})
+        rows = await cur.fetchall()
+    return {
+        (
+            r["condition_id"],
+            r["code_id"],
+            r["code"],
+            r["display"],
+            r["system_id"],
+            tuple(sorted(r["sources"])),
+            r["is_excluded"],
+        )
+        for r in rows
+    }
+
+
+async def _assert_projection_matches(db_pool, configuration_id: UUID) -> set[tuple]:
+    expected = await _rows(db_pool, EXPECTED_MEMBERSHIP_QUERY, configuration_id)
+    projected = await _rows(db_pool, PROJECTED_MEMBERSHIP_QUERY, configuration_id)
+    assert projected == expected
+    return projected
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestConfigurationsCodes:
+    async def test_projection_follows_code_sets_and_exclusions(
+        self,
+        setup,
+        db_pool,
+        create_config,
+        get_condition_id,
+        associate_codeset,
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+        config_id = UUID(config["id"])
+
+        # creating the configuration associates the primary code set
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert rows
+        assert {r[0] for r in rows} == {condition_id}
+
+        # associating another code set adds its codes
+        other_condition_id = await get_condition_id("COVID-19")
+        await associate_codeset(config_id, other_condition_id)
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert {r[0] for r in rows} == {condition_id, other_condition_id}
+
+        # excluding and re-including codes flips is_excluded
+        excluded_ids = sorted({r[1] for r in rows})[:3]
+        await set_codes_status_db(
+            configuration_id=config_id,
+            code_ids=excluded_ids,
+            status="excluded",
+            db=db_pool,
+        )
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert {r[1] for r in rows if r[6]} == set(excluded_ids)
+
+        counts = await get_code_count_metadata_db(
+            configuration_id=config_id, db=db_pool
+        )
+        assert counts is not None
+        assert counts.total_code_count == len({r[1] for r in rows})
+        assert counts.excluded_code_count == len(excluded_ids)
+        assert counts.code_set_count == 2
+
+        await set_codes_status_db(
+            configuration_id=config_id,
+            code_ids=excluded_ids[:1],
+            status="included",
+            db=db_pool,
+        )
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert {r[1] for r in rows if r[6]} == set(excluded_ids[1:])
+
+        # disassociating a code set removes its codes
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    DELETE FROM configurations_conditions
+                    WHERE configuration_id = %s AND condition_id = %s
+                    """,
+                    (config_id, other_condition_id),
+                )
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert {r[0] for r in rows} == {condition_id}
+
+        # exclusions don't cascade, so clear them before reset_db deletes the
+        # configuration
+        await set_codes_status_db(
+            configuration_id=config_id,
+            code_ids=excluded_ids,
+            status="included",
+            db=db_pool,
+        )
+        await _assert_projection_matches(db_pool, config_id)
+
+    async def test_projection_follows_code_updates(
+        self, setup, db_pool, create_config, get_condition_id
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+        config_id = UUID(config["id"])
+
+        rows = await _assert_projection_matches(db_pool, config_id)
+        code_id, original_display = next((r[1], r[3]) for r in rows)
+
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "UPDATE codes SET display = %s WHERE id = %s",
+                    ("renamed for test", code_id),
+                )
+        try:
+            rows = await _assert_projection_matches(db_pool, config_id)
+            assert {r[3] for r in rows if r[1] == code_id} == {"renamed for test"}
+        finally:
+            async with db_pool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "UPDATE codes SET display = %s WHERE id = %s",
+                        (original_display, code_id),
+                    )
+
+    async def test_projection_follows_reseeding_to_zero_codes(
+        self, setup, db_pool, create_config, get_condition_id, associate_codeset
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        other_condition_id = await get_condition_id("COVID-19")
+        config = await create_config(condition_id)
+        config_id = UUID(config["id"])
+        await associate_codeset(config_id, other_condition_id)
+        rows = await _assert_projection_matches(db_pool, config_id)
+        assert {r[0] for r in rows} == {condition_id, other_condition_id}
+
+        # reseed the way load_static_data does, truncating and reloading
+        # conditions_codes_temp, but with no codes left for one condition;
+        # rolled back so the seeded data is left alone
+        async with db_pool.get_connection() as conn:
+            async with conn.transaction(force_rollback=True):
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        """
+                        CREATE TEMP TABLE reseed ON COMMIT DROP AS
+                        SELECT * FROM conditions_codes_temp
+                        WHERE condition_id <> %s
+                        """,
+                        (condition_id,),
+                    )
+                    await cur.execute("TRUNCATE conditions_codes_temp")
+                    await cur.execute(
+                        "INSERT INTO conditions_codes_temp SELECT * FROM reseed"
+                    )
+
+                expected = await _rows_on(conn, EXPECTED_MEMBERSHIP_QUERY, config_id)
+                projected = await _rows_on(conn, PROJECTED_MEMBERSHIP_QUERY, config_id)
+                assert projected == expected
+                assert {r[0] for r in projected} == {other_condition_id}
+
+        await _assert_projection_matches(db_pool, config_id)
@@ -12,6 +12,7 @@ from app.api.v1.events import _format_timestamp
 from app.db.code_systems.db import get_code_systems_db
 from app.db.events.db import insert_event_db
 from app.db.events.model import EventInput
+from tests.integration.conftest import TEST_JD_ID, TEST_USER_ID
 
 FROZEN_TIME = datetime(2026, 7, 13, 15, 50, 0, tzinfo=UTC)
 DEFAULT_TIMEZONE = "America/New_York"
@@ -451,3 +452,60 @@ class TestEventsCsvExport:
             f'attachment; filename="'
             f'{condition_name}_code_set_removed_{expected_timestamp}.csv"'
         )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestEventsPagination:
+    async def test_cursor_pages_walk_the_log_in_page_order(
+        self, setup, get_condition_id, create_config, authed_client, db_pool
+    ):
+        """
+        Following `next_cursor` should return every event exactly once, in the
+        same order as the numbered pages, including events that share a
+        timestamp.
+        """
+        condition_id = await get_condition_id("COVID-19")
+        config = await create_config(condition_id)
+
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                # one statement, so every row gets the same created_at
+                await cur.execute(
+                    """
+                    INSERT INTO events (
+                        jurisdiction_id, user_id, configuration_id, event_type,
+                        action_text, created_at
+                    )
+                    SELECT %s, %s, %s, 'section_update', 'Paged event ' || g, NOW()
+                    FROM generate_series(1, 25) g
+                    """,
+                    (TEST_JD_ID, TEST_USER_ID, config["id"]),
+                )
+
+        numbered_ids = []
+        first_page = (await authed_client.get("/api/v1/events/")).json()
+        for page in range(1, first_page["total_pages"] + 1):
+            response = await authed_client.get(f"/api/v1/events/?page={page}")
+            assert response.status_code == status.HTTP_200_OK
+            numbered_ids += [e["id"] for e in response.json()["audit_events"]]
+
+        cursor_ids = []
+        body = first_page
+        while True:
+            cursor_ids += [e["id"] for e in body["audit_events"]]
+            if body["next_cursor"] is None:
+                break
+            response = await authed_client.get(
+                f"/api/v1/events/?cursor={body['next_cursor']}"
+            )
+            assert response.status_code == status.HTTP_200_OK
+            body = response.json()
+
+        assert len(cursor_ids) == len(set(cursor_ids))
+        assert cursor_ids == numbered_ids
+        assert len(cursor_ids) >= 25
+
+    async def test_invalid_cursor_returns_400(self, setup, authed_client):
+        response = await authed_client.get("/api/v1/events/?cursor=not-a-cursor")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -258,6 +258,51 @@ class TestConfigurationExportCodesCsv:
                     f"Expected blank Condition for custom code, got {row['Condition']!r}"
                 )
 
+    async def test_export_lists_condition_codes_before_custom_codes(
+        self,
+        setup,
+        authed_client,
+        get_condition_id,
+        create_config,
+        add_custom_code,
+        db_pool,
+    ):
+        """
+        Condition codes should come first, in the order the per-condition
+        query returns them, followed by custom codes.
+        """
+        condition_id = await get_condition_id("Amebiasis")
+        config = await create_config(condition_id)
+        config_id = config["id"]
+
+        loinc = await get_code_system_by_key_db(key="loinc", db=db_pool)
+        assert loinc
+
+        await add_custom_code(
+            config_id,
+            AddCustomCodeInput(
+                code="MOCK-CODE-001",
+                system_id=loinc.id,
+                display="Mock custom code",
+            ),
+        )
+
+        condition_codes = await get_condition_codes_by_condition_id_db(
+            condition_id=condition_id, db=db_pool
+        )
+
+        response = await authed_client.get(f"/api/v1/configurations/{config_id}/export")
+        assert response.status_code == status.HTTP_200_OK
+
+        content = _get_csv_from_zip(response.content, r"Code_Export")
+        rows = list(csv.DictReader(StringIO(content)))
+
+        assert [(r["Code System"], r["Code"]) for r in rows[:-1]] == [
+            (c.system, c.code) for c in condition_codes
+        ]
+        assert rows[-1]["Code Type"] == "Custom code"
+        assert rows[-1]["Code"] == "MOCK-CODE-001"
+
     async def test_export_codes_csv_body_is_non_empty(
         self, setup, authed_client, get_condition_id, create_config
     ):
@@ -0,0 +1,395 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import psycopg
+import pytest
+from psycopg.rows import dict_row
+
+from app.api.v1.configurations.codes.model import FilterInput
+from app.db.configurations.codes.db import get_codes_db
+from app.db.configurations.db import get_configurations_db
+from app.db.events.db import (
+    EventPageKey,
+    get_all_events_by_jd_db,
+    get_events_by_jd_db,
+)
+from app.db.tes.db import get_tes_update_condition_diff_db
+from tests.integration.conftest import (
+    DEFAULT_TES_VERSION,
+    PREV_TES_VERSION,
+    TEST_JD_ID,
+    TEST_USER_ID,
+)
+
+# a sequential scan reading more rows than this fails the test; small lookup
+# tables (tes, systems, users, ...) stay under it and may be scanned freely
+SEQ_SCAN_ROW_THRESHOLD = 1_000
+
+# seeded on top of the test data so every hot table is well past the threshold
+SEED_JURISDICTION_PREFIX = "QP"
+SEED_JURISDICTIONS = 40
+SEED_CONFIGURATIONS_PER_JURISDICTION = 50
+SEED_EVENTS_PER_CONFIGURATION = 25
+SEED_CUSTOM_CODES_PER_CONFIGURATION = 5
+SEED_TEST_JURISDICTION_EVENTS = 1_000
+
+SEED_QUERY = f"""
+    INSERT INTO jurisdictions (id, name)
+    SELECT
+        '{SEED_JURISDICTION_PREFIX}' || LPAD(g::TEXT, 3, '0'),
+        'Query plan jurisdiction ' || g
+    FROM generate_series(1, {SEED_JURISDICTIONS}) g;
+
+    INSERT INTO configurations (version, jurisdiction_id, name, created_by)
+    SELECT 1, j.id, 'Seeded configuration ' || g, '{TEST_USER_ID}'
+    FROM jurisdictions j
+    CROSS JOIN generate_series(1, {SEED_CONFIGURATIONS_PER_JURISDICTION}) g
+    WHERE j.id LIKE '{SEED_JURISDICTION_PREFIX}%';
+
+    INSERT INTO events (
+        jurisdiction_id, user_id, configuration_id, event_type, action_text, created_at
+    )
+    SELECT
+        c.jurisdiction_id,
+        c.created_by,
+        c.id,
+        'create_configuration',
+        'Seeded event',
+        NOW() - g * INTERVAL '1 minute'
+    FROM configurations c
+    CROSS JOIN generate_series(1, {SEED_EVENTS_PER_CONFIGURATION}) g
+    WHERE c.jurisdiction_id LIKE '{SEED_JURISDICTION_PREFIX}%';
+
+    INSERT INTO custom_codes (display, code, system_id, configuration_id)
+    SELECT
+        'Seeded custom code ' || g,
+        'QP-' || g,
+        (SELECT id FROM systems ORDER BY key LIMIT 1),
+        c.id
+    FROM configurations c
+    CROSS JOIN generate_series(1, {SEED_CUSTOM_CODES_PER_CONFIGURATION}) g
+    WHERE c.jurisdiction_id LIKE '{SEED_JURISDICTION_PREFIX}%';
+
+    -- the jurisdiction under test gets a realistic history of its own
+    INSERT INTO events (
+        jurisdiction_id, user_id, configuration_id, event_type, action_text, created_at
+    )
+    SELECT
+        c.jurisdiction_id,
+        c.created_by,
+        c.id,
+        'section_update',
+        'Seeded event',
+        NOW() - g * INTERVAL '1 minute'
+    FROM configurations c
+    CROSS JOIN generate_series(1, {SEED_TEST_JURISDICTION_EVENTS}) g
+    WHERE c.jurisdiction_id = '{TEST_JD_ID}';
+"""
+
+ANALYZE_QUERY = """
+    ANALYZE configurations;
+    ANALYZE configurations_conditions;
+    ANALYZE configurations_codes;
+    ANALYZE custom_codes;
+    ANALYZE events;
+    ANALYZE events_custom_code_uploads;
+    ANALYZE conditions;
+    ANALYZE conditions_codes_temp;
+    ANALYZE codes;
+"""
+
+
+def _large_seq_scans(plan: dict) -> list[tuple[str, int]]:
+    """
+    Find every sequential scan in an EXPLAIN (ANALYZE, FORMAT JSON) plan node
+    that read more than SEQ_SCAN_ROW_THRESHOLD rows.
+    """
+
+    scans = []
+    if plan["Node Type"] == "Seq Scan":
+        rows_read = (
+            plan["Actual Rows"] + plan.get("Rows Removed by Filter", 0)
+        ) * plan["Actual Loops"]
+        if rows_read > SEQ_SCAN_ROW_THRESHOLD:
+            scans.append((plan["Relation Name"], rows_read))
+    for child in plan.get("Plans", []):
+        scans += _large_seq_scans(child)
+    return scans
+
+
+def _index_scans(plan: dict, node_type: str) -> list[str]:
+    """
+    Find the index used by every plan node of the given type, e.g.
+    "Bitmap Index Scan" or "Index Only Scan".
+    """
+
+    indexes = [plan["Index Name"]] if plan["Node Type"] == node_type else []
+    for child in plan.get("Plans", []):
+        indexes += _index_scans(child, node_type)
+    return indexes
+
+
+async def _capture_queries(
+    monkeypatch: pytest.MonkeyPatch, call: Callable[[], Awaitable[Any]]
+) -> list[tuple[str, Any]]:
+    """
+    Run a db function and record every SELECT it executes, with its parameters.
+    """
+
+    captured: list[tuple[str, Any]] = []
+
+    def recording(execute):
+        async def recording_execute(self, query, params=None, **kwargs):
+            if str(query).lstrip().upper().startswith(("SELECT", "WITH")):
+                captured.append((query, params))
+            return await execute(self, query, params, **kwargs)
+
+        return recording_execute
+
+    with monkeypatch.context() as m:
+        # exports stream through server-side (named) cursors
+        for cursor_class in (psycopg.AsyncCursor, psycopg.AsyncServerCursor):
+            m.setattr(cursor_class, "execute", recording(cursor_class.execute))
+        await call()
+
+    return captured
+
+
+async def _explain(db_pool, query: str, params: Any) -> dict:
+    async with db_pool.get_connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params
+            )
+            row = await cur.fetchone()
+
+    assert row is not None
+    return row["QUERY PLAN"][0]["Plan"]
+
+
+async def _consume(iterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestQueryPlans:
+    async def test_hot_queries_avoid_large_sequential_scans(
+        self,
+        setup,
+        db_pool,
+        monkeypatch,
+        create_config,
+        get_condition_id,
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT canonical_url FROM conditions WHERE id = %s",
+                    (condition_id,),
+                )
+                row = await cur.fetchone()
+                assert row is not None
+                condition_url = row[0]
+
+                await cur.execute(SEED_QUERY)
+                await cur.execute(ANALYZE_QUERY)
+
+        hot_queries: dict[str, Callable[[], Awaitable[Any]]] = {
+            "get_configurations_db": lambda: get_configurations_db(
+                jurisdiction_id=TEST_JD_ID, db=db_pool
+            ),
+            "get_events_by_jd_db": lambda: get_events_by_jd_db(
+                jurisdiction_id=TEST_JD_ID, page=2, page_size=10, db=db_pool
+            ),
+            "get_events_by_jd_db (keyset)": lambda: get_events_by_jd_db(
+                jurisdiction_id=TEST_JD_ID,
+                page_size=10,
+                after=EventPageKey(
+                    created_at=datetime.now(UTC) - timedelta(minutes=500),
+                    id=UUID(int=0),
+                ),
+                db=db_pool,
+            ),
+            "get_all_events_by_jd_db": lambda: _consume(
+                get_all_events_by_jd_db(jurisdiction_id=TEST_JD_ID, db=db_pool)
+            ),
+            "get_codes_db": lambda: get_codes_db(
+                configuration_id=config["id"],
+                db=db_pool,
+                limit=100,
+                filters=FilterInput(),
+            ),
+            "get_codes_db (search)": lambda: get_codes_db(
+                configuration_id=config["id"],
+                db=db_pool,
+                limit=100,
+                filters=FilterInput(search="drown"),
+            ),
+            "get_tes_update_condition_diff_db": lambda: (
+                get_tes_update_condition_diff_db(
+                    db=db_pool,
+                    cur_version=DEFAULT_TES_VERSION,
+                    prev_version=PREV_TES_VERSION,
+                    cond_url=condition_url,
+                )
+            ),
+        }
+
+        try:
+            regressions = []
+            for name, call in hot_queries.items():
+                queries = await _capture_queries(monkeypatch, call)
+                assert queries, f"{name} executed no queries"
+
+                for query, params in queries:
+                    plan = await _explain(db_pool, query, params)
+                    regressions += [
+                        f"{name}: Seq Scan on {relation} read {rows} rows"
+                        for relation, rows in _large_seq_scans(plan)
+                    ]
+
+            assert not regressions, "\n".join(regressions)
+        finally:
+            # reset_db doesn't know about the seeded jurisdictions; events
+            # cascade with their configurations, custom codes don't
+            async with db_pool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        """
+                        DELETE FROM custom_codes
+                        WHERE configuration_id IN (
+                            SELECT id FROM configurations WHERE jurisdiction_id LIKE %s
+                        )
+                        """,
+                        (f"{SEED_JURISDICTION_PREFIX}%",),
+                    )
+                    await cur.execute(
+                        "DELETE FROM configurations WHERE jurisdiction_id LIKE %s",
+                        (f"{SEED_JURISDICTION_PREFIX}%",),
+                    )
+                    await cur.execute(
+                        "DELETE FROM jurisdictions WHERE id LIKE %s",
+                        (f"{SEED_JURISDICTION_PREFIX}%",),
+                    )
+
+    async def test_keyset_page_is_read_from_the_index_alone(
+        self,
+        setup,
+        db_pool,
+        monkeypatch,
+        create_config,
+        get_condition_id,
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+
+        # events cascade with the configuration when reset_db removes it
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO events (
+                        jurisdiction_id, user_id, configuration_id, event_type,
+                        action_text, created_at
+                    )
+                    SELECT
+                        c.jurisdiction_id,
+                        c.created_by,
+                        c.id,
+                        'section_update',
+                        'Seeded event',
+                        NOW() - g * INTERVAL '1 minute'
+                    FROM configurations c
+                    CROSS JOIN generate_series(1, %(events)s) g
+                    WHERE c.id = %(configuration_id)s
+                    """,
+                    {
+                        "events": SEED_TEST_JURISDICTION_EVENTS,
+                        "configuration_id": config["id"],
+                    },
+                )
+
+        # an index-only scan needs the pages marked all-visible, which only
+        # VACUUM does; it can't run in a transaction
+        async with await psycopg.AsyncConnection.connect(
+            db_pool.connection_url, password=db_pool.db_password, autocommit=True
+        ) as conn:
+            await conn.execute("VACUUM (ANALYZE) events")
+
+        queries = await _capture_queries(
+            monkeypatch,
+            lambda: get_events_by_jd_db(
+                jurisdiction_id=TEST_JD_ID,
+                page_size=10,
+                after=EventPageKey(
+                    created_at=datetime.now(UTC) - timedelta(minutes=500),
+                    id=UUID(int=0),
+                ),
+                db=db_pool,
+            ),
+        )
+        assert len(queries) == 1
+
+        plan = await _explain(db_pool, *queries[0])
+        assert "events_jurisdiction_id_created_at_id_idx" in _index_scans(
+            plan, "Index Only Scan"
+        )
+
+    async def test_code_search_uses_trigram_indexes(
+        self,
+        setup,
+        db_pool,
+        monkeypatch,
+        create_config,
+        get_condition_id,
+    ):
+        condition_id = await get_condition_id("Drowning and Submersion")
+        config = await create_config(condition_id)
+
+        # every condition of the version, so the configuration's rows are
+        # most of configurations_codes and only a search index can narrow
+        # them; reset_db removes them with the configuration
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO configurations_conditions (configuration_id, condition_id)
+                    SELECT %(configuration_id)s, c.id
+                    FROM conditions c
+                    WHERE c.tes_id = (
+                        SELECT tes_id FROM conditions WHERE id = %(condition_id)s
+                    )
+                    AND c.id <> %(condition_id)s
+                    """,
+                    {"configuration_id": config["id"], "condition_id": condition_id},
+                )
+                await cur.execute("ANALYZE configurations_codes")
+
+        queries = await _capture_queries(
+            monkeypatch,
+            lambda: get_codes_db(
+                configuration_id=config["id"],
+                db=db_pool,
+                limit=100,
+                filters=FilterInput(search="drown"),
+            ),
+        )
+        search_queries = [
+            (query, params)
+            for query, params in queries
+            if "FROM configurations_codes" in str(query)
+        ]
+        assert len(search_queries) == 1
+
+        plan = await _explain(db_pool, *search_queries[0])
+        assert set(_index_scans(plan, "Bitmap Index Scan")) >= {
+            "idx_configurations_codes_code_trgm",
+            "idx_configurations_codes_display_trgm",
+        }
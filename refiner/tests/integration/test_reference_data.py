@@ -0,0 +1,32 @@
+import asyncio
+
+import psycopg
+import pytest
+
+from app.db.reference_data import REFERENCE_DATA_CHANNEL
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestReferenceDataNotifications:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "UPDATE systems SET display_name = display_name WHERE false",
+            "UPDATE tes SET version = version WHERE false",
+            "UPDATE conditions SET display_name = display_name WHERE false",
+            "DELETE FROM conditions_codes_temp WHERE false",
+        ],
+    )
+    async def test_reference_table_change_notifies_on_commit(self, db_pool, statement):
+        async with await psycopg.AsyncConnection.connect(
+            db_pool.connection_url, password=db_pool.db_password, autocommit=True
+        ) as listener:
+            await listener.execute(f"LISTEN {REFERENCE_DATA_CHANNEL}")
+
+            # statement triggers fire even when no row matches
+            async with db_pool.get_connection() as conn:
+                await conn.execute(statement)
+
+            notify = await asyncio.wait_for(anext(listener.notifies()), timeout=5)
+            assert notify.channel == REFERENCE_DATA_CHANNEL
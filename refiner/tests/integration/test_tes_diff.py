@@ -61,3 +61,82 @@ class TestTesDiff:
             in (row["Display Name"] for row in reader)
         )
         assert "Removed" in (row["Change"] for row in reader)
+
+    async def test_tes_diffs_are_precomputed_by_seeding(self, setup, db_pool):
+        async with db_pool.get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT
+                        (SELECT COUNT(*) FROM tes) ^ 2,
+                        (SELECT COUNT(*) FROM tes_diffs)
+                    """
+                )
+                row = await cur.fetchone()
+
+        assert row is not None
+        expected_pairs, computed_pairs = row
+        assert computed_pairs == expected_pairs
+
+    async def test_refresh_only_diffs_new_versions(self, setup, db_pool):
+        async with db_pool.get_connection() as conn:
+            async with conn.transaction(force_rollback=True):
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "SELECT id FROM tes ORDER BY version DESC LIMIT 1"
+                    )
+                    row = await cur.fetchone()
+                    assert row is not None
+                    (new_tes_id,) = row
+
+                    # forget one version's diffs, as if it had just been loaded
+                    await cur.execute(
+                        """
+                        DELETE FROM tes_diffs
+                        WHERE cur_tes_id = %(id)s OR prev_tes_id = %(id)s
+                        """,
+                        {"id": new_tes_id},
+                    )
+                    await cur.execute(
+                        """
+                        SELECT COUNT(*) FROM tes_diffs
+                        WHERE computed_at < NOW()
+                        """
+                    )
+                    row = await cur.fetchone()
+                    assert row is not None
+                    (kept_pairs,) = row
+
+                    await cur.execute("SELECT refresh_tes_diffs()")
+                    await cur.execute(
+                        """
+                        SELECT
+                            (SELECT COUNT(*) FROM tes),
+                            COUNT(*) FILTER (WHERE computed_at < NOW()),
+                            COUNT(*) FILTER (
+                                WHERE computed_at = NOW()
+                                AND %(id)s IN (cur_tes_id, prev_tes_id)
+                            ),
+                            COUNT(*) FILTER (WHERE computed_at = NOW())
+                        FROM tes_diffs
+                        """,
+                        {"id": new_tes_id},
+                    )
+                    row = await cur.fetchone()
+
+        assert row is not None
+        versions, old_pairs, new_version_pairs, new_pairs = row
+        # the existing pairs are kept; only the new version's are computed
+        assert old_pairs == kept_pairs == (versions - 1) ** 2
+        assert new_pairs == new_version_pairs == 2 * versions - 1
+
+    async def test_tes_baseline_diff(self, authed_client):
+        response = await authed_client.get(
+            "/api/v1/tes/?cur_version=5.0.0&prev_version="
+        )
+        assert response.status_code == 200
+        baseline = response.json()
+
+        assert baseline
+        assert all(c["is_new"] for c in baseline)
+        assert all(c["removed_code_total"] == 0 for c in baseline)
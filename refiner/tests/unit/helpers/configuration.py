@@ -17,8 +17,8 @@ async def create_processed_config(
             return_value=conditions,
         ),
         unittest.mock.patch(
-            "app.services.configurations.get_id_to_code_system_dict_db",
-            new=unittest.mock.AsyncMock(return_value={m.id: m for m in mock_systems}),
+            "app.services.configurations.get_code_systems_db",
+            new=unittest.mock.AsyncMock(return_value=mock_systems),
         ),
     ):
         storage_payload = await convert_config_to_storage_payload(
@@ -249,9 +249,9 @@ async def test_add_custom_code_to_configuration(
 ):
     # Mock adding read of systems information to a config
     monkeypatch.setattr(
-        "app.services.configurations.get_code_system_by_key_db",
+        "app.services.configurations.get_code_systems_db",
         AsyncMock(
-            return_value=get_mock_system(code_system.key),
+            return_value=[get_mock_system(code_system.key)],
         ),
     )
 
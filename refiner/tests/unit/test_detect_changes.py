@@ -0,0 +1,145 @@
+import importlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+PIPELINE_DIR = Path(__file__).parents[2] / "scripts" / "pipeline"
+
+FILENAME = "condition_grouper_6.0.0.json"
+
+
+def _valueset(index: int, title: str = "Original") -> dict:
+    return {
+        "resourceType": "ValueSet",
+        "url": f"http://example.org/ValueSet/{index:05d}",
+        "version": "6.0.0",
+        "status": "active",
+        "title": title,
+    }
+
+
+class _Pipeline:
+    """
+    Runs detect_changes.main against a temporary data directory, with the
+    fetch step replaced by writing self.valuesets to a staged file.
+    """
+
+    def __init__(self, module, tmp_path: Path, monkeypatch):
+        self.module = module
+        self.data_dir = tmp_path / "data"
+        self.data_dir.mkdir()
+        self.manifest_path = self.data_dir / "manifest.json"
+        self.valuesets = [_valueset(i) for i in range(3)]
+        self.processed: list[str] = []
+
+        def fetch(output_dir: Path, **kwargs) -> dict[str, int]:
+            with open(output_dir / FILENAME, "w", encoding="utf-8") as fh:
+                json.dump({"valuesets": self.valuesets}, fh, indent=2)
+            return {FILENAME.removesuffix(".json"): len(self.valuesets)}
+
+        process_staged_file = module._process_staged_file
+
+        def record_processing(filepath: Path, validate: bool):
+            self.processed.append(filepath.name)
+            return process_staged_file(filepath, validate)
+
+        monkeypatch.setattr(module, "SCRIPTS_DIR", tmp_path)
+        monkeypatch.setattr(module, "TES_DATA_DIR", self.data_dir)
+        monkeypatch.setattr(module, "TES_DATA_STAGING_DIR", self.data_dir / "staging")
+        monkeypatch.setattr(module, "MANIFEST_PATH", self.manifest_path)
+        monkeypatch.setattr(module, "API_KEY", "test-key")
+        monkeypatch.setattr(module, "TES_VALIDATE", False)
+        monkeypatch.setattr(module, "run_fetch_pipeline", fetch)
+        # threads, so the recorder sees every file that gets processed
+        monkeypatch.setattr(module, "ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr(module, "_process_staged_file", record_processing)
+
+    def run(self) -> None:
+        self.processed.clear()
+        self.module.main()
+
+    def manifest(self) -> dict:
+        with open(self.manifest_path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch) -> _Pipeline:
+    # detect_changes imports fetch_api_data as a top-level module
+    monkeypatch.syspath_prepend(str(PIPELINE_DIR))
+    module = importlib.import_module("scripts.pipeline.detect_changes")
+
+    pipeline = _Pipeline(module, tmp_path, monkeypatch)
+    pipeline.run()
+    return pipeline
+
+
+def test_v2_manifest_is_upgraded_without_syncing_files(pipeline, capsys):
+    synced = pipeline.manifest()["files"][FILENAME]
+
+    v2_entry = {k: v for k, v in synced.items() if k != "valuesets"}
+    with open(pipeline.manifest_path, "w", encoding="utf-8") as fh:
+        json.dump({"manifest_version": 2, "files": {FILENAME: v2_entry}}, fh)
+    capsys.readouterr()
+
+    pipeline.run()
+
+    # no per-valueset hashes to compare, so the file is hashed again, but
+    # it's the same file
+    assert pipeline.processed == [FILENAME]
+    output = capsys.readouterr().out
+    assert "UPDATED" not in output
+    manifest = pipeline.manifest()
+    assert manifest["manifest_version"] == pipeline.module.MANIFEST_VERSION
+    assert manifest["files"] == {FILENAME: synced}
+
+
+def test_unchanged_run_skips_validation_and_the_manifest(pipeline, capsys):
+    manifest_text = pipeline.manifest_path.read_text(encoding="utf-8")
+    capsys.readouterr()
+
+    pipeline.run()
+
+    assert pipeline.processed == []
+    assert pipeline.manifest_path.read_text(encoding="utf-8") == manifest_text
+    output = capsys.readouterr().out
+    assert "No changes detected" in output
+    assert "Manifest file updated" not in output
+
+
+def test_one_edited_valueset_is_reported_as_changed(pipeline, capsys):
+    old_hash = pipeline.manifest()["files"][FILENAME]["hash"]
+    pipeline.valuesets[1] = _valueset(1, title="Renamed")
+    capsys.readouterr()
+
+    pipeline.run()
+
+    assert pipeline.processed == [FILENAME]
+    output = capsys.readouterr().out
+    changed = [line.strip() for line in output.splitlines() if "CHANGED:" in line]
+    assert changed == ["CHANGED: http://example.org/ValueSet/00001|6.0.0"]
+    assert "0 added, 1 changed, 0 removed" in output
+    assert "UPDATED: " + FILENAME in output
+
+    assert pipeline.manifest()["files"][FILENAME]["hash"] != old_hash
+    with open(pipeline.data_dir / FILENAME, encoding="utf-8") as fh:
+        assert json.load(fh)["valuesets"][1]["title"] == "Renamed"
+
+
+def test_unvalidated_file_is_validated_once_validation_is_on(pipeline, monkeypatch):
+    # the fixture's first run recorded the file with TES_VALIDATE off
+    assert pipeline.manifest()["files"][FILENAME]["validation_ran"] is False
+    monkeypatch.setattr(pipeline.module, "TES_VALIDATE", True)
+
+    pipeline.run()
+
+    assert pipeline.processed == [FILENAME]
+    entry = pipeline.manifest()["files"][FILENAME]
+    assert entry["validation_ran"] is True
+    assert entry["record_count"] == len(pipeline.valuesets)
+
+    # validated now, so the next run skips it
+    pipeline.run()
+    assert pipeline.processed == []
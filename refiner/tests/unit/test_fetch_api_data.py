@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from scripts.pipeline import fetch_api_data
+from scripts.pipeline.fetch_api_data import BATCH_SIZE, run_fetch_pipeline
+
+CONDITION_GROUPER_PROFILE = (
+    "http://aphl.org/fhir/vsm/StructureDefinition/vsm-conditiongroupervalueset"
+)
+
+
+def _valueset(index: int, version: str = "6.0.0") -> dict:
+    return {
+        "resourceType": "ValueSet",
+        "url": f"http://example.org/ValueSet/{index:05d}",
+        "version": version,
+        "meta": {"profile": [CONDITION_GROUPER_PROFILE]},
+    }
+
+
+class _StandInTes:
+    """
+    Serves a fixed list of ValueSets the way the TES API pages them, honoring
+    If-None-Match, and counts full (200) and empty (304) responses.
+    """
+
+    def __init__(self, valuesets: list[dict]):
+        self.valuesets = valuesets
+        self.responses: Counter[int] = Counter()
+
+    def page(self, offset: int) -> bytes:
+        entries = [
+            {"resource": vs} for vs in self.valuesets[offset : offset + BATCH_SIZE]
+        ]
+        return json.dumps({"resourceType": "Bundle", "entry": entries}).encode()
+
+
+@pytest.fixture
+def stand_in_tes(monkeypatch):
+    tes = _StandInTes([_valueset(i) for i in range(BATCH_SIZE * 3 + 10)])
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            body = tes.page(int(query["_getpagesoffset"][0]))
+            etag = f'"{hashlib.sha256(body).hexdigest()}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                tes.responses[304] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            tes.responses[200] += 1
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/fhir+json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("TES_API_URL", f"http://127.0.0.1:{server.server_port}")
+
+    yield tes
+
+    server.shutdown()
+    server.server_close()
+
+
+def _run(tmp_path, name: str, sleep_interval: float = 0) -> tuple[dict[str, int], dict]:
+    output_dir = tmp_path / name
+    output_dir.mkdir()
+    counts = run_fetch_pipeline(
+        output_dir=output_dir,
+        api_key="test-key",
+        sleep_interval=sleep_interval,
+        log_dir_base=tmp_path,
+        cache_dir=tmp_path / "cache",
+        max_in_flight=2,
+    )
+    with open(output_dir / "condition_grouper_6.0.0.json", encoding="utf-8") as fh:
+        return counts, json.load(fh)
+
+
+def test_fetch_writes_every_valueset_in_url_order(tmp_path, stand_in_tes):
+    counts, written = _run(tmp_path, "first")
+
+    urls = [vs["url"] for vs in written["valuesets"]]
+    assert counts == {"condition_grouper_6.0.0": len(stand_in_tes.valuesets)}
+    assert urls == sorted(vs["url"] for vs in stand_in_tes.valuesets)
+
+
+def test_refresh_only_downloads_changed_pages(tmp_path, stand_in_tes):
+    _, first = _run(tmp_path, "first")
+    # 4 pages of data plus both empty pages of the round that finds the end
+    first_downloads = stand_in_tes.responses[200]
+    assert first_downloads == 6
+
+    stand_in_tes.responses.clear()
+    _, unchanged = _run(tmp_path, "unchanged")
+    assert unchanged == first
+    assert stand_in_tes.responses[200] == 0
+    assert stand_in_tes.responses[304] == first_downloads
+
+    stand_in_tes.responses.clear()
+    stand_in_tes.valuesets[BATCH_SIZE]["title"] = "Renamed"
+    _, changed = _run(tmp_path, "changed")
+    assert stand_in_tes.responses[200] == 1
+    assert {vs.get("title") for vs in changed["valuesets"]} == {None, "Renamed"}
+
+
+def test_sleep_interval_is_waited_once_per_round(tmp_path, stand_in_tes, monkeypatch):
+    sleeps: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def recording_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(fetch_api_data.asyncio, "sleep", recording_sleep)
+    _run(tmp_path, "first", sleep_interval=0.5)
+
+    # 2 pages a round: 4 pages of data, then the round that finds the end
+    assert sleeps.count(0.5) == 3
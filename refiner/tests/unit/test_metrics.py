@@ -0,0 +1,124 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import get_app_config
+from app.core.metrics import CallbackGauge, Histogram, MetricsRegistry, registry
+from app.main import create_fastapi_app
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(
+        "test_duration_seconds",
+        "Test durations.",
+        label_names=("function",),
+        buckets=(0.1, 1.0),
+    )
+    histogram.observe(0.05, function="fast")
+    histogram.observe(0.5, function="fast")
+    histogram.observe(5, function="fast")
+
+    assert list(histogram.render()) == [
+        "# HELP test_duration_seconds Test durations.",
+        "# TYPE test_duration_seconds histogram",
+        'test_duration_seconds_bucket{function="fast",le="0.1"} 1',
+        'test_duration_seconds_bucket{function="fast",le="1"} 2',
+        'test_duration_seconds_bucket{function="fast",le="+Inf"} 3',
+        'test_duration_seconds_sum{function="fast"} 5.55',
+        'test_duration_seconds_count{function="fast"} 3',
+    ]
+
+
+def test_histogram_requires_every_label():
+    histogram = Histogram("test_seconds", "Test.", label_names=("function",))
+
+    with pytest.raises(KeyError):
+        histogram.observe(1.0)
+
+
+def test_histogram_time_observes_even_when_block_raises():
+    histogram = Histogram("test_seconds", "Test.", label_names=("operation",))
+
+    with histogram.time(operation="ok"):
+        pass
+    with pytest.raises(ValueError), histogram.time(operation="failed"):
+        raise ValueError("boom")
+
+    rendered = list(histogram.render())
+    assert 'test_seconds_count{operation="failed"} 1' in rendered
+    assert 'test_seconds_count{operation="ok"} 1' in rendered
+
+
+def test_callback_gauge_reads_values_at_render_time():
+    stats = {"pool_size": 2}
+    gauge = CallbackGauge(
+        "test_pool",
+        "Test pool stats.",
+        callback=lambda: {(stat,): value for stat, value in stats.items()},
+        label_names=("stat",),
+    )
+
+    stats["pool_size"] = 4
+    stats["requests_waiting"] = 1
+
+    assert list(gauge.render())[2:] == [
+        'test_pool{stat="pool_size"} 4',
+        'test_pool{stat="requests_waiting"} 1',
+    ]
+
+
+def test_registry_replaces_metrics_by_name():
+    test_registry = MetricsRegistry()
+    test_registry.histogram("test_seconds", "First.")
+    test_registry.histogram("test_seconds", "Second.")
+
+    rendered = test_registry.render()
+
+    assert "# HELP test_seconds Second." in rendered
+    assert "First." not in rendered
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_only_exists_when_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    registry.histogram("test_endpoint_seconds", "Test.").observe(0.2)
+
+    monkeypatch.setattr(get_app_config(), "METRICS_ENABLED", False)
+    disabled_app = create_fastapi_app(lifespan=None)
+    monkeypatch.setattr(get_app_config(), "METRICS_ENABLED", True)
+    enabled_app = create_fastapi_app(lifespan=None)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=enabled_app), base_url="http://testserver"
+    ) as client:
+        response = await client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "test_endpoint_seconds_count 1" in response.text
+
+    assert not any(
+        getattr(route, "path", None) == "/api/metrics" for route in disabled_app.routes
+    )
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_are_labelled_by_route_template(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(get_app_config(), "METRICS_ENABLED", True)
+    app = create_fastapi_app(lifespan=None)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        await client.get("/api/metrics")
+        response = await client.get("/api/metrics")
+
+    # each request is recorded once it has finished, so the first scrape
+    # shows up in the second
+    assert (
+        'refiner_http_request_duration_seconds_count{method="GET",'
+        'route="/api/metrics",status="200"}'
+    ) in response.text
+    assert 'refiner_threadpool{stat="capacity"}' in response.text
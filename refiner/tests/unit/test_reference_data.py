@@ -0,0 +1,128 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import DbConfig
+from app.db.code_systems.db import (
+    DbCodeSystem,
+    get_code_system_by_key_db,
+    get_code_systems_db,
+    get_id_to_code_system_dict_db,
+)
+from app.db.reference_data import ReferenceDataCache, reference_data_cache
+
+
+@pytest.fixture
+def enabled_reference_data_cache():
+    reference_data_cache.enable()
+    yield reference_data_cache
+    reference_data_cache.disable()
+
+
+def _counting_loader(value):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return value
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_loads():
+    cache = ReferenceDataCache()
+    loader, calls = _counting_loader(["a"])
+
+    assert await cache.get_or_load("key", loader) == ["a"]
+    assert await cache.get_or_load("key", loader) == ["a"]
+
+    assert len(calls) == 2
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.keys) == (0, 0, [])
+
+
+@pytest.mark.asyncio
+async def test_enabled_cache_counts_hits_and_misses():
+    cache = ReferenceDataCache()
+    cache.enable()
+    loader, calls = _counting_loader(["a"])
+
+    await cache.get_or_load("key", loader)
+    await cache.get_or_load("key", loader)
+    await cache.get_or_load("key", loader)
+
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.keys) == (2, 1, ["key"])
+
+    cache.invalidate()
+    await cache.get_or_load("key", loader)
+
+    assert len(calls) == 2
+    assert cache.get_stats().invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_value_loaded_across_invalidation_is_not_cached():
+    cache = ReferenceDataCache()
+    cache.enable()
+
+    async def stale_loader():
+        # seeding finishes while this load is in flight
+        cache.invalidate()
+        return ["stale"]
+
+    assert await cache.get_or_load("key", stale_loader) == ["stale"]
+    assert cache.get_stats().keys == []
+
+
+@pytest.mark.asyncio
+async def test_code_system_lookups_share_one_query(
+    mock_db, enabled_reference_data_cache
+):
+    loinc = DbCodeSystem(
+        id=uuid4(), key="loinc", display_name="LOINC", oid="2.16.840.1.113883.6.1"
+    )
+    mock_db._mock_cursor.fetchall.return_value = [loinc]
+
+    systems = await get_code_systems_db(db=mock_db)
+    by_id = await get_id_to_code_system_dict_db(db=mock_db)
+    by_key = await get_code_system_by_key_db(key="loinc", db=mock_db)
+    missing = await get_code_system_by_key_db(key="cvx", db=mock_db)
+
+    assert systems == [loinc]
+    assert by_id == {loinc.id: loinc}
+    assert by_key == loinc
+    assert missing is None
+    assert mock_db._mock_cursor.execute.await_count == 1
+
+    # callers get their own list; mutating it must not touch the cache
+    systems.clear()
+    assert await get_code_systems_db(db=mock_db) == [loinc]
+
+
+@pytest.mark.parametrize(
+    ("cache", "listen", "expected_listen"),
+    [
+        (None, None, True),
+        ("false", None, False),
+        ("true", "false", False),
+    ],
+)
+def test_listen_defaults_to_the_cache_setting(
+    monkeypatch: pytest.MonkeyPatch,
+    cache: str | None,
+    listen: str | None,
+    expected_listen: bool,
+):
+    for name, value in (
+        ("REFERENCE_DATA_CACHE", cache),
+        ("REFERENCE_DATA_CACHE_LISTEN", listen),
+    ):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+
+    assert DbConfig().REFERENCE_DATA_CACHE_LISTEN is expected_listen
@@ -1,8 +1,17 @@
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
 from app.api.v1.configurations.model import SectionUpdateInput
 from app.api.v1.configurations.sections import _build_section_update
+from app.db.configurations.custom_codes.model import DbCustomCode
 from app.db.configurations.model import DbConfigurationSectionProcessing
 from app.services.configurations import (
     clone_section_processing_instructions,
+    convert_config_to_storage_payload,
     get_default_sections,
 )
 from app.services.ecr.policy import NARRATIVE_ONLY_SECTIONS, SECTION_PROCESSING_SKIP
@@ -440,3 +449,136 @@ class TestCloneSectionNarrativeNormalization:
         result = clone_section_processing_instructions(clone_from, clone_to)
 
         assert result[0].narrative == "retain"
+
+
+class _QueryCountingCursor:
+    def __init__(self, db: "_QueryCountingDb"):
+        self._db = db
+        self._rows: list = []
+
+    async def execute(self, query, params=None):
+        self._db.queries.append(query)
+        if "FROM systems" in query:
+            self._rows = self._db.systems
+        elif "FROM conditions" in query:
+            (ids,) = params
+            self._rows = [row for row in self._db.condition_rows if row["id"] in ids]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    async def fetchall(self):
+        return self._rows
+
+
+class _QueryCountingConnection:
+    def __init__(self, db: "_QueryCountingDb"):
+        self._db = db
+
+    @asynccontextmanager
+    async def cursor(self, row_factory=None):
+        yield _QueryCountingCursor(self._db)
+
+
+class _QueryCountingDb:
+    """
+    Stands in for AsyncDatabaseConnection and records every executed query.
+    """
+
+    def __init__(self, systems, condition_rows):
+        self.systems = systems
+        self.condition_rows = condition_rows
+        self.queries: list[str] = []
+
+    @asynccontextmanager
+    async def get_connection(self):
+        yield _QueryCountingConnection(self)
+
+
+def _condition_row(index: int) -> dict:
+    return {
+        "id": uuid4(),
+        "canonical_url": f"http://url.com/{index}",
+        "display_name": f"Condition {index}",
+        "version": "3.0.0",
+        "child_rsg_snomed_codes": [f"rsg-{index}"],
+        "snomed_codes": [{"code": f"sn-{index}", "display": "snomed"}],
+        "loinc_codes": [{"code": f"ln-{index}", "display": "loinc"}],
+        "icd10_codes": [{"code": f"icd-{index}", "display": "icd10"}],
+        "rxnorm_codes": [{"code": f"rx-{index}", "display": "rxnorm"}],
+        "cvx_codes": [{"code": f"cvx-{index}", "display": "cvx"}],
+    }
+
+
+class TestConvertConfigToStoragePayload:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("condition_count", [1, 5, 25])
+    async def test_query_count_is_constant(
+        self, condition_count, mock_configuration, mock_all_systems, get_mock_system
+    ):
+        """
+        Tests that the payload is built from a fixed number of queries however many conditions are included.
+        """
+        condition_rows = [_condition_row(i) for i in range(condition_count)]
+        loinc = get_mock_system("loinc")
+        configuration = replace(
+            mock_configuration,
+            included_conditions=[row["id"] for row in condition_rows],
+            custom_codes=[
+                DbCustomCode(
+                    id=uuid4(),
+                    code="custom-1",
+                    display="custom code",
+                    system_id=loinc.id,
+                    created_at=datetime.now(),
+                    updated_at=datetime.now(),
+                    configuration_id=mock_configuration.id,
+                )
+            ],
+        )
+        db = _QueryCountingDb(systems=mock_all_systems, condition_rows=condition_rows)
+
+        payload = await convert_config_to_storage_payload(
+            configuration=configuration, db=db
+        )
+
+        assert len(db.queries) == 2
+        assert payload is not None
+        assert payload.included_condition_rsg_codes == {
+            f"rsg-{i}" for i in range(condition_count)
+        }
+
+        loinc_codes = {c["code"]: c for c in payload.code_system_sets["loinc"]}
+        assert set(loinc_codes) == {"custom-1"} | {
+            f"ln-{i}" for i in range(condition_count)
+        }
+        assert loinc_codes["custom-1"]["system"] == loinc.oid
+        assert {c["code"] for c in payload.code_system_sets["cvx"]} == {
+            f"cvx-{i}" for i in range(condition_count)
+        }
+
+    @pytest.mark.asyncio
+    async def test_unknown_custom_code_system_raises(
+        self, mock_configuration, mock_all_systems
+    ):
+        """
+        Tests that a custom code pointing at an unknown system is rejected.
+        """
+        configuration = replace(
+            mock_configuration,
+            included_conditions=[],
+            custom_codes=[
+                DbCustomCode(
+                    id=uuid4(),
+                    code="custom-1",
+                    display="custom code",
+                    system_id=uuid4(),
+                    created_at=datetime.now(),
+                    updated_at=datetime.now(),
+                    configuration_id=mock_configuration.id,
+                )
+            ],
+        )
+        db = _QueryCountingDb(systems=mock_all_systems, condition_rows=[])
+
+        with pytest.raises(ValueError, match="doesn't match supported systems"):
+            await convert_config_to_storage_payload(configuration=configuration, db=db)
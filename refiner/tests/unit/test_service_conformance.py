@@ -0,0 +1,67 @@
+import pytest
+from lxml import etree
+
+from app.services.conformance import (
+    CONFORMANCE_SAMPLE_RATE_ENV_VAR,
+    MAX_REPORTED_ERRORS,
+    check_conformance,
+    get_conformance_sample_rate,
+    should_check_conformance,
+)
+
+# =============================================================================
+# SAMPLING
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, 0.0),
+        ("0", 0.0),
+        ("0.25", 0.25),
+        ("1", 1.0),
+        ("5", 1.0),
+        ("-1", 0.0),
+        ("bogus", 0.0),
+    ],
+)
+def test_get_conformance_sample_rate(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, expected: float
+):
+    if value is None:
+        monkeypatch.delenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, value)
+
+    assert get_conformance_sample_rate() == expected
+
+
+def test_should_check_conformance_follows_rate(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, "0")
+    assert not any(should_check_conformance() for _ in range(100))
+
+    monkeypatch.setenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, "1")
+    assert all(should_check_conformance() for _ in range(100))
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+
+def test_check_conformance_reports_violations():
+    # a ClinicalDocument missing every required child, plus repeated
+    # unknown elements to push past the reported-error cap
+    root = etree.fromstring(
+        '<ClinicalDocument xmlns="urn:hl7-org:v3">'
+        + "<bogus/>" * (MAX_REPORTED_ERRORS * 2)
+        + "</ClinicalDocument>"
+    )
+
+    check = check_conformance(root)
+
+    assert not check.valid
+    assert check.error_count >= 1
+    assert 1 <= len(check.errors) <= MAX_REPORTED_ERRORS
+    assert all(error.startswith("line ") for error in check.errors)
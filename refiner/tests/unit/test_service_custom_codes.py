@@ -0,0 +1,113 @@
+import csv
+import io
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.db.code_systems.db import DbCodeSystem
+from app.db.configurations.custom_codes.model import DbCustomCode
+from app.services import custom_codes
+from app.services.custom_codes import validate_custom_codes_csv
+
+LOINC = DbCodeSystem(
+    id=uuid4(), key="loinc", display_name="LOINC", oid="2.16.840.1.113883.6.1"
+)
+SNOMED = DbCodeSystem(
+    id=uuid4(), key="snomed", display_name="SNOMED", oid="2.16.840.1.113883.6.96"
+)
+SYSTEMS = [LOINC, SNOMED]
+
+
+def _reader(*rows: str) -> csv.DictReader[str]:
+    text = "\n".join(["code,code_system,display_name", *rows])
+    return csv.DictReader(io.StringIO(text))
+
+
+def _existing_code(code: str, system: DbCodeSystem) -> DbCustomCode:
+    now = datetime.now()
+    return DbCustomCode(
+        id=uuid4(),
+        display="Existing",
+        code=code,
+        system_id=system.id,
+        created_at=now,
+        updated_at=now,
+        configuration_id=uuid4(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_valid_rows_become_preview_items_in_order():
+    result = await validate_custom_codes_csv(
+        _reader("1234-5,LOINC,First", " 999 ,SNOMED, Second "),
+        supported_systems=SYSTEMS,
+        existing_codes=[],
+    )
+
+    assert result.errors == []
+    assert [(i.code, i.system_id, i.display, i.row) for i in result.preview_items] == [
+        ("1234-5", LOINC.id, "First", 2),
+        ("999", SNOMED.id, "Second", 3),
+    ]
+    assert result.preview_items[1].system_name == "SNOMED"
+
+
+@pytest.mark.asyncio
+async def test_invalid_rows_report_every_problem():
+    result = await validate_custom_codes_csv(
+        _reader(",,", "1,ICD-99,Name"),
+        supported_systems=SYSTEMS,
+        existing_codes=[],
+    )
+
+    assert result.preview_items == []
+    assert result.errors == [
+        {
+            "row": 2,
+            "error": "Missing code, Missing display_name, Missing code_system",
+        },
+        {
+            "row": 3,
+            "error": "Invalid system: ICD-99. [code_system] must be one of [LOINC, SNOMED]",
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_duplicates_of_existing_and_earlier_rows_are_errors():
+    result = await validate_custom_codes_csv(
+        _reader(
+            "1,LOINC,Existing",
+            "2,LOINC,New",
+            "2,LOINC,Repeated",
+            "2,SNOMED,Same code in another system",
+        ),
+        supported_systems=SYSTEMS,
+        existing_codes=[_existing_code("1", LOINC)],
+    )
+
+    assert [(i.code, i.system_id) for i in result.preview_items] == [
+        ("2", LOINC.id),
+        ("2", SNOMED.id),
+    ]
+    assert result.errors == [
+        {"row": 2, "error": "Duplicate: matches existing custom code"},
+        {"row": 4, "error": "Duplicate: matches uploaded batch code"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_numbered_across_chunks(monkeypatch):
+    monkeypatch.setattr(custom_codes, "CSV_UPLOAD_CHUNK_ROWS", 2)
+
+    result = await validate_custom_codes_csv(
+        _reader(*(f"{n},LOINC,Code {n}" for n in range(5)), "0,LOINC,Again"),
+        supported_systems=SYSTEMS,
+        existing_codes=[],
+    )
+
+    assert [i.row for i in result.preview_items] == [2, 3, 4, 5, 6]
+    assert result.errors == [
+        {"row": 7, "error": "Duplicate: matches uploaded batch code"}
+    ]
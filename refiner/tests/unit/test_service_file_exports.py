@@ -0,0 +1,45 @@
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.services import file_exports
+from app.services.file_exports import iter_csv_chunks, spool_csv_chunks
+
+
+class _Rows:
+    """
+    Yields numbered rows and records when it has been read to the end, the
+    way a server-side cursor releases its connection.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.finished = False
+
+    async def __aiter__(self) -> AsyncIterator[list[str]]:
+        for n in range(self.count):
+            yield [str(n), f"Code {n}"]
+        self.finished = True
+
+
+@pytest.mark.asyncio
+async def test_spool_reads_every_row_before_yielding(monkeypatch):
+    monkeypatch.setattr(file_exports, "CSV_CHUNK_SIZE", 100)
+    monkeypatch.setattr(file_exports, "CSV_SPOOL_MAX_MEMORY", 200)
+    rows = _Rows(count=50)
+
+    chunks = spool_csv_chunks(header=["code", "display"], rows=rows)
+    first = await anext(chunks)
+    assert rows.finished
+    spooled = first + "".join([chunk async for chunk in chunks])
+
+    streamed = "".join(
+        [
+            chunk
+            async for chunk in iter_csv_chunks(
+                header=["code", "display"], rows=_Rows(count=50)
+            )
+        ]
+    )
+    assert spooled == streamed
+    assert spooled.splitlines()[-1] == "49,Code 49"
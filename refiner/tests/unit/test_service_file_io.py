@@ -1,3 +1,4 @@
+import io
 import time
 import zipfile
 from pathlib import Path
@@ -21,6 +22,7 @@ from app.services.file_io import (
     create_refined_ecr_zip_in_memory,
     parse_xml,
     read_xml_zip,
+    stream_zip,
 )
 
 
@@ -276,3 +278,35 @@ def test_zip_contains_only_xml_when_html_fails() -> None:
         # Verify contents
         assert zf.read("ConditionD-654.html").startswith(b"<html")
         assert zf.read("ConditionC-321.xml").decode("utf-8").startswith("<xml>")
+
+
+@pytest.mark.asyncio
+async def test_stream_zip_yields_before_entries_are_finished():
+    """
+    Test that stream_zip hands out compressed data while an entry is still
+    being produced, and that the result is a valid archive.
+    """
+
+    chunks_out: list[bytes] = []
+
+    async def rows():
+        for i in range(20_000):
+            # by the last row, part of the archive has already been yielded
+            if i == 19_999:
+                assert chunks_out
+            yield f"{i},{'x' * (i % 97)}\n"
+
+    async def single():
+        yield "only,row\n"
+
+    async for chunk in stream_zip([("codes.csv", rows()), ("sections.csv", single())]):
+        chunks_out.append(chunk)
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks_out))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["codes.csv", "sections.csv"]
+        codes = zf.read("codes.csv").decode("utf-8").splitlines()
+        assert len(codes) == 20_000
+        assert codes[-1] == f"19999,{'x' * (19_999 % 97)}"
+        assert zf.read("sections.csv") == b"only,row\n"
+        assert zf.getinfo("codes.csv").compress_type == zipfile.ZIP_DEFLATED
@@ -0,0 +1,278 @@
+import threading
+from zipfile import ZipFile
+
+import pytest
+
+from app.core.models.types import XMLFiles
+from app.services.assets import get_asset_path
+from app.services.instrumentation import (
+    STAGE_TIMING_ENV_VAR,
+    StageTimer,
+    StageTiming,
+    add_stage_observer,
+    create_stage_timer,
+    remove_stage_observer,
+    stage,
+    timed_stage,
+    timing_session,
+)
+from app.services.pipeline import (
+    RefinementContext,
+    create_augmentation_run_from_xml_files,
+    refine_for_condition,
+)
+from app.services.terminology import ProcessedConfiguration
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def sample_xml_files() -> XMLFiles:
+    """
+    Load the mon-mothma two-jurisdiction sample files.
+    """
+    zip_path = get_asset_path("demo", "mon-mothma-reportable-two-jds.zip")
+
+    with ZipFile(zip_path) as z:
+        with z.open("CDA_RR.xml") as f:
+            rr_xml = f.read().decode("utf-8")
+        with z.open("CDA_eICR.xml") as f:
+            eicr_xml = f.read().decode("utf-8")
+
+    return XMLFiles(eicr=eicr_xml, rr=rr_xml)
+
+
+def _refine(xml_files: XMLFiles):
+    return refine_for_condition(
+        xml_files=xml_files,
+        processed_configuration=ProcessedConfiguration.from_dict(
+            {
+                "sections": [],
+                "included_condition_rsg_codes": ["840539006"],
+                "code_system_sets": {},
+            }
+        ),
+        context=RefinementContext(
+            jurisdiction_id="SDDH",
+            canonical_url="https://tes.tools.aimsplatform.org/api/fhir/ValueSet/07221093-b8a1-4b1d-8678-259277bfba64",
+            configuration_version=1,
+        ),
+        run=create_augmentation_run_from_xml_files(xml_files),
+    )
+
+
+# =============================================================================
+# TIMER
+# =============================================================================
+
+
+def test_stage_is_noop_without_active_timer():
+    with stage("orphan") as span:
+        span.set(outcome="ignored")
+
+    @timed_stage("decorated")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert add(1, 2) == 3
+
+
+def test_create_stage_timer_modes(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(STAGE_TIMING_ENV_VAR, raising=False)
+    assert create_stage_timer() is None
+
+    monkeypatch.setenv(STAGE_TIMING_ENV_VAR, "on")
+    timer = create_stage_timer()
+    assert timer is not None
+    assert not timer.track_memory
+
+    monkeypatch.setenv(STAGE_TIMING_ENV_VAR, "MEMORY")
+    timer = create_stage_timer()
+    assert timer is not None
+    assert timer.track_memory
+
+    monkeypatch.setenv(STAGE_TIMING_ENV_VAR, "bogus")
+    assert create_stage_timer() is None
+
+
+def test_stages_record_order_depth_and_attributes():
+    timer = StageTimer()
+
+    @timed_stage("inner_decorated")
+    def inner() -> None:
+        return None
+
+    with timing_session(timer):
+        with stage("outer", section_code="30954-2") as span:
+            inner()
+            with stage("inner_block"):
+                pass
+            span.set(outcome="refined")
+        with stage("sibling"):
+            pass
+
+    assert [(s.name, s.depth) for s in timer.stages] == [
+        ("outer", 0),
+        ("inner_decorated", 1),
+        ("inner_block", 1),
+        ("sibling", 0),
+    ]
+    assert timer.stages[0].attributes == {
+        "section_code": "30954-2",
+        "outcome": "refined",
+    }
+    assert all(s.duration_ms >= 0 for s in timer.stages)
+    assert all(s.memory_peak_kib is None for s in timer.stages)
+
+
+def test_stage_records_error_type():
+    timer = StageTimer()
+
+    with timing_session(timer), pytest.raises(ValueError):
+        with stage("failing"):
+            raise ValueError("boom")
+
+    assert timer.stages[0].attributes["error"] == "ValueError"
+
+
+def test_memory_mode_records_allocations():
+    timer = StageTimer(track_memory=True)
+
+    with timing_session(timer):
+        with stage("outer"):
+            with stage("allocate"):
+                retained = [bytes(1024) for _ in range(256)]
+        del retained
+
+    outer, allocate = timer.stages
+    assert allocate.memory_peak_kib is not None
+    assert allocate.memory_peak_kib >= 256
+    # the child's peak must be carried up to the enclosing stage
+    assert outer.memory_peak_kib is not None
+    assert outer.memory_peak_kib >= allocate.memory_peak_kib
+
+
+def test_only_one_memory_session_traces_at_a_time():
+    first = StageTimer(track_memory=True)
+    nested = StageTimer(track_memory=True)
+    concurrent = StageTimer(track_memory=True)
+
+    def run_concurrent_session():
+        # a new thread starts with an empty context, like a second request
+        with timing_session(concurrent):
+            with stage("other"):
+                pass
+
+    with timing_session(first):
+        with stage("outer"):
+            with timing_session(nested):
+                with stage("inner"):
+                    pass
+            thread = threading.Thread(target=run_concurrent_session)
+            thread.start()
+            thread.join()
+
+    assert first.track_memory
+    assert nested.track_memory
+    assert nested.stages[0].memory_peak_kib is not None
+    assert not concurrent.track_memory
+    assert concurrent.stages[0].memory_peak_kib is None
+
+    # the slot is free again once the first session ends
+    after = StageTimer(track_memory=True)
+    with timing_session(after):
+        with stage("after"):
+            pass
+    assert after.stages[0].memory_peak_kib is not None
+
+
+def test_session_with_none_masks_enclosing_timer():
+    timer = StageTimer()
+
+    with timing_session(timer):
+        with timing_session(None):
+            with stage("hidden"):
+                pass
+
+    assert timer.stages == []
+
+
+def test_stage_observer_sees_every_stage_when_timing_is_off(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.delenv(STAGE_TIMING_ENV_VAR, raising=False)
+    observed: list[StageTiming] = []
+    add_stage_observer(observed.append)
+
+    try:
+        timer = create_stage_timer()
+        assert timer is not None
+        with timing_session(timer):
+            with stage("outer"):
+                with stage("inner"):
+                    pass
+    finally:
+        remove_stage_observer(observed.append)
+
+    # observers are called as stages close, innermost first
+    assert [s.name for s in observed] == ["inner", "outer"]
+    assert create_stage_timer() is None
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+
+def test_refine_for_condition_stages_off_by_default(
+    monkeypatch: pytest.MonkeyPatch, sample_xml_files: XMLFiles
+):
+    monkeypatch.delenv(STAGE_TIMING_ENV_VAR, raising=False)
+
+    result = _refine(sample_xml_files)
+
+    assert result.metrics.stages is None
+
+
+def test_refine_for_condition_reports_stages(
+    monkeypatch: pytest.MonkeyPatch, sample_xml_files: XMLFiles
+):
+    monkeypatch.setenv(STAGE_TIMING_ENV_VAR, "on")
+
+    result = _refine(sample_xml_files)
+
+    stages = result.metrics.stages
+    assert stages is not None
+    top_level = [s.name for s in stages if s.depth == 0]
+    assert top_level == [
+        "parse_eicr",
+        "parse_rr",
+        "index_rr",
+        "plan_eicr",
+        "refine_eicr",
+        "augment_eicr",
+        "serialize_eicr",
+        "refine_rr",
+        "augment_rr",
+        "serialize_rr",
+    ]
+
+    sections = [s for s in stages if s.name == "refine_eicr.section"]
+    assert sections
+    assert all(s.depth == 1 for s in sections)
+    assert all("section_code" in s.attributes for s in sections)
+    assert all("outcome" in s.attributes for s in sections)
+
+
+def test_outer_session_sees_refinement_as_single_stage(
+    monkeypatch: pytest.MonkeyPatch, sample_xml_files: XMLFiles
+):
+    monkeypatch.setenv(STAGE_TIMING_ENV_VAR, "on")
+    timer = StageTimer()
+
+    with timing_session(timer):
+        _refine(sample_xml_files)
+
+    assert [s.name for s in timer.stages] == ["refine_for_condition"]
@@ -3,8 +3,13 @@ from zipfile import ZipFile
 
 import pytest
 
+from app.core.exceptions import XMLValidationError
 from app.core.models.types import XMLFiles
 from app.services.assets import get_asset_path
+from app.services.conformance import (
+    CONFORMANCE_SAMPLE_RATE_ENV_VAR,
+    check_conformance,
+)
 from app.services.ecr.model import JurisdictionReportableConditions
 from app.services.pipeline import (
     RefinementContext,
@@ -109,6 +114,24 @@ class TestDiscoverReportableConditions:
         assert "840539006" in sddh_codes  # COVID
         assert "772828001" in sddh_codes  # Influenza
 
+    def test_streaming_matches_full_parse(self, sample_xml_files: XMLFiles):
+        """
+        Streaming discovery reads only up to the RR11 organizer but must
+        return the same groups as the full parse.
+        """
+        assert discover_reportable_conditions(
+            sample_xml_files, streaming=True
+        ) == discover_reportable_conditions(sample_xml_files)
+
+    def test_streaming_malformed_rr_raises_xml_validation_error(self):
+        """
+        A malformed RR surfaces as XMLValidationError in both modes.
+        """
+        xml_files = XMLFiles(eicr="<ClinicalDocument/>", rr="<ClinicalDocument>")
+
+        with pytest.raises(XMLValidationError):
+            discover_reportable_conditions(xml_files, streaming=True)
+
 
 # =============================================================================
 # STAGE 2: REFINEMENT EXECUTION
@@ -204,3 +227,101 @@ class TestRefineForCondition:
                     run=run,
                 )
             assert exc_info.value.detail == "plan creation failed"
+
+    def test_conformance_not_checked_by_default(
+        self,
+        sample_xml_files: XMLFiles,
+        minimal_processed_configuration: ProcessedConfiguration,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        With no sample rate set, refinement should skip the XSD check.
+        """
+        monkeypatch.delenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, raising=False)
+        context = RefinementContext(
+            jurisdiction_id="SDDH",
+            canonical_url="https://tes.tools.aimsplatform.org/api/fhir/ValueSet/07221093-b8a1-4b1d-8678-259277bfba64",
+            configuration_version=1,
+        )
+        run = create_augmentation_run_from_xml_files(sample_xml_files)
+
+        result = refine_for_condition(
+            xml_files=sample_xml_files,
+            processed_configuration=minimal_processed_configuration,
+            context=context,
+            run=run,
+        )
+
+        assert result.report.eicr_conformance is None
+        assert result.report.rr_conformance is None
+
+    def test_sampled_refinement_adds_no_xsd_violations(
+        self,
+        sample_xml_files: XMLFiles,
+        minimal_processed_configuration: ProcessedConfiguration,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        When sampled, the refined eICR and RR should both be checked against
+        the CDA XSD, and refinement should not add violations beyond those
+        already in the source documents (the demo eICR has a few of its own).
+        """
+        monkeypatch.setenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, "1")
+        context = RefinementContext(
+            jurisdiction_id="SDDH",
+            canonical_url="https://tes.tools.aimsplatform.org/api/fhir/ValueSet/07221093-b8a1-4b1d-8678-259277bfba64",
+            configuration_version=1,
+        )
+        run = create_augmentation_run_from_xml_files(sample_xml_files)
+
+        result = refine_for_condition(
+            xml_files=sample_xml_files,
+            processed_configuration=minimal_processed_configuration,
+            context=context,
+            run=run,
+        )
+
+        sources = (sample_xml_files.parse_eicr(), sample_xml_files.parse_rr())
+        checks = (result.report.eicr_conformance, result.report.rr_conformance)
+        for source, check in zip(sources, checks):
+            assert check is not None
+            assert check.duration_ms > 0
+            assert check.error_count <= check_conformance(source).error_count, (
+                check.errors
+            )
+
+    def test_failing_conformance_check_does_not_fail_refinement(
+        self,
+        sample_xml_files: XMLFiles,
+        minimal_processed_configuration: ProcessedConfiguration,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        If the sampled XSD check itself raises (e.g. the schema can't be
+        compiled), refinement should still succeed and report the failure.
+        """
+        monkeypatch.setenv(CONFORMANCE_SAMPLE_RATE_ENV_VAR, "1")
+        context = RefinementContext(
+            jurisdiction_id="SDDH",
+            canonical_url="https://tes.tools.aimsplatform.org/api/fhir/ValueSet/07221093-b8a1-4b1d-8678-259277bfba64",
+            configuration_version=1,
+        )
+        run = create_augmentation_run_from_xml_files(sample_xml_files)
+
+        with patch(
+            "app.services.conformance.check_conformance",
+            side_effect=OSError("schema not found"),
+        ):
+            result = refine_for_condition(
+                xml_files=sample_xml_files,
+                processed_configuration=minimal_processed_configuration,
+                context=context,
+                run=run,
+            )
+
+        assert result.documents.eicr
+        assert result.documents.rr
+        for check in (result.report.eicr_conformance, result.report.rr_conformance):
+            assert check is not None
+            assert not check.valid
+            assert check.check_error == "schema not found"
@@ -3,8 +3,93 @@ from lxml import etree
 from lxml.etree import _Element
 
 from app.core.exceptions import StructureValidationError
-from app.services.ecr.model import ReportableCondition
-from app.services.ecr.reportability import get_reportable_conditions_by_jurisdiction
+from app.services.ecr.model import ReportableCondition, RRRefinementPlan
+from app.services.ecr.refine import refine_rr
+from app.services.ecr.reportability import (
+    build_rr_index,
+    get_reportable_conditions_by_jurisdiction,
+    stream_reportable_conditions_by_jurisdiction,
+)
+from tests.fixtures.loader import load_fixture_str
+
+_RR_TWO_JURISDICTIONS = """
+    <ClinicalDocument xmlns="urn:hl7-org:v3">
+        <component>
+            <structuredBody>
+                <component>
+                    <section>
+                        <code code="55112-7"/>
+                        <entry>
+                            <organizer>
+                                <code code="RR11"/>
+                                <component>
+                                    <observation>
+                                        <templateId root="2.16.840.1.113883.10.20.15.2.3.12"/>
+                                        <value code="840539006" displayName="COVID-19"/>
+                                        <entryRelationship>
+                                            <organizer>
+                                                <participant>
+                                                    <participantRole>
+                                                        <id extension="jur1"/>
+                                                        <code code="RR7"/>
+                                                    </participantRole>
+                                                </participant>
+                                                <component>
+                                                    <observation>
+                                                        <code code="RR1"/>
+                                                        <value code="RRVS1"/>
+                                                    </observation>
+                                                </component>
+                                            </organizer>
+                                        </entryRelationship>
+                                        <entryRelationship>
+                                            <organizer>
+                                                <participant>
+                                                    <participantRole>
+                                                        <id extension="JUR2"/>
+                                                        <code code="RR7"/>
+                                                    </participantRole>
+                                                </participant>
+                                                <component>
+                                                    <observation>
+                                                        <code code="RR1"/>
+                                                        <value code="RRVS2"/>
+                                                    </observation>
+                                                </component>
+                                            </organizer>
+                                        </entryRelationship>
+                                    </observation>
+                                </component>
+                                <component>
+                                    <observation>
+                                        <templateId root="2.16.840.1.113883.10.20.15.2.3.12"/>
+                                        <value code="27836007" displayName="Pertussis"/>
+                                        <entryRelationship>
+                                            <organizer>
+                                                <participant>
+                                                    <participantRole>
+                                                        <id extension="JUR2"/>
+                                                        <code code="RR7"/>
+                                                    </participantRole>
+                                                </participant>
+                                                <component>
+                                                    <observation>
+                                                        <code code="RR1"/>
+                                                        <value code="RRVS2"/>
+                                                    </observation>
+                                                </component>
+                                            </organizer>
+                                        </entryRelationship>
+                                    </observation>
+                                </component>
+                            </organizer>
+                        </entry>
+                    </section>
+                </component>
+            </structuredBody>
+        </component>
+    </ClinicalDocument>
+"""
 
 
 def test_get_reportable_conditions_no_codes() -> None:
@@ -165,3 +250,140 @@ def test_get_reportable_conditions_empty_rr11() -> None:
 
     result = get_reportable_conditions_by_jurisdiction(root)
     assert result == []
+
+
+def test_build_rr_index() -> None:
+    """
+    Test that build_rr_index records each condition's code and routing contexts.
+    """
+
+    root: _Element = etree.fromstring(_RR_TWO_JURISDICTIONS)
+
+    index = build_rr_index(root)
+
+    assert [entry.code for entry in index.conditions] == ["840539006", "27836007"]
+    assert set(index.by_code) == {"840539006", "27836007"}
+
+    covid = index.by_code["840539006"][0]
+    assert covid.display_name == "COVID-19"
+    assert [(r.jurisdiction, r.is_reportable) for r in covid.routings] == [
+        ("JUR1", True),
+        ("JUR2", False),
+    ]
+
+
+def test_get_reportable_conditions_with_prebuilt_index() -> None:
+    """
+    Test that a prebuilt index gives the same result as building one internally.
+    """
+
+    root: _Element = etree.fromstring(_RR_TWO_JURISDICTIONS)
+    index = build_rr_index(root)
+
+    result = get_reportable_conditions_by_jurisdiction(root, index=index)
+
+    assert result == get_reportable_conditions_by_jurisdiction(root)
+    assert len(result) == 1
+    assert result[0].jurisdiction == "JUR1"
+    assert result[0].conditions == [
+        ReportableCondition(code="840539006", display_name="COVID-19")
+    ]
+
+
+def test_refine_rr_with_index_removes_unconfigured_and_unreportable() -> None:
+    """
+    Test that refine_rr driven by an index drops unconfigured and non-reportable conditions.
+    """
+
+    root: _Element = etree.fromstring(_RR_TWO_JURISDICTIONS)
+    index = build_rr_index(root)
+
+    # COVID is configured and reportable (first routing organizer is RRVS1)
+    refine_rr(
+        rr_root=root,
+        plan=RRRefinementPlan(
+            included_condition_child_rsg_snomed_codes_to_retain={"840539006"}
+        ),
+        index=index,
+    )
+
+    assert [entry.code for entry in build_rr_index(root).conditions] == ["840539006"]
+
+    # Pertussis is configured but not reportable, so it is removed too
+    root = etree.fromstring(_RR_TWO_JURISDICTIONS)
+    refine_rr(
+        rr_root=root,
+        plan=RRRefinementPlan(
+            included_condition_child_rsg_snomed_codes_to_retain={"27836007"}
+        ),
+    )
+
+    assert build_rr_index(root).conditions == []
+
+
+@pytest.mark.parametrize(
+    "rr_fixture",
+    [
+        "eicr_v1_1/mon_mothma_covid_influenza_RR.xml",
+        "eicr_v3_1_1/mon_mothma_zika_RR.xml",
+        "eicr_v3_1_1/multi-condition-multi-covid-CDA_RR.xml",
+    ],
+)
+def test_stream_reportable_conditions_matches_full_parse(rr_fixture: str) -> None:
+    """
+    Test that streaming discovery returns exactly what the DOM-based discovery does.
+    """
+
+    rr_content = load_fixture_str(rr_fixture)
+
+    assert stream_reportable_conditions_by_jurisdiction(
+        rr_content
+    ) == get_reportable_conditions_by_jurisdiction(
+        etree.fromstring(rr_content.encode())
+    )
+
+
+def test_stream_reportable_conditions_stops_after_rr11() -> None:
+    """
+    Test that streaming discovery never reads past the RR11 organizer.
+
+    The trailing content is malformed, so a full parse would fail.
+    """
+
+    truncated = _RR_TWO_JURISDICTIONS.split("</section>")[0] + "<broken"
+
+    with pytest.raises(etree.XMLSyntaxError):
+        etree.fromstring(truncated)
+
+    result = stream_reportable_conditions_by_jurisdiction(truncated)
+
+    assert [group.jurisdiction for group in result] == ["JUR1"]
+    assert result[0].conditions == [
+        ReportableCondition(code="840539006", display_name="COVID-19")
+    ]
+
+
+def test_stream_reportable_conditions_missing_rr11() -> None:
+    """
+    Test that streaming discovery raises the same error as build_rr_index when RR11 is missing.
+    """
+
+    rr_content = """
+        <ClinicalDocument xmlns="urn:hl7-org:v3">
+            <component>
+                <section>
+                    <code code="55112-7"/>
+                    <entry>
+                        <organizer>
+                            <code code="RR99"/>
+                        </organizer>
+                    </entry>
+                </section>
+            </component>
+        </ClinicalDocument>
+    """
+
+    with pytest.raises(StructureValidationError) as exc_info:
+        stream_reportable_conditions_by_jurisdiction(rr_content)
+
+    assert "Missing required RR11 Coded Information Organizer" in str(exc_info.value)
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from io import BytesIO
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services.aws.s3 import AsyncS3Client
+
+
+class FakeS3Client:
+    """
+    Stands in for a boto3 client: blocking calls against an in-memory bucket.
+    """
+
+    def __init__(self, objects: dict[str, bytes], barrier: threading.Barrier | None):
+        self.objects = objects
+        self.barrier = barrier
+        self.threads: set[str] = set()
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        self.threads.add(threading.current_thread().name)
+        if self.barrier is not None:
+            # only passes once every read is in flight at the same time
+            self.barrier.wait(timeout=5)
+        if Key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject"
+            )
+        return {"Body": BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str):
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        self.objects[Key] = Body
+
+
+@pytest.mark.asyncio
+async def test_get_objects_reads_concurrently_off_the_default_threadpool():
+    client = FakeS3Client({"a": b"1", "b": b"2", "c": b"3"}, threading.Barrier(3))
+    s3 = AsyncS3Client(client, max_workers=3)
+    try:
+        assert await s3.get_objects("bucket", ["c", "a", "b"]) == [b"3", b"1", b"2"]
+    finally:
+        s3.shutdown()
+
+    assert all(name.startswith("refiner-s3") for name in client.threads)
+
+
+@pytest.mark.asyncio
+async def test_put_objects_writes_concurrently():
+    client = FakeS3Client({}, threading.Barrier(2))
+    s3 = AsyncS3Client(client, max_workers=2)
+    try:
+        await s3.put_objects(
+            "bucket", {"a": b"1", "b": b"2"}, content_type="application/json"
+        )
+    finally:
+        s3.shutdown()
+
+    assert client.objects == {"a": b"1", "b": b"2"}
+
+
+@pytest.mark.asyncio
+async def test_missing_key_raises_file_not_found():
+    s3 = AsyncS3Client(FakeS3Client({}, barrier=None), max_workers=1)
+    try:
+        with pytest.raises(FileNotFoundError) as exc_info:
+            await s3.get_object("bucket", "missing.json")
+    finally:
+        s3.shutdown()
+
+    assert exc_info.value.filename == "missing.json"
+
+
+@pytest.mark.asyncio
+async def test_open_object_stream_yields_chunks():
+    s3 = AsyncS3Client(FakeS3Client({"f.zip": b"abcdefg"}, None), max_workers=1)
+    try:
+        chunks = await s3.open_object_stream("bucket", "f.zip", chunk_size=3)
+        assert [chunk async for chunk in chunks] == [b"abc", b"def", b"g"]
+
+        with pytest.raises(ClientError):
+            await s3.open_object_stream("bucket", "missing.zip")
+    finally:
+        s3.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_is_recreated_after_shutdown():
+    s3 = AsyncS3Client(FakeS3Client({"a": b"1"}, None), max_workers=1)
+    await s3.get_object("bucket", "a")
+    s3.shutdown()
+
+    assert await asyncio.wait_for(s3.get_object("bucket", "a"), timeout=5) == b"1"
+    s3.shutdown()
@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import time
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.logger import get_request_id, set_request_id
+from app.services.watchdog import LoopWatchdog, fold_stack
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _wait_on_io(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+def _warnings(logger: MagicMock, message: str) -> list[dict]:
+    return [
+        call.kwargs["extra"]
+        for call in logger.warning.call_args_list
+        if call.args[0] == message
+    ]
+
+
+def test_fold_stack_names_file_function_and_line():
+    frame = sys._getframe()
+    location, line = fold_stack([frame]).rsplit(":", 1)
+
+    assert location == (
+        "test_service_watchdog.py:test_fold_stack_names_file_function_and_line"
+    )
+    assert line.isdigit()
+
+
+@pytest.mark.asyncio
+async def test_stall_is_profiled_and_attributed_to_request():
+    logger = MagicMock()
+    watchdog = LoopWatchdog()
+    request_id = uuid.uuid4()
+    set_request_id(request_id)
+
+    watchdog.start(
+        logger,
+        lag_threshold_seconds=0.05,
+        slow_request_seconds=0.2,
+        interval_seconds=0.01,
+        sample_interval_seconds=0.002,
+    )
+    try:
+        with watchdog.track_request(str(request_id), "POST", "/api/v1/refine"):
+            await asyncio.sleep(0.05)
+            _block_the_loop(0.4)
+            # let the heartbeat beat so the stall is closed and logged
+            await asyncio.sleep(0.1)
+    finally:
+        await watchdog.stop()
+
+    [stall] = _warnings(logger, "Event loop stalled")
+    assert stall["request_id"] == str(request_id)
+    assert stall["path"] == "/api/v1/refine"
+    assert stall["stall_ms"] >= 200
+    assert "_block_the_loop" in stall["stacks"][0]["stack"]
+
+    # the request was slow too, and its profile includes the stall
+    [slow] = _warnings(logger, "Slow request")
+    assert slow["blocked_ms"] >= 200
+    assert any("_block_the_loop" in s["stack"] for s in slow["stacks"])
+
+    # the watchdog thread's logging doesn't leak into the request's context
+    assert get_request_id() == str(request_id)
+
+
+@pytest.mark.asyncio
+async def test_slow_request_samples_await_stacks():
+    logger = MagicMock()
+    watchdog = LoopWatchdog()
+    request_id = uuid.uuid4()
+    set_request_id(request_id)
+
+    watchdog.start(
+        logger,
+        lag_threshold_seconds=0,
+        slow_request_seconds=0.05,
+        interval_seconds=0.01,
+    )
+    try:
+        with watchdog.track_request(str(request_id), "GET", "/api/v1/configurations"):
+            await asyncio.create_task(_wait_on_io(0.3))
+        with watchdog.track_request("fast", "GET", "/api/healthcheck"):
+            pass
+    finally:
+        await watchdog.stop()
+
+    assert _warnings(logger, "Event loop stalled") == []
+    [slow] = _warnings(logger, "Slow request")
+    assert slow["path"] == "/api/v1/configurations"
+    assert slow["blocked_ms"] == 0
+    assert slow["samples"] > 0
+    assert any("_wait_on_io" in s["stack"] for s in slow["stacks"])
+
+
+def test_track_request_is_noop_when_not_running():
+    watchdog = LoopWatchdog()
+
+    with watchdog.track_request("id", "GET", "/"):
+        pass
+
+    assert not watchdog.running
@@ -0,0 +1,68 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.api.auth.session import SessionCache
+from app.db.users.model import DbUser
+
+
+@pytest.fixture
+def user() -> DbUser:
+    now = datetime.now(UTC)
+    return DbUser(
+        id=uuid4(),
+        username="refiner",
+        email="refiner@refiner.com",
+        jurisdiction_id="SDDH",
+        created_at=now,
+        updated_at=now,
+        notifications={},
+    )
+
+
+def test_disabled_cache_stores_nothing(user: DbUser):
+    cache = SessionCache()
+    cache.set("hash", user, datetime.now(UTC) + timedelta(hours=1))
+
+    assert cache.get("hash") is None
+
+
+def test_cached_lookup_is_returned_until_ttl(user: DbUser):
+    cache = SessionCache()
+    cache.enable(ttl_seconds=5)
+
+    with patch("app.api.auth.session.monotonic", return_value=100.0):
+        cache.set("hash", user, datetime.now(UTC) + timedelta(hours=1))
+
+    with patch("app.api.auth.session.monotonic", return_value=104.0):
+        entry = cache.get("hash")
+        assert entry is not None
+        assert entry.user == user
+
+    with patch("app.api.auth.session.monotonic", return_value=105.0):
+        assert cache.get("hash") is None
+
+
+def test_expired_session_is_not_returned(user: DbUser):
+    cache = SessionCache()
+    cache.enable(ttl_seconds=5)
+    cache.set("hash", user, datetime.now(UTC) - timedelta(seconds=1))
+
+    assert cache.get("hash") is None
+
+
+def test_invalidate_and_disable_drop_entries(user: DbUser):
+    cache = SessionCache()
+    cache.enable(ttl_seconds=5)
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+
+    cache.set("first", user, expires_at)
+    cache.set("second", user, expires_at)
+    cache.invalidate("first")
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+
+    cache.disable()
+    assert cache.get("second") is None
@@ -0,0 +1,108 @@
+import io
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from scripts.validation.validate_batch import (
+    DocumentResult,
+    build_json_report,
+    build_junit_report,
+    iter_documents,
+)
+
+
+def _issue(severity: str, message: str = "Problem") -> dict[str, str]:
+    return {
+        "severity": severity,
+        "message": message,
+        "location": "/ClinicalDocument",
+        "test": "true()",
+    }
+
+
+RESULTS = [
+    DocumentResult(path="clean.xml", document_type="eICR STU 3.1.1"),
+    DocumentResult(
+        path="warned.xml",
+        document_type="eICR STU 3.1.1",
+        schematron=[_issue("WARNING", "SHOULD have a title")],
+    ),
+    DocumentResult(
+        path="invalid.xml",
+        document_type="RR STU 1.1.0",
+        xsd=[_issue("ERROR", "Bad element")],
+        schematron=[_issue("ERROR"), _issue("FATAL"), _issue("WARNING")],
+    ),
+    DocumentResult(path="unknown.xml", error="Not a recognized document."),
+]
+
+
+def test_iter_documents_expands_directories_and_keeps_files(tmp_path):
+    (tmp_path / "nested").mkdir()
+    for name in ["b.xml", "a.xml", "nested/c.xml", "notes.txt"]:
+        (tmp_path / name).touch()
+
+    assert list(iter_documents([str(tmp_path), "other.xml"])) == [
+        tmp_path / "a.xml",
+        tmp_path / "b.xml",
+        tmp_path / "nested" / "c.xml",
+        Path("other.xml"),
+    ]
+
+
+def test_iter_documents_reads_paths_from_stdin_for_dash(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO("one.xml\n\n  two.xml  \n"))
+
+    assert list(iter_documents(["first.xml", "-"])) == [
+        Path("first.xml"),
+        Path("one.xml"),
+        Path("two.xml"),
+    ]
+
+
+def test_json_report_counts_passes_failures_and_warnings():
+    report = build_json_report(RESULTS, elapsed=1.23456)
+
+    assert report["summary"] == {
+        "documents": 4,
+        "passed": 2,
+        "failed": 2,
+        "errors": 3,
+        "warnings": 2,
+        "elapsed_seconds": 1.235,
+    }
+    assert [
+        (d["path"], d["passed"], d["error_count"], d["warning_count"])
+        for d in report["documents"]
+    ] == [
+        ("clean.xml", True, 0, 0),
+        ("warned.xml", True, 0, 1),
+        ("invalid.xml", False, 3, 1),
+        ("unknown.xml", False, 0, 0),
+    ]
+
+
+def test_junit_report_fails_errors_and_lists_warnings():
+    testsuites = ET.fromstring(build_junit_report(RESULTS, elapsed=2.0))
+
+    assert testsuites.get("tests") == "4"
+    assert testsuites.get("failures") == "2"
+    testcases = {tc.get("name"): tc for tc in testsuites.iter("testcase")}
+
+    assert list(testcases["clean.xml"]) == []
+
+    warned = testcases["warned.xml"]
+    assert warned.find("failure") is None
+    assert warned.findtext("system-out") == (
+        "[Schematron WARNING] SHOULD have a title (/ClinicalDocument)"
+    )
+
+    failure = testcases["invalid.xml"].find("failure")
+    assert failure is not None
+    assert failure.get("message") == "3 validation errors"
+    assert failure.text is not None
+    assert len(failure.text.splitlines()) == 4
+
+    unknown = testcases["unknown.xml"].find("failure")
+    assert unknown is not None
+    assert unknown.get("message") == "Not a recognized document."
+    assert testcases["unknown.xml"].get("classname") == "unknown"